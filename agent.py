@@ -14,6 +14,7 @@ from __future__ import annotations
 
 import sys
 import json
+import asyncio
 import argparse
 from datetime import datetime
 from typing import Any, Dict, List
@@ -34,6 +35,9 @@ from src.utils import (
     log_tool_call,
     get_daily_usage,
 )
+from src.deadline import Deadline
+from src.event_stream import report_command_progress
+from src.tracing import span
 from src.ha_client import get_ha_client
 from tools.lights import LIGHT_TOOLS, execute_light_tool
 from tools.vacuum import VACUUM_TOOLS, execute_vacuum_tool
@@ -113,6 +117,13 @@ def execute_tool(tool_name: str, tool_input: dict) -> str:
     Returns:
         Result string to send back to Claude
     """
+    report_command_progress("tool", tool=tool_name)
+    with span("tool", tool_name):
+        return _dispatch_tool(tool_name, tool_input)
+
+
+def _dispatch_tool(tool_name: str, tool_input: dict) -> str:
+    """Route a tool call to its implementation (see execute_tool)."""
     logger.info(f"Executing tool: {tool_name}")
 
     # System tools
@@ -256,20 +267,17 @@ def convert_tools_to_openai_format(tools: List[Dict]) -> List[Dict]:
     return openai_tools
 
 
-def run_agent(user_message: str) -> str:
-    """
-    Run the agentic loop with OpenAI.
+DEADLINE_EXCEEDED_MESSAGE = "Sorry, that took too long. Please try again."
+MAX_ITERATIONS_MESSAGE = "I've reached my processing limit. Please try a simpler request."
 
-    Args:
-        user_message: User's natural language command
 
-    Returns:
-        Final response from the agent
+def _start_conversation(user_message: str) -> tuple[List[Dict], List[Dict]]:
     """
-    if not OPENAI_API_KEY:
-        return "Error: OPENAI_API_KEY not configured. Please set it in .env file."
+    Set up an agent run: log the command and build the opening messages.
 
-    client = openai.OpenAI(api_key=OPENAI_API_KEY)
+    Returns:
+        (messages, OpenAI tool definitions)
+    """
     prompts = load_prompts()
     system_prompt = prompts.get("main_agent", {}).get("system", "You are a helpful smart home assistant.")
 
@@ -278,68 +286,178 @@ def run_agent(user_message: str) -> str:
         {"role": "user", "content": user_message}
     ]
 
-    openai_tools = convert_tools_to_openai_format(TOOLS)
-
     log_command(user_message)
+    return messages, convert_tools_to_openai_format(TOOLS)
+
+
+def _completion_request(messages: List[Dict], openai_tools: List[Dict]) -> Dict:
+    """Arguments for one chat completion request of the agent loop."""
+    return {
+        "model": OPENAI_MODEL,
+        "max_tokens": 1024,
+        "messages": messages,
+        "tools": openai_tools,
+        "tool_choice": "auto",
+    }
+
+
+def _handle_response(
+    response, messages: List[Dict], user_message: str
+) -> tuple[str | None, List[tuple]]:
+    """
+    Track usage for an LLM response and decide what the loop does next.
+
+    If the model asked for tools, its message is appended to messages.
+
+    Returns:
+        (final reply, []) when the agent is done, otherwise
+        (None, [(tool_call_id, tool_name, tool_input), ...])
+    """
+    message = response.choices[0].message
+
+    # Track usage
+    track_api_usage(
+        model=OPENAI_MODEL,
+        input_tokens=response.usage.prompt_tokens,
+        output_tokens=response.usage.completion_tokens,
+        command=user_message[:100]
+    )
+
+    logger.debug(f"Finish reason: {response.choices[0].finish_reason}")
+
+    # Done when the model stops or answers without calling tools
+    if response.choices[0].finish_reason == "stop" or not message.tool_calls:
+        return message.content or "Done.", []
+
+    # Add assistant message with tool calls
+    messages.append(message)
+
+    tool_calls = []
+    for tool_call in message.tool_calls:
+        tool_name = tool_call.function.name
+        tool_input = json.loads(tool_call.function.arguments)
+        logger.info(f"Tool use: {tool_name} with {tool_input}")
+        tool_calls.append((tool_call.id, tool_name, tool_input))
+    return None, tool_calls
+
+
+def _add_tool_result(messages: List[Dict], tool_call_id: str, result: str) -> None:
+    """Append a tool result for the next LLM request."""
+    messages.append({
+        "role": "tool",
+        "tool_call_id": tool_call_id,
+        "content": result
+    })
+
+
+def run_agent(user_message: str, deadline: Deadline | None = None) -> str:
+    """
+    Run the agentic loop with OpenAI.
+
+    Args:
+        user_message: User's natural language command
+        deadline: Optional request deadline. Once it expires (or the caller
+                  cancels it) no further LLM or tool calls are made, and each
+                  LLM request is given only the remaining time as its timeout.
+
+    Returns:
+        Final response from the agent
+    """
+    if not OPENAI_API_KEY:
+        return "Error: OPENAI_API_KEY not configured. Please set it in .env file."
+
+    client = openai.OpenAI(api_key=OPENAI_API_KEY)
+    messages, openai_tools = _start_conversation(user_message)
 
     for iteration in range(MAX_AGENT_ITERATIONS):
         logger.debug(f"Agent iteration {iteration + 1}/{MAX_AGENT_ITERATIONS}")
 
+        request = _completion_request(messages, openai_tools)
+        if deadline is not None:
+            if deadline.expired():
+                logger.warning("Deadline expired, skipping LLM call")
+                return DEADLINE_EXCEEDED_MESSAGE
+            request["timeout"] = deadline.remaining()
+
         try:
-            response = client.chat.completions.create(
-                model=OPENAI_MODEL,
-                max_tokens=1024,
-                messages=messages,
-                tools=openai_tools,
-                tool_choice="auto"
-            )
+            with span("llm", OPENAI_MODEL):
+                response = client.chat.completions.create(**request)
         except openai.APIError as error:
             logger.error(f"OpenAI API error: {error}")
             return f"API Error: {error}"
 
-        message = response.choices[0].message
+        reply, tool_calls = _handle_response(response, messages, user_message)
+        if reply is not None:
+            return reply
 
-        # Track usage
-        track_api_usage(
-            model=OPENAI_MODEL,
-            input_tokens=response.usage.prompt_tokens,
-            output_tokens=response.usage.completion_tokens,
-            command=user_message[:100]
-        )
+        for tool_call_id, tool_name, tool_input in tool_calls:
+            if deadline is not None and deadline.expired():
+                logger.warning(f"Deadline expired, skipping tool {tool_name}")
+                return DEADLINE_EXCEEDED_MESSAGE
 
-        logger.debug(f"Finish reason: {response.choices[0].finish_reason}")
+            _add_tool_result(messages, tool_call_id, execute_tool(tool_name, tool_input))
 
-        # Check if we're done (no tool calls)
-        if response.choices[0].finish_reason == "stop":
-            return message.content or "Done."
+    # Max iterations reached
+    logger.warning("Max agent iterations reached")
+    return MAX_ITERATIONS_MESSAGE
 
-        # Process tool calls
-        if message.tool_calls:
-            # Add assistant message with tool calls
-            messages.append(message)
 
-            for tool_call in message.tool_calls:
-                tool_name = tool_call.function.name
-                tool_input = json.loads(tool_call.function.arguments)
+# Async OpenAI client, created once and reused on the shared event loop
+_async_openai_client: openai.AsyncOpenAI | None = None
 
-                logger.info(f"Tool use: {tool_name} with {tool_input}")
 
-                # Execute tool
-                result = execute_tool(tool_name, tool_input)
+def _get_async_openai_client() -> openai.AsyncOpenAI:
+    """Get the async OpenAI client (must only be awaited on src.async_loop's loop)."""
+    global _async_openai_client
+    if _async_openai_client is None:
+        _async_openai_client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
+    return _async_openai_client
 
-                # Add tool result
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "content": result
-                })
-        else:
-            # No tool calls and not stopped - return content
-            return message.content or "Done."
 
-    # Max iterations reached
+async def arun_agent(user_message: str) -> str:
+    """
+    Run the agentic loop asynchronously on the shared event loop.
+
+    Behaves like run_agent(), but awaits the OpenAI request so that
+    cancelling the task (e.g. on a voice timeout) aborts the in-flight
+    request and stops any further iterations. Tool calls run in a worker
+    thread via asyncio.to_thread(); cancelling only stops the await, so a
+    tool call already started runs to completion in its thread.
+
+    Args:
+        user_message: User's natural language command
+
+    Returns:
+        Final response from the agent
+    """
+    if not OPENAI_API_KEY:
+        return "Error: OPENAI_API_KEY not configured. Please set it in .env file."
+
+    client = _get_async_openai_client()
+    messages, openai_tools = _start_conversation(user_message)
+
+    for iteration in range(MAX_AGENT_ITERATIONS):
+        logger.debug(f"Agent iteration {iteration + 1}/{MAX_AGENT_ITERATIONS} (async)")
+
+        try:
+            with span("llm", OPENAI_MODEL):
+                response = await client.chat.completions.create(
+                    **_completion_request(messages, openai_tools)
+                )
+        except openai.APIError as error:
+            logger.error(f"OpenAI API error: {error}")
+            return f"API Error: {error}"
+
+        reply, tool_calls = _handle_response(response, messages, user_message)
+        if reply is not None:
+            return reply
+
+        for tool_call_id, tool_name, tool_input in tool_calls:
+            result = await asyncio.to_thread(execute_tool, tool_name, tool_input)
+            _add_tool_result(messages, tool_call_id, result)
+
     logger.warning("Max agent iterations reached")
-    return "I've reached my processing limit. Please try a simpler request."
+    return MAX_ITERATIONS_MESSAGE
 
 
 def interactive_mode() -> None:
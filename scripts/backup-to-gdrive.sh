@@ -28,7 +28,17 @@ log "Starting backup..."
 # Stop containers for consistent backup (optional - comment out if you don't want downtime)
 # docker stop homeassistant wyoming-whisper wyoming-piper 2>/dev/null || true
 
-# Create compressed archive
+# Snapshot the SQLite databases with the online backup API. Copying the live
+# files (and their -wal/-shm) while the server writes can produce a corrupt
+# copy, so tar gets the snapshots instead.
+SNAPSHOT_DIR=$(mktemp -d)
+trap 'rm -rf "$SNAPSHOT_DIR"' EXIT
+log "Snapshotting databases..."
+"${SOURCE_DIR}/venv/bin/python" "${SOURCE_DIR}/scripts/backup_databases.py" \
+    --output "${SNAPSHOT_DIR}/data" 2>&1 | tee -a "$LOG_FILE"
+
+# Create compressed archive (snapshots are stored under the project's data/)
+PROJECT_NAME="$(basename "$SOURCE_DIR")"
 log "Creating archive: $BACKUP_FILE"
 tar -czf "${LOCAL_BACKUP_DIR}/${BACKUP_FILE}" \
     --exclude='venv' \
@@ -37,8 +47,15 @@ tar -czf "${LOCAL_BACKUP_DIR}/${BACKUP_FILE}" \
     --exclude='*.pyc' \
     --exclude='.coverage' \
     --exclude='.pytest_cache' \
+    --exclude="${PROJECT_NAME}/data/*.db" \
+    --exclude="${PROJECT_NAME}/data/*.db-wal" \
+    --exclude="${PROJECT_NAME}/data/*.db-shm" \
+    --exclude="${PROJECT_NAME}/data/backups" \
+    --transform "s,^data\\(/\\|\$\\),${PROJECT_NAME}/data\\1," \
     -C "$(dirname "$SOURCE_DIR")" \
-    "$(basename "$SOURCE_DIR")"
+    "$PROJECT_NAME" \
+    -C "$SNAPSHOT_DIR" \
+    data
 
 # Restart containers (if stopped above)
 # docker start homeassistant wyoming-whisper wyoming-piper 2>/dev/null || true
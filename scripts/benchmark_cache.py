@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the in-memory CacheManager.
+
+Measures get/set throughput with several request threads (the Flask server
+runs threaded, one thread per in-flight request) for a single-lock cache
+versus a sharded one, and compares tag-indexed invalidation with a full
+fnmatch pattern scan.
+
+Usage:
+    python scripts/benchmark_cache.py                    # 8 threads, 1 vs 8 shards
+    python scripts/benchmark_cache.py --threads 1 4 16   # Sweep thread counts
+    python scripts/benchmark_cache.py --shards 16 --ops 50000
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.cache import CacheManager, entity_tag  # noqa: E402
+
+
+ENTITY_COUNT = 200
+
+
+def run_throughput(num_shards: int, threads: int, ops_per_thread: int, read_ratio: float) -> float:
+    """
+    Run a mixed get/set workload and return operations per second.
+
+    Args:
+        num_shards: Cache shard count
+        threads: Concurrent worker threads
+        ops_per_thread: Operations each thread performs
+        read_ratio: Fraction of operations that are reads
+
+    Returns:
+        Total operations per second
+    """
+    cache = CacheManager(max_size=1000, default_ttl=60, num_shards=num_shards)
+    keys = [cache.make_key("get_state", entity_id=f"light.bench_{i}") for i in range(ENTITY_COUNT)]
+    for i, key in enumerate(keys):
+        cache.set(key, {"state": "on"}, tags=[entity_tag(f"light.bench_{i}")])
+
+    start_barrier = threading.Barrier(threads + 1)
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        start_barrier.wait()
+        for _ in range(ops_per_thread):
+            index = rng.randrange(ENTITY_COUNT)
+            if rng.random() < read_ratio:
+                cache.get(keys[index])
+            else:
+                cache.set(keys[index], {"state": "off"}, tags=[entity_tag(f"light.bench_{index}")])
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    for thread in workers:
+        thread.start()
+
+    start_barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return threads * ops_per_thread / elapsed
+
+
+def run_invalidation(cache_size: int, rounds: int) -> tuple[float, float]:
+    """
+    Compare per-entity invalidation by tag against a pattern scan.
+
+    Args:
+        cache_size: Number of cached entries
+        rounds: Invalidations to time
+
+    Returns:
+        (microseconds per tag invalidation, microseconds per pattern scan)
+    """
+    cache = CacheManager(max_size=cache_size, default_ttl=None)
+
+    def fill() -> None:
+        for i in range(cache_size):
+            cache.set(f"state:light.bench_{i}", i, tags=[entity_tag(f"light.bench_{i}")])
+
+    fill()
+    started = time.perf_counter()
+    for i in range(rounds):
+        cache.invalidate_tag(entity_tag(f"light.bench_{i % cache_size}"))
+    tag_us = (time.perf_counter() - started) / rounds * 1e6
+
+    fill()
+    started = time.perf_counter()
+    for i in range(rounds):
+        cache.invalidate_pattern(f"state:light.bench_{i % cache_size}*")
+    scan_us = (time.perf_counter() - started) / rounds * 1e6
+
+    return tag_us, scan_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CacheManager throughput")
+    parser.add_argument("--threads", type=int, nargs="+", default=[8], help="Thread counts to test")
+    parser.add_argument("--shards", type=int, default=8, help="Shard count to compare with 1")
+    parser.add_argument("--ops", type=int, default=20000, help="Operations per thread")
+    parser.add_argument("--read-ratio", type=float, default=0.9, help="Fraction of reads")
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'shards':>7} {'ops/sec':>12}")
+    for threads in args.threads:
+        for num_shards in (1, args.shards):
+            ops_per_sec = run_throughput(num_shards, threads, args.ops, args.read_ratio)
+            print(f"{threads:>8} {num_shards:>7} {ops_per_sec:>12,.0f}")
+
+    tag_us, scan_us = run_invalidation(cache_size=1000, rounds=500)
+    print()
+    print("Per-entity invalidation (1000 entries):")
+    print(f"  invalidate_tag:     {tag_us:8.1f} us")
+    print(f"  invalidate_pattern: {scan_us:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
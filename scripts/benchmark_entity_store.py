@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the compact EntityStore.
+
+Builds a synthetic /api/states payload shaped like a large Home Assistant
+install, then compares the memory held by the raw dicts with the EntityStore
+built from them, and the cost of finding entities by scanning the raw list
+versus building a store and querying it (what a fetch of /api/states pays)
+and querying a store that is already built (what each cached read pays).
+
+Usage:
+    python scripts/benchmark_entity_store.py                  # 5000 entities
+    python scripts/benchmark_entity_store.py --entities 20000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.entity_store import EntityStore, compare_memory  # noqa: E402
+
+
+DOMAIN_TEMPLATES = {
+    "light": {"brightness": 255, "color_mode": "color_temp", "supported_features": 44,
+              "supported_color_modes": ["color_temp", "hs"]},
+    "switch": {"device_class": "outlet", "icon": "mdi:power-plug"},
+    "sensor": {"device_class": "power", "unit_of_measurement": "W",
+               "state_class": "measurement"},
+    "binary_sensor": {"device_class": "motion"},
+    "cover": {"device_class": "blind", "current_position": 100, "supported_features": 15},
+}
+STATES = {"light": ["on", "off"], "switch": ["on", "off"], "sensor": ["12.5", "0.0"],
+          "binary_sensor": ["on", "off"], "cover": ["open", "closed"]}
+
+
+def build_payload(entity_count: int, seed: int = 1) -> list[dict]:
+    """
+    Build a synthetic states payload, decoded from JSON like the HA client's.
+
+    Args:
+        entity_count: Number of entities
+        seed: Random seed
+
+    Returns:
+        List of entity state dicts
+    """
+    rng = random.Random(seed)
+    domains = list(DOMAIN_TEMPLATES)
+    states = []
+    for i in range(entity_count):
+        domain = rng.choice(domains)
+        attributes = {"friendly_name": f"{domain.title()} {i}", **DOMAIN_TEMPLATES[domain]}
+        states.append({
+            "entity_id": f"{domain}.device_{i}",
+            "state": rng.choice(STATES[domain]),
+            "attributes": attributes,
+            "last_changed": "2026-01-01T00:00:00+00:00",
+            "last_updated": "2026-01-01T00:00:00+00:00",
+        })
+    return json.loads(json.dumps(states))
+
+
+def find_outlets_by_scan(states: list[dict]) -> list[dict]:
+    return [
+        state for state in states
+        if state["entity_id"].startswith("switch.")
+        and state["attributes"].get("device_class") == "outlet"
+    ]
+
+
+def time_lookups(states: list[dict], rounds: int) -> dict[str, float]:
+    """
+    Compare ways of finding all outlet switches.
+
+    Returns:
+        Microseconds per scan of the raw list, per store build plus query,
+        and per query of a built store
+    """
+    started = time.perf_counter()
+    for _ in range(rounds):
+        find_outlets_by_scan(states)
+    scan_us = (time.perf_counter() - started) / rounds * 1e6
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        EntityStore(states).query(domain="switch", device_class="outlet")
+    build_query_us = (time.perf_counter() - started) / rounds * 1e6
+
+    store = EntityStore(states)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        store.query(domain="switch", device_class="outlet")
+    query_us = (time.perf_counter() - started) / rounds * 1e6
+
+    return {"scan": scan_us, "build_query": build_query_us, "query": query_us}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the compact EntityStore")
+    parser.add_argument("--entities", type=int, default=5000, help="Entities in the payload")
+    parser.add_argument("--rounds", type=int, default=20, help="Lookups to time")
+    args = parser.parse_args()
+
+    states = build_payload(args.entities)
+    memory = compare_memory(states)
+    timings = time_lookups(states, args.rounds)
+    raw_kib = memory["raw_bytes"] / 1024
+
+    print(f"Entities:              {memory['entities']:>10,}")
+    print(f"Raw dicts:             {raw_kib:>10,.0f} KiB")
+    print(f"EntityStore:           {memory['store_bytes'] / 1024:>10,.0f} KiB "
+          f"({memory['ratio']:.0%} of raw, held between fetches)")
+    print(f"Raw + store:           {memory['peak_bytes'] / 1024:>10,.0f} KiB "
+          f"({memory['peak_bytes'] / memory['raw_bytes']:.0%} of raw, while building)")
+    print("Outlet lookup:")
+    print(f"  scan raw list:       {timings['scan']:>10.1f} us")
+    print(f"  build store + query: {timings['build_query']:>10.1f} us (once per /api/states fetch)")
+    print(f"  query built store:   {timings['query']:>10.1f} us (each cached read)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark for rate limiter storage.
+
+Measures the per-request cost of the limit checks flask-limiter makes for a
+typical API route (the default per-day and per-hour limits plus a route
+limit) with the sliding window counter strategy, comparing the in-memory
+storage with the shared SQLite storage from src.rate_limit_storage.
+
+Requests come from several request threads, or with --processes from
+separate worker processes sharing one SQLite file (as gunicorn workers do).
+Each user sends --requests-per-user requests, so runs above the route
+limit also time rejected requests.
+
+Usage:
+    python scripts/benchmark_rate_limiter.py                       # 1 and 8 threads
+    python scripts/benchmark_rate_limiter.py --threads 1 4 16
+    python scripts/benchmark_rate_limiter.py --processes 4 --requests 5000
+    python scripts/benchmark_rate_limiter.py --db /dev/shm/bench-ratelimits.db
+"""
+
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from limits import parse  # noqa: E402
+from limits.storage import storage_from_string  # noqa: E402
+from limits.strategies import SlidingWindowCounterRateLimiter  # noqa: E402
+
+import src.rate_limit_storage  # noqa: E402, F401  (registers sqlite://)
+from src.config import (  # noqa: E402
+    RATE_LIMIT_API_PER_MINUTE,
+    RATE_LIMIT_DEFAULT_PER_DAY,
+    RATE_LIMIT_DEFAULT_PER_HOUR,
+)
+
+
+LIMITS = [
+    parse(f"{RATE_LIMIT_DEFAULT_PER_DAY} per day"),
+    parse(f"{RATE_LIMIT_DEFAULT_PER_HOUR} per hour"),
+    parse(f"{RATE_LIMIT_API_PER_MINUTE} per minute"),
+]
+
+
+def handle_requests(storage_uri: str, worker: int, requests: int, requests_per_user: int) -> int:
+    """
+    Check every limit for each request, as flask-limiter does.
+
+    Returns:
+        Number of requests allowed
+    """
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(storage_uri))
+    allowed = 0
+    for number in range(requests):
+        user = f"user:{worker}:{number // requests_per_user}"
+        if all(limiter.hit(item, user, "api_command") for item in LIMITS):
+            allowed += 1
+    return allowed
+
+
+def _process_worker(args: tuple) -> int:
+    return handle_requests(*args)
+
+
+def run(storage_uri: str, workers: int, requests: int, requests_per_user: int,
+        use_processes: bool) -> tuple[float, int]:
+    """
+    Time requests spread over threads or processes.
+
+    Args:
+        storage_uri: limits storage URI
+        workers: Concurrent threads or processes
+        requests: Requests each worker handles
+        requests_per_user: Requests before switching to a new user key
+        use_processes: Use processes instead of threads
+
+    Returns:
+        (microseconds per request, requests allowed)
+    """
+    storage_from_string(storage_uri).reset()
+
+    started = time.perf_counter()
+    if use_processes:
+        with multiprocessing.Pool(workers) as pool:
+            allowed = sum(pool.map(
+                _process_worker,
+                [(storage_uri, worker, requests, requests_per_user) for worker in range(workers)],
+            ))
+    else:
+        counts = [0] * workers
+
+        def worker_thread(worker: int) -> None:
+            counts[worker] = handle_requests(storage_uri, worker, requests, requests_per_user)
+
+        threads = [threading.Thread(target=worker_thread, args=(w,)) for w in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        allowed = sum(counts)
+    elapsed = time.perf_counter() - started
+
+    return elapsed / (workers * requests) * 1e6, allowed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark rate limiter storage")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8], help="Thread counts to test")
+    parser.add_argument("--processes", type=int, default=0, help="Also test N worker processes")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per worker")
+    parser.add_argument(
+        "--requests-per-user", type=int, default=RATE_LIMIT_API_PER_MINUTE + 10,
+        help="Requests per user key (above the route limit times rejections too)",
+    )
+    parser.add_argument("--db", help="SQLite file to use (default: a temporary file)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_uri = f"sqlite://{args.db or Path(tmp) / 'ratelimits.db'}"
+        print(f"Limits: {', '.join(str(item) for item in LIMITS)}")
+        print(f"{'storage':>8} {'workers':>12} {'us/request':>11} {'allowed':>9}")
+
+        for threads in args.threads:
+            for name, uri in (("memory", "memory://"), ("sqlite", sqlite_uri)):
+                per_request, allowed = run(uri, threads, args.requests, args.requests_per_user, False)
+                print(f"{name:>8} {f'{threads} threads':>12} {per_request:>11.1f} {allowed:>9,}")
+
+        if args.processes:
+            # Memory storage is per process, so only the shared file is meaningful
+            per_request, allowed = run(
+                sqlite_uri, args.processes, args.requests, args.requests_per_user, True
+            )
+            print(f"{'sqlite':>8} {f'{args.processes} procs':>12} {per_request:>11.1f} {allowed:>9,}")
+
+
+if __name__ == "__main__":
+    main()
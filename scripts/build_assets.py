@@ -10,6 +10,14 @@ Provides:
 - Asset versioning for cache busting
 - Build statistics and comparison
 
+Besides name.min.js/css, every bundle (except the service worker, which
+must keep a stable URL) is written under a content-hashed name such as
+app.1a2b3c4d.min.js, with precompressed .gz (and .br, if the brotli package
+is installed) variants next to it. build-manifest.json maps the minified
+names to the hashed files; the server resolves template URLs through it and
+serves hashed files as immutable. The service worker's precache list is
+injected into sw.min.js from the same manifest.
+
 Usage:
     python scripts/build_assets.py          # Build all assets
     python scripts/build_assets.py --stats  # Show size comparison
@@ -17,12 +25,33 @@ Usage:
 """
 
 import argparse
+import gzip
 import hashlib
 import json
 import re
 import shutil
 from pathlib import Path
 
+# Optional: brotli variants are ~15% smaller than gzip
+try:
+    import brotli
+
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+
+# Served from /sw.js, so it can't be renamed per build
+SERVICE_WORKER = 'sw.js'
+
+# Precache entries that aren't build outputs
+PRECACHE_PAGES = ['/', '/manifest.json', '/static/icons/icon.svg']
+
+HASHED_NAME_PATTERN = re.compile(r'^.+\.[0-9a-f]{8}\.min\.(css|js)$')
+
+# Placeholder in sw.js replaced with the precache manifest
+PRECACHE_PLACEHOLDER = re.compile(r'PRECACHE_MANIFEST\s*=\s*null')
+
 
 def minify_css(css_content: str) -> str:
     """
@@ -151,6 +180,46 @@ def get_content_hash(content: str, length: int = 8) -> str:
     return hashlib.md5(content.encode()).hexdigest()[:length]
 
 
+def hashed_name(output_name: str, content_hash: str) -> str:
+    """Insert a content hash into a minified file name (app.min.js -> app.<hash>.min.js)."""
+    stem, _, suffix = output_name.partition('.min.')
+    return f"{stem}.{content_hash}.min.{suffix}"
+
+
+def write_precompressed(path: Path, content: bytes) -> list[str]:
+    """
+    Write .gz (and .br when available) variants of a built file.
+
+    Returns:
+        Content codings written, in order of preference
+    """
+    encodings = []
+    if HAS_BROTLI:
+        path.with_name(path.name + '.br').write_bytes(
+            brotli.compress(content, quality=11)
+        )
+        encodings.append('br')
+    path.with_name(path.name + '.gz').write_bytes(
+        gzip.compress(content, compresslevel=9, mtime=0)
+    )
+    encodings.append('gzip')
+    return encodings
+
+
+def inject_precache_manifest(sw_content: str, version: str, urls: list[str]) -> str:
+    """Replace the service worker's PRECACHE_MANIFEST placeholder."""
+    manifest = json.dumps({'version': version, 'urls': urls}, separators=(',', ':'))
+    return PRECACHE_PLACEHOLDER.sub(lambda _: f"PRECACHE_MANIFEST={manifest}", sw_content, count=1)
+
+
+def prune_hashed_files(build_dir: Path, keep: set[str]) -> None:
+    """Remove hashed bundles (and their compressed variants) not in keep."""
+    for path in build_dir.iterdir():
+        name = path.name.removesuffix('.gz').removesuffix('.br')
+        if HASHED_NAME_PATTERN.match(name) and name not in keep:
+            path.unlink()
+
+
 def build_assets(static_dir: Path, build_dir: Path, verbose: bool = True) -> dict:
     """
     Build minified versions of CSS and JS files.
@@ -182,54 +251,25 @@ def build_assets(static_dir: Path, build_dir: Path, verbose: bool = True) -> dic
         if verbose:
             print(f"Copied icons directory")
 
-    # Process CSS files
-    for css_file in static_dir.glob('*.css'):
-        original = css_file.read_text()
-        minified = minify_css(original)
-
-        # Generate versioned filename
-        content_hash = get_content_hash(minified)
-        output_name = f"{css_file.stem}.min.css"
-        output_path = build_dir / output_name
-
-        output_path.write_text(minified)
-
-        original_size = len(original.encode())
-        minified_size = len(minified.encode())
-        reduction = (1 - minified_size / original_size) * 100
-
-        stats['files'].append({
-            'name': css_file.name,
-            'output': output_name,
-            'hash': content_hash,
-            'original_size': original_size,
-            'minified_size': minified_size,
-            'reduction_percent': round(reduction, 1),
-        })
-        stats['total_original'] += original_size
-        stats['total_minified'] += minified_size
-
-        if verbose:
-            print(f"CSS: {css_file.name} -> {output_name} ({reduction:.1f}% reduction)")
-
-    # Process JS files
-    for js_file in static_dir.glob('*.js'):
-        original = js_file.read_text()
-        minified = minify_js(original)
+    # Process CSS and JS files
+    minified_files = {}
+    for source_file in sorted(static_dir.glob('*.css')) + sorted(static_dir.glob('*.js')):
+        original = source_file.read_text()
+        is_css = source_file.suffix == '.css'
+        minified = minify_css(original) if is_css else minify_js(original)
+        minified_files[source_file.name] = minified
 
         # Generate versioned filename
         content_hash = get_content_hash(minified)
-        output_name = f"{js_file.stem}.min.js"
-        output_path = build_dir / output_name
-
-        output_path.write_text(minified)
+        output_name = f"{source_file.stem}.min{source_file.suffix}"
+        (build_dir / output_name).write_text(minified)
 
         original_size = len(original.encode())
         minified_size = len(minified.encode())
         reduction = (1 - minified_size / original_size) * 100
 
         stats['files'].append({
-            'name': js_file.name,
+            'name': source_file.name,
             'output': output_name,
             'hash': content_hash,
             'original_size': original_size,
@@ -240,7 +280,20 @@ def build_assets(static_dir: Path, build_dir: Path, verbose: bool = True) -> dic
         stats['total_minified'] += minified_size
 
         if verbose:
-            print(f"JS:  {js_file.name} -> {output_name} ({reduction:.1f}% reduction)")
+            label = 'CSS:' if is_css else 'JS: '
+            print(f"{label} {source_file.name} -> {output_name} ({reduction:.1f}% reduction)")
+
+    # Content-hashed copies with precompressed variants
+    assets = {}
+    precompressed = {}
+    for file_stats in stats['files']:
+        if file_stats['name'] == SERVICE_WORKER:
+            continue
+        name = hashed_name(file_stats['output'], file_stats['hash'])
+        content = minified_files[file_stats['name']].encode()
+        (build_dir / name).write_bytes(content)
+        assets[file_stats['output']] = name
+        precompressed[name] = write_precompressed(build_dir / name, content)
 
     # Copy manifest.json (no minification needed)
     manifest_src = static_dir / 'manifest.json'
@@ -258,12 +311,35 @@ def build_assets(static_dir: Path, build_dir: Path, verbose: bool = True) -> dic
         stats['total_reduction_percent'] = 0
 
     # Write build manifest for server to use
+    version = get_content_hash(json.dumps(assets, sort_keys=True))
     manifest = {
-        'version': get_content_hash(str(stats)),
+        'version': version,
         'files': {f['name']: f['output'] for f in stats['files']},
         'hashes': {f['name']: f['hash'] for f in stats['files']},
+        'assets': assets,
+        'precompressed': precompressed,
+        'precache': PRECACHE_PAGES + [f"/static/build/{name}" for name in assets.values()],
     }
-    (build_dir / 'build-manifest.json').write_text(json.dumps(manifest, indent=2))
+
+    # The service worker changes whenever a precached bundle does, which is
+    # what makes browsers install the new one
+    sw_output = build_dir / f"{Path(SERVICE_WORKER).stem}.min.js"
+    if sw_output.exists():
+        sw_output.write_text(
+            inject_precache_manifest(sw_output.read_text(), version, manifest['precache'])
+        )
+
+    # Keep the previous build's bundles for pages loaded before this one
+    manifest_path = build_dir / 'build-manifest.json'
+    keep = set(assets.values())
+    if manifest_path.exists():
+        try:
+            keep.update(json.loads(manifest_path.read_text()).get('assets', {}).values())
+        except ValueError:
+            pass
+    prune_hashed_files(build_dir, keep)
+
+    manifest_path.write_text(json.dumps(manifest, indent=2))
 
     return stats
 
@@ -0,0 +1,133 @@
+"""
+Smart Home Assistant - Shared Async Event Loop
+
+Runs one long-lived asyncio event loop in a daemon thread so that async
+clients (AsyncOpenAI, AsyncAnthropic) keep a single connection pool for the
+life of the process instead of creating a loop and pool per request.
+
+Synchronous code (Flask request threads, VoiceHandler) submits coroutines
+with run_sync(). When a timeout expires the coroutine's task is cancelled on
+the loop, which aborts the in-flight HTTP request rather than leaving an
+orphaned thread running to completion.
+
+Usage:
+    from src.async_loop import run_sync
+
+    response = run_sync(client.acomplete("Hello"), timeout=10)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+from src.tracing import bind_current_span
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class EventLoopThread:
+    """A single asyncio event loop running in a background daemon thread."""
+
+    def __init__(self, name: str = "smarthome-async-loop"):
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Get the running loop, starting the thread on first use."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._start()
+            return self._loop
+
+    def _start(self) -> None:
+        """Create the loop and start the thread. Lock held."""
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            loop.run_forever()
+
+        self._loop = loop
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        started.wait()
+        logger.debug(f"Started shared event loop thread '{self.name}'")
+
+    def in_loop_thread(self) -> bool:
+        """Check whether the caller is running on the loop thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coroutine: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+        """Schedule a coroutine on the loop and return a thread-safe future."""
+        # Keep spans opened by the coroutine attached to the caller's request
+        return asyncio.run_coroutine_threadsafe(bind_current_span(coroutine), self.loop)
+
+    def run_sync(self, coroutine: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """
+        Run a coroutine on the loop and block until it completes.
+
+        Args:
+            coroutine: Coroutine to run
+            timeout: Seconds to wait before cancelling (None waits forever)
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            TimeoutError: If the timeout expires (the task is cancelled)
+            RuntimeError: If called from the loop thread itself
+        """
+        if self.in_loop_thread():
+            coroutine.close()
+            raise RuntimeError("run_sync() cannot be called from the event loop thread")
+
+        future = self.submit(coroutine)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Async operation did not complete within {timeout} seconds")
+
+    def stop(self) -> None:
+        """Stop the loop and join the thread."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._thread is not None:
+                self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+
+# Singleton instance
+_event_loop_thread: EventLoopThread | None = None
+_event_loop_lock = threading.Lock()
+
+
+def get_event_loop_thread() -> EventLoopThread:
+    """Get the process-wide shared event loop thread."""
+    global _event_loop_thread
+    with _event_loop_lock:
+        if _event_loop_thread is None:
+            _event_loop_thread = EventLoopThread()
+        return _event_loop_thread
+
+
+def run_sync(coroutine: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+    """Run a coroutine on the shared loop, cancelling it if the timeout expires."""
+    return get_event_loop_thread().run_sync(coroutine, timeout=timeout)
@@ -14,6 +14,7 @@ from datetime import datetime
 from typing import Any
 
 from src.automation_manager import AutomationManager, get_automation_manager
+from src.database import record_command_result
 from src.ha_client import HomeAssistantClient, get_ha_client
 from src.utils import send_health_alert
 
@@ -204,6 +205,7 @@ class AutomationScheduler:
             return False
 
         logger.info(f"Executing agent command: {command}")
+        started = time.monotonic()
 
         try:
             # Import here to avoid circular imports
@@ -214,10 +216,24 @@ class AutomationScheduler:
                 f"Agent command completed: {response[:100] if response else 'No response'}..."
             )
             self._stats["executions_success"] += 1
+            record_command_result(
+                command,
+                source="automation",
+                success=True,
+                response_text=response,
+                latency_ms=int((time.monotonic() - started) * 1000),
+            )
             return True
         except Exception as error:
             logger.error(f"Agent command failed: {error}")
             self._stats["executions_failed"] += 1
+            record_command_result(
+                command,
+                source="automation",
+                success=False,
+                error_message=str(error),
+                latency_ms=int((time.monotonic() - started) * 1000),
+            )
             return False
 
     def _execute_ha_service(self, action_config: dict[str, Any]) -> bool:
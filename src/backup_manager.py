@@ -0,0 +1,289 @@
+"""
+Smart Home Assistant - Online Database Backups
+
+Consistent snapshots of the project's SQLite databases while they are in
+use. Copying a live WAL-mode database file can capture a torn state (the
+main file without the -wal pages), so backups go through SQLite's online
+backup API instead, in page batches:
+- each step holds the source's read lock only while it copies one batch,
+  so writers in the server and daemons keep running
+- an optional pause between batches throttles I/O on the Pi
+- the copy is checked with PRAGMA quick_check before it is kept
+- output can be gzip-compressed
+
+Usage:
+    from src.backup_manager import BackupManager
+
+    results = BackupManager().backup_all("/home/pi/backups/2026-01-15", compress=True)
+    for result in results:
+        print(result.name, result.pages_per_second)
+
+Or from the command line: python scripts/backup_databases.py --compress
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from src import config
+from src.config import BACKUP_PAGES_PER_STEP, BACKUP_STEP_SLEEP_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+# Project databases (file names under DATA_DIR). Any other *.db file found
+# there is backed up too, except the disposable ones below.
+PROJECT_DATABASES = {
+    "smarthome": "smarthome.db",
+    "devices": "devices.db",
+    "camera": "camera_observations.db",
+    "camera_scheduler": "camera_scheduler.db",
+    "timers": "timers.db",
+    "todos": "todos.db",
+    "reminders": "reminders.db",
+    "presence": "presence.db",
+    "locations": "locations.db",
+    "automations": "automations.db",
+    "auth": "auth.db",
+    "usage": "usage.db",
+    "vibe_memo": "vibe_memo.db",
+    "discovery": "discovery.db",
+    "improvements": "improvements.db",
+}
+
+# Rebuilt on demand: cached HA state and rate limit counters
+DISPOSABLE_DATABASES = {config.CACHE_SQLITE_PATH.name, "smarthome-ratelimits.db"}
+
+MANIFEST_NAME = "manifest.json"
+
+
+class BackupError(Exception):
+    """Raised when a database snapshot cannot be created or verified."""
+
+
+@dataclass
+class BackupResult:
+    """Outcome of backing up one database."""
+
+    name: str
+    source: str
+    destination: str | None = None
+    success: bool = False
+    skipped: bool = False
+    pages: int = 0
+    steps: int = 0
+    size_bytes: int = 0
+    duration_seconds: float = 0.0
+    compressed: bool = False
+    error: str | None = None
+
+    @property
+    def pages_per_second(self) -> float:
+        """Copy rate (0 if nothing was copied)."""
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.pages / self.duration_seconds
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "pages_per_second": round(self.pages_per_second, 1)}
+
+
+class BackupManager:
+    """Takes online, incremental backups of SQLite databases."""
+
+    def __init__(
+        self,
+        pages_per_step: int = BACKUP_PAGES_PER_STEP,
+        step_sleep_seconds: float = BACKUP_STEP_SLEEP_SECONDS,
+        verify: bool = True,
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            pages_per_step: Pages copied per backup step (-1 copies everything
+                in one step)
+            step_sleep_seconds: Pause between steps, to throttle I/O
+            verify: Run PRAGMA quick_check on each copy
+        """
+        self.pages_per_step = pages_per_step
+        self.step_sleep_seconds = step_sleep_seconds
+        self.verify = verify
+
+    def backup_database(
+        self,
+        source: str | Path,
+        destination: str | Path,
+        compress: bool = False,
+        name: str | None = None,
+    ) -> BackupResult:
+        """
+        Back up one database.
+
+        The copy is written next to the destination and moved into place
+        only once it is complete (and verified), so a failed run never
+        leaves a partial file under the final name.
+
+        Args:
+            source: Live database file
+            destination: Backup file (".gz" is appended when compressing)
+            compress: gzip the backup
+            name: Label for logs and results (defaults to the file stem)
+
+        Returns:
+            BackupResult (success False with error set on failure)
+        """
+        source = Path(source)
+        destination = Path(destination)
+        if compress and destination.suffix != ".gz":
+            destination = destination.with_name(destination.name + ".gz")
+        result = BackupResult(
+            name=name or source.stem,
+            source=str(source),
+            destination=str(destination),
+            compressed=compress,
+        )
+
+        if not source.exists():
+            result.skipped = True
+            result.error = "source database not found"
+            return result
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        snapshot = destination.with_name(destination.name + ".partial")
+        started = time.perf_counter()
+
+        try:
+            result.pages, result.steps = self._copy(source, snapshot)
+            if self.verify:
+                self._verify(snapshot)
+            if compress:
+                compressed = snapshot.with_name(snapshot.name + ".gz")
+                with open(snapshot, "rb") as raw, gzip.open(compressed, "wb") as packed:
+                    shutil.copyfileobj(raw, packed, length=1024 * 1024)
+                snapshot.unlink()
+                snapshot = compressed
+            os.replace(snapshot, destination)
+        except (sqlite3.Error, OSError, BackupError) as error:
+            result.error = str(error)
+            result.destination = None
+            logger.error(f"Backup of {result.name} failed: {error}")
+            for leftover in (snapshot, snapshot.with_name(snapshot.name + ".gz")):
+                leftover.unlink(missing_ok=True)
+            return result
+        finally:
+            result.duration_seconds = time.perf_counter() - started
+
+        result.success = True
+        result.size_bytes = destination.stat().st_size
+        logger.info(
+            f"Backed up {result.name}: {result.pages} pages in {result.steps} steps, "
+            f"{result.duration_seconds:.2f}s ({result.pages_per_second:,.0f} pages/s)"
+        )
+        return result
+
+    def _copy(self, source: Path, target: Path) -> tuple[int, int]:
+        """Run the incremental backup. Returns (total pages, steps)."""
+        progress = {"pages": 0, "steps": 0}
+
+        def on_progress(status: int, remaining: int, total: int) -> None:
+            progress["pages"] = total
+            progress["steps"] += 1
+            # Locks are released between steps, so pausing here lets
+            # writers in other connections through
+            if remaining and self.step_sleep_seconds > 0:
+                time.sleep(self.step_sleep_seconds)
+
+        target.unlink(missing_ok=True)
+        source_connection = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+        target_connection = sqlite3.connect(target)
+        try:
+            source_connection.backup(
+                target_connection, pages=self.pages_per_step, progress=on_progress
+            )
+        finally:
+            target_connection.close()
+            source_connection.close()
+
+        return progress["pages"], progress["steps"]
+
+    def _verify(self, snapshot: Path) -> None:
+        connection = sqlite3.connect(snapshot)
+        try:
+            status = connection.execute("PRAGMA quick_check").fetchone()[0]
+        finally:
+            connection.close()
+        if status != "ok":
+            raise BackupError(f"quick_check failed: {status}")
+
+    def backup_all(
+        self,
+        output_dir: str | Path,
+        compress: bool = False,
+        databases: dict[str, Path] | None = None,
+    ) -> list[BackupResult]:
+        """
+        Back up every project database into a directory.
+
+        Each database keeps its file name. A manifest.json with the
+        results is written alongside.
+
+        Args:
+            output_dir: Directory for the backup files
+            compress: gzip each backup
+            databases: Name -> path to back up (defaults to the project
+                databases under DATA_DIR)
+
+        Returns:
+            One BackupResult per database (missing ones are skipped)
+        """
+        output_dir = Path(output_dir)
+        if databases is None:
+            databases = project_databases()
+
+        results = [
+            self.backup_database(path, output_dir / path.name, compress=compress, name=name)
+            for name, path in databases.items()
+        ]
+
+        manifest = {
+            "created_at": datetime.now().isoformat(),
+            "compressed": compress,
+            "databases": [result.to_dict() for result in results],
+        }
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+
+        backed_up = [result for result in results if result.success]
+        failed = [result.name for result in results if not result.success and not result.skipped]
+        logger.info(
+            f"Backed up {len(backed_up)} databases to {output_dir}"
+            + (f"; failed: {', '.join(failed)}" if failed else "")
+        )
+        return results
+
+
+def project_databases() -> dict[str, Path]:
+    """
+    Paths of the project databases under the current DATA_DIR.
+
+    Covers PROJECT_DATABASES plus any other *.db file in DATA_DIR (named by
+    its stem), so a database added by a new module is not missed.
+    """
+    from src import database
+
+    paths = {name: config.DATA_DIR / filename for name, filename in PROJECT_DATABASES.items()}
+    paths["smarthome"] = Path(database.DATABASE_PATH)
+
+    known = {path.name for path in paths.values()} | DISPOSABLE_DATABASES
+    for path in sorted(Path(config.DATA_DIR).glob("*.db")):
+        if path.name not in known:
+            paths.setdefault(path.stem, path)
+    return paths
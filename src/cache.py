@@ -3,17 +3,127 @@ Smart Home Assistant - Cache Module
 
 In-memory caching system with TTL support, LRU eviction, and statistics tracking.
 Reduces API costs and latency by caching Home Assistant state queries and repeated requests.
+
+Entries can carry tags (e.g. entity_tag("light.kitchen")) so that everything
+derived from one entity can be invalidated through a tag -> keys index without
+scanning the cache. Keys are spread over independently locked shards so that
+concurrent request threads don't serialize on a single lock.
+
+get_or_load() coalesces concurrent misses for a key into a single loader call
+(single-flight) and, for key families configured with a stale window, serves
+the expired value immediately while one background refresh runs
+(stale-while-revalidate). Writes and invalidations bump a per-key generation:
+a load that started before one of them returns its result to its callers but
+does not cache it, and later callers start a new load.
+
+An optional CacheBackend (see src/cache_backends.py) adds a host-wide L2
+tier shared between processes. The in-process dict remains the L1 tier:
+writes and invalidations go to both, and L1 misses are filled from L2.
+A key family's CachePolicy can convert values that aren't JSON (such as an
+index built over a payload) to and from the form kept in L2.
 """
 
 from __future__ import annotations
 
+import concurrent.futures
 import fnmatch
 import hashlib
 import json
+import logging
+import math
 import time
 from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 from threading import Lock
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from src.cache_backends import CacheBackend
+
+
+logger = logging.getLogger(__name__)
+
+
+# Characters that make invalidate_pattern() fall back to a full fnmatch scan
+_WILDCARD_CHARS = frozenset("*?[")
+
+
+def entity_tag(entity_id: str) -> str:
+    """
+    Build the tag used for cache entries derived from one HA entity.
+
+    Args:
+        entity_id: Home Assistant entity ID (e.g., light.kitchen)
+
+    Returns:
+        Tag string for CacheManager.set(tags=...) / invalidate_tag()
+    """
+    return f"entity:{entity_id}"
+
+
+def _namespace(key: str) -> str | None:
+    """Return the namespace of a key (the part before the first ':'), if any."""
+    namespace, separator, _ = key.partition(":")
+    return namespace if separator else None
+
+
+def _key_family(key: str) -> str:
+    """Return the policy family of a key: its namespace, or the key itself."""
+    return key.partition(":")[0]
+
+
+def _entry_tags(key: str, tags: Iterable[str] | None) -> frozenset[str]:
+    """Tags stored with an entry: the given tags plus its namespace tag."""
+    entry_tags = set(tags or ())
+    namespace = _namespace(key)
+    if namespace is not None:
+        entry_tags.add(f"ns:{namespace}")
+    return frozenset(entry_tags)
+
+
+def _new_stats() -> dict[str, int]:
+    """Create a zeroed per-shard statistics dict."""
+    return {"hits": 0, "misses": 0, "evictions": 0, "stale_hits": 0, "l2_hits": 0}
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Read policy for a key family used by CacheManager.get_or_load().
+
+    Attributes:
+        stale_seconds: How long after expiry a value may still be served
+                       while a background refresh runs (0 = never stale)
+        single_flight: Coalesce concurrent misses into one loader call
+        backend_encode: Converts a value to the JSON-serializable form
+                        written to the L2 backend (None = the value itself)
+        backend_decode: Rebuilds the value from that form when L1 is
+                        filled from L2
+    """
+
+    stale_seconds: float = 0.0
+    single_flight: bool = True
+    backend_encode: Callable[[Any], Any] | None = None
+    backend_decode: Callable[[Any], Any] | None = None
+
+
+DEFAULT_POLICY = CachePolicy()
+
+
+class _Shard:
+    """One lock-protected slice of the cache."""
+
+    __slots__ = ("entries", "lock", "max_size", "stats")
+
+    def __init__(self, max_size: int):
+        # OrderedDict preserves insertion order for LRU
+        # key -> (value, expiry_time, tags)
+        self.entries: OrderedDict[str, tuple[Any, float | None, frozenset[str]]] = OrderedDict()
+        self.lock = Lock()
+        self.max_size = max_size
+        self.stats = _new_stats()
 
 
 class CacheManager:
@@ -22,13 +132,24 @@ class CacheManager:
 
     Features:
     - Time-based expiration (TTL)
-    - Size-based eviction (LRU)
+    - Size-based eviction (LRU, per shard when num_shards > 1)
     - Statistics tracking (hits, misses, evictions, hit rate)
+    - Tag and namespace invalidation backed by an index
     - Pattern-based invalidation
     - Key generation helpers
+    - Lock striping across shards
+    - Single-flight loading and stale-while-revalidate per key family
+    - Optional shared L2 backend
     """
 
-    def __init__(self, max_size: int = 1000, default_ttl: int | None = 10, enabled: bool = True):
+    def __init__(
+        self,
+        max_size: int = 1000,
+        default_ttl: int | None = 10,
+        enabled: bool = True,
+        num_shards: int = 1,
+        backend: CacheBackend | None = None,
+    ):
         """
         Initialize the cache manager.
 
@@ -36,21 +157,146 @@ class CacheManager:
             max_size: Maximum number of entries before LRU eviction
             default_ttl: Default time-to-live in seconds (None = no expiration)
             enabled: Whether caching is enabled (for testing/debugging)
+            num_shards: Number of independently locked shards. With more than
+                        one shard, max_size is split evenly and LRU order is
+                        tracked per shard.
+            backend: Optional shared L2 tier (e.g., SQLiteCacheBackend)
         """
         self.max_size = max_size
         self.default_ttl = default_ttl
         self.enabled = enabled
+        self.num_shards = max(1, num_shards)
+        self.backend = backend
+
+        shard_size = math.ceil(max_size / self.num_shards)
+        self._shards = [_Shard(shard_size) for _ in range(self.num_shards)]
+
+        # tag -> keys. Lock ordering: a shard lock may be held while taking
+        # _tag_lock, never the other way round.
+        self._tag_index: dict[str, set[str]] = {}
+        self._tag_lock = Lock()
+
+        # Read policies by key family, and loads currently in flight by key
+        self._policies: dict[str, CachePolicy] = {}
+        self._inflight: dict[str, concurrent.futures.Future] = {}
+        # Keys being loaded: key -> [running loads, generation, entry tags].
+        # The generation is bumped by writes and invalidations of the key.
+        # Lock ordering: _inflight_lock may be held while taking a shard lock.
+        self._loading: dict[str, list] = {}
+        self._inflight_lock = Lock()
+        self._coalesced = 0
+        self._refresh_executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    def set_policy(self, family: str, policy: CachePolicy) -> None:
+        """
+        Configure get_or_load() behaviour for a key family.
 
-        # OrderedDict preserves insertion order for LRU
-        self._cache: OrderedDict[str, tuple[Any, float]] = OrderedDict()
-        self._lock = Lock()
-
-        # Statistics
-        self._stats = {
-            "hits": 0,
-            "misses": 0,
-            "evictions": 0,
-        }
+        Args:
+            family: Key namespace (e.g., "get_state") or a whole key without
+                    a namespace (e.g., "get_all_states")
+            policy: Policy to apply
+        """
+        self._policies[family] = policy
+
+    def get_policy(self, key: str) -> CachePolicy:
+        """Get the policy that applies to a key."""
+        return self._policies.get(_key_family(key), DEFAULT_POLICY)
+
+    def _is_past_stale_window(self, key: str, expiry_time: float, now: float) -> bool:
+        """Check whether an expired entry can no longer be served stale."""
+        return now > expiry_time + self.get_policy(key).stale_seconds
+
+    def _shard_for(self, key: str) -> _Shard:
+        """Get the shard responsible for a key."""
+        if self.num_shards == 1:
+            return self._shards[0]
+        return self._shards[hash(key) % self.num_shards]
+
+    def _index_tags(self, key: str, tags: frozenset[str]) -> None:
+        """Add a key to the tag index. Shard lock held."""
+        if not tags:
+            return
+        with self._tag_lock:
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+
+    def _unindex_tags(self, key: str, tags: frozenset[str]) -> None:
+        """Remove a key from the tag index. Shard lock held."""
+        if not tags:
+            return
+        with self._tag_lock:
+            for tag in tags:
+                keys = self._tag_index.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tag_index[tag]
+
+    def _remove_entry(self, shard: _Shard, key: str) -> bool:
+        """Remove a key from its shard and the tag index. Shard lock held."""
+        entry = shard.entries.pop(key, None)
+        if entry is None:
+            return False
+        self._unindex_tags(key, entry[2])
+        return True
+
+    def _insert_entry(
+        self,
+        shard: _Shard,
+        key: str,
+        value: Any,
+        expiry_time: float | None,
+        tags: frozenset[str],
+    ) -> None:
+        """Insert or replace an L1 entry, evicting the LRU entry if full. Shard lock held."""
+        # If key exists, update it (move to end)
+        self._remove_entry(shard, key)
+
+        # Add new entry
+        shard.entries[key] = (value, expiry_time, tags)
+        self._index_tags(key, tags)
+
+        # Enforce max size (evict oldest)
+        if len(shard.entries) > shard.max_size:
+            # Remove oldest (first item in OrderedDict)
+            oldest_key = next(iter(shard.entries))
+            self._remove_entry(shard, oldest_key)
+            shard.stats["evictions"] += 1
+
+    def _fill_from_backend(self, key: str) -> None:
+        """
+        Copy a key from the L2 backend into L1 unless L1 holds a fresh copy.
+
+        A newer L2 copy (written by another process) replaces an expired L1
+        entry. Entries past their stale window are ignored.
+        """
+        shard = self._shard_for(key)
+        now = time.time()
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None and (entry[1] is None or now <= entry[1]):
+                return
+            local_expiry = entry[1] if entry is not None else None
+
+        record = self.backend.get(key)
+        if record is None:
+            return
+
+        value, expiry_time, tags = record
+        if expiry_time is not None and self._is_past_stale_window(key, expiry_time, now):
+            return
+        decode = self.get_policy(key).backend_decode
+        if decode is not None:
+            value = decode(value)
+
+        with shard.lock:
+            current = shard.entries.get(key)
+            if current is not None and current[1] != local_expiry:
+                return  # Written locally meanwhile
+            if current is not None and expiry_time is not None and current[1] >= expiry_time:
+                return  # L1 copy is at least as new
+            self._insert_entry(shard, key, value, expiry_time, frozenset(tags))
+            shard.stats["l2_hits"] += 1
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -66,26 +312,39 @@ class CacheManager:
         if not self.enabled:
             return default
 
-        with self._lock:
-            if key not in self._cache:
-                self._stats["misses"] += 1
+        if self.backend is not None:
+            self._fill_from_backend(key)
+
+        shard = self._shard_for(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                shard.stats["misses"] += 1
                 return default
 
-            value, expiry_time = self._cache[key]
+            value, expiry_time, _ = entry
 
             # Check if expired
-            if expiry_time is not None and time.time() > expiry_time:
-                # Expired - remove and count as miss
-                del self._cache[key]
-                self._stats["misses"] += 1
+            now = time.time()
+            if expiry_time is not None and now > expiry_time:
+                # Expired - count as miss, keeping it if it may still be served stale
+                if self._is_past_stale_window(key, expiry_time, now):
+                    self._remove_entry(shard, key)
+                shard.stats["misses"] += 1
                 return default
 
             # Cache hit - move to end (most recently used)
-            self._cache.move_to_end(key)
-            self._stats["hits"] += 1
+            shard.entries.move_to_end(key)
+            shard.stats["hits"] += 1
             return value
 
-    def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int | None = None,
+        tags: Iterable[str] | None = None,
+    ) -> None:
         """
         Set a value in the cache.
 
@@ -93,29 +352,39 @@ class CacheManager:
             key: Cache key
             value: Value to cache
             ttl: Time-to-live in seconds (overrides default_ttl, None = no expiration)
+            tags: Tags for invalidate_tag() (e.g., [entity_tag("light.kitchen")])
         """
         if not self.enabled:
             return
 
-        with self._lock:
-            # Calculate expiry time
-            if ttl is None:
-                ttl = self.default_ttl
+        self._bump_generations([key])
+        expiry_time, entry_tags = self._set_local(key, value, ttl, tags)
+
+        if self.backend is not None:
+            self._backend_set(key, value, expiry_time, entry_tags)
 
-            expiry_time = None if ttl is None else time.time() + ttl
+    def _backend_set(
+        self, key: str, value: Any, expiry_time: float | None, tags: frozenset[str]
+    ) -> None:
+        """Write a value to the L2 backend in its family's encoded form."""
+        encode = self.get_policy(key).backend_encode
+        self.backend.set(key, encode(value) if encode is not None else value, expiry_time, tags)
 
-            # If key exists, update it (move to end)
-            if key in self._cache:
-                del self._cache[key]
+    def _set_local(
+        self, key: str, value: Any, ttl: int | None, tags: Iterable[str] | None
+    ) -> tuple[float | None, frozenset[str]]:
+        """Write a value to L1 only. Returns its (expiry time, tags)."""
+        # Calculate expiry time
+        if ttl is None:
+            ttl = self.default_ttl
 
-            # Add new entry
-            self._cache[key] = (value, expiry_time)
+        expiry_time = None if ttl is None else time.time() + ttl
+        entry_tags = _entry_tags(key, tags)
 
-            # Enforce max size (evict oldest)
-            if len(self._cache) > self.max_size:
-                # Remove oldest (first item in OrderedDict)
-                self._cache.popitem(last=False)
-                self._stats["evictions"] += 1
+        shard = self._shard_for(key)
+        with shard.lock:
+            self._insert_entry(shard, key, value, expiry_time, entry_tags)
+        return expiry_time, entry_tags
 
     def has_key(self, key: str) -> bool:
         """
@@ -130,19 +399,287 @@ class CacheManager:
         if not self.enabled:
             return False
 
-        with self._lock:
-            if key not in self._cache:
-                return False
+        if self.backend is not None:
+            self._fill_from_backend(key)
 
-            value, expiry_time = self._cache[key]
+        shard = self._shard_for(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                return False
 
             # Check if expired
-            if expiry_time is not None and time.time() > expiry_time:
-                del self._cache[key]
+            expiry_time = entry[1]
+            now = time.time()
+            if expiry_time is not None and now > expiry_time:
+                if self._is_past_stale_window(key, expiry_time, now):
+                    self._remove_entry(shard, key)
                 return False
 
             return True
 
+    def update(self, key: str, updater: Callable[[Any], Any], default: Any = None) -> Any:
+        """
+        Atomically replace a cached value, keeping its expiry and tags.
+
+        Entries inside their stale window are updated too, so that values
+        served stale during a refresh stay current.
+
+        Args:
+            key: Cache key
+            updater: Function mapping the current value to the new value
+            default: Returned if the key is missing or past its stale window
+
+        Returns:
+            The new value, or default if nothing was updated
+        """
+        if not self.enabled:
+            return default
+
+        if self.backend is not None:
+            self._fill_from_backend(key)
+
+        shard = self._shard_for(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                return default
+
+            value, expiry_time, tags = entry
+            if expiry_time is not None and self._is_past_stale_window(key, expiry_time, time.time()):
+                self._remove_entry(shard, key)
+                return default
+
+            new_value = updater(value)
+            shard.entries[key] = (new_value, expiry_time, tags)
+
+        self._bump_generations([key])
+
+        if self.backend is not None:
+            self._backend_set(key, new_value, expiry_time, tags)
+        return new_value
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: int | None = None,
+        tags: Iterable[str] | None = None,
+    ) -> Any:
+        """
+        Get a value, calling loader() to fill the cache on a miss.
+
+        Follows the key family's CachePolicy:
+        - single_flight: concurrent misses wait for one loader call instead
+          of each calling it
+        - stale_seconds: an expired value still inside the stale window is
+          returned immediately and refreshed in the background (at most one
+          refresh per key at a time)
+
+        A loader result of None is returned but not cached. Loader
+        exceptions propagate to the caller and to every coalesced waiter.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument function that fetches the value
+            ttl: Time-to-live for the loaded value (None = default_ttl)
+            tags: Tags for the loaded value
+
+        Returns:
+            Cached, stale or freshly loaded value
+        """
+        if not self.enabled:
+            return loader()
+
+        if self.backend is not None:
+            self._fill_from_backend(key)
+
+        policy = self.get_policy(key)
+        shard = self._shard_for(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
+                value, expiry_time, _ = entry
+                now = time.time()
+                if expiry_time is None or now <= expiry_time:
+                    shard.entries.move_to_end(key)
+                    shard.stats["hits"] += 1
+                    return value
+
+                if now <= expiry_time + policy.stale_seconds:
+                    shard.entries.move_to_end(key)
+                    shard.stats["hits"] += 1
+                    shard.stats["stale_hits"] += 1
+                    stale = True
+                else:
+                    self._remove_entry(shard, key)
+                    stale = False
+            else:
+                stale = False
+
+            if not stale:
+                shard.stats["misses"] += 1
+
+        if stale:
+            self._refresh_in_background(key, loader, ttl, tags)
+            return value
+
+        if not policy.single_flight:
+            return self._load(key, loader, ttl, tags)
+        return self._load_single_flight(key, loader, ttl, tags)
+
+    def _load(
+        self, key: str, loader: Callable[[], Any], ttl: int | None, tags: Iterable[str] | None
+    ) -> Any:
+        """
+        Call the loader and cache a non-None result.
+
+        The result is not cached if the key was written or invalidated
+        while the loader ran, since it may predate that change.
+        """
+        generation = self._begin_load(key, tags)
+        try:
+            value = loader()
+            if value is not None:
+                self._store_loaded(key, generation, value, ttl, tags)
+        finally:
+            self._end_load(key)
+        return value
+
+    def _begin_load(self, key: str, tags: Iterable[str] | None) -> int:
+        """Register a running load and return the key's generation."""
+        with self._inflight_lock:
+            loading = self._loading.setdefault(key, [0, 0, frozenset()])
+            loading[0] += 1
+            loading[2] = loading[2] | _entry_tags(key, tags)
+            return loading[1]
+
+    def _end_load(self, key: str) -> None:
+        """Unregister a load started by _begin_load()."""
+        with self._inflight_lock:
+            loading = self._loading[key]
+            loading[0] -= 1
+            if loading[0] == 0:
+                del self._loading[key]
+
+    def _store_loaded(
+        self, key: str, generation: int, value: Any, ttl: int | None, tags: Iterable[str] | None
+    ) -> None:
+        """Cache a loaded value unless the key's generation moved on."""
+        with self._inflight_lock:
+            if self._loading[key][1] != generation:
+                logger.debug(f"Not caching {key}: written or invalidated during load")
+                return
+            expiry_time, entry_tags = self._set_local(key, value, ttl, tags)
+
+        if self.backend is None:
+            return
+        self._backend_set(key, value, expiry_time, entry_tags)
+        with self._inflight_lock:
+            superseded = self._loading[key][1] != generation
+        if superseded:
+            # An invalidation ran while writing to L2: don't leave our copy there
+            self.backend.delete(key)
+
+    def _bump_generations(self, keys: Iterable[str] = (), tag: str | None = None) -> None:
+        """
+        Mark loads in flight for keys (or any key carrying tag) as outdated.
+
+        Their results will not be cached, and they are dropped from the
+        in-flight table so that later callers start a fresh load.
+        """
+        with self._inflight_lock:
+            if not self._loading:
+                return
+            affected = set(keys).intersection(self._loading)
+            if tag is not None:
+                affected.update(
+                    key for key, loading in self._loading.items() if tag in loading[2]
+                )
+            for key in affected:
+                self._loading[key][1] += 1
+                self._inflight.pop(key, None)
+
+    def _load_single_flight(
+        self, key: str, loader: Callable[[], Any], ttl: int | None, tags: Iterable[str] | None
+    ) -> Any:
+        """Load a key, or wait for the load already in flight for it."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = concurrent.futures.Future()
+                self._inflight[key] = future
+            else:
+                self._coalesced += 1
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            value = self._load(key, loader, ttl, tags)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._finish_inflight(key, future)
+
+    def _finish_inflight(self, key: str, future: concurrent.futures.Future) -> None:
+        """Remove a finished load from the in-flight table (if still listed)."""
+        with self._inflight_lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _refresh_in_background(
+        self, key: str, loader: Callable[[], Any], ttl: int | None, tags: Iterable[str] | None
+    ) -> None:
+        """Start a background reload of a stale key unless one is in flight."""
+        with self._inflight_lock:
+            if key in self._inflight:
+                return
+            future = concurrent.futures.Future()
+            self._inflight[key] = future
+            if self._refresh_executor is None:
+                self._refresh_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="cache-refresh"
+                )
+            executor = self._refresh_executor
+
+        def refresh() -> None:
+            try:
+                future.set_result(self._load(key, loader, ttl, tags))
+            except Exception as error:
+                logger.warning(f"Background refresh of {key} failed: {error}")
+                future.set_exception(error)
+            finally:
+                self._finish_inflight(key, future)
+
+        executor.submit(refresh)
+
+    def delete(self, key: str) -> bool:
+        """
+        Remove a single key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the key was present in L1
+        """
+        self._bump_generations([key])
+        if self.backend is not None:
+            self.backend.delete(key)
+        return self._delete_local(key)
+
+    def _delete_local(self, key: str) -> bool:
+        """Remove a key from L1 only."""
+        shard = self._shard_for(key)
+        with shard.lock:
+            return self._remove_entry(shard, key)
+
     def clear(self, reset_stats: bool = True) -> None:
         """
         Clear all cache entries.
@@ -150,20 +687,83 @@ class CacheManager:
         Args:
             reset_stats: If True, also reset hit/miss/eviction statistics
         """
-        with self._lock:
-            self._cache.clear()
-            if reset_stats:
-                self._stats = {
-                    "hits": 0,
-                    "misses": 0,
-                    "evictions": 0,
-                }
+        with self._inflight_lock:
+            loading = list(self._loading)
+        self._bump_generations(loading)
+        for shard in self._shards:
+            with shard.lock:
+                for key, entry in shard.entries.items():
+                    self._unindex_tags(key, entry[2])
+                shard.entries.clear()
+                if reset_stats:
+                    shard.stats = _new_stats()
+        if reset_stats:
+            with self._inflight_lock:
+                self._coalesced = 0
+
+        if self.backend is not None:
+            self.backend.clear()
+
+    def invalidate_tag(self, tag: str) -> int:
+        """
+        Invalidate all cache keys carrying a tag.
+
+        Uses the tag index, so cost is proportional to the number of tagged
+        keys rather than the size of the cache.
+
+        Args:
+            tag: Tag to invalidate (e.g., entity_tag("light.kitchen"))
+
+        Returns:
+            Number of keys invalidated
+        """
+        with self._tag_lock:
+            tagged = set(self._tag_index.get(tag, ()))
+        self._bump_generations(tagged, tag=tag)
+
+        if self.backend is not None:
+            self.backend.delete_tag(tag)
+
+        with self._tag_lock:
+            keys = self._tag_index.pop(tag, set())
+
+        removed = 0
+        for key in keys:
+            if self._delete_local(key):
+                removed += 1
+        return removed
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Invalidate all cache keys carrying any of the given tags.
+
+        Args:
+            tags: Tags to invalidate
+
+        Returns:
+            Number of keys invalidated
+        """
+        return sum(self.invalidate_tag(tag) for tag in tags)
+
+    def invalidate_namespace(self, namespace: str) -> int:
+        """
+        Invalidate all keys in a namespace (keys of the form "<namespace>:...").
+
+        Args:
+            namespace: Key prefix before the first ':' (e.g., "get_state")
+
+        Returns:
+            Number of keys invalidated
+        """
+        return self.invalidate_tag(f"ns:{namespace}")
 
     def invalidate_pattern(self, pattern: str) -> int:
         """
         Invalidate all cache keys matching a pattern.
 
         Uses fnmatch for pattern matching (supports * and ? wildcards).
+        Exact keys and "<namespace>:*" patterns are served from the index;
+        other patterns scan each shard.
 
         Args:
             pattern: Pattern to match (e.g., "user:*:profile")
@@ -171,41 +771,71 @@ class CacheManager:
         Returns:
             Number of keys invalidated
         """
-        with self._lock:
-            keys_to_remove = [key for key in self._cache.keys() if fnmatch.fnmatch(key, pattern)]
+        if not _WILDCARD_CHARS.intersection(pattern):
+            return 1 if self.delete(pattern) else 0
+
+        prefix = pattern[:-2]
+        if pattern.endswith(":*") and ":" not in prefix and not _WILDCARD_CHARS.intersection(prefix):
+            return self.invalidate_namespace(prefix)
 
-            for key in keys_to_remove:
-                del self._cache[key]
+        with self._inflight_lock:
+            loading = [key for key in self._loading if fnmatch.fnmatch(key, pattern)]
+        self._bump_generations(loading)
 
-            return len(keys_to_remove)
+        if self.backend is not None:
+            self.backend.delete_pattern(pattern)
+
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                keys_to_remove = [key for key in shard.entries if fnmatch.fnmatch(key, pattern)]
+                for key in keys_to_remove:
+                    self._remove_entry(shard, key)
+                removed += len(keys_to_remove)
+        return removed
 
     def get_stats(self) -> dict[str, Any]:
         """
         Get cache statistics.
 
         Returns:
-            Dictionary with hits, misses, evictions, size, and hit_rate
+            Dictionary with hits, misses, evictions, size, hit_rate,
+            stale_hits (served expired during a refresh), coalesced
+            (misses that waited on another caller's load), l2_hits (L1
+            misses filled from the shared backend) and backend name
         """
-        with self._lock:
-            total_requests = self._stats["hits"] + self._stats["misses"]
-            hit_rate = self._stats["hits"] / total_requests if total_requests > 0 else 0.0
-
-            return {
-                "hits": self._stats["hits"],
-                "misses": self._stats["misses"],
-                "evictions": self._stats["evictions"],
-                "size": len(self._cache),
-                "hit_rate": hit_rate,
-            }
+        hits = misses = evictions = stale_hits = l2_hits = size = 0
+        for shard in self._shards:
+            with shard.lock:
+                hits += shard.stats["hits"]
+                misses += shard.stats["misses"]
+                evictions += shard.stats["evictions"]
+                stale_hits += shard.stats["stale_hits"]
+                l2_hits += shard.stats["l2_hits"]
+                size += len(shard.entries)
+
+        total_requests = hits + misses
+        hit_rate = hits / total_requests if total_requests > 0 else 0.0
+
+        return {
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "size": size,
+            "hit_rate": hit_rate,
+            "stale_hits": stale_hits,
+            "coalesced": self._coalesced,
+            "l2_hits": l2_hits,
+            "backend": self.backend.name if self.backend is not None else None,
+        }
 
     def reset_stats(self) -> None:
         """Reset statistics counters (cache contents remain)."""
-        with self._lock:
-            self._stats = {
-                "hits": 0,
-                "misses": 0,
-                "evictions": 0,
-            }
+        for shard in self._shards:
+            with shard.lock:
+                shard.stats = _new_stats()
+        with self._inflight_lock:
+            self._coalesced = 0
 
     def make_key(self, prefix: str, **kwargs) -> str:
         """
@@ -245,12 +875,27 @@ def get_cache() -> CacheManager:
     global _global_cache
     if _global_cache is None:
         # Import config here to avoid circular imports
-        from src.config import CACHE_ENABLED, CACHE_MAX_SIZE, HA_STATE_CACHE_TTL
+        from src.config import (
+            CACHE_BACKEND,
+            CACHE_ENABLED,
+            CACHE_MAX_SIZE,
+            CACHE_SHARDS,
+            CACHE_SQLITE_PATH,
+            HA_STATE_CACHE_TTL,
+        )
+
+        backend = None
+        if CACHE_ENABLED and CACHE_BACKEND == "sqlite":
+            from src.cache_backends import SQLiteCacheBackend
+
+            backend = SQLiteCacheBackend(CACHE_SQLITE_PATH)
 
         _global_cache = CacheManager(
             max_size=CACHE_MAX_SIZE,
             default_ttl=HA_STATE_CACHE_TTL,
             enabled=CACHE_ENABLED,
+            num_shards=CACHE_SHARDS,
+            backend=backend,
         )
     return _global_cache
 
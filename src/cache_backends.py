@@ -0,0 +1,246 @@
+"""
+Smart Home Assistant - Shared Cache Backends
+
+Second-tier (L2) storage for CacheManager. The in-process OrderedDict stays
+the L1 tier. An L2 backend lets the Flask server, automation scheduler,
+notification worker, camera scheduler and security daemon on one host share
+cached HA state instead of each warming and polling Home Assistant itself.
+
+Backends:
+- SQLiteCacheBackend: a WAL-mode SQLite file with memory-mapped reads, safe
+  for concurrent use by several processes
+
+Only JSON-serializable values are stored in L2. Other values stay L1-only.
+
+Usage:
+    from src.cache import CacheManager
+    from src.cache_backends import SQLiteCacheBackend
+
+    cache = CacheManager(backend=SQLiteCacheBackend("/var/lib/smarthome/cache.db"))
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+# Expired rows are kept this long (for stale-while-revalidate) before purging
+PURGE_GRACE_SECONDS = 300
+# Purge expired rows every N writes
+PURGE_INTERVAL_WRITES = 500
+# Memory-map up to this many bytes of the database file for reads
+SQLITE_MMAP_SIZE = 64 * 1024 * 1024
+
+
+class CacheBackend(ABC):
+    """Interface for a CacheManager L2 tier."""
+
+    name = "backend"
+
+    @abstractmethod
+    def get(self, key: str) -> tuple[Any, float | None, frozenset[str]] | None:
+        """
+        Look up a key.
+
+        Returns:
+            (value, expiry_time, tags) or None if absent. Expired entries may
+            be returned; CacheManager decides whether they are still usable.
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: Any, expiry_time: float | None, tags: Iterable[str]) -> None:
+        """Store a value with an absolute expiry time (None = no expiration)."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a key."""
+
+    @abstractmethod
+    def delete_tag(self, tag: str) -> None:
+        """Remove every key carrying a tag."""
+
+    @abstractmethod
+    def delete_pattern(self, pattern: str) -> None:
+        """Remove every key matching a glob pattern (* ? [...])."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all keys."""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Host-wide cache tier in a local SQLite file.
+
+    Uses WAL journaling so readers in other processes never block on a
+    writer, and mmap for reads. Each thread keeps its own connection.
+    Errors are logged and treated as misses: the L2 tier is best-effort.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, database_path: str | Path, max_entries: int = 10000):
+        """
+        Initialize the backend.
+
+        Args:
+            database_path: Path to the shared SQLite file
+            max_entries: Rows kept after a purge (soonest-expiring dropped first)
+        """
+        self.database_path = Path(database_path)
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._initialize_database()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.database_path, timeout=2, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+            self._local.connection = connection
+        return connection
+
+    def _initialize_database(self) -> None:
+        """Create the cache tables if they don't exist."""
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connection()
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL
+            )
+        """)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS cache_tags (
+                tag TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (tag, key)
+            )
+        """)
+        connection.execute("CREATE INDEX IF NOT EXISTS idx_cache_tags_key ON cache_tags(key)")
+
+    def get(self, key: str) -> tuple[Any, float | None, frozenset[str]] | None:
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            tags = connection.execute(
+                "SELECT tag FROM cache_tags WHERE key = ?", (key,)
+            ).fetchall()
+        except sqlite3.Error as error:
+            logger.warning(f"Shared cache read failed for {key}: {error}")
+            return None
+
+        return json.loads(row[0]), row[1], frozenset(tag for (tag,) in tags)
+
+    def set(self, key: str, value: Any, expiry_time: float | None, tags: Iterable[str]) -> None:
+        try:
+            serialized = json.dumps(value)
+        except (TypeError, ValueError):
+            return  # Not shareable, stays in L1 only
+
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, serialized, expiry_time),
+                )
+                connection.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+                connection.executemany(
+                    "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+                    [(tag, key) for tag in tags],
+                )
+        except sqlite3.Error as error:
+            logger.warning(f"Shared cache write failed for {key}: {error}")
+            return
+
+        with self._writes_lock:
+            self._writes += 1
+            purge_due = self._writes % PURGE_INTERVAL_WRITES == 0
+        if purge_due:
+            self.purge()
+
+    def _delete_keys_where(self, condition: str, parameters: tuple) -> None:
+        """Delete entries (and their tag rows) whose keys a SELECT returns."""
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS doomed_keys (key TEXT PRIMARY KEY)"
+                )
+                connection.execute("DELETE FROM doomed_keys")
+                connection.execute(
+                    f"INSERT OR IGNORE INTO doomed_keys {condition}", parameters
+                )
+                connection.execute(
+                    "DELETE FROM cache_entries WHERE key IN (SELECT key FROM doomed_keys)"
+                )
+                connection.execute(
+                    "DELETE FROM cache_tags WHERE key IN (SELECT key FROM doomed_keys)"
+                )
+        except sqlite3.Error as error:
+            logger.warning(f"Shared cache delete failed: {error}")
+
+    def delete(self, key: str) -> None:
+        self._delete_keys_where("SELECT ?", (key,))
+
+    def delete_tag(self, tag: str) -> None:
+        self._delete_keys_where("SELECT key FROM cache_tags WHERE tag = ?", (tag,))
+
+    def delete_pattern(self, pattern: str) -> None:
+        self._delete_keys_where("SELECT key FROM cache_entries WHERE key GLOB ?", (pattern,))
+
+    def clear(self) -> None:
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute("DELETE FROM cache_entries")
+                connection.execute("DELETE FROM cache_tags")
+        except sqlite3.Error as error:
+            logger.warning(f"Shared cache clear failed: {error}")
+
+    def purge(self) -> None:
+        """Drop long-expired rows and trim the table to max_entries."""
+        cutoff = time.time() - PURGE_GRACE_SECONDS
+        self._delete_keys_where(
+            "SELECT key FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (cutoff,),
+        )
+        self._delete_keys_where(
+            """
+            SELECT key FROM cache_entries
+            ORDER BY expires_at IS NULL, expires_at
+            LIMIT MAX(0, (SELECT COUNT(*) FROM cache_entries) - ?)
+            """,
+            (self.max_entries,),
+        )
+
+    def size(self) -> int:
+        """Number of rows currently stored."""
+        try:
+            return self._connection().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        except sqlite3.Error:
+            return 0
@@ -0,0 +1,146 @@
+"""
+Smart Home Assistant - Response Compression
+
+Flask after_request middleware for text and JSON responses:
+- Weak ETags on GET responses that don't set their own, with
+  If-None-Match answered by an empty 304
+- gzip (or brotli, if the brotli package is installed and the client
+  accepts it) for bodies of at least COMPRESSION_MIN_BYTES
+
+ETags are computed from the uncompressed body and marked weak, so the same
+validator matches whichever encoding a client received. Streamed responses
+(event streams, file downloads) pass through untouched, and so do HTML
+pages: they carry CSRF tokens next to reflected input, which compression
+would expose to BREACH-style length attacks.
+
+Compression ratio and bytes saved (including by 304s) are exported as
+smarthome_response_compression_ratio and
+smarthome_response_bytes_saved_total.
+
+Usage:
+    from src.compression import init_compression
+
+    init_compression(app)
+"""
+
+import gzip
+import hashlib
+import logging
+
+from flask import Flask, Response, request
+
+from src.config import COMPRESSION_LEVEL, COMPRESSION_MIN_BYTES
+from src.metrics import _normalize_endpoint, track_not_modified, track_response_compression
+
+
+logger = logging.getLogger(__name__)
+
+# Optional: brotli compresses JSON ~15-20% smaller than gzip
+try:
+    import brotli
+
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+# Brotli quality comparable in speed to gzip level 6
+BROTLI_QUALITY = 4
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/javascript",
+    "application/x-ndjson",
+    "application/xml",
+    "image/svg+xml",
+}
+
+# Never compressed (pages mixing secrets with reflected content, see above)
+UNCOMPRESSED_MIMETYPES = {"text/html"}
+
+
+def is_compressible(mimetype: str | None) -> bool:
+    """Whether a response of this mimetype benefits from compression."""
+    if not mimetype or mimetype in UNCOMPRESSED_MIMETYPES:
+        return False
+    return mimetype.startswith("text/") or mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def choose_encoding(accept_encoding) -> str | None:
+    """
+    Pick a content coding the client accepts.
+
+    Args:
+        accept_encoding: request.accept_encodings
+
+    Returns:
+        "br", "gzip" or None
+    """
+    if HAS_BROTLI and accept_encoding.quality("br") > 0:
+        return "br"
+    if accept_encoding.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+
+def compress_body(body: bytes, encoding: str, level: int = COMPRESSION_LEVEL) -> bytes:
+    """Compress a response body with the given content coding."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def compress_response(response: Response) -> Response:
+    """
+    after_request hook: add a weak ETag, answer revalidations and compress.
+
+    Args:
+        response: Response about to be sent
+
+    Returns:
+        The same response, possibly turned into a 304 or compressed
+    """
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or not is_compressible(response.mimetype)
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    body = response.get_data()
+    endpoint = _normalize_endpoint(request.path)
+
+    if request.method in ("GET", "HEAD"):
+        if "ETag" not in response.headers:
+            response.set_etag(hashlib.sha1(body).hexdigest()[:20], weak=True)
+        response.make_conditional(request)
+        if response.status_code == 304:
+            track_not_modified(endpoint, len(body))
+            return response
+
+    if len(body) < COMPRESSION_MIN_BYTES:
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    compressed = compress_body(body, encoding)
+    if len(compressed) >= len(body):
+        return response
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    track_response_compression(endpoint, encoding, len(body), len(compressed))
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    """Register the compression middleware on a Flask app."""
+    app.after_request(compress_response)
+    logger.info(
+        f"Response compression enabled (gzip{', br' if HAS_BROTLI else ''}, "
+        f"min {COMPRESSION_MIN_BYTES} bytes)"
+    )
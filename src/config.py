@@ -66,7 +66,77 @@ LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 # Cache Configuration
 CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
 HA_STATE_CACHE_TTL = int(os.getenv("HA_STATE_CACHE_TTL", "10"))  # seconds
+# Seconds an expired get_all_states result may be served while it refreshes
+HA_STATES_STALE_SECONDS = int(os.getenv("HA_STATES_STALE_SECONDS", "30"))
 CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", "1000"))  # entries
+CACHE_SHARDS = int(os.getenv("CACHE_SHARDS", "8"))  # independently locked shards
+# Shared L2 cache tier for multi-process hosts: "memory" (none) or "sqlite"
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_SQLITE_PATH = Path(os.getenv("CACHE_SQLITE_PATH", str(DATA_DIR / "shared_cache.db")))
+
+# Device State History
+# Snapshots are buffered and written in batches of this size (or every N seconds)
+STATE_HISTORY_BATCH_SIZE = int(os.getenv("STATE_HISTORY_BATCH_SIZE", "200"))
+STATE_HISTORY_FLUSH_SECONDS = float(os.getenv("STATE_HISTORY_FLUSH_SECONDS", "5"))
+# Retention tiers: raw snapshots, then per-minute rollups, then per-hour rollups
+STATE_HISTORY_RAW_HOURS = int(os.getenv("STATE_HISTORY_RAW_HOURS", "24"))
+STATE_HISTORY_MINUTE_DAYS = int(os.getenv("STATE_HISTORY_MINUTE_DAYS", "7"))
+STATE_HISTORY_HOUR_DAYS = int(os.getenv("STATE_HISTORY_HOUR_DAYS", "365"))
+
+# Settings Cache
+# Seconds between checks for settings written by other processes
+SETTINGS_CACHE_POLL_SECONDS = float(os.getenv("SETTINGS_CACHE_POLL_SECONDS", "1.0"))
+
+# Database Backups
+# Online backups copy this many pages per step and pause between steps so
+# the server and daemons can keep writing while a snapshot is taken
+BACKUP_DIR = Path(os.getenv("BACKUP_DIR", str(DATA_DIR / "backups")))
+BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "1024"))
+BACKUP_STEP_SLEEP_SECONDS = float(os.getenv("BACKUP_STEP_SLEEP_SECONDS", "0.01"))
+
+# Request Tracing
+# Requests slower than this are logged with their span tree (0 disables)
+SLOW_REQUEST_LOG_MS = float(os.getenv("SLOW_REQUEST_LOG_MS", "0"))
+
+# Web Server (python -m src.web_server)
+# "development" runs Flask's built-in server; "production" runs gunicorn
+# with pre-forked workers (SERVER_WORKERS=0 picks one per CPU, up to 4)
+SERVER_MODE = os.getenv("SERVER_MODE", "development").lower()
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "5050"))
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "0"))
+# Workers for the plain-HTTP listener on SERVER_PORT - 1 (Tailscale) that
+# runs next to the TLS one; it only sees tailnet traffic
+SERVER_HTTP_WORKERS = int(os.getenv("SERVER_HTTP_WORKERS", "1"))
+SERVER_THREADS = int(os.getenv("SERVER_THREADS", "8"))
+# Worker timeout must cover the slowest agent command (LLM + tool calls)
+SERVER_TIMEOUT = int(os.getenv("SERVER_TIMEOUT", "120"))
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+
+# Response Compression
+# Responses smaller than this are sent uncompressed
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+# gzip level (1-9); brotli (if installed) uses an equivalent fast quality
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+
+# Live Event Stream (/api/events)
+# Concurrent streams per server process; further clients fall back to polling
+SSE_MAX_CLIENTS = int(os.getenv("SSE_MAX_CLIENTS", "4"))
+# How often the stream re-reads device state from Home Assistant
+SSE_STATUS_POLL_SECONDS = float(os.getenv("SSE_STATUS_POLL_SECONDS", "10"))
+# Streams are closed after this long and the browser reconnects, so worker
+# threads are released on reloads
+SSE_MAX_STREAM_SECONDS = int(os.getenv("SSE_MAX_STREAM_SECONDS", "300"))
+
+# Voice Configuration
+# Run voice commands through the async agent on the shared event loop so a
+# timeout cancels the in-flight LLM request instead of abandoning a thread
+VOICE_ASYNC_AGENT = os.getenv("VOICE_ASYNC_AGENT", "false").lower() == "true"
+# Shared worker pool for synchronous voice commands
+VOICE_WORKER_POOL_SIZE = int(os.getenv("VOICE_WORKER_POOL_SIZE", "4"))
+VOICE_MAX_QUEUE_DEPTH = int(os.getenv("VOICE_MAX_QUEUE_DEPTH", "16"))  # waiting commands
+# Prefetch the puck's room device states while the LLM call is in flight
+VOICE_PREFETCH_ENABLED = os.getenv("VOICE_PREFETCH_ENABLED", "true").lower() == "true"
 
 # Rate Limiting Configuration (WP-10.23)
 RATE_LIMIT_DEFAULT_PER_DAY = int(os.getenv("RATE_LIMIT_DEFAULT_PER_DAY", "200"))
@@ -76,10 +146,16 @@ RATE_LIMIT_COMMAND_PER_MINUTE = int(os.getenv("RATE_LIMIT_COMMAND_PER_MINUTE", "
 RATE_LIMIT_ADMIN_MULTIPLIER = int(
     os.getenv("RATE_LIMIT_ADMIN_MULTIPLIER", "5")
 )  # 5x normal limits for admins
+# Where limit counters live (a limits storage URI). Empty picks memory:// in
+# development and, in production, a SQLite file shared by every worker
+# (sqlite:///dev/shm/smarthome-ratelimits.db, or under DATA_DIR without /dev/shm)
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "")
 
 # Room Entity Mappings
 # Maps room names to Home Assistant entity IDs
 # Blinds use the Tuya integration via Hapadif Smart Bridge Hub
+# Rooms may also list "media" player entity IDs (str or list) so their state
+# is prefetched when a voice command arrives from that room's puck
 #
 # Philips Hue Device Descriptions (updated 2026-01-02):
 # Kitchen: Two 2-bulb overhanging fixtures
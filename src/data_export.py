@@ -3,18 +3,40 @@ Data Export/Import Module (WP-10.35)
 
 Provides functionality to export all user data in JSON or CSV format
 and import data for migration purposes.
+
+Besides the in-memory export_* methods, DataExporter has streaming
+variants (stream_ndjson, stream_csv, stream_json) that read each table in
+rowid-ordered batches of EXPORT_BATCH_SIZE and yield text chunks, so memory
+use doesn't grow with the amount of data. NDJSON and CSV records carry a
+cursor ("section:rowid") that can be passed back to resume an export after
+the last record received.
+
+DataImporter.import_ndjson() reads such an NDJSON export line by line,
+validates each record and writes todos, automations and reminders with
+executemany in transactions of IMPORT_BATCH_SIZE rows. A dry run goes
+through the same pass, writing inside one transaction per database that
+is rolled back at the end (in a scratch directory when the database file
+doesn't exist yet), so its written and conflict counts are the ones an
+import would report.
 """
 
+import contextlib
 import csv
 import io
 import json
 import logging
 import sqlite3
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from src.automation_manager import AutomationManager
 from src.config import DATA_DIR
+from src.reminder_manager import ReminderManager
+from src.todo_manager import TodoManager
 
 
 logger = logging.getLogger(__name__)
@@ -22,6 +44,120 @@ logger = logging.getLogger(__name__)
 # Export format version for compatibility checking
 EXPORT_VERSION = "1.0"
 
+# Exportable sections in export order: section -> (database file, table)
+EXPORT_SECTIONS = {
+    "todos": ("todos.db", "todos"),
+    "automations": ("automations.db", "automations"),
+    "reminders": ("reminders.db", "reminders"),
+    "command_history": ("smarthome.db", "command_history"),
+    "timers": ("timers.db", "timers"),
+    "locations": ("locations.db", "locations"),
+}
+
+# Rows fetched per query when streaming an export
+EXPORT_BATCH_SIZE = 500
+
+# Column holding the resume cursor in streamed CSV
+CSV_CURSOR_COLUMN = "_cursor"
+
+# Rows written per transaction when importing
+IMPORT_BATCH_SIZE = 500
+
+# Validation errors kept in an ImportResult (the rest are only counted)
+MAX_IMPORT_ERRORS = 50
+
+
+@dataclass(frozen=True)
+class ImportSection:
+    """Where an importable section is stored and which fields it accepts."""
+
+    db_file: str
+    table: str
+    columns: tuple[str, ...]
+    required: tuple[str, ...]
+    manager: type
+
+
+# Sections that can be imported; the manager creates the table if needed
+IMPORT_SECTIONS = {
+    "todos": ImportSection(
+        "todos.db",
+        "todos",
+        (
+            "id",
+            "list_name",
+            "content",
+            "priority",
+            "status",
+            "created_at",
+            "updated_at",
+            "completed_at",
+            "due_date",
+            "tags",
+            "category",
+        ),
+        ("content",),
+        TodoManager,
+    ),
+    "automations": ImportSection(
+        "automations.db",
+        "automations",
+        (
+            "id",
+            "name",
+            "description",
+            "trigger_type",
+            "trigger_config",
+            "action_type",
+            "action_config",
+            "enabled",
+            "ha_automation_id",
+            "created_at",
+            "updated_at",
+            "last_triggered",
+        ),
+        ("name", "trigger_type", "trigger_config", "action_type", "action_config"),
+        AutomationManager,
+    ),
+    "reminders": ImportSection(
+        "reminders.db",
+        "reminders",
+        (
+            "id",
+            "todo_id",
+            "message",
+            "remind_at",
+            "repeat_interval",
+            "status",
+            "created_at",
+            "triggered_at",
+        ),
+        ("message", "remind_at"),
+        ReminderManager,
+    ),
+}
+
+
+def parse_export_cursor(cursor: str | None) -> tuple[str, int] | None:
+    """
+    Parse a resume cursor of the form "section:rowid".
+
+    Args:
+        cursor: Cursor from a previously streamed record, or None
+
+    Returns:
+        (section, rowid) or None when no cursor was given
+
+    Raises:
+        ValueError: If the cursor is malformed or names an unknown section
+    """
+    if not cursor:
+        return None
+    section, _, rowid = cursor.rpartition(":")
+    if section not in EXPORT_SECTIONS or not rowid.isdigit():
+        raise ValueError(f"Invalid export cursor: {cursor!r}")
+    return section, int(rowid)
+
 
 class DataExporter:
     """
@@ -102,6 +238,218 @@ class DataExporter:
 
         return csv_data
 
+    def stream_ndjson(self, cursor: str | None = None) -> Iterator[str]:
+        """
+        Stream all data as newline-delimited JSON.
+
+        Yields a metadata line, one line per record and a closing line with
+        the number of records sent per section:
+
+            {"type": "metadata", "version": ..., "exported_at": ..., ...}
+            {"type": "record", "section": "todos", "cursor": "todos:1", "data": {...}}
+            {"type": "end", "counts": {...}}
+
+        Args:
+            cursor: Cursor of the last record already received; the export
+                resumes with the record after it
+
+        Yields:
+            Chunks of NDJSON text, one per batch of records
+
+        Raises:
+            ValueError: If the cursor is invalid (raised before the first chunk)
+        """
+        resume = parse_export_cursor(cursor)
+        return self._stream_ndjson(resume, cursor)
+
+    def _stream_ndjson(self, resume: tuple[str, int] | None, cursor: str | None) -> Iterator[str]:
+        metadata = {"type": "metadata", **self._get_metadata(), "resumed_from": cursor}
+        yield json.dumps(metadata) + "\n"
+
+        counts = {}
+        for section, after_rowid in self._sections_from(resume):
+            counts[section] = 0
+            for batch in self.iter_section_batches(section, after_rowid):
+                counts[section] += len(batch)
+                yield "".join(
+                    json.dumps(
+                        {
+                            "type": "record",
+                            "section": section,
+                            "cursor": f"{section}:{rowid}",
+                            "data": record,
+                        },
+                        default=str,
+                    )
+                    + "\n"
+                    for rowid, record in batch
+                )
+
+        yield json.dumps({"type": "end", "counts": counts}) + "\n"
+
+    def stream_csv(self, section: str, cursor: str | None = None) -> Iterator[str]:
+        """
+        Stream one section as CSV.
+
+        The header row is the table's columns plus a trailing _cursor
+        column; pass the last _cursor value received to resume.
+
+        Args:
+            section: Section name (see EXPORT_SECTIONS)
+            cursor: Cursor of the last row already received
+
+        Yields:
+            Chunks of CSV text, the header first and then one per batch
+
+        Raises:
+            ValueError: If the section or cursor is invalid (raised before
+                the first chunk)
+        """
+        if section not in EXPORT_SECTIONS:
+            raise ValueError(f"Unknown export section: {section!r}")
+        resume = parse_export_cursor(cursor)
+        if resume and resume[0] != section:
+            raise ValueError(f"Cursor {cursor!r} is not for section {section!r}")
+        return self._stream_csv(section, resume[1] if resume else 0)
+
+    def _stream_csv(self, section: str, after_rowid: int) -> Iterator[str]:
+        columns = self._section_columns(section)
+        if not columns:
+            return
+
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=[*columns, CSV_CURSOR_COLUMN])
+        writer.writeheader()
+        yield output.getvalue()
+
+        for batch in self.iter_section_batches(section, after_rowid):
+            output.seek(0)
+            output.truncate()
+            writer.writerows(
+                {**record, CSV_CURSOR_COLUMN: f"{section}:{rowid}"} for rowid, record in batch
+            )
+            yield output.getvalue()
+
+    def stream_json(self) -> Iterator[str]:
+        """
+        Stream all data in the export_all() layout as one JSON document.
+
+        Counts are taken up front so metadata can come first; rows written
+        between counting and reading may make them differ slightly from the
+        records that follow.
+
+        Yields:
+            Chunks of the JSON document, one per batch of records
+        """
+        metadata = self._get_metadata()
+        metadata["counts"] = {section: self.count_section(section) for section in EXPORT_SECTIONS}
+        yield '{"metadata": ' + json.dumps(metadata)
+
+        for section in EXPORT_SECTIONS:
+            yield f", {json.dumps(section)}: ["
+            separator = ""
+            for batch in self.iter_section_batches(section):
+                yield separator + ", ".join(
+                    json.dumps(record, default=str) for _, record in batch
+                )
+                separator = ", "
+            yield "]"
+
+        yield "}"
+
+    def iter_section_batches(
+        self,
+        section: str,
+        after_rowid: int = 0,
+        batch_size: int | None = None,
+    ) -> Iterator[list[tuple[int, dict]]]:
+        """
+        Read a section's table in rowid order, one batch at a time.
+
+        Each batch is a separate query (keyset pagination on rowid), so no
+        read transaction is held open while a slow client consumes the
+        stream.
+
+        Args:
+            section: Section name (see EXPORT_SECTIONS)
+            after_rowid: Only return rows with a greater rowid
+            batch_size: Rows per batch (defaults to EXPORT_BATCH_SIZE)
+
+        Yields:
+            Lists of (rowid, record) tuples
+        """
+        db_file, table = EXPORT_SECTIONS[section]
+        db_path = self.data_dir / db_file
+        if not db_path.exists():
+            return
+
+        batch_size = batch_size or EXPORT_BATCH_SIZE
+        conn = None
+        try:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            conn.row_factory = sqlite3.Row
+            while True:
+                rows = conn.execute(
+                    f"SELECT rowid AS _export_rowid, * FROM {table} "  # nosec B608 - table name is hardcoded
+                    "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (after_rowid, batch_size),
+                ).fetchall()
+                if not rows:
+                    return
+                batch = []
+                for row in rows:
+                    record = dict(row)
+                    batch.append((record.pop("_export_rowid"), record))
+                yield batch
+                after_rowid = batch[-1][0]
+        except sqlite3.Error as e:
+            logger.warning(f"Error streaming {db_path}/{table}: {e}")
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def count_section(self, section: str) -> int:
+        """Count the records in a section without reading them."""
+        db_file, table = EXPORT_SECTIONS[section]
+        db_path = self.data_dir / db_file
+        if not db_path.exists():
+            return 0
+
+        try:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            try:
+                return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]  # nosec B608
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error counting {db_path}/{table}: {e}")
+            return 0
+
+    def _section_columns(self, section: str) -> list[str]:
+        """Column names of a section's table ([] if it doesn't exist)."""
+        db_file, table = EXPORT_SECTIONS[section]
+        db_path = self.data_dir / db_file
+        if not db_path.exists():
+            return []
+
+        try:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            try:
+                cursor = conn.execute(f"SELECT * FROM {table} LIMIT 0")  # nosec B608
+                return [column[0] for column in cursor.description]
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error reading columns of {db_path}/{table}: {e}")
+            return []
+
+    def _sections_from(self, resume: tuple[str, int] | None) -> Iterator[tuple[str, int]]:
+        """(section, after_rowid) pairs for an export starting at a cursor."""
+        sections = list(EXPORT_SECTIONS)
+        start = sections.index(resume[0]) if resume else 0
+        for section in sections[start:]:
+            yield section, resume[1] if resume and section == resume[0] else 0
+
     def _to_csv(self, records: list[dict]) -> str:
         """Convert a list of dicts to CSV string."""
         if not records:
@@ -153,7 +501,7 @@ class DataExporter:
 
     def _export_command_history(self) -> list[dict]:
         """Export command history."""
-        return self._read_db_table(self.data_dir / "smarthome.db", "commands")
+        return self._read_db_table(self.data_dir / "smarthome.db", "command_history")
 
     def _export_timers(self) -> list[dict]:
         """Export timers."""
@@ -247,7 +595,8 @@ class DataImporter:
 
         Args:
             data: Validated import data
-            merge: If True, merge with existing data; if False, replace
+            merge: If True, add to existing data (records that conflict with
+                existing ids are skipped); if False, replace
 
         Returns:
             Dictionary with counts of imported records per section
@@ -256,30 +605,271 @@ class DataImporter:
         if not valid:
             raise ValueError(f"Invalid import data: {errors}")
 
-        imported = {}
-
-        # Import each section
-        if "todos" in data:
-            imported["todos"] = self._import_todos(data["todos"], merge)
+        records = (
+            (section, record)
+            for section in IMPORT_SECTIONS
+            for record in data.get(section) or []
+        )
+        result = self._import_records(records, ImportResult(), merge=merge, dry_run=False)
+        return {section: result.counts[section] for section in IMPORT_SECTIONS if section in data}
+
+    def import_ndjson(
+        self,
+        lines: Iterable[str | bytes],
+        merge: bool = True,
+        dry_run: bool = False,
+        progress: Callable[["ImportResult"], None] | None = None,
+    ) -> "ImportResult":
+        """
+        Import an NDJSON export (see DataExporter.stream_ndjson) as it is read.
 
-        if "automations" in data:
-            imported["automations"] = self._import_automations(data["automations"], merge)
+        Records are validated one at a time; invalid ones are reported and
+        skipped. Valid records are written in transactions of
+        IMPORT_BATCH_SIZE, so an interrupted import keeps the batches
+        already committed. Records keep their ids. When merging, a record
+        whose id (or other unique field) is already taken is skipped and
+        counted in ImportResult.conflicts, so existing data is never
+        overwritten and importing the same file again adds nothing.
 
-        if "reminders" in data:
-            imported["reminders"] = self._import_reminders(data["reminders"], merge)
+        Args:
+            lines: NDJSON lines, e.g. a request stream
+            merge: If True, add to existing data; if False, each imported
+                section's table is emptied before its first batch
+            dry_run: Validate and count without writing (import preview)
+            progress: Called with the running result after every batch and
+                once more when the import is done
 
-        return imported
+        Returns:
+            ImportResult with counts, samples and validation errors
 
-    def _import_todos(self, todos: list[dict], merge: bool) -> int:
-        """Import todo items."""
-        # Implementation would insert/update records
-        # For now, return count
-        return len(todos)
+        Raises:
+            ValueError: If the stream doesn't start with a compatible
+                metadata line (nothing has been written)
+        """
+        result = ImportResult(dry_run=dry_run)
+        records = self._parse_ndjson(lines, result)
+        return self._import_records(records, result, merge, dry_run, progress)
+
+    def _parse_ndjson(
+        self, lines: Iterable[str | bytes], result: "ImportResult"
+    ) -> Iterator[tuple[str, Any]]:
+        """Parse NDJSON lines into (section, record) pairs."""
+        for line_number, line in enumerate(lines, start=1):
+            if isinstance(line, bytes):
+                line = line.decode("utf-8", errors="replace")
+            if not line.strip():
+                continue
+            result.lines += 1
+
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as error:
+                if result.metadata is None:
+                    raise ValueError(f"Line {line_number}: invalid JSON ({error.msg})") from None
+                result.add_error(f"Line {line_number}: invalid JSON ({error.msg})")
+                continue
+            if not isinstance(item, dict):
+                item = {}
+
+            item_type = item.get("type")
+            if result.metadata is None:
+                self._check_metadata(item)
+                result.metadata = {k: v for k, v in item.items() if k != "type"}
+            elif item_type == "record":
+                yield item.get("section"), item.get("data")
+            elif item_type == "end":
+                continue
+            else:
+                result.add_error(f"Line {line_number}: unexpected line type {item_type!r}")
+
+        if result.metadata is None:
+            raise ValueError("Import must start with a metadata line")
+
+    def _check_metadata(self, item: dict) -> None:
+        """Reject streams without a metadata line of a compatible version."""
+        if item.get("type") != "metadata":
+            raise ValueError("Import must start with a metadata line")
+        version = str(item.get("version", ""))
+        if version.split(".")[0] != EXPORT_VERSION.split(".")[0]:
+            raise ValueError(f"Unsupported export version: {version!r}")
+
+    def _import_records(
+        self,
+        records: Iterable[tuple[str, Any]],
+        result: "ImportResult",
+        merge: bool = True,
+        dry_run: bool = False,
+        progress: Callable[["ImportResult"], None] | None = None,
+    ) -> "ImportResult":
+        """Validate records and write them in batches (the import pipeline)."""
+        batches: dict[str, list[dict]] = {}
+        connections: dict[str, sqlite3.Connection] = {}
+        # A dry run never commits: closing its connections rolls it back
+        scratch = tempfile.TemporaryDirectory() if dry_run else contextlib.nullcontext()
+        with scratch as scratch_dir:
+            flush_args = (connections, result, merge, dry_run, scratch_dir)
+            try:
+                for section, record in records:
+                    if section not in IMPORT_SECTIONS:
+                        result.skipped[section] = result.skipped.get(section, 0) + 1
+                        continue
+                    try:
+                        row = self._validate_record(IMPORT_SECTIONS[section], record)
+                    except ValueError as error:
+                        result.add_error(f"{section}: {error}")
+                        continue
+
+                    result.counts[section] += 1
+                    result.samples.setdefault(section, record)
+                    batch = batches.setdefault(section, [])
+                    batch.append(row)
+                    if len(batch) >= IMPORT_BATCH_SIZE:
+                        self._flush(section, batch, *flush_args)
+                        if progress:
+                            progress(result)
+
+                for section, batch in batches.items():
+                    if batch:
+                        self._flush(section, batch, *flush_args)
+            finally:
+                for conn in connections.values():
+                    conn.close()
+
+        result.done = True
+        if progress:
+            progress(result)
+        logger.info(
+            f"{'Import preview' if dry_run else 'Imported'}: {result.counts} "
+            f"({result.error_count} errors)"
+        )
+        return result
+
+    def _validate_record(self, spec: ImportSection, record: Any) -> dict:
+        """
+        Check a record and reduce it to the table's columns.
 
-    def _import_automations(self, automations: list[dict], merge: bool) -> int:
-        """Import automations."""
-        return len(automations)
+        Raises:
+            ValueError: If it isn't an object or lacks a required field
+        """
+        if not isinstance(record, dict):
+            raise ValueError("record must be an object")
+        missing = [name for name in spec.required if record.get(name) in (None, "")]
+        if missing:
+            raise ValueError(f"missing {', '.join(missing)}")
+
+        row = {}
+        for column in spec.columns:
+            if column not in record:
+                continue
+            value = record[column]
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value)
+            elif isinstance(value, bool):
+                value = int(value)
+            row[column] = value
+        return row
+
+    def _flush(
+        self,
+        section: str,
+        batch: list[dict],
+        connections: dict[str, sqlite3.Connection],
+        result: "ImportResult",
+        merge: bool,
+        dry_run: bool,
+        scratch_dir: str | None = None,
+    ) -> None:
+        """
+        Write one batch of rows in a single transaction.
 
-    def _import_reminders(self, reminders: list[dict], merge: bool) -> int:
-        """Import reminders."""
-        return len(reminders)
+        Merging inserts with ON CONFLICT DO NOTHING and counts the rows
+        skipped; replacing (after the table was emptied) uses INSERT OR
+        REPLACE so later duplicates in the file win. A dry run writes the
+        same way but leaves the transaction open for the caller to roll
+        back; a database file that doesn't exist yet is previewed in scratch_dir.
+        """
+        spec = IMPORT_SECTIONS[section]
+        conn = connections.get(section)
+        first_batch = conn is None
+        if first_batch:
+            db_path = self.data_dir / spec.db_file
+            if dry_run and not db_path.exists():
+                db_path = Path(scratch_dir) / spec.db_file
+            spec.manager(database_path=db_path)
+            conn = connections[section] = sqlite3.connect(db_path)
+
+        # Rows are grouped by the fields they have, so missing fields get
+        # the column defaults rather than NULL
+        groups: dict[tuple[str, ...], list[tuple]] = {}
+        for row in batch:
+            groups.setdefault(tuple(row), []).append(tuple(row.values()))
+
+        if merge:
+            statement = "INSERT INTO {table} ({columns}) VALUES ({values}) ON CONFLICT DO NOTHING"
+        else:
+            statement = "INSERT OR REPLACE INTO {table} ({columns}) VALUES ({values})"
+
+        with contextlib.nullcontext() if dry_run else conn:
+            if first_batch and not merge:
+                conn.execute(f"DELETE FROM {spec.table}")  # nosec B608 - table name is hardcoded
+            if section == "todos":
+                conn.executemany(
+                    "INSERT OR IGNORE INTO todo_lists (name) VALUES (?)",
+                    [(name,) for name in {row.get("list_name") or "default" for row in batch}],
+                )
+            changes_before = conn.total_changes
+            for columns, values in groups.items():
+                conn.executemany(
+                    statement.format(  # nosec B608 - table and columns are hardcoded
+                        table=spec.table,
+                        columns=", ".join(columns),
+                        values=", ".join("?" * len(columns)),
+                    ),
+                    values,
+                )
+            written = conn.total_changes - changes_before
+
+        result.written[section] = result.written.get(section, 0) + written
+        if len(batch) > written and merge:
+            result.conflicts[section] = result.conflicts.get(section, 0) + len(batch) - written
+        batch.clear()
+
+
+@dataclass
+class ImportResult:
+    """Running totals of an import or import preview."""
+
+    dry_run: bool = False
+    lines: int = 0
+    metadata: dict | None = None
+    counts: dict[str, int] = field(default_factory=lambda: dict.fromkeys(IMPORT_SECTIONS, 0))
+    written: dict[str, int] = field(default_factory=dict)
+    # Records not written because their id already exists (merge only)
+    conflicts: dict[str, int] = field(default_factory=dict)
+    skipped: dict[str, int] = field(default_factory=dict)
+    samples: dict[str, Any] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)
+    error_count: int = 0
+    done: bool = False
+
+    def add_error(self, message: str) -> None:
+        """Record a validation error, keeping the first MAX_IMPORT_ERRORS."""
+        self.error_count += 1
+        if len(self.errors) < MAX_IMPORT_ERRORS:
+            self.errors.append(message)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a dictionary for JSON responses and progress events."""
+        return {
+            "dry_run": self.dry_run,
+            "done": self.done,
+            "lines": self.lines,
+            "metadata": self.metadata,
+            "counts": self.counts,
+            "written": self.written,
+            "conflicts": self.conflicts,
+            "skipped": self.skipped,
+            "samples": self.samples,
+            "errors": self.errors,
+            "error_count": self.error_count,
+        }
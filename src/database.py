@@ -10,6 +10,10 @@ WP-10.24: Database Query Optimization
 - Query performance monitoring
 - SQLite optimizations (WAL mode, cache size, etc.)
 - Database statistics and backup functionality
+
+Hot read helpers (devices, command history, settings) use fetch_rows():
+pooled connections with cached prepared statements, JSON columns decoded
+on first access, and a latency histogram per statement.
 """
 
 import json
@@ -27,6 +31,9 @@ from queue import Queue, Empty
 from typing import Any
 
 from src.config import DATA_DIR
+from src.metrics import track_db_query
+from src.tracing import span
+from src.settings_cache import SettingsCache
 
 
 logger = logging.getLogger(__name__)
@@ -34,16 +41,36 @@ logger = logging.getLogger(__name__)
 # Database file path
 DATABASE_PATH = DATA_DIR / "smarthome.db"
 
+# devices columns stored as JSON
+DEVICE_JSON_COLUMNS = ("capabilities", "metadata")
+
+# Values of command_history.command_type recorded for processed commands
+COMMAND_SOURCES = ("web", "voice", "automation")
+
+# Default and maximum page sizes for get_command_history_page()
+HISTORY_PAGE_SIZE = 20
+MAX_HISTORY_PAGE_SIZE = 100
+
 # =============================================================================
 # Connection Pooling (WP-10.24)
 # =============================================================================
 
 MAX_POOL_CONNECTIONS = 5
+# Prepared statements kept per pooled connection by the sqlite3 module
+STATEMENT_CACHE_SIZE = 256
 _connection_pool: Queue = Queue(maxsize=MAX_POOL_CONNECTIONS)
 _pool_lock = threading.Lock()
 _pool_initialized = False
 
 
+class _PooledConnection(sqlite3.Connection):
+    """Connection that remembers which database file it was opened on."""
+
+    def __init__(self, database: Path, *args: Any, **kwargs: Any):
+        super().__init__(database, *args, **kwargs)
+        self.database_path = database
+
+
 def _apply_sqlite_optimizations(connection: sqlite3.Connection) -> None:
     """Apply SQLite performance optimizations to a connection."""
     cursor = connection.cursor()
@@ -62,7 +89,12 @@ def _apply_sqlite_optimizations(connection: sqlite3.Connection) -> None:
 
 def _create_pooled_connection() -> sqlite3.Connection:
     """Create a new connection with optimizations applied."""
-    connection = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
+    connection = sqlite3.connect(
+        DATABASE_PATH,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        factory=_PooledConnection,
+    )
     connection.row_factory = sqlite3.Row
     _apply_sqlite_optimizations(connection)
     return connection
@@ -92,12 +124,17 @@ def get_pooled_connection() -> sqlite3.Connection:
         SQLite connection from pool (or new if pool empty)
     """
     _initialize_pool()
-    try:
-        return _connection_pool.get_nowait()
-    except Empty:
-        # Pool exhausted, create new connection
-        logger.debug("Connection pool exhausted, creating new connection")
-        return _create_pooled_connection()
+    while True:
+        try:
+            connection = _connection_pool.get_nowait()
+        except Empty:
+            # Pool exhausted, create new connection
+            logger.debug("Connection pool exhausted, creating new connection")
+            return _create_pooled_connection()
+        if connection.database_path == DATABASE_PATH:
+            return connection
+        # Opened before DATABASE_PATH changed
+        connection.close()
 
 
 def release_connection(connection: sqlite3.Connection) -> None:
@@ -107,6 +144,9 @@ def release_connection(connection: sqlite3.Connection) -> None:
     Args:
         connection: Connection to return to pool
     """
+    if getattr(connection, "database_path", None) != DATABASE_PATH:
+        connection.close()
+        return
     try:
         _connection_pool.put_nowait(connection)
     except Exception:
@@ -142,17 +182,18 @@ def get_cursor() -> Generator[sqlite3.Cursor, None, None]:
             cursor.execute("SELECT * FROM devices")
             rows = cursor.fetchall()
     """
-    connection = get_connection()
-    try:
-        cursor = connection.cursor()
-        yield cursor
-        connection.commit()
-    except Exception as error:
-        connection.rollback()
-        logger.error(f"Database error: {error}")
-        raise
-    finally:
-        connection.close()
+    with span("database", "cursor"):
+        connection = get_connection()
+        try:
+            cursor = connection.cursor()
+            yield cursor
+            connection.commit()
+        except Exception as error:
+            connection.rollback()
+            logger.error(f"Database error: {error}")
+            raise
+        finally:
+            connection.close()
 
 
 # =============================================================================
@@ -228,8 +269,13 @@ def execute_with_monitoring(query: str, params: tuple = ()) -> list:
 
     end_time = time.perf_counter()
     duration_ms = (end_time - start_time) * 1000
+    _record_query_time(query, duration_ms)
+
+    return [dict(row) for row in rows]
+
 
-    # Update metrics
+def _record_query_time(query: str, duration_ms: float) -> None:
+    """Add a query's duration to the metrics and report it if slow."""
     with _metrics_lock:
         _query_metrics["total_queries"] += 1
         _query_metrics["total_time_ms"] += duration_ms
@@ -243,7 +289,168 @@ def execute_with_monitoring(query: str, params: tuple = ()) -> list:
         except Exception as e:
             logger.warning(f"Slow query callback error: {e}")
 
-    return [dict(row) for row in rows]
+
+# =============================================================================
+# Read Fast Path
+# =============================================================================
+
+class LazyRow(dict):
+    """
+    Row dict whose JSON columns are decoded on first access.
+
+    Behaves like the dicts the query helpers used to build: reading a
+    JSON column (by key, get(), items(), values(), dict(row), comparison
+    or json.dumps) returns the decoded value. Columns that are never read
+    are never parsed.
+    """
+
+    __slots__ = ("_pending",)
+
+    def __init__(self, columns: tuple[str, ...], values: tuple, json_columns: tuple[str, ...]):
+        super().__init__(zip(columns, values, strict=True))
+        # Empty and NULL columns are left as they are, like the eager decode did
+        self._pending = {column for column in json_columns if dict.get(self, column)}
+
+    def _decode(self, key: str) -> None:
+        self._pending.discard(key)
+        dict.__setitem__(self, key, json.loads(dict.__getitem__(self, key)))
+
+    def _decode_all(self) -> None:
+        for key in list(self._pending):
+            self._decode(key)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._pending:
+            self._decode(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._pending.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self._pending.discard(key)
+        dict.__delitem__(self, key)
+
+    def __iter__(self):
+        # Overriding __iter__ makes dict(row) and {**row} go through __getitem__
+        return dict.__iter__(self)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key in self._pending:
+            self._decode(key)
+        return dict.pop(self, key, *default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        updates = dict(*args, **kwargs)
+        self._pending.difference_update(updates)
+        dict.update(self, updates)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        dict.__setitem__(self, key, default)
+        return default
+
+    def items(self):
+        self._decode_all()
+        return dict.items(self)
+
+    def values(self):
+        self._decode_all()
+        return dict.values(self)
+
+    def copy(self) -> dict:
+        self._decode_all()
+        return dict(dict.items(self))
+
+    def __eq__(self, other: object) -> bool:
+        self._decode_all()
+        if isinstance(other, LazyRow):
+            other._decode_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        self._decode_all()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
+
+
+def fetch_rows(
+    statement: str,
+    query: str,
+    params: tuple = (),
+    json_columns: tuple[str, ...] = (),
+    as_tuples: bool = False,
+) -> list:
+    """
+    Run a read query on the fast path.
+
+    Uses a pooled connection, whose statement cache keeps the query
+    prepared across calls, and records the query's latency under its
+    statement name.
+
+    Args:
+        statement: Stable name for the query (metrics label)
+        query: SQL query
+        params: Query parameters
+        json_columns: Columns holding JSON, decoded lazily on access
+        as_tuples: Return plain tuples (no column names, no JSON decoding)
+            for bulk paths that read columns by position
+
+    Returns:
+        List of LazyRow dicts, or tuples if as_tuples is set
+    """
+    start_time = time.perf_counter()
+    with span("database", statement):
+        connection = get_pooled_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.row_factory = None
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            columns = tuple(column[0] for column in cursor.description or ())
+            cursor.close()
+        except sqlite3.Error as error:
+            logger.error(f"Database error: {error}")
+            raise
+        finally:
+            release_connection(connection)
+
+    duration = time.perf_counter() - start_time
+    _record_query_time(query, duration * 1000)
+    track_db_query(statement, duration)
+
+    if as_tuples:
+        return rows
+    return [LazyRow(columns, row, json_columns) for row in rows]
+
+
+def fetch_value(statement: str, query: str, params: tuple = (), default: Any = None) -> Any:
+    """
+    Run a fast-path query and return the first column of the first row.
+
+    Args:
+        statement: Stable name for the query (metrics label)
+        query: SQL query
+        params: Query parameters
+        default: Returned when the query yields no rows
+
+    Returns:
+        The value, or default
+    """
+    rows = fetch_rows(statement, query, params, as_tuples=True)
+    return rows[0][0] if rows else default
 
 
 def initialize_database():
@@ -278,7 +485,7 @@ def initialize_database():
             CREATE TABLE IF NOT EXISTS command_history (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 command_text TEXT NOT NULL,
-                command_type TEXT,           -- 'voice', 'text', 'api'
+                command_type TEXT,           -- source: 'web', 'voice', 'automation'
                 interpreted_action TEXT,     -- JSON of parsed action
                 result TEXT,                 -- 'success', 'failure', 'partial'
                 error_message TEXT,
@@ -287,7 +494,7 @@ def initialize_database():
                 output_tokens INTEGER,
                 cost_usd REAL,
                 latency_ms INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP  -- UTC, 'YYYY-MM-DD HH:MM:SS'
             )
         """)
 
@@ -330,6 +537,23 @@ def initialize_database():
             )
         """)
 
+        # Downsampled device state history (see src/state_history.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS device_state_rollups (
+                entity_id TEXT NOT NULL,
+                resolution TEXT NOT NULL,    -- 'minute' or 'hour'
+                bucket_start TIMESTAMP NOT NULL,
+                last_state TEXT NOT NULL,
+                last_recorded_at TIMESTAMP NOT NULL,
+                samples INTEGER NOT NULL,
+                value_count INTEGER NOT NULL DEFAULT 0,
+                value_sum REAL,
+                value_min REAL,
+                value_max REAL,
+                PRIMARY KEY (entity_id, resolution, bucket_start)
+            )
+        """)
+
         # Create indexes (WP-10.24: Added additional indexes for common queries)
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_command_history_created
@@ -343,6 +567,10 @@ def initialize_database():
             CREATE INDEX IF NOT EXISTS idx_device_state_history_entity
             ON device_state_history(entity_id, recorded_at)
         """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_device_state_rollups_bucket
+            ON device_state_rollups(resolution, bucket_start)
+        """)
 
         # Response Feedback (for thumbs-down feature)
         cursor.execute("""
@@ -383,6 +611,14 @@ def initialize_database():
             CREATE INDEX IF NOT EXISTS idx_response_feedback_created
             ON response_feedback(created_at)
         """)
+        # Covers get_command_history_page() filtered by source: a range
+        # scan on (command_type, id) with every listed column in the index
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_command_history_source_page
+            ON command_history(command_type, id, created_at, result, command_text)
+        """)
+
+        _migrate_usage_command_history(cursor)
 
     # Apply SQLite optimizations after table creation
     connection = get_connection()
@@ -391,6 +627,9 @@ def initialize_database():
     finally:
         connection.close()
 
+    # Warm the settings cache so the first hot-path read doesn't hit SQLite
+    _settings_cache.load()
+
     logger.info(f"Database initialized at {DATABASE_PATH}")
 
 
@@ -468,21 +707,13 @@ def get_device(entity_id: str) -> dict | None:
     Returns:
         Device dict or None if not found
     """
-    with get_cursor() as cursor:
-        cursor.execute("SELECT * FROM devices WHERE entity_id = ?", (entity_id,))
-        row = cursor.fetchone()
-
-        if row is None:
-            return None
-
-        device = dict(row)
-        # Parse JSON fields
-        if device.get("capabilities"):
-            device["capabilities"] = json.loads(device["capabilities"])
-        if device.get("metadata"):
-            device["metadata"] = json.loads(device["metadata"])
-
-        return device
+    rows = fetch_rows(
+        "get_device",
+        "SELECT * FROM devices WHERE entity_id = ?",
+        (entity_id,),
+        json_columns=DEVICE_JSON_COLUMNS,
+    )
+    return rows[0] if rows else None
 
 
 def get_all_devices() -> list[dict]:
@@ -492,20 +723,24 @@ def get_all_devices() -> list[dict]:
     Returns:
         List of device dicts
     """
-    with get_cursor() as cursor:
-        cursor.execute("SELECT * FROM devices ORDER BY room, device_type, entity_id")
-        rows = cursor.fetchall()
+    return fetch_rows(
+        "get_all_devices",
+        "SELECT * FROM devices ORDER BY room, device_type, entity_id",
+        json_columns=DEVICE_JSON_COLUMNS,
+    )
 
-        devices = []
-        for row in rows:
-            device = dict(row)
-            if device.get("capabilities"):
-                device["capabilities"] = json.loads(device["capabilities"])
-            if device.get("metadata"):
-                device["metadata"] = json.loads(device["metadata"])
-            devices.append(device)
 
-        return devices
+def get_device_entity_ids() -> list[str]:
+    """
+    Get the entity IDs of all registered devices.
+
+    Returns:
+        List of entity IDs
+    """
+    rows = fetch_rows(
+        "get_device_entity_ids", "SELECT entity_id FROM devices", as_tuples=True
+    )
+    return [entity_id for (entity_id,) in rows]
 
 
 def get_devices_by_room(room: str) -> list[dict]:
@@ -518,22 +753,12 @@ def get_devices_by_room(room: str) -> list[dict]:
     Returns:
         List of device dicts
     """
-    with get_cursor() as cursor:
-        cursor.execute(
-            "SELECT * FROM devices WHERE room = ? ORDER BY device_type, entity_id", (room,)
-        )
-        rows = cursor.fetchall()
-
-        devices = []
-        for row in rows:
-            device = dict(row)
-            if device.get("capabilities"):
-                device["capabilities"] = json.loads(device["capabilities"])
-            if device.get("metadata"):
-                device["metadata"] = json.loads(device["metadata"])
-            devices.append(device)
-
-        return devices
+    return fetch_rows(
+        "get_devices_by_room",
+        "SELECT * FROM devices WHERE room = ? ORDER BY device_type, entity_id",
+        (room,),
+        json_columns=DEVICE_JSON_COLUMNS,
+    )
 
 
 def get_devices_by_type(device_type: str) -> list[dict]:
@@ -546,22 +771,12 @@ def get_devices_by_type(device_type: str) -> list[dict]:
     Returns:
         List of device dicts
     """
-    with get_cursor() as cursor:
-        cursor.execute(
-            "SELECT * FROM devices WHERE device_type = ? ORDER BY room, entity_id", (device_type,)
-        )
-        rows = cursor.fetchall()
-
-        devices = []
-        for row in rows:
-            device = dict(row)
-            if device.get("capabilities"):
-                device["capabilities"] = json.loads(device["capabilities"])
-            if device.get("metadata"):
-                device["metadata"] = json.loads(device["metadata"])
-            devices.append(device)
-
-        return devices
+    return fetch_rows(
+        "get_devices_by_type",
+        "SELECT * FROM devices WHERE device_type = ? ORDER BY room, entity_id",
+        (device_type,),
+        json_columns=DEVICE_JSON_COLUMNS,
+    )
 
 
 def delete_device(entity_id: str) -> bool:
@@ -601,7 +816,7 @@ def record_command(
 
     Args:
         command_text: Original command text
-        command_type: Type of command (voice, text, api)
+        command_type: Source of the command (see COMMAND_SOURCES)
         interpreted_action: Parsed action dict
         result: Command result (success, failure, partial)
         error_message: Error message if failed
@@ -639,6 +854,130 @@ def record_command(
         return cursor.lastrowid
 
 
+def record_command_result(
+    command_text: str,
+    source: str,
+    success: bool,
+    response_text: str | None = None,
+    error_message: str | None = None,
+    latency_ms: int | None = None,
+) -> None:
+    """
+    Record a processed command without letting history errors reach the caller.
+
+    Args:
+        command_text: Original command text
+        source: Where the command came from (see COMMAND_SOURCES)
+        success: Whether the command succeeded
+        response_text: Response given to user
+        error_message: Error message if failed
+        latency_ms: Response latency in milliseconds
+    """
+    try:
+        record_command(
+            command_text=command_text,
+            command_type=source,
+            result="success" if success else "failure",
+            error_message=error_message,
+            response_text=response_text,
+            latency_ms=latency_ms,
+        )
+    except sqlite3.Error as error:
+        logger.warning(f"Could not record command history: {error}")
+
+
+def get_command_history_page(
+    limit: int = HISTORY_PAGE_SIZE,
+    before_id: int | None = None,
+    source: str | None = None,
+) -> tuple[list[dict], int | None]:
+    """
+    Get one page of command history, newest first.
+
+    Uses keyset pagination on id, so any page costs the same regardless of
+    how deep it is (unlike get_command_history's OFFSET).
+
+    Args:
+        limit: Maximum number of records
+        before_id: Only return commands older than this id (the previous
+            page's cursor)
+        source: Only return commands from this source
+
+    Returns:
+        (records, cursor for the next page or None on the last page);
+        created_at is UTC in 'YYYY-MM-DD HH:MM:SS' form
+    """
+    conditions = []
+    params: list = []
+    if source:
+        conditions.append("command_type = ?")
+        params.append(source)
+    if before_id is not None:
+        conditions.append("id < ?")
+        params.append(before_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    rows = fetch_rows(
+        "get_command_history_page",
+        f"""
+        SELECT id, command_text, command_type, result, created_at
+        FROM command_history
+        {where}
+        ORDER BY id DESC
+        LIMIT ?
+        """,  # nosec B608 - conditions are fixed strings
+        (*params, limit + 1),
+    )
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1]["id"]
+    return rows, None
+
+
+def _migrate_usage_command_history(cursor: sqlite3.Cursor) -> None:
+    """
+    Copy commands from usage.db into an empty command_history (one-time).
+
+    Before command_history was the canonical store, /api/history read the
+    command column of usage.db's api_usage table (one row per LLM call).
+    usage.db timestamps are local-time ISO strings; they are converted to
+    UTC 'YYYY-MM-DD HH:MM:SS' to match CURRENT_TIMESTAMP on new rows.
+    """
+    legacy_path = DATABASE_PATH.parent / "usage.db"
+    if not legacy_path.exists():
+        return
+    if cursor.execute("SELECT 1 FROM command_history LIMIT 1").fetchone():
+        return
+
+    try:
+        legacy = sqlite3.connect(f"file:{legacy_path}?mode=ro", uri=True)
+        try:
+            columns = {row[1] for row in legacy.execute("PRAGMA table_info(api_usage)")}
+            if "command" not in columns:
+                return
+            source = "source" if "source" in columns else "NULL"
+            rows = legacy.execute(f"""
+                SELECT DISTINCT command, {source}, timestamp
+                FROM api_usage
+                WHERE command IS NOT NULL AND command != ''
+                ORDER BY timestamp
+            """).fetchall()  # nosec B608 - column name is fixed
+        finally:
+            legacy.close()
+    except sqlite3.Error as error:
+        logger.warning(f"Could not migrate command history from {legacy_path}: {error}")
+        return
+
+    cursor.executemany(
+        """
+        INSERT INTO command_history (command_text, command_type, created_at)
+        VALUES (?1, ?2, COALESCE(datetime(?3, 'utc'), ?3))
+        """,
+        rows,
+    )
+    if rows:
+        logger.info(f"Migrated {len(rows)} commands from {legacy_path} to command_history")
+
+
 def get_command_history(limit: int = 100, offset: int = 0) -> list[dict]:
     """
     Get recent command history.
@@ -650,25 +989,16 @@ def get_command_history(limit: int = 100, offset: int = 0) -> list[dict]:
     Returns:
         List of command history dicts
     """
-    with get_cursor() as cursor:
-        cursor.execute(
-            """
-            SELECT * FROM command_history
-            ORDER BY created_at DESC
-            LIMIT ? OFFSET ?
+    return fetch_rows(
+        "get_command_history",
+        """
+        SELECT * FROM command_history
+        ORDER BY created_at DESC
+        LIMIT ? OFFSET ?
         """,
-            (limit, offset),
-        )
-        rows = cursor.fetchall()
-
-        history = []
-        for row in rows:
-            record = dict(row)
-            if record.get("interpreted_action"):
-                record["interpreted_action"] = json.loads(record["interpreted_action"])
-            history.append(record)
-
-        return history
+        (limit, offset),
+        json_columns=("interpreted_action",),
+    )
 
 
 # =============================================================================
@@ -785,6 +1115,9 @@ def get_usage_for_period(start_date: str, end_date: str) -> list[dict]:
 # Settings Functions
 # =============================================================================
 
+# Whole settings table, reloaded after set_setting() or a commit by another process
+_settings_cache = SettingsCache(lambda: DATABASE_PATH, "settings", decode=json.loads)
+
 
 def set_setting(key: str, value: Any, description: str | None = None):
     """
@@ -808,11 +1141,15 @@ def set_setting(key: str, value: Any, description: str | None = None):
             (key, json.dumps(value), description),
         )
 
+    _settings_cache.invalidate()
+
 
 def get_setting(key: str, default: Any = None) -> Any:
     """
     Get a configuration setting.
 
+    Served from the in-memory settings cache (see src/settings_cache.py).
+
     Args:
         key: Setting key
         default: Default value if not found
@@ -820,14 +1157,7 @@ def get_setting(key: str, default: Any = None) -> Any:
     Returns:
         Setting value or default
     """
-    with get_cursor() as cursor:
-        cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
-        row = cursor.fetchone()
-
-        if row is None:
-            return default
-
-        return json.loads(row["value"])
+    return _settings_cache.get(key, default)
 
 
 def get_all_settings() -> dict[str, Any]:
@@ -837,11 +1167,12 @@ def get_all_settings() -> dict[str, Any]:
     Returns:
         Dict of key-value pairs
     """
-    with get_cursor() as cursor:
-        cursor.execute("SELECT key, value FROM settings")
-        rows = cursor.fetchall()
+    return _settings_cache.get_all()
+
 
-        return {row["key"]: json.loads(row["value"]) for row in rows}
+def get_settings_cache() -> SettingsCache:
+    """Get the process-wide cache of the settings table."""
+    return _settings_cache
 
 
 # =============================================================================
@@ -857,23 +1188,18 @@ def record_device_state(
     """
     Record a device state snapshot.
 
+    Written immediately, skipping it if the state and attributes are
+    unchanged since the last snapshot. For bulk ingestion, buffer
+    snapshots with src.state_history.get_state_history().record().
+
     Args:
         entity_id: Device entity ID
         state: Current state value
         attributes: State attributes
     """
-    with get_cursor() as cursor:
-        cursor.execute(
-            """
-            INSERT INTO device_state_history (entity_id, state, attributes)
-            VALUES (?, ?, ?)
-        """,
-            (
-                entity_id,
-                state,
-                json.dumps(attributes) if attributes else None,
-            ),
-        )
+    from src.state_history import get_state_history
+
+    get_state_history().record(entity_id, state, attributes, flush=True)
 
 
 def get_device_state_history(
@@ -895,7 +1221,7 @@ def get_device_state_history(
             """
             SELECT * FROM device_state_history
             WHERE entity_id = ?
-            ORDER BY recorded_at DESC
+            ORDER BY recorded_at DESC, id DESC
             LIMIT ?
         """,
             (entity_id, limit),
@@ -923,36 +1249,32 @@ _backup_schedule = {
 }
 
 
-def create_backup(backup_path: str) -> bool:
+def create_backup(backup_path: str, compress: bool = False) -> bool:
     """
     Create a backup of the database.
 
+    Uses the online backup API in page batches (see src/backup_manager.py),
+    so writers are not blocked for the whole copy.
+
     Args:
         backup_path: Path to save the backup file
+        compress: gzip the backup (".gz" is appended to the path)
 
     Returns:
         True if backup successful
     """
-    try:
-        # Ensure parent directory exists
-        Path(backup_path).parent.mkdir(parents=True, exist_ok=True)
+    from src.backup_manager import BackupManager
 
-        # Use SQLite's backup API for safe backup
-        source_conn = sqlite3.connect(DATABASE_PATH)
-        dest_conn = sqlite3.connect(backup_path)
-
-        with dest_conn:
-            source_conn.backup(dest_conn)
-
-        source_conn.close()
-        dest_conn.close()
-
-        logger.info(f"Database backup created at {backup_path}")
-        return True
-    except Exception as e:
-        logger.error(f"Database backup failed: {e}")
+    result = BackupManager().backup_database(
+        DATABASE_PATH, backup_path, compress=compress, name="smarthome"
+    )
+    if not result.success:
+        logger.error(f"Database backup failed: {result.error}")
         return False
 
+    logger.info(f"Database backup created at {result.destination}")
+    return True
+
 
 def get_backup_schedule() -> dict:
     """Get the current backup schedule."""
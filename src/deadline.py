@@ -0,0 +1,70 @@
+"""
+Smart Home Assistant - Request Deadlines
+
+A Deadline carries an absolute expiry time through a request so that work
+abandoned by its caller (e.g. a voice command that already timed out) stops
+making LLM and Home Assistant calls at the next checkpoint instead of
+running to completion in the background.
+
+Usage:
+    deadline = Deadline(30)
+    ...
+    if deadline.expired():
+        return  # Caller has given up, skip remaining work
+    client.chat.completions.create(..., timeout=deadline.remaining())
+"""
+
+from __future__ import annotations
+
+import time
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work is attempted after its deadline has passed."""
+
+
+class Deadline:
+    """An absolute point in time after which work should be skipped."""
+
+    def __init__(self, timeout_seconds: float):
+        """
+        Create a deadline timeout_seconds from now.
+
+        Args:
+            timeout_seconds: Seconds until the deadline expires
+        """
+        self.timeout_seconds = timeout_seconds
+        self._expires_at = time.monotonic() + timeout_seconds
+        self._cancelled = False
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (0.0 once expired)."""
+        if self._cancelled:
+            return 0.0
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Check whether the deadline has passed or was cancelled."""
+        return self._cancelled or time.monotonic() >= self._expires_at
+
+    def cancel(self) -> None:
+        """Expire the deadline immediately (caller gave up early)."""
+        self._cancelled = True
+
+    def check(self, operation: str = "operation") -> None:
+        """
+        Raise if the deadline has passed.
+
+        Args:
+            operation: Description of the work being skipped, for the error
+
+        Raises:
+            DeadlineExceeded: If the deadline has expired
+        """
+        if self.expired():
+            raise DeadlineExceeded(
+                f"Deadline of {self.timeout_seconds}s exceeded before {operation}"
+            )
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.2f}s)"
@@ -804,13 +804,17 @@ class DeviceRegistry:
             List of newly added device dicts
         """
         new_devices = []
-        states = ha_client.get_all_states()
+        store = ha_client.get_entity_store()
 
-        for state in states:
-            entity_id = state.get("entity_id", "")
+        with self._get_cursor() as cursor:
+            cursor.execute("SELECT entity_id FROM devices")
+            registered = {row["entity_id"] for row in cursor.fetchall()}
+
+        for entity in store:
+            entity_id = entity.entity_id
 
             # Skip if already registered
-            if self.get_device_by_entity_id(entity_id):
+            if entity_id in registered:
                 continue
 
             # Determine device type from entity_id prefix
@@ -818,7 +822,7 @@ class DeviceRegistry:
             if device_type is None:
                 continue  # Skip unsupported types
 
-            friendly_name = state.get("attributes", {}).get("friendly_name", entity_id)
+            friendly_name = entity.friendly_name or entity_id
 
             try:
                 device_id = self.register_device(
@@ -8,15 +8,18 @@ Handles discovery, registration, and state tracking.
 from src.database import (
     delete_device,
     get_all_devices,
+    get_device_entity_ids,
     record_device_state,
     register_device,
 )
+from src.entity_store import EntityStore
 from src.homeassistant import (
     HomeAssistantClient,
     HomeAssistantError,
     get_client,
 )
 from src.logging_config import LogContext, get_logger
+from src.state_history import get_state_history
 
 
 logger = get_logger(__name__)
@@ -212,27 +215,29 @@ def sync_devices_from_ha(
             logger.error(f"Failed to fetch states from HA: {error}")
             raise
 
-        # Get existing devices for comparison
-        existing_entities = {device["entity_id"] for device in get_all_devices()}
+        store = EntityStore(
+            all_states, room_resolver=infer_room_from_entity if infer_rooms else None
+        )
+
+        history = get_state_history()
 
-        for state in all_states:
-            entity_id = state.get("entity_id", "")
-            domain = entity_id.split(".")[0] if "." in entity_id else None
+        # Get existing devices for comparison
+        existing_entities = set(get_device_entity_ids())
 
-            if domain not in domains:
-                continue
+        for entity in store.by_domains(domains):
+            entity_id = entity.entity_id
+            domain = entity.domain
 
             stats["total_discovered"] += 1
             stats["by_domain"][domain] = stats["by_domain"].get(domain, 0) + 1
 
             # Extract device info
+            state = entity.to_dict()
             device_info = extract_device_info(state)
 
-            # Infer room if requested
+            # Use the room inferred from the entity name if requested
             if infer_rooms and not device_info.get("room"):
-                device_info["room"] = infer_room_from_entity(
-                    entity_id, device_info.get("friendly_name")
-                )
+                device_info["room"] = entity.room
 
             # Register device
             is_new = entity_id not in existing_entities
@@ -244,12 +249,10 @@ def sync_devices_from_ha(
             else:
                 stats["updated_devices"] += 1
 
-            # Record current state
-            record_device_state(
-                entity_id=entity_id,
-                state=state.get("state", "unknown"),
-                attributes=state.get("attributes"),
-            )
+            # Record current state (written in one batch below)
+            history.record(entity_id, entity.state, state["attributes"])
+
+        history.flush()
 
     logger.info(
         f"Device sync complete: {stats['total_discovered']} discovered, "
@@ -314,11 +317,8 @@ def remove_stale_devices(client: HomeAssistantClient | None = None) -> list[str]
         return []
 
     ha_entities = {state.get("entity_id") for state in ha_states}
-    local_devices = get_all_devices()
-
     removed = []
-    for device in local_devices:
-        entity_id = device["entity_id"]
+    for entity_id in get_device_entity_ids():
         if entity_id not in ha_entities:
             delete_device(entity_id)
             removed.append(entity_id)
@@ -0,0 +1,491 @@
+"""
+Smart Home Assistant - Compact Entity State Store
+
+Holds a Home Assistant /api/states payload in a compact, indexed form.
+
+Large installs report thousands of entities, and the raw payload is a list
+of dicts: every entity carries its own attributes dict and its own copies of
+strings like "on", "off", "W" or "outlet". Callers that need "all switches"
+or "everything in the bedroom" then scan the whole list.
+
+EntityStore instead keeps one __slots__ record per entity:
+- repeated strings (domains, states, device classes, attribute keys and
+  string values) are interned, so each distinct value is stored once
+- attribute keys live in a shared shape; a record keeps only a tuple of
+  values, so entities with the same attribute layout share their key tuple
+- domain, room and device_class indexes answer lookups without a scan
+
+The HA client builds the store when it loads /api/states, caches it in
+place of the raw payload and patches changed entities into it with
+update(), so the raw dicts are dropped as soon as the store is built.
+
+Usage:
+    from src.ha_client import get_ha_client
+
+    store = get_ha_client().get_entity_store()
+    for entity in store.query(domain="switch", device_class="outlet"):
+        print(entity.entity_id, entity.state)
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from src.config import ROOM_ENTITY_MAP
+
+
+RoomResolver = Callable[[str, str | None], str | None]
+
+_MISSING = object()
+
+
+class _AttributeShape:
+    """An ordered set of attribute keys shared by entities with the same layout."""
+
+    __slots__ = ("keys", "positions")
+
+    def __init__(self, keys: tuple[str, ...]):
+        self.keys = keys
+        self.positions = {key: index for index, key in enumerate(keys)}
+
+
+def _intern_value(value: Any) -> Any:
+    """Intern string values; leave everything else untouched."""
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+class EntityState:
+    """
+    Compact record of a single entity's state.
+
+    Attributes are stored as a value tuple against a shared key shape;
+    use get_attribute() for single lookups and the attributes property
+    (which builds a new dict) only when the full mapping is needed.
+    """
+
+    __slots__ = (
+        "entity_id",
+        "domain",
+        "state",
+        "friendly_name",
+        "device_class",
+        "room",
+        "last_changed",
+        "last_updated",
+        "context",
+        "_shape",
+        "_values",
+    )
+
+    def __init__(
+        self,
+        entity_id: str,
+        domain: str,
+        state: str,
+        shape: _AttributeShape,
+        values: tuple,
+        room: str | None = None,
+        last_changed: str | None = None,
+        last_updated: str | None = None,
+        context: dict[str, Any] | None = None,
+    ):
+        self.entity_id = entity_id
+        self.domain = domain
+        self.state = state
+        self._shape = shape
+        self._values = values
+        self.friendly_name = self.get_attribute("friendly_name")
+        self.device_class = self.get_attribute("device_class")
+        self.room = room
+        self.last_changed = last_changed
+        self.last_updated = last_updated
+        self.context = context
+
+    def get_attribute(self, name: str, default: Any = None) -> Any:
+        """Get one attribute value without building the attributes dict."""
+        position = self._shape.positions.get(name)
+        if position is None:
+            return default
+        return self._values[position]
+
+    def has_attribute(self, name: str) -> bool:
+        """Check whether the entity reports an attribute."""
+        return name in self._shape.positions
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """The entity's attributes as a new dict."""
+        return dict(zip(self._shape.keys, self._values, strict=True))
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Rebuild the HA state dict for this entity.
+
+        Returns:
+            Dict with entity_id, state, attributes and the timestamps
+            and context that were present in the payload
+        """
+        state_dict: dict[str, Any] = {
+            "entity_id": self.entity_id,
+            "state": self.state,
+            "attributes": self.attributes,
+        }
+        if self.last_changed is not None:
+            state_dict["last_changed"] = self.last_changed
+        if self.last_updated is not None:
+            state_dict["last_updated"] = self.last_updated
+        if self.context is not None:
+            state_dict["context"] = self.context
+        return state_dict
+
+    def __repr__(self) -> str:
+        return f"EntityState({self.entity_id!r}, state={self.state!r})"
+
+
+def _configured_room_map() -> dict[str, str]:
+    """Map each entity in ROOM_ENTITY_MAP to its room."""
+    entity_rooms: dict[str, str] = {}
+    for room_name, room_config in ROOM_ENTITY_MAP.items():
+        configured = list(room_config.get("lights", []))
+        for device_type in ("default_light", "blinds", "media"):
+            value = room_config.get(device_type)
+            if isinstance(value, str):
+                configured.append(value)
+            elif value:
+                configured.extend(value)
+        for entity_id in configured:
+            entity_rooms.setdefault(entity_id, room_name)
+    return entity_rooms
+
+
+def configured_room_resolver() -> RoomResolver:
+    """Build a room resolver backed by ROOM_ENTITY_MAP."""
+    entity_rooms = _configured_room_map()
+    return lambda entity_id, friendly_name: entity_rooms.get(entity_id)
+
+
+class EntityStore:
+    """
+    Indexed store of Home Assistant entity states.
+
+    Build one from a states payload and keep it current with update().
+    Query results are tuples in payload order and must not be modified.
+    Updates never mutate a tuple or dict a reader may be iterating: index
+    groups are replaced, and the entity map is copied when entities are
+    added.
+    """
+
+    def __init__(
+        self,
+        states: Iterable[dict[str, Any]],
+        room_resolver: RoomResolver | None = None,
+    ):
+        """
+        Build the store from a states payload.
+
+        Args:
+            states: Entity state dicts as returned by /api/states
+            room_resolver: Maps (entity_id, friendly_name) to a room name;
+                defaults to the rooms configured in ROOM_ENTITY_MAP
+        """
+        if room_resolver is None:
+            room_resolver = configured_room_resolver()
+        self._room_resolver = room_resolver
+        self._shapes: dict[tuple[str, ...], _AttributeShape] = {}
+        self._lock = threading.Lock()
+        self._states: list[dict[str, Any]] | None = None
+
+        entities: dict[str, EntityState] = {}
+        by_domain: dict[str, list[EntityState]] = {}
+        by_room: dict[str, list[EntityState]] = {}
+        by_device_class: dict[str, list[EntityState]] = {}
+
+        for raw in states:
+            entity = self._build_entity(raw)
+            if entity is None or entity.entity_id in entities:
+                continue  # HA never repeats an entity; keep the first if it does
+            entities[entity.entity_id] = entity
+            by_domain.setdefault(entity.domain, []).append(entity)
+            if entity.room:
+                by_room.setdefault(entity.room, []).append(entity)
+            if isinstance(entity.device_class, str):
+                by_device_class.setdefault(entity.device_class, []).append(entity)
+
+        self._entities = entities
+        self._by_domain = {key: tuple(group) for key, group in by_domain.items()}
+        self._by_room = {key: tuple(group) for key, group in by_room.items()}
+        self._by_device_class = {key: tuple(group) for key, group in by_device_class.items()}
+
+    def _build_entity(self, raw: dict[str, Any]) -> EntityState | None:
+        """Compact record for one state dict (None if it has no valid entity_id)."""
+        entity_id = raw.get("entity_id")
+        if not entity_id or "." not in entity_id:
+            return None
+
+        attributes = raw.get("attributes") or {}
+        keys = tuple(sys.intern(key) for key in attributes)
+        shape = self._shapes.get(keys)
+        if shape is None:
+            shape = self._shapes[keys] = _AttributeShape(keys)
+        values = tuple(_intern_value(value) for value in attributes.values())
+
+        entity_id = sys.intern(entity_id)
+        entity = EntityState(
+            entity_id=entity_id,
+            domain=sys.intern(entity_id.split(".", 1)[0]),
+            state=sys.intern(str(raw.get("state", "unknown"))),
+            shape=shape,
+            values=values,
+            last_changed=raw.get("last_changed"),
+            last_updated=raw.get("last_updated"),
+            context=raw.get("context"),
+        )
+        room = self._room_resolver(entity_id, entity.friendly_name)
+        entity.room = sys.intern(room) if room else None
+        return entity
+
+    def update(self, states: Iterable[dict[str, Any]]) -> EntityStore:
+        """
+        Patch fresh entity states into the store in place.
+
+        Changed entities keep their position; new ones are appended. Only
+        the index groups an entity leaves or joins are rebuilt.
+
+        Args:
+            states: State dicts for a subset of entities
+
+        Returns:
+            This store
+        """
+        with self._lock:
+            self._states = None
+            for raw in states:
+                entity = self._build_entity(raw)
+                if entity is None:
+                    continue
+                previous = self._entities.get(entity.entity_id)
+                if previous is None:
+                    entities = dict(self._entities)
+                    entities[entity.entity_id] = entity
+                    self._entities = entities
+                else:
+                    self._entities[entity.entity_id] = entity
+
+                _reindex(self._by_domain, previous, entity, lambda item: item.domain)
+                _reindex(self._by_room, previous, entity, lambda item: item.room)
+                _reindex(
+                    self._by_device_class,
+                    previous,
+                    entity,
+                    lambda item: item.device_class if isinstance(item.device_class, str) else None,
+                )
+        return self
+
+    def to_states(self) -> list[dict[str, Any]]:
+        """
+        Rebuild the states payload (see EntityState.to_dict).
+
+        The list is built once and reused until the next update(), so
+        callers must not modify it.
+        """
+        states = self._states
+        if states is None:
+            with self._lock:
+                states = self._states
+                if states is None:
+                    states = [entity.to_dict() for entity in self._entities.values()]
+                    self._states = states
+        return states
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __contains__(self, entity_id: object) -> bool:
+        return entity_id in self._entities
+
+    def __iter__(self) -> Iterator[EntityState]:
+        return iter(self._entities.values())
+
+    def get(self, entity_id: str) -> EntityState | None:
+        """Get one entity by ID."""
+        return self._entities.get(entity_id)
+
+    def entity_ids(self) -> set[str]:
+        """All entity IDs in the store."""
+        return set(self._entities)
+
+    def domains(self) -> list[str]:
+        """Domains present in the store."""
+        return list(self._by_domain)
+
+    def rooms(self) -> list[str]:
+        """Rooms with at least one resolved entity."""
+        return list(self._by_room)
+
+    def by_domain(self, domain: str) -> tuple[EntityState, ...]:
+        """Entities in a domain (e.g. "switch")."""
+        return self._by_domain.get(domain, ())
+
+    def by_domains(self, domains: Iterable[str]) -> list[EntityState]:
+        """Entities in any of several domains, grouped by domain."""
+        matches: list[EntityState] = []
+        for domain in dict.fromkeys(domains):
+            matches.extend(self._by_domain.get(domain, ()))
+        return matches
+
+    def by_room(self, room: str) -> tuple[EntityState, ...]:
+        """Entities resolved to a room."""
+        return self._by_room.get(room, ())
+
+    def by_device_class(self, device_class: str) -> tuple[EntityState, ...]:
+        """Entities reporting a device_class attribute (e.g. "outlet")."""
+        return self._by_device_class.get(device_class, ())
+
+    def query(
+        self,
+        domain: str | None = None,
+        room: str | None = None,
+        device_class: str | None = None,
+    ) -> list[EntityState]:
+        """
+        Find entities matching every given criterion.
+
+        Starts from the smallest matching index and filters the rest, so
+        the cost is proportional to the candidates, not the whole store.
+
+        Args:
+            domain: Entity domain
+            room: Room name
+            device_class: device_class attribute
+
+        Returns:
+            Matching entities (all entities if no criteria are given)
+        """
+        candidates: list[tuple[EntityState, ...]] = []
+        if domain is not None:
+            candidates.append(self.by_domain(domain))
+        if room is not None:
+            candidates.append(self.by_room(room))
+        if device_class is not None:
+            candidates.append(self.by_device_class(device_class))
+        if not candidates:
+            return list(self._entities.values())
+
+        smallest = min(candidates, key=len)
+        return [
+            entity
+            for entity in smallest
+            if (domain is None or entity.domain == domain)
+            and (room is None or entity.room == room)
+            and (device_class is None or entity.device_class == device_class)
+        ]
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by the store, including its indexes."""
+        return deep_sizeof(self)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Entity, index and shape counts."""
+        return {
+            "entities": len(self._entities),
+            "domains": len(self._by_domain),
+            "rooms": len(self._by_room),
+            "device_classes": len(self._by_device_class),
+            "attribute_shapes": len(self._shapes),
+        }
+
+
+def _reindex(
+    index: dict[str, tuple[EntityState, ...]],
+    previous: EntityState | None,
+    entity: EntityState,
+    key_of: Callable[[EntityState], str | None],
+) -> None:
+    """Move an entity's replacement into the right group of one index."""
+    old_key = key_of(previous) if previous is not None else None
+    new_key = key_of(entity)
+    if old_key is not None and old_key == new_key:
+        index[new_key] = tuple(entity if item is previous else item for item in index[new_key])
+        return
+
+    if old_key is not None:
+        remaining = tuple(item for item in index[old_key] if item is not previous)
+        if remaining:
+            index[old_key] = remaining
+        else:
+            del index[old_key]
+    if new_key is not None:
+        index[new_key] = index.get(new_key, ()) + (entity,)
+
+
+def deep_sizeof(obj: Any) -> int:
+    """
+    Approximate the memory held by an object graph.
+
+    Each object is counted once, so values shared between entities (interned
+    strings, attribute shapes) only count the first time they are reached.
+
+    Args:
+        obj: Root object
+
+    Returns:
+        Total size in bytes
+    """
+    seen: set[int] = set()
+    total = 0
+    pending = [obj]
+
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            pending.extend(current.keys())
+            pending.extend(current.values())
+        elif isinstance(current, list | tuple | set | frozenset):
+            pending.extend(current)
+        else:
+            for slot_owner in type(current).__mro__:
+                for slot in getattr(slot_owner, "__slots__", ()):
+                    value = getattr(current, slot, _MISSING)
+                    if value is not _MISSING:
+                        pending.append(value)
+            instance_dict = getattr(current, "__dict__", None)
+            if instance_dict is not None:
+                pending.append(instance_dict)
+
+    return total
+
+
+def compare_memory(states: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Measure a states payload against the EntityStore built from it.
+
+    While the store is built both are held (peak_bytes); afterwards only
+    the store is.
+
+    Args:
+        states: Entity state dicts as returned by /api/states
+
+    Returns:
+        Dict with raw_bytes, store_bytes, peak_bytes, ratio (store / raw)
+        and entity count
+    """
+    store = EntityStore(states)
+    raw_bytes = deep_sizeof(states)
+    store_bytes = store.memory_usage()
+    return {
+        "entities": len(store),
+        "raw_bytes": raw_bytes,
+        "store_bytes": store_bytes,
+        "peak_bytes": deep_sizeof([states, store]),
+        "ratio": round(store_bytes / raw_bytes, 3) if raw_bytes else 0.0,
+    }
@@ -0,0 +1,518 @@
+"""
+Smart Home Assistant - Live Event Stream
+
+Server-sent events for the web UI. Instead of each browser tab polling
+/api/status every 30s and /api/logs/tail every 3s, tabs hold one
+/api/events connection and the server pushes:
+- status:    system/device snapshot (same shape as /api/status)
+- log:       new lines from the main log file
+- timers:    running timers and alarms, plus any that just finished
+- reminders: pending reminders, plus any that just fired
+- command:   progress of commands submitted through /api/command
+
+One background poller per process produces these for every connected tab,
+so the cost of watching Home Assistant, the log file and the timer/reminder
+databases no longer grows with the number of open tabs. The poller only
+runs while at least one client is subscribed. Snapshot sources publish only
+when their content changes; timers and reminders are re-read only when
+SQLite's data_version says another connection has written to the database.
+
+Events carry ids of the form "<process token>:<sequence>". A reconnecting
+client sends its last id (Last-Event-ID) and gets the events it missed from
+a small replay buffer, or the latest snapshots if the id is unknown (the
+buffer moved on, or it reconnected to another worker).
+
+Usage:
+    hub = get_event_hub()
+    hub.add_source(SnapshotSource("status", collect_status, interval=10))
+
+    with hub.subscribe(last_event_id) as subscription:
+        for event in subscription.initial_events():
+            yield event.encode()
+        events = subscription.wait(timeout=15)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Generator, Iterable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.config import SSE_MAX_CLIENTS
+
+
+logger = logging.getLogger(__name__)
+
+# Events kept for Last-Event-ID replay
+REPLAY_BUFFER_SIZE = 256
+
+# Longest a poller sleeps between checks for new subscribers/stop requests
+MAX_IDLE_SECONDS = 5.0
+
+
+class StreamFullError(Exception):
+    """Raised when SSE_MAX_CLIENTS clients are already connected."""
+
+
+@dataclass
+class Event:
+    """One pushed event."""
+
+    id: str
+    type: str
+    data: Any
+
+    def encode(self) -> str:
+        """Format as a text/event-stream frame."""
+        payload = json.dumps(self.data, default=str, separators=(",", ":"))
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+# =============================================================================
+# Sources
+# =============================================================================
+
+
+class EventSource:
+    """
+    Something the hub polls for events.
+
+    Subclasses implement poll(), returning the payload to publish or None
+    when there is nothing new. Payloads of snapshot sources are full state
+    and are also sent to clients when they connect.
+    """
+
+    snapshot = False
+
+    def __init__(self, topic: str, interval: float):
+        self.topic = topic
+        self.interval = interval
+
+    def start(self) -> None:
+        """Called when the poller starts (clients connected)."""
+
+    def stop(self) -> None:
+        """Called when the poller stops (last client left)."""
+
+    def poll(self) -> Any | None:
+        """Payload to publish, or None when there is nothing new."""
+        return None
+
+
+class SnapshotSource(EventSource):
+    """
+    Publishes the result of fetch() whenever it differs from the last one.
+
+    annotate(previous, current), if given, builds the published payload from
+    the two snapshots (e.g. to list timers that just finished); it is not
+    called for the first snapshot after the poller starts.
+    """
+
+    snapshot = True
+
+    def __init__(
+        self,
+        topic: str,
+        fetch: Callable[[], Any],
+        interval: float,
+        annotate: Callable[[Any, Any], Any] | None = None,
+    ):
+        super().__init__(topic, interval)
+        self.fetch = fetch
+        self.annotate = annotate
+        self._last: Any = None
+
+    def start(self) -> None:
+        self._last = None
+
+    def poll(self) -> Any | None:
+        current = self.fetch()
+        if current == self._last:
+            return None
+        previous, self._last = self._last, current
+        if self.annotate is not None and previous is not None:
+            return self.annotate(previous, current)
+        return current
+
+
+class DatabaseSnapshotSource(SnapshotSource):
+    """
+    Snapshot of a SQLite database, re-read only after it has been written.
+
+    PRAGMA data_version changes whenever another connection (including
+    other worker processes) commits to the database, so checking it costs
+    one query on a connection held open for that purpose.
+    """
+
+    def __init__(
+        self,
+        topic: str,
+        database_path: Callable[[], Path],
+        fetch: Callable[[], Any],
+        interval: float = 1.0,
+        annotate: Callable[[Any, Any], Any] | None = None,
+    ):
+        super().__init__(topic, fetch, interval, annotate)
+        self.database_path = database_path
+        self._connection: sqlite3.Connection | None = None
+        self._data_version: int | None = None
+
+    def start(self) -> None:
+        super().start()
+        self._data_version = None
+
+    def stop(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def poll(self) -> Any | None:
+        version = self._read_data_version()
+        if version is not None and version == self._data_version:
+            return None
+        self._data_version = version
+        return super().poll()
+
+    def _read_data_version(self) -> int | None:
+        try:
+            if self._connection is None:
+                path = self.database_path()
+                if not Path(path).exists():
+                    return None
+                self._connection = sqlite3.connect(
+                    f"file:{path}?mode=ro", uri=True, check_same_thread=False
+                )
+            return self._connection.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as error:
+            logger.debug(f"data_version check failed for {self.topic}: {error}")
+            self.stop()
+            return None
+
+
+class LogTailSource(EventSource):
+    """Publishes lines appended to the newest main log file."""
+
+    # Entries per event; a burst beyond this only sends the newest ones
+    MAX_ENTRIES = 50
+
+    def __init__(self, reader: Any, interval: float = 1.0):
+        super().__init__("log", interval)
+        self.reader = reader
+        self._path: Path | None = None
+        self._position = 0
+
+    def start(self) -> None:
+        # Only lines written from now on; clients load history via /api/logs
+        self._path = self._current_file()
+        self._position = self._path.stat().st_size if self._path else 0
+
+    def poll(self) -> Any | None:
+        path = self._current_file()
+        if path is None:
+            return None
+        size = path.stat().st_size
+        if path != self._path or size < self._position:
+            # Rotated or truncated: continue from the start of the new file
+            self._path, self._position = path, 0
+        if size == self._position:
+            return None
+
+        entries, self._position = self.reader.read_from_position(path, self._position)
+        if not entries:
+            return None
+        return {
+            "entries": [entry.to_dict() for entry in entries[-self.MAX_ENTRIES:]],
+            "dropped": max(len(entries) - self.MAX_ENTRIES, 0),
+        }
+
+    def _current_file(self) -> Path | None:
+        files = self.reader.list_log_files(log_type="main")
+        return files[0] if files else None
+
+
+def finished_items(previous: list[dict], current: list[dict], due_key: str) -> list[dict]:
+    """
+    Items that left a snapshot because they came due.
+
+    Items (by id) present in previous but not current whose due_key
+    timestamp has passed; ones removed before they were due were cancelled.
+    """
+    now = datetime.now().isoformat()
+    current_ids = {item.get("id") for item in current}
+    return [
+        item
+        for item in previous
+        if item.get("id") not in current_ids and str(item.get(due_key, "")) <= now
+    ]
+
+
+# =============================================================================
+# Hub
+# =============================================================================
+
+
+class Subscription:
+    """One connected client's view of the hub."""
+
+    def __init__(self, hub: "EventHub", last_event_id: str | None, topics: set[str] | None):
+        self.hub = hub
+        self.topics = topics
+        self._replay: list[Event] | None = None
+        self.cursor = hub.last_sequence
+        if last_event_id:
+            self._replay = hub.events_after(last_event_id)
+            if self._replay is not None:
+                self.cursor = hub.sequence_of(last_event_id)
+
+    def initial_events(self) -> list[Event]:
+        """
+        Events to send first: missed events on a successful resume,
+        otherwise the latest snapshot of every topic.
+        """
+        if self._replay is not None:
+            events = self._replay
+            if events:
+                self.cursor = self.hub.sequence_of(events[-1].id)
+        else:
+            events = self.hub.latest_snapshots()
+        return [event for event in events if self.wants(event)]
+
+    def wait(self, timeout: float) -> list[Event]:
+        """Block until events newer than the cursor arrive (or timeout)."""
+        events, self.cursor = self.hub.wait_for_events(self.cursor, timeout)
+        return [event for event in events if self.wants(event)]
+
+    def wants(self, event: Event) -> bool:
+        return self.topics is None or event.type in self.topics
+
+
+class EventHub:
+    """
+    Fan-out point between event sources and connected clients.
+
+    publish() may be called from any thread; each subscriber blocks in
+    wait_for_events() on a shared condition variable.
+    """
+
+    def __init__(self, max_clients: int = SSE_MAX_CLIENTS):
+        self.max_clients = max_clients
+        self.token = f"{os.getpid():x}{int(time.time()):x}"
+        self._sources: list[EventSource] = []
+        self._buffer: deque[tuple[int, Event]] = deque(maxlen=REPLAY_BUFFER_SIZE)
+        self._snapshots: dict[str, Event] = {}
+        self._sequence = 0
+        self._subscribers = 0
+        self._condition = threading.Condition()
+        self._wake = threading.Event()
+        self._poller: threading.Thread | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._subscribers
+
+    @property
+    def last_sequence(self) -> int:
+        return self._sequence
+
+    def add_source(self, source: EventSource) -> None:
+        """Register a source (polled while clients are connected)."""
+        self._sources.append(source)
+
+    def publish(self, event_type: str, data: Any, snapshot: bool = False) -> Event:
+        """
+        Push an event to every subscriber.
+
+        Args:
+            event_type: SSE event name
+            data: JSON-serializable payload
+            snapshot: Keep as the topic's latest state for new clients
+        """
+        with self._condition:
+            self._sequence += 1
+            event = Event(f"{self.token}:{self._sequence}", event_type, data)
+            self._buffer.append((self._sequence, event))
+            if snapshot:
+                self._snapshots[event_type] = event
+            self._condition.notify_all()
+        return event
+
+    def refresh(self) -> None:
+        """Poll every source now instead of waiting for its interval."""
+        self._wake.set()
+
+    def sequence_of(self, event_id: str) -> int:
+        return int(event_id.rpartition(":")[2])
+
+    def events_after(self, event_id: str) -> list[Event] | None:
+        """
+        Buffered events newer than event_id, or None if they cannot be
+        replayed (id from another process, or older than the buffer).
+        """
+        token, _, sequence = event_id.rpartition(":")
+        if token != self.token or not sequence.isdigit():
+            return None
+        sequence = int(sequence)
+        with self._condition:
+            if sequence > self._sequence:
+                return None
+            if self._buffer and sequence < self._buffer[0][0] - 1:
+                return None
+            return [event for number, event in self._buffer if number > sequence]
+
+    def latest_snapshots(self) -> list[Event]:
+        with self._condition:
+            return sorted(self._snapshots.values(), key=lambda event: self.sequence_of(event.id))
+
+    def wait_for_events(self, after: int, timeout: float) -> tuple[list[Event], int]:
+        """
+        Events with a sequence above `after`, waiting up to timeout for one.
+
+        Returns:
+            (events, new cursor). If the client fell behind the replay
+            buffer, a single "resync" event tells it to reload state.
+        """
+        with self._condition:
+            if self._sequence == after:
+                self._condition.wait(timeout)
+            if self._sequence == after:
+                return [], after
+            if self._buffer and after < self._buffer[0][0] - 1:
+                resync = Event(f"{self.token}:{self._sequence}", "resync", {})
+                return [resync, *self._snapshots.values()], self._sequence
+            events = [event for number, event in self._buffer if number > after]
+            return events, self._sequence
+
+    @contextmanager
+    def subscribe(
+        self, last_event_id: str | None = None, topics: Iterable[str] | None = None
+    ) -> Generator[Subscription, None, None]:
+        """
+        Register a client for the duration of the block.
+
+        Raises:
+            StreamFullError: max_clients are already connected
+        """
+        with self._condition:
+            if self._subscribers >= self.max_clients:
+                raise StreamFullError(f"{self.max_clients} event stream clients connected")
+            self._subscribers += 1
+            self._ensure_poller()
+        try:
+            yield Subscription(self, last_event_id, set(topics) if topics else None)
+        finally:
+            with self._condition:
+                self._subscribers -= 1
+            self._wake.set()
+
+    def _ensure_poller(self) -> None:
+        if self._poller is not None and self._poller.is_alive():
+            return
+        self._poller = threading.Thread(target=self._run, name="event-hub", daemon=True)
+        self._poller.start()
+
+    def _run(self) -> None:
+        """Poll sources while anyone is subscribed."""
+        for source in self._sources:
+            source.start()
+        next_due = {id(source): 0.0 for source in self._sources}
+        try:
+            while self._subscribers > 0:
+                forced = self._wake.is_set()
+                self._wake.clear()
+                now = time.monotonic()
+                for source in self._sources:
+                    if forced or now >= next_due[id(source)]:
+                        next_due[id(source)] = now + source.interval
+                        self._poll(source)
+                delay = min(next_due.values(), default=now + MAX_IDLE_SECONDS) - time.monotonic()
+                self._wake.wait(min(max(delay, 0.0), MAX_IDLE_SECONDS))
+        finally:
+            for source in self._sources:
+                source.stop()
+            with self._condition:
+                # Stale snapshots would be replayed as current state
+                self._snapshots.clear()
+                self._poller = None
+                if self._subscribers > 0:
+                    # A client subscribed while this thread was exiting
+                    self._ensure_poller()
+
+    def _poll(self, source: EventSource) -> None:
+        try:
+            data = source.poll()
+        except Exception as error:
+            logger.warning(f"Event source {source.topic} failed: {error}")
+            return
+        if data is not None:
+            self.publish(source.topic, data, snapshot=source.snapshot)
+
+
+# =============================================================================
+# Command progress
+# =============================================================================
+
+_current_command: ContextVar[dict | None] = ContextVar("current_command", default=None)
+
+
+@contextmanager
+def command_progress(command: str, source: str = "web") -> Generator[dict, None, None]:
+    """
+    Publish started/completed events around a command.
+
+    Tool calls made while the block runs report progress through
+    report_command_progress(). When the command finishes, sources are
+    refreshed so device changes reach clients immediately.
+    """
+    hub = get_event_hub()
+    state = {"command": command, "source": source}
+    started_event = hub.publish("command", {**state, "stage": "started"})
+    state["id"] = started_event.id
+    started_event.data["id"] = started_event.id
+    token = _current_command.set(state)
+    started = time.monotonic()
+    result = {"success": False}
+    try:
+        yield result
+    finally:
+        _current_command.reset(token)
+        hub.publish(
+            "command",
+            {
+                **state,
+                "stage": "completed" if result.get("success") else "failed",
+                "duration_seconds": round(time.monotonic() - started, 3),
+            },
+        )
+        hub.refresh()
+
+
+def report_command_progress(stage: str, **detail: Any) -> None:
+    """Publish a progress step for the command running in this context (if any)."""
+    state = _current_command.get()
+    if state is None:
+        return
+    get_event_hub().publish("command", {**state, "stage": stage, **detail})
+
+
+# Singleton instance
+_event_hub: EventHub | None = None
+_event_hub_lock = threading.Lock()
+
+
+def get_event_hub() -> EventHub:
+    """Get the singleton EventHub instance."""
+    global _event_hub
+    if _event_hub is None:
+        with _event_hub_lock:
+            if _event_hub is None:
+                _event_hub = EventHub()
+    return _event_hub
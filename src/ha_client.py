@@ -5,15 +5,26 @@ Handles all communication with the Home Assistant API.
 Includes caching for state queries to reduce API calls and latency.
 """
 
+import threading
+import time
+
 import requests
 
-from src.cache import get_cache
-from src.config import HA_TOKEN, HA_URL
+from src.cache import CachePolicy, entity_tag, get_cache
+from src.config import HA_STATES_STALE_SECONDS, HA_TOKEN, HA_URL
+from src.entity_store import EntityStore
+from src.metrics import track_state_prefetch
+from src.tracing import span
 from src.utils import setup_logging
 
 
 logger = setup_logging("ha_client")
 
+# A prefetched state not read via get_state within this window counts as wasted
+PREFETCH_TRACKING_SECONDS = 30
+
+ALL_STATES_CACHE_KEY = "get_all_states"
+
 
 class HomeAssistantClient:
     """Client for interacting with Home Assistant REST API."""
@@ -34,6 +45,34 @@ class HomeAssistantClient:
         }
         self.cache = get_cache()
 
+        # Serve the entity store stale while one background fetch refreshes
+        # it, so an expiry doesn't send every request thread to /api/states.
+        # The shared L2 tier holds the states list; each process builds its
+        # own store from it when filling L1.
+        self.cache.set_policy(
+            ALL_STATES_CACHE_KEY,
+            CachePolicy(
+                stale_seconds=HA_STATES_STALE_SECONDS,
+                backend_encode=EntityStore.to_states,
+                backend_decode=EntityStore,
+            ),
+        )
+
+        # Speculative prefetch tracking: entity_id -> (time prefetched, state cached)
+        self._prefetched: dict[str, tuple[float, dict]] = {}
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_stats = {"issued": 0, "used": 0, "wasted": 0, "skipped": 0}
+
+        # Entities changed by a service call whose new state HA didn't report;
+        # patched into the cached entity store on next read
+        self._dirty_entities: set[str] = set()
+        self._dirty_lock = threading.Lock()
+
+        # Outcome of the latest state fetch (None until one completes). The
+        # entity store can be served stale after HA goes down, so this, not
+        # the presence of states, says whether HA is currently reachable.
+        self.last_fetch_ok: bool | None = None
+
     def _request(
         self, method: str, endpoint: str, data: dict | None = None, timeout: int = 10
     ) -> dict | list | None:
@@ -51,11 +90,12 @@ class HomeAssistantClient:
         """
         url = f"{self.url}{endpoint}"
         try:
-            response = requests.request(
-                method=method, url=url, headers=self.headers, json=data, timeout=timeout
-            )
-            response.raise_for_status()
-            return response.json()
+            with span("home_assistant", f"{method} {endpoint}"):
+                response = requests.request(
+                    method=method, url=url, headers=self.headers, json=data, timeout=timeout
+                )
+                response.raise_for_status()
+                return response.json()
         except requests.exceptions.Timeout:
             logger.error(f"Request timeout: {method} {url}")
             return None
@@ -86,7 +126,8 @@ class HomeAssistantClient:
         """
         Get the current state of an entity.
 
-        Results are cached to reduce API calls.
+        Results are cached to reduce API calls. Concurrent misses for the
+        same entity share one API request.
 
         Args:
             entity_id: Entity ID (e.g., light.living_room)
@@ -94,52 +135,247 @@ class HomeAssistantClient:
         Returns:
             State dictionary or None
         """
-        # Check cache first
+        def load() -> dict | None:
+            logger.debug(f"Cache miss for state of {entity_id}, fetching from API")
+            result = self._request("GET", f"/api/states/{entity_id}")
+            if result:
+                logger.debug(f"State of {entity_id}: {result.get('state')}")
+            return result or None
+
+        # Tagged so service calls can invalidate it
         cache_key = self.cache.make_key("get_state", entity_id=entity_id)
-        cached_result = self.cache.get(cache_key)
+        state = self.cache.get_or_load(cache_key, load, tags=[entity_tag(entity_id)])
+        self._record_prefetch_use(entity_id, state)
+        return state
 
-        if cached_result is not None:
-            logger.debug(f"Cache hit for state of {entity_id}")
-            return cached_result
+    def prefetch_states(self, entity_ids: list[str]) -> int:
+        """
+        Speculatively fetch entity states into the cache.
 
-        # Cache miss - fetch from API
-        logger.debug(f"Cache miss for state of {entity_id}, fetching from API")
-        result = self._request("GET", f"/api/states/{entity_id}")
+        States already cached are skipped. Prefetched entities are tracked so
+        that later get_state() calls can be counted as prefetch hits.
 
-        if result:
-            logger.debug(f"State of {entity_id}: {result.get('state')}")
-            # Cache the result
-            self.cache.set(cache_key, result)
+        Args:
+            entity_ids: Entity IDs likely to be read soon
+
+        Returns:
+            Number of states fetched
+        """
+        fetched = 0
+        for entity_id in entity_ids:
+            cache_key = self.cache.make_key("get_state", entity_id=entity_id)
+            if self.cache.has_key(cache_key):
+                with self._prefetch_lock:
+                    self._prefetch_stats["skipped"] += 1
+                continue
+
+            result = self._request("GET", f"/api/states/{entity_id}")
+            if result:
+                self.cache.set(cache_key, result, tags=[entity_tag(entity_id)])
+                with self._prefetch_lock:
+                    self._prefetched[entity_id] = (time.monotonic(), result)
+                    self._prefetch_stats["issued"] += 1
+                fetched += 1
+
+        track_state_prefetch("issued", fetched)
+        logger.debug(f"Prefetched {fetched}/{len(entity_ids)} entity states")
+        return fetched
+
+    def _record_prefetch_use(self, entity_id: str, state: dict | None) -> None:
+        """
+        Settle a prefetched entity on its first get_state() read.
+
+        The prefetch counts as used only if that read was served by the
+        cache entry the prefetch wrote. If the entry had expired or been
+        replaced, the read went to HA (or got a newer state) and the
+        prefetch counts as wasted.
+        """
+        with self._prefetch_lock:
+            self._expire_prefetched()
+            prefetched = self._prefetched.pop(entity_id, None)
+            if prefetched is None:
+                return
+            outcome = "used" if state is prefetched[1] else "wasted"
+            self._prefetch_stats[outcome] += 1
+        track_state_prefetch(outcome)
+
+    def _expire_prefetched(self) -> None:
+        """Drop prefetched entities past the tracking window. Lock held."""
+        cutoff = time.monotonic() - PREFETCH_TRACKING_SECONDS
+        expired = [
+            entity_id for entity_id, (at, _) in self._prefetched.items() if at < cutoff
+        ]
+        for entity_id in expired:
+            del self._prefetched[entity_id]
+        if expired:
+            self._prefetch_stats["wasted"] += len(expired)
+            track_state_prefetch("wasted", len(expired))
+
+    def get_prefetch_stats(self) -> dict:
+        """
+        Get speculative prefetch statistics.
+
+        Returns:
+            Dictionary with issued, used, wasted, skipped, pending and hit_rate
+            (used / issued)
+        """
+        with self._prefetch_lock:
+            self._expire_prefetched()
+            stats = dict(self._prefetch_stats)
+            stats["pending"] = len(self._prefetched)
+
+        issued = stats["issued"]
+        stats["hit_rate"] = stats["used"] / issued if issued > 0 else 0.0
+        return stats
+
+    def get_entity_store(self) -> EntityStore:
+        """
+        Get every entity's state as an indexed EntityStore.
+
+        The store is built once per /api/states fetch and cached in place
+        of the raw payload (the shared L2 tier keeps the states list, and
+        other processes build their store from it instead of fetching).
+        Concurrent misses share one request, and after
+        expiry the previous store is served (for up to
+        HA_STATES_STALE_SECONDS) while it refreshes in the background.
+        Entities changed by service calls are patched into it in place.
+
+        Returns:
+            EntityStore (empty if Home Assistant could not be reached)
+        """
+        store = self.cache.get_or_load(ALL_STATES_CACHE_KEY, self._load_all_states)
+        if store is None:
+            return EntityStore([])
 
-        return result
+        with self._dirty_lock:
+            dirty = self._dirty_entities
+            self._dirty_entities = set()
+
+        if not dirty:
+            return store
+
+        refreshed = self._fetch_states(dirty)
+        if refreshed is None:
+            # Couldn't refresh individually, fall back to a full fetch
+            self.cache.delete(ALL_STATES_CACHE_KEY)
+            store = self.cache.get_or_load(ALL_STATES_CACHE_KEY, self._load_all_states)
+            return store if store is not None else EntityStore([])
+
+        logger.debug(f"Refreshed {len(dirty)} changed entities in the entity store")
+        patched = self.cache.update(ALL_STATES_CACHE_KEY, lambda cached: cached.update(refreshed))
+        return patched if patched is not None else store.update(refreshed)
 
     def get_all_states(self) -> list[dict]:
         """
         Get states of all entities.
 
-        Results are cached to reduce API calls.
+        The list is rebuilt from the cached entity store once per store
+        version and shared between callers, so it must not be modified;
+        callers that only need some entities should query
+        get_entity_store() instead.
 
         Returns:
             List of state dictionaries
         """
-        # Check cache first
-        cache_key = "get_all_states"
-        cached_result = self.cache.get(cache_key)
+        return self.get_entity_store().to_states()
 
-        if cached_result is not None:
-            logger.debug("Cache hit for all states")
-            return cached_result
+    def _load_all_states(self) -> EntityStore | None:
+        """Fetch every entity state from the API (get_entity_store loader)."""
+        # Entities marked dirty before the request are covered by its result;
+        # ones marked while it is in flight must stay dirty
+        with self._dirty_lock:
+            covered = set(self._dirty_entities)
 
-        # Cache miss - fetch from API
-        logger.debug("Cache miss for all states, fetching from API")
+        logger.debug("Fetching all states from API")
         result = self._request("GET", "/api/states")
+        self.last_fetch_ok = isinstance(result, list)
 
         if result and isinstance(result, list):
-            # Cache the result
-            self.cache.set(cache_key, result)
-            return result
+            with self._dirty_lock:
+                self._dirty_entities -= covered
+            return EntityStore(result)
+
+        return None
+
+    def _fetch_states(self, entity_ids: set[str]) -> list[dict] | None:
+        """
+        Fetch fresh states for specific entities and write them to the cache.
+
+        Args:
+            entity_ids: Entities to fetch
+
+        Returns:
+            List of state dicts, or None if any fetch failed
+        """
+        states = []
+        for entity_id in entity_ids:
+            state = self._request("GET", f"/api/states/{entity_id}")
+            if not state:
+                self.last_fetch_ok = False
+                return None
+            self.cache.set(
+                self.cache.make_key("get_state", entity_id=entity_id),
+                state,
+                tags=[entity_tag(entity_id)],
+            )
+            states.append(state)
+        self.last_fetch_ok = True
+        return states
+
+    def _apply_service_result(self, data: dict, result: dict | list) -> None:
+        """
+        Update the cache after a successful service call.
+
+        HA returns the states that changed while the service ran. Those are
+        written through to the get_state cache and patched into the cached
+        entity store. Targeted entities HA didn't report (state changes that
+        land asynchronously) are invalidated and refreshed individually on
+        the next get_entity_store() call.
+
+        Args:
+            data: Service call payload (may contain entity_id)
+            result: Service call response (list of changed state dicts)
+        """
+        changed_states = []
+        if isinstance(result, list):
+            changed_states = [
+                state
+                for state in result
+                if isinstance(state, dict) and "entity_id" in state and "state" in state
+            ]
+
+        target_ids = data.get("entity_id") or []
+        if isinstance(target_ids, str):
+            target_ids = [target_ids]
+
+        if "all" in target_ids or (not target_ids and not changed_states):
+            # Affected entities unknown (entity_id: all, or area/device targets)
+            self.cache.invalidate_namespace("get_state")
+            self.cache.delete(ALL_STATES_CACHE_KEY)
+            logger.debug("Invalidated all cached states")
+            return
+
+        changed_ids = set()
+        for state in changed_states:
+            entity_id = state["entity_id"]
+            self.cache.invalidate_tag(entity_tag(entity_id))
+            self.cache.set(
+                self.cache.make_key("get_state", entity_id=entity_id),
+                state,
+                tags=[entity_tag(entity_id)],
+            )
+            changed_ids.add(entity_id)
+
+        pending_ids = [entity_id for entity_id in target_ids if entity_id not in changed_ids]
+        self.cache.invalidate_tags(entity_tag(entity_id) for entity_id in pending_ids)
 
-        return []
+        if changed_states:
+            self.cache.update(ALL_STATES_CACHE_KEY, lambda store: store.update(changed_states))
+        if pending_ids:
+            with self._dirty_lock:
+                self._dirty_entities.update(pending_ids)
+
+        logger.debug(f"Cache updated for {sorted(changed_ids)}, invalidated {pending_ids}")
 
     def call_service(
         self,
@@ -151,7 +387,8 @@ class HomeAssistantClient:
         """
         Call a Home Assistant service.
 
-        Invalidates cache for affected entities to ensure fresh data.
+        Writes changed states from HA's response through to the cache and
+        invalidates only the affected entities.
 
         Args:
             domain: Service domain (e.g., 'light')
@@ -172,15 +409,7 @@ class HomeAssistantClient:
         result = self._request("POST", endpoint, data)
 
         if result is not None:
-            # Invalidate cache for affected entity
-            if "entity_id" in data:
-                entity_id = data["entity_id"]
-                cache_key = self.cache.make_key("get_state", entity_id=entity_id)
-                self.cache.invalidate_pattern(cache_key)
-                logger.debug(f"Invalidated cache for {entity_id}")
-
-            # Also invalidate get_all_states cache since state changed
-            self.cache.invalidate_pattern("get_all_states")
+            self._apply_service_result(data, result)
 
         return result is not None
 
@@ -292,8 +521,7 @@ class HomeAssistantClient:
         Returns:
             List of light entity states
         """
-        all_states = self.get_all_states()
-        return [s for s in all_states if s.get("entity_id", "").startswith("light.")]
+        return [entity.to_dict() for entity in self.get_entity_store().by_domain("light")]
 
     def get_hue_scenes(self) -> list[dict]:
         """
@@ -302,8 +530,7 @@ class HomeAssistantClient:
         Returns:
             List of scene entity states
         """
-        all_states = self.get_all_states()
-        return [s for s in all_states if s.get("entity_id", "").startswith("scene.")]
+        return [entity.to_dict() for entity in self.get_entity_store().by_domain("scene")]
 
     def get_light_state(self, entity_id: str) -> dict | None:
         """
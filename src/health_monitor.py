@@ -10,18 +10,32 @@ WP-10.21 Enhancements:
 - Health history retention policies
 - Manual healing triggers
 - Improved healing action logging
+
+Checks run concurrently, each with its own timeout, so one slow dependency
+(an LLM round trip, an unreachable Home Assistant) no longer adds to the
+others. Every result is kept with a per-component freshness budget
+(max_age): /api/health reuses results younger than their budget, and a
+background refresher re-runs checks as they go stale so /readyz answers
+from the last snapshot without doing network I/O. Only one process per host
+runs the refresher (it holds REFRESH_LOCK_PATH). Checks marked on_demand,
+such as the billed LLM completion, never run in the background: only when
+a caller asks for a refresh.
 """
 
+import fcntl
 import logging
+import os
 import sqlite3
 import time
 from collections import defaultdict
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from threading import Lock
+from threading import Event, Lock, Thread
 from typing import Any
 
 
@@ -30,6 +44,40 @@ logger = logging.getLogger("health_monitor")
 # Data directory for databases
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+# Held (flock) by the one process on the host running the background refresher
+REFRESH_LOCK_PATH = DATA_DIR / "health_refresh.lock"
+
+# This process's open lock file while it holds REFRESH_LOCK_PATH: (pid, file)
+_refresh_lock: tuple[int, Any] | None = None
+
+
+def _acquire_refresh_lock() -> bool:
+    """
+    Try to become the host's background refresh process (non-blocking).
+
+    The lock is kept until the process exits, so a worker that dies hands
+    the refresher over to the next one that asks.
+
+    Returns:
+        True if this process holds the lock
+    """
+    global _refresh_lock
+    if _refresh_lock is not None and _refresh_lock[0] == os.getpid():
+        return True
+    try:
+        REFRESH_LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(REFRESH_LOCK_PATH, "a")  # noqa: SIM115 - held for the process lifetime
+    except OSError as error:
+        logger.warning(f"Cannot open {REFRESH_LOCK_PATH}, refreshing in this process: {error}")
+        return True
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _refresh_lock = (os.getpid(), lock_file)
+    return True
+
 
 class HealthStatus(Enum):
     """Health status levels for components."""
@@ -76,6 +124,9 @@ class ComponentChecker:
 
     name: str
     check_fn: Callable[[], ComponentHealth]
+    max_age: float = 60.0  # Seconds a result stays fresh
+    timeout: float = 10.0  # Seconds before the check counts as failed
+    on_demand: bool = False  # Costly: run only for get_system_health(refresh=True)
 
 
 @dataclass
@@ -122,6 +173,10 @@ class HealthMonitor:
     API_COST_WARNING_THRESHOLD = 4.0  # Daily cost USD
     API_COST_CRITICAL_THRESHOLD = 5.0  # Daily cost USD
 
+    # Readiness re-checks a component itself only when its snapshot is this
+    # many times older than its budget (i.e. the refresher is not running)
+    READINESS_STALENESS_FACTOR = 3
+
     def __init__(
         self,
         check_interval: int = 60,
@@ -150,13 +205,25 @@ class HealthMonitor:
         self._healing_log: list[dict[str, Any]] = []  # WP-10.21: Healing action log
         self._healer: Any | None = None  # WP-10.21: Self-healer reference
 
-        # Register default component checkers
+        # Latest result per component and the monotonic time it was taken
+        self._results_lock = Lock()
+        self._latest: dict[str, tuple[ComponentHealth, float]] = {}
+        self._in_flight: dict[str, Future] = {}
+        self._timed_out: dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="health-check")
+        self._refresher: Thread | None = None
+        self._stop_refresh = Event()
+
+        # Register default component checkers. The LLM check is a real
+        # (billed) completion, so it only runs when explicitly refreshed.
         self._component_checkers: list[ComponentChecker] = [
-            ComponentChecker("home_assistant", self.check_home_assistant),
-            ComponentChecker("cache", self.check_cache),
-            ComponentChecker("database", self.check_database),
-            ComponentChecker("anthropic_api", self.check_anthropic_api),
-            ComponentChecker("llm_provider", self.check_llm_provider),  # WP-10.21
+            ComponentChecker("home_assistant", self.check_home_assistant, max_age=30, timeout=5),
+            ComponentChecker("cache", self.check_cache, max_age=15, timeout=2),
+            ComponentChecker("database", self.check_database, max_age=300, timeout=10),
+            ComponentChecker("anthropic_api", self.check_anthropic_api, max_age=60, timeout=5),
+            ComponentChecker(  # WP-10.21
+                "llm_provider", self.check_llm_provider, max_age=300, timeout=20, on_demand=True
+            ),
         ]
 
     def check_home_assistant(self) -> ComponentHealth:
@@ -430,43 +497,27 @@ class HealthMonitor:
                 details={"error": str(error)},
             )
 
-    def get_system_health(self) -> dict[str, Any]:
+    def get_system_health(self, refresh: bool = True) -> dict[str, Any]:
         """
         Get aggregated system health status.
 
+        Args:
+            refresh: Run every check now. When False, results still within
+                their component's max_age are reused and only stale
+                components are checked; on-demand checks (the LLM
+                completion) report their last result, if any.
+
         Returns:
             Dictionary with overall status and component details
         """
-        component_healths = []
-        overall_status = HealthStatus.HEALTHY
-
-        for checker in self._component_checkers:
-            try:
-                health = checker.check_fn()
-                component_healths.append(health)
+        max_age_factor = 0.0 if refresh else 1.0
+        component_healths = self._collect(max_age_factor)
 
-                # Track status changes and consecutive failures
-                previous_status = self._last_status.get(checker.name)
-                self._record_health_check(health)
-                self._handle_status_change(health, previous_status)
-                self._last_status[checker.name] = health.status
-
-                # Determine overall status (worst wins)
-                if health.status.severity > overall_status.severity:
-                    overall_status = health.status
-
-            except Exception as error:
-                logger.error(f"Error running health check for {checker.name}: {error}")
-                # Create an unhealthy status for the failed check
-                health = ComponentHealth(
-                    name=checker.name,
-                    status=HealthStatus.UNHEALTHY,
-                    message=f"Health check failed: {error!s}",
-                    last_check=datetime.now(),
-                    details={"error": str(error)},
-                )
-                component_healths.append(health)
-                overall_status = HealthStatus.UNHEALTHY
+        overall_status = HealthStatus.HEALTHY
+        for health in component_healths:
+            # Determine overall status (worst wins)
+            if health.status.severity > overall_status.severity:
+                overall_status = health.status
 
         return {
             "timestamp": datetime.now().isoformat(),
@@ -474,6 +525,152 @@ class HealthMonitor:
             "components": [health.to_dict() for health in component_healths],
         }
 
+    def _collect(
+        self, max_age_factor: float, include_on_demand: bool = True
+    ) -> list[ComponentHealth]:
+        """
+        Latest health of every component, re-running stale checks in parallel.
+
+        On-demand checks only run when max_age_factor is 0; otherwise their
+        last result is reported, and they are left out until they have one.
+
+        Args:
+            max_age_factor: A cached result is reused while younger than
+                checker.max_age times this (0 re-runs everything)
+            include_on_demand: Report on-demand checks at all
+
+        Returns:
+            ComponentHealth per registered checker, in registration order
+        """
+        now = time.monotonic()
+        results: dict[str, ComponentHealth] = {}
+        pending: list[tuple[ComponentChecker, Future]] = []
+        checkers = [
+            checker
+            for checker in self._component_checkers
+            if include_on_demand or not checker.on_demand
+        ]
+
+        with self._results_lock:
+            for checker in checkers:
+                cached = self._latest.get(checker.name)
+                if cached and now - cached[1] < checker.max_age * max_age_factor:
+                    results[checker.name] = cached[0]
+                    continue
+                if checker.on_demand and max_age_factor > 0:
+                    if cached:
+                        results[checker.name] = cached[0]
+                    continue
+                # Share a check another caller already started
+                future = self._in_flight.get(checker.name)
+                if future is None or future.done():
+                    future = self._executor.submit(self._run_check, checker)
+                    self._in_flight[checker.name] = future
+                pending.append((checker, future))
+
+        for checker, future in pending:
+            remaining = max(checker.timeout - (time.monotonic() - now), 0.0)
+            try:
+                results[checker.name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                results[checker.name] = self._record_timeout(checker, future)
+
+        return [results[checker.name] for checker in checkers if checker.name in results]
+
+    def _run_check(self, checker: ComponentChecker) -> ComponentHealth:
+        """Run one check (on the executor) and record its result."""
+        try:
+            health = checker.check_fn()
+        except Exception as error:
+            logger.error(f"Error running health check for {checker.name}: {error}")
+            # Create an unhealthy status for the failed check
+            health = ComponentHealth(
+                name=checker.name,
+                status=HealthStatus.UNHEALTHY,
+                message=f"Health check failed: {error!s}",
+                last_check=datetime.now(),
+                details={"error": str(error)},
+            )
+        self._record_result(health)
+        return health
+
+    def _record_timeout(self, checker: ComponentChecker, future: Future) -> ComponentHealth:
+        """
+        Record a check that overran its timeout (once per run).
+
+        The check keeps its worker thread and is not resubmitted until it
+        returns; its late result then replaces this one.
+        """
+        with self._results_lock:
+            if self._timed_out.get(checker.name) is future:
+                return self._latest[checker.name][0]
+            self._timed_out[checker.name] = future
+
+        logger.warning(f"Health check for {checker.name} timed out after {checker.timeout}s")
+        health = ComponentHealth(
+            name=checker.name,
+            status=HealthStatus.UNHEALTHY,
+            message=f"Health check timed out after {checker.timeout}s",
+            last_check=datetime.now(),
+            details={"timeout_seconds": checker.timeout},
+        )
+        self._record_result(health)
+        return health
+
+    def _record_result(self, health: ComponentHealth) -> None:
+        """Cache a result and track status changes and consecutive failures."""
+        with self._results_lock:
+            previous_status = self._last_status.get(health.name)
+            self._last_status[health.name] = health.status
+            self._latest[health.name] = (health, time.monotonic())
+        self._record_health_check(health)
+        self._handle_status_change(health, previous_status)
+
+    # ========== Background Refresh ==========
+
+    def start_background_refresh(self) -> None:
+        """
+        Keep results fresh from a daemon thread (idempotent).
+
+        The thread wakes at the shortest component budget (at most every
+        check_interval seconds) and re-runs the background checks that went
+        stale. Only the process holding REFRESH_LOCK_PATH starts it; the
+        others keep asking, so one takes over if that process exits.
+        """
+        with self._results_lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            if not _acquire_refresh_lock():
+                return
+            self._stop_refresh.clear()
+            self._refresher = Thread(
+                target=self._refresh_loop, name="health-refresh", daemon=True
+            )
+            self._refresher.start()
+
+    def stop_background_refresh(self) -> None:
+        """Stop the refresher thread started by start_background_refresh()."""
+        self._stop_refresh.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+            self._refresher = None
+
+    def _refresh_loop(self) -> None:
+        while not self._stop_refresh.is_set():
+            try:
+                self._collect(max_age_factor=1.0, include_on_demand=False)
+            except RuntimeError as error:
+                # Only a shut-down executor (interpreter exit) ends the loop
+                if "cannot schedule new futures" in str(error):
+                    return
+                logger.error(f"Background health refresh failed: {error}")
+            except Exception as error:
+                logger.error(f"Background health refresh failed: {error}")
+            budgets = [
+                checker.max_age for checker in self._component_checkers if not checker.on_demand
+            ]
+            self._stop_refresh.wait(min([self.check_interval, *budgets]))
+
     def _record_health_check(self, health: ComponentHealth) -> None:
         """Record a health check result in history."""
         with self._lock:
@@ -576,15 +773,27 @@ class HealthMonitor:
         with self._lock:
             return self._consecutive_failures.get(component_name, 0)
 
-    def register_component(self, name: str, check_fn: Callable[[], ComponentHealth]) -> None:
+    def register_component(
+        self,
+        name: str,
+        check_fn: Callable[[], ComponentHealth],
+        max_age: float = 60.0,
+        timeout: float = 10.0,
+        on_demand: bool = False,
+    ) -> None:
         """
         Register a custom component checker.
 
         Args:
             name: Component name
             check_fn: Function that returns ComponentHealth
+            max_age: Seconds a result stays fresh
+            timeout: Seconds before the check counts as failed
+            on_demand: Only run the check for get_system_health(refresh=True)
         """
-        self._component_checkers.append(ComponentChecker(name, check_fn))
+        self._component_checkers.append(
+            ComponentChecker(name, check_fn, max_age, timeout, on_demand)
+        )
 
     # ========== WP-10.21: Liveness and Readiness ==========
 
@@ -606,23 +815,23 @@ class HealthMonitor:
 
         Readiness indicates the service can accept traffic.
         Returns not ready if any critical dependency is unhealthy.
-        """
-        failing_components = []
-        all_healthy = True
 
-        for checker in self._component_checkers:
-            try:
-                health = checker.check_fn()
-                if health.status == HealthStatus.UNHEALTHY:
-                    failing_components.append(checker.name)
-                    all_healthy = False
-            except Exception as error:
-                logger.error(f"Readiness check failed for {checker.name}: {error}")
-                failing_components.append(checker.name)
-                all_healthy = False
+        Answers from the last results; components are only checked here
+        if they have never been checked or the refresher has fallen far
+        behind (see READINESS_STALENESS_FACTOR). On-demand checks don't
+        count towards readiness.
+        """
+        component_healths = self._collect(
+            self.READINESS_STALENESS_FACTOR, include_on_demand=False
+        )
+        failing_components = [
+            health.name
+            for health in component_healths
+            if health.status == HealthStatus.UNHEALTHY
+        ]
 
         return {
-            "ready": all_healthy,
+            "ready": not failing_components,
             "timestamp": datetime.now().isoformat(),
             "failing": failing_components,
         }
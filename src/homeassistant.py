@@ -11,6 +11,7 @@ from urllib.parse import urljoin
 import requests
 
 from src.config import HA_TOKEN, HA_URL
+from src.tracing import span
 
 
 logger = logging.getLogger(__name__)
@@ -86,12 +87,13 @@ class HomeAssistantClient:
         url = urljoin(self.base_url, endpoint)
 
         try:
-            response = self._session.request(
-                method=method,
-                url=url,
-                json=data,
-                timeout=self._timeout,
-            )
+            with span("home_assistant", f"{method} {endpoint}"):
+                response = self._session.request(
+                    method=method,
+                    url=url,
+                    json=data,
+                    timeout=self._timeout,
+                )
 
             if response.status_code == 401:
                 raise HomeAssistantAuthError("Invalid or expired access token")
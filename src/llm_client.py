@@ -25,6 +25,10 @@ from dataclasses import dataclass
 
 import requests
 
+from src.async_loop import run_sync
+from src.llm_router import ProviderCall, ProviderRouter
+from src.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
@@ -125,8 +129,15 @@ class LLMClient:
         self.fallback_count = 0
         self._fallback_client = None  # OpenAI fallback client
 
+        # Health-aware routing between home-llm and the OpenAI fallback
+        self.router = ProviderRouter()
+
         self._client = None
 
+        # Async clients, bound to the shared event loop (see src/async_loop.py)
+        self._async_client = None
+        self._async_fallback_client = None
+
     def _get_client(self):
         """Get or create the appropriate client."""
         if self._client is not None:
@@ -161,7 +172,7 @@ class LLMClient:
         from src.config import OPENAI_API_KEY
 
         if not OPENAI_API_KEY:
-            logger.warning("No OpenAI API key available for fallback")
+            logger.debug("No OpenAI API key available for fallback")
             return None
 
         import openai
@@ -169,12 +180,14 @@ class LLMClient:
         self._fallback_client = openai.OpenAI(api_key=OPENAI_API_KEY)
         return self._fallback_client
 
+    @traced("llm")
     def complete(
         self,
         prompt: str,
         system_prompt: str = "",
         max_tokens: int = 1024,
         temperature: float = 0.7,
+        timeout: float | None = None,
     ) -> LLMResponse:
         """
         Generate a completion with automatic fallback.
@@ -187,10 +200,20 @@ class LLMClient:
             system_prompt: System message (optional)
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
+            timeout: If set, run via acomplete() on the shared event loop and
+                     cancel the request when the timeout expires
 
         Returns:
             LLMResponse with content and usage stats
+
+        Raises:
+            TimeoutError: If timeout is set and expires
         """
+        if timeout is not None:
+            return run_sync(
+                self.acomplete(prompt, system_prompt, max_tokens, temperature), timeout=timeout
+            )
+
         client = self._get_client()
 
         if self.provider == "anthropic":
@@ -202,6 +225,39 @@ class LLMClient:
             # OpenAI and local LLMs use the same API
             return self._complete_openai(client, prompt, system_prompt, max_tokens, temperature)
 
+    def _fallback_calls(self, client, call) -> list[ProviderCall]:
+        """
+        Build the ordered provider list for home-llm with OpenAI fallback.
+
+        Args:
+            client: The home-llm client
+            call: Callable taking (client, model) that performs the request
+
+        Returns:
+            Provider calls in priority order (fallback omitted if unconfigured)
+        """
+        from src.config import OPENAI_MODEL
+
+        model = self.model
+        calls = [ProviderCall("home_llm", lambda: call(client, model))]
+
+        fallback_client = self._get_fallback_client()
+        if fallback_client is not None:
+            calls.append(ProviderCall("openai", lambda: call(fallback_client, OPENAI_MODEL)))
+        return calls
+
+    def _route(self, calls: list[ProviderCall]):
+        """Execute provider calls through the router, tracking fallback usage."""
+        result, provider = self.router.execute(calls)
+        if provider != calls[0].name:
+            self.fallback_count += 1
+            logger.info(f"Using OpenAI fallback (count: {self.fallback_count})")
+        return result
+
+    def get_provider_health(self) -> dict:
+        """Get per-provider latency, error rate, and circuit state."""
+        return self.router.get_stats()
+
     def _complete_with_fallback(
         self,
         client,
@@ -213,33 +269,18 @@ class LLMClient:
         """
         Complete using home-llm with automatic OpenAI fallback.
 
-        This method tries the home-llm server first. If it fails (connection error,
-        timeout, or server error), it automatically falls back to OpenAI.
+        Requests are routed by provider health: a home-llm provider with an
+        open circuit is skipped so outages don't cost a full timeout per
+        request, and slow requests may be hedged against OpenAI.
 
         WP-10.8: Enables 95% cost reduction while maintaining reliability.
         """
-        try:
-            return self._complete_openai(client, prompt, system_prompt, max_tokens, temperature)
-        except Exception as exception:
-            logger.warning(f"Home-LLM request failed: {exception}. Attempting OpenAI fallback.")
-
-            # Try OpenAI fallback
-            fallback_client = self._get_fallback_client()
-            if fallback_client is None:
-                logger.error("No OpenAI API key configured for fallback. Raising original error.")
-                raise
-
-            self.fallback_count += 1
-            logger.info(f"Using OpenAI fallback (count: {self.fallback_count})")
+        def call(provider_client, model):
+            return self._complete_openai(
+                provider_client, prompt, system_prompt, max_tokens, temperature, model=model
+            )
 
-            # Use OpenAI with their default model
-            from src.config import OPENAI_MODEL
-            original_model = self.model
-            try:
-                self.model = OPENAI_MODEL
-                return self._complete_openai(fallback_client, prompt, system_prompt, max_tokens, temperature)
-            finally:
-                self.model = original_model
+        return self._route(self._fallback_calls(client, call))
 
     def _complete_openai(
         self,
@@ -248,26 +289,17 @@ class LLMClient:
         system_prompt: str,
         max_tokens: int,
         temperature: float,
+        model: str | None = None,
     ) -> LLMResponse:
         """Complete using OpenAI-compatible API."""
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-
+        model = model or self.model
         response = client.chat.completions.create(
-            model=self.model,
+            model=model,
             max_tokens=max_tokens,
             temperature=temperature,
-            messages=messages,
-        )
-
-        return LLMResponse(
-            content=response.choices[0].message.content or "",
-            input_tokens=getattr(response.usage, "prompt_tokens", 0),
-            output_tokens=getattr(response.usage, "completion_tokens", 0),
-            model=self.model,
+            messages=_build_openai_messages(prompt, system_prompt),
         )
+        return _parse_openai_response(response, model)
 
     def _complete_anthropic(
         self,
@@ -285,20 +317,16 @@ class LLMClient:
             system=system_prompt if system_prompt else None,
             messages=[{"role": "user", "content": prompt}],
         )
+        return _parse_anthropic_response(response, self.model)
 
-        return LLMResponse(
-            content=response.content[0].text,
-            input_tokens=response.usage.input_tokens,
-            output_tokens=response.usage.output_tokens,
-            model=self.model,
-        )
-
+    @traced("llm")
     def complete_with_tools(
         self,
         prompt: str,
         tools: list[dict],
         system_prompt: str = "",
         max_tokens: int = 1024,
+        timeout: float | None = None,
     ) -> tuple[str | None, list[dict]]:
         """
         Generate a completion with tool calling and automatic fallback.
@@ -310,11 +338,22 @@ class LLMClient:
             tools: List of tool definitions (Anthropic format)
             system_prompt: System message
             max_tokens: Maximum tokens
+            timeout: If set, run via acomplete_with_tools() on the shared event
+                     loop and cancel the request when the timeout expires
 
         Returns:
             Tuple of (text_response, tool_calls)
             tool_calls is list of {"name": str, "arguments": dict, "id": str}
+
+        Raises:
+            TimeoutError: If timeout is set and expires
         """
+        if timeout is not None:
+            return run_sync(
+                self.acomplete_with_tools(prompt, tools, system_prompt, max_tokens),
+                timeout=timeout,
+            )
+
         client = self._get_client()
 
         if self.provider == "anthropic":
@@ -342,28 +381,16 @@ class LLMClient:
         """
         Complete with tools using home-llm with automatic OpenAI fallback.
 
+        Shares the provider router (and its health stats) with complete().
+
         WP-10.8: Enables 95% cost reduction while maintaining reliability.
         """
-        try:
-            return self._complete_with_tools_openai(client, prompt, tools, system_prompt, max_tokens)
-        except Exception as exception:
-            logger.warning(f"Home-LLM tools request failed: {exception}. Attempting OpenAI fallback.")
-
-            fallback_client = self._get_fallback_client()
-            if fallback_client is None:
-                logger.error("No OpenAI API key configured for fallback. Raising original error.")
-                raise
-
-            self.fallback_count += 1
-            logger.info(f"Using OpenAI fallback for tools (count: {self.fallback_count})")
+        def call(provider_client, model):
+            return self._complete_with_tools_openai(
+                provider_client, prompt, tools, system_prompt, max_tokens, model=model
+            )
 
-            from src.config import OPENAI_MODEL
-            original_model = self.model
-            try:
-                self.model = OPENAI_MODEL
-                return self._complete_with_tools_openai(fallback_client, prompt, tools, system_prompt, max_tokens)
-            finally:
-                self.model = original_model
+        return self._route(self._fallback_calls(client, call))
 
     def _complete_with_tools_openai(
         self,
@@ -372,50 +399,18 @@ class LLMClient:
         tools: list[dict],
         system_prompt: str,
         max_tokens: int,
+        model: str | None = None,
     ) -> tuple[str | None, list[dict]]:
         """Complete with tools using OpenAI API."""
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-
-        # Convert Anthropic tool format to OpenAI
-        openai_tools = []
-        for tool in tools:
-            openai_tools.append(
-                {
-                    "type": "function",
-                    "function": {
-                        "name": tool["name"],
-                        "description": tool["description"],
-                        "parameters": tool["input_schema"],
-                    },
-                }
-            )
-
+        openai_tools = _convert_tools_to_openai(tools)
         response = client.chat.completions.create(
-            model=self.model,
+            model=model or self.model,
             max_tokens=max_tokens,
-            messages=messages,
+            messages=_build_openai_messages(prompt, system_prompt),
             tools=openai_tools if openai_tools else None,
             tool_choice="auto" if openai_tools else None,
         )
-
-        message = response.choices[0].message
-        text_response = message.content
-
-        tool_calls = []
-        if message.tool_calls:
-            for tc in message.tool_calls:
-                tool_calls.append(
-                    {
-                        "name": tc.function.name,
-                        "arguments": json.loads(tc.function.arguments),
-                        "id": tc.id,
-                    }
-                )
-
-        return text_response, tool_calls
+        return _parse_openai_tool_response(response)
 
     def _complete_with_tools_anthropic(
         self,
@@ -433,23 +428,238 @@ class LLMClient:
             tools=tools,
             messages=[{"role": "user", "content": prompt}],
         )
+        return _parse_anthropic_tool_response(response)
 
-        text_response = None
-        tool_calls = []
-
-        for block in response.content:
-            if block.type == "text":
-                text_response = block.text
-            elif block.type == "tool_use":
-                tool_calls.append(
-                    {
-                        "name": block.name,
-                        "arguments": block.input,
-                        "id": block.id,
-                    }
+    # =========================================================================
+    # Async API
+    #
+    # Async clients keep one connection pool and must always be awaited on the
+    # shared event loop (src/async_loop.py). Sync callers use run_sync() or the
+    # timeout argument of complete()/complete_with_tools().
+    # =========================================================================
+
+    def _get_async_client(self):
+        """Get or create the async client for the configured provider."""
+        if self._async_client is not None:
+            return self._async_client
+
+        if self.provider in ("openai", "local", "home_llm"):
+            import openai
+
+            if self.base_url:
+                self._async_client = openai.AsyncOpenAI(
+                    api_key=self.api_key or "not-needed", base_url=self.base_url
                 )
+            else:
+                self._async_client = openai.AsyncOpenAI(api_key=self.api_key)
+
+        elif self.provider == "anthropic":
+            import anthropic
+
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
+
+        else:
+            raise ValueError(f"Unknown LLM provider: {self.provider}")
 
-        return text_response, tool_calls
+        return self._async_client
+
+    def _get_async_fallback_client(self):
+        """Get or create the async OpenAI fallback client."""
+        if self._async_fallback_client is not None:
+            return self._async_fallback_client
+
+        from src.config import OPENAI_API_KEY
+
+        if not OPENAI_API_KEY:
+            logger.debug("No OpenAI API key available for fallback")
+            return None
+
+        import openai
+
+        self._async_fallback_client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
+        return self._async_fallback_client
+
+    @traced("llm")
+    async def acomplete(
+        self,
+        prompt: str,
+        system_prompt: str = "",
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """
+        Async variant of complete().
+
+        Cancelling the awaiting task aborts the in-flight HTTP request.
+        """
+        client = self._get_async_client()
+
+        if self.provider == "anthropic":
+            response = await client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system_prompt if system_prompt else None,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            return _parse_anthropic_response(response, self.model)
+
+        async def call(provider_client, model):
+            response = await provider_client.chat.completions.create(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                messages=_build_openai_messages(prompt, system_prompt),
+            )
+            return _parse_openai_response(response, model)
+
+        if self.provider == "home_llm":
+            return await self._aroute(self._async_fallback_calls(client, call))
+        return await call(client, self.model)
+
+    @traced("llm")
+    async def acomplete_with_tools(
+        self,
+        prompt: str,
+        tools: list[dict],
+        system_prompt: str = "",
+        max_tokens: int = 1024,
+    ) -> tuple[str | None, list[dict]]:
+        """
+        Async variant of complete_with_tools().
+
+        Cancelling the awaiting task aborts the in-flight HTTP request.
+        """
+        client = self._get_async_client()
+
+        if self.provider == "anthropic":
+            response = await client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens,
+                system=system_prompt if system_prompt else None,
+                tools=tools,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            return _parse_anthropic_tool_response(response)
+
+        openai_tools = _convert_tools_to_openai(tools)
+
+        async def call(provider_client, model):
+            response = await provider_client.chat.completions.create(
+                model=model,
+                max_tokens=max_tokens,
+                messages=_build_openai_messages(prompt, system_prompt),
+                tools=openai_tools if openai_tools else None,
+                tool_choice="auto" if openai_tools else None,
+            )
+            return _parse_openai_tool_response(response)
+
+        if self.provider == "home_llm":
+            return await self._aroute(self._async_fallback_calls(client, call))
+        return await call(client, self.model)
+
+    def _async_fallback_calls(self, client, call) -> list[ProviderCall]:
+        """Async counterpart of _fallback_calls()."""
+        from src.config import OPENAI_MODEL
+
+        model = self.model
+        calls = [ProviderCall("home_llm", lambda: call(client, model))]
+
+        fallback_client = self._get_async_fallback_client()
+        if fallback_client is not None:
+            calls.append(ProviderCall("openai", lambda: call(fallback_client, OPENAI_MODEL)))
+        return calls
+
+    async def _aroute(self, calls: list[ProviderCall]):
+        """Async counterpart of _route()."""
+        result, provider = await self.router.aexecute(calls)
+        if provider != calls[0].name:
+            self.fallback_count += 1
+            logger.info(f"Using OpenAI fallback (count: {self.fallback_count})")
+        return result
+
+
+# =============================================================================
+# Request/response helpers shared by the sync and async paths
+# =============================================================================
+
+
+def _build_openai_messages(prompt: str, system_prompt: str) -> list[dict]:
+    """Build an OpenAI chat message list."""
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+def _convert_tools_to_openai(tools: list[dict]) -> list[dict]:
+    """Convert Anthropic tool format to OpenAI function format."""
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": tool["name"],
+                "description": tool["description"],
+                "parameters": tool["input_schema"],
+            },
+        }
+        for tool in tools
+    ]
+
+
+def _parse_openai_response(response, model: str) -> LLMResponse:
+    """Convert an OpenAI chat completion into an LLMResponse."""
+    return LLMResponse(
+        content=response.choices[0].message.content or "",
+        input_tokens=getattr(response.usage, "prompt_tokens", 0),
+        output_tokens=getattr(response.usage, "completion_tokens", 0),
+        model=model,
+    )
+
+
+def _parse_anthropic_response(response, model: str) -> LLMResponse:
+    """Convert an Anthropic message into an LLMResponse."""
+    return LLMResponse(
+        content=response.content[0].text,
+        input_tokens=response.usage.input_tokens,
+        output_tokens=response.usage.output_tokens,
+        model=model,
+    )
+
+
+def _parse_openai_tool_response(response) -> tuple[str | None, list[dict]]:
+    """Extract text and tool calls from an OpenAI chat completion."""
+    message = response.choices[0].message
+    tool_calls = []
+    if message.tool_calls:
+        for tc in message.tool_calls:
+            tool_calls.append(
+                {
+                    "name": tc.function.name,
+                    "arguments": json.loads(tc.function.arguments),
+                    "id": tc.id,
+                }
+            )
+    return message.content, tool_calls
+
+
+def _parse_anthropic_tool_response(response) -> tuple[str | None, list[dict]]:
+    """Extract text and tool calls from an Anthropic message."""
+    text_response = None
+    tool_calls = []
+    for block in response.content:
+        if block.type == "text":
+            text_response = block.text
+        elif block.type == "tool_use":
+            tool_calls.append(
+                {
+                    "name": block.name,
+                    "arguments": block.input,
+                    "id": block.id,
+                }
+            )
+    return text_response, tool_calls
 
 
 # Singleton instance
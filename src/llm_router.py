@@ -0,0 +1,506 @@
+"""
+Smart Home Assistant - LLM Provider Router
+
+Health-aware routing between LLM providers (home-llm, OpenAI).
+
+Keeps rolling latency and error statistics per provider, trips a circuit
+breaker on a provider that keeps failing, and optionally hedges a slow
+primary request by sending a second request to the next provider once the
+primary exceeds its p95 latency budget. The first successful response wins.
+
+Without the router, every home-llm outage costs the full request timeout on
+each call before OpenAI is tried. With it, an open circuit sends traffic
+straight to the healthy provider until the cooldown expires and a single
+probe request confirms recovery.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+# Rolling window of recent calls used for latency/error statistics
+STATS_WINDOW_SIZE = 50
+
+# Circuit breaker
+CIRCUIT_FAILURE_THRESHOLD = 3  # Trip after 3 consecutive failures
+CIRCUIT_COOLDOWN_SECONDS = 30.0  # Wait before sending a probe request
+
+# Hedging
+HEDGE_MIN_SAMPLES = 10  # Successful samples needed before p95 is trusted
+HEDGE_DEFAULT_BUDGET_SECONDS = 5.0  # Budget used until p95 is known
+HEDGE_MIN_BUDGET_SECONDS = 0.5  # Never hedge faster than this
+HEDGE_MAX_WORKERS = 8
+
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"  # Normal operation
+    OPEN = "open"  # Provider skipped until cooldown expires
+    HALF_OPEN = "half_open"  # One probe request allowed through
+
+
+@dataclass
+class ProviderCall:
+    """
+    A provider name paired with the callable that performs the request.
+
+    For ProviderRouter.aexecute() the callable returns an awaitable.
+    """
+
+    name: str
+    call: Callable[[], Any]
+
+
+class ProviderHealth:
+    """
+    Rolling health statistics and circuit breaker for a single provider.
+
+    Thread-safe: hedged requests record results from worker threads.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = STATS_WINDOW_SIZE,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown_seconds: float = CIRCUIT_COOLDOWN_SECONDS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+
+        self._lock = threading.Lock()
+        self._samples: deque[tuple[float, bool]] = deque(maxlen=window_size)
+        self._consecutive_failures = 0
+        self._circuit_state = CircuitState.CLOSED
+        self._circuit_opened_at: float | None = None
+        self._probe_in_flight = False
+        self.total_requests = 0
+        self.total_failures = 0
+
+    @property
+    def circuit_state(self) -> str:
+        """Current circuit state as string (cooldown-aware)."""
+        with self._lock:
+            self._refresh_circuit()
+            return self._circuit_state.value
+
+    def _refresh_circuit(self) -> None:
+        """Move OPEN -> HALF_OPEN once the cooldown has elapsed. Lock held."""
+        if (
+            self._circuit_state == CircuitState.OPEN
+            and self._circuit_opened_at is not None
+            and time.monotonic() - self._circuit_opened_at >= self.cooldown_seconds
+        ):
+            self._circuit_state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+            logger.info(f"LLM provider '{self.name}' circuit half-open, allowing probe")
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent to this provider.
+
+        In HALF_OPEN state only a single probe request is allowed until its
+        result is recorded.
+        """
+        with self._lock:
+            self._refresh_circuit()
+            if self._circuit_state == CircuitState.CLOSED:
+                return True
+            if self._circuit_state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def is_available(self) -> bool:
+        """Whether allow_request() would let a request through (reserves nothing)."""
+        with self._lock:
+            self._refresh_circuit()
+            return self._circuit_state == CircuitState.CLOSED or (
+                self._circuit_state == CircuitState.HALF_OPEN and not self._probe_in_flight
+            )
+
+    def release_probe(self) -> None:
+        """Release a HALF_OPEN probe slot without recording an outcome (cancelled call)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful call and close the circuit."""
+        with self._lock:
+            self._samples.append((latency, True))
+            self.total_requests += 1
+            self._consecutive_failures = 0
+            if self._circuit_state != CircuitState.CLOSED:
+                logger.info(f"LLM provider '{self.name}' recovered, closing circuit")
+            self._circuit_state = CircuitState.CLOSED
+            self._circuit_opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self, latency: float) -> None:
+        """Record a failed call, opening the circuit past the threshold."""
+        with self._lock:
+            self._samples.append((latency, False))
+            self.total_requests += 1
+            self.total_failures += 1
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+
+            should_open = (
+                self._circuit_state == CircuitState.HALF_OPEN
+                or self._consecutive_failures >= self.failure_threshold
+            )
+            if should_open and self._circuit_state != CircuitState.OPEN:
+                logger.warning(
+                    f"LLM provider '{self.name}' circuit opened after "
+                    f"{self._consecutive_failures} consecutive failures"
+                )
+            if should_open:
+                self._circuit_state = CircuitState.OPEN
+                self._circuit_opened_at = time.monotonic()
+
+    def p95_latency(self, min_samples: int = HEDGE_MIN_SAMPLES) -> float | None:
+        """
+        Get the 95th percentile latency of recent successful calls.
+
+        Returns:
+            Latency in seconds, or None if fewer than min_samples successes
+        """
+        with self._lock:
+            latencies = sorted(latency for latency, ok in self._samples if ok)
+        if len(latencies) < max(min_samples, 1):
+            return None
+        index = min(len(latencies) - 1, int(round(0.95 * (len(latencies) - 1))))
+        return latencies[index]
+
+    def error_rate(self) -> float:
+        """Get the error rate over the rolling window (0.0-1.0)."""
+        with self._lock:
+            if not self._samples:
+                return 0.0
+            failures = sum(1 for _, ok in self._samples if not ok)
+            return failures / len(self._samples)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for health/metrics reporting."""
+        p95 = self.p95_latency(min_samples=1)
+        return {
+            "name": self.name,
+            "circuit_state": self.circuit_state,
+            "error_rate": round(self.error_rate(), 3),
+            "p95_latency_ms": int(p95 * 1000) if p95 is not None else None,
+            "total_requests": self.total_requests,
+            "total_failures": self.total_failures,
+        }
+
+
+class ProviderRouter:
+    """
+    Routes a request across an ordered list of providers.
+
+    Providers are tried in priority order, skipping any whose circuit is
+    open. When hedging is enabled, a second request is sent to the next
+    provider if the first has not answered within its p95 budget.
+    """
+
+    def __init__(
+        self,
+        hedge_enabled: bool | None = None,
+        hedge_default_budget: float | None = None,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown_seconds: float = CIRCUIT_COOLDOWN_SECONDS,
+    ):
+        if hedge_enabled is None:
+            hedge_enabled = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+        if hedge_default_budget is None:
+            hedge_default_budget = float(
+                os.getenv("LLM_HEDGE_BUDGET_SECONDS", str(HEDGE_DEFAULT_BUDGET_SECONDS))
+            )
+
+        self.hedge_enabled = hedge_enabled
+        self.hedge_default_budget = hedge_default_budget
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.hedge_count = 0
+
+        self._providers: dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def get_health(self, name: str) -> ProviderHealth:
+        """Get (or create) the health tracker for a provider."""
+        with self._lock:
+            health = self._providers.get(name)
+            if health is None:
+                health = ProviderHealth(
+                    name,
+                    failure_threshold=self.failure_threshold,
+                    cooldown_seconds=self.cooldown_seconds,
+                )
+                self._providers[name] = health
+            return health
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get routing statistics for all known providers."""
+        with self._lock:
+            providers = list(self._providers.values())
+        return {
+            "hedge_enabled": self.hedge_enabled,
+            "hedge_count": self.hedge_count,
+            "providers": {health.name: health.to_dict() for health in providers},
+        }
+
+    def hedge_budget(self, name: str) -> float:
+        """Seconds to wait on a provider before sending a hedged request."""
+        p95 = self.get_health(name).p95_latency()
+        if p95 is None:
+            return self.hedge_default_budget
+        return max(p95, HEDGE_MIN_BUDGET_SECONDS)
+
+    def _select_candidates(self, calls: list[ProviderCall]) -> tuple[list[ProviderCall], bool]:
+        """
+        Filter calls to providers whose circuit allows a request.
+
+        Nothing is reserved here: a HALF_OPEN provider's probe slot is only
+        taken by _reserve() right before that provider is called, so a
+        fallback that is never needed does not hold it.
+
+        Returns:
+            Tuple of (candidates, forced), forced meaning every circuit is
+            open and the primary is tried regardless
+        """
+        if not calls:
+            raise ValueError("No LLM providers configured")
+
+        candidates = [call for call in calls if self.get_health(call.name).is_available()]
+        if not candidates:
+            # Every circuit is open - still try the primary rather than failing outright
+            logger.warning("All LLM provider circuits open, trying primary provider anyway")
+            return [calls[0]], True
+        return candidates, False
+
+    def _reserve(
+        self, remaining: list[ProviderCall], forced: bool, first: bool = False
+    ) -> ProviderCall | None:
+        """
+        Pop the next candidate whose circuit lets a request through now.
+
+        Args:
+            remaining: Candidates not yet tried (consumed from the front)
+            forced: Skip circuit checks (every circuit was open)
+            first: This is the request's first call; if another request
+                took the last probe slot meanwhile, the first candidate is
+                tried regardless, as when every circuit is open
+
+        Returns:
+            The call to make, or None if no candidate is left
+        """
+        fallback = remaining[0] if first and remaining else None
+        while remaining:
+            provider_call = remaining.pop(0)
+            if forced or self.get_health(provider_call.name).allow_request():
+                return provider_call
+        return fallback
+
+    def execute(self, calls: list[ProviderCall]) -> tuple[Any, str]:
+        """
+        Execute a request against the healthiest available provider.
+
+        Args:
+            calls: Provider calls in priority order
+
+        Returns:
+            Tuple of (result, name of the provider that served it)
+
+        Raises:
+            The last provider error if every provider failed
+        """
+        candidates, forced = self._select_candidates(calls)
+        if self.hedge_enabled and len(candidates) > 1:
+            return self._execute_hedged(candidates, forced)
+        return self._execute_sequential(candidates, forced)
+
+    def _timed_call(self, provider_call: ProviderCall) -> Any:
+        """Run a provider call, recording latency and outcome."""
+        health = self.get_health(provider_call.name)
+        start_time = time.monotonic()
+        try:
+            result = provider_call.call()
+        except Exception:
+            health.record_failure(time.monotonic() - start_time)
+            raise
+        health.record_success(time.monotonic() - start_time)
+        return result
+
+    def _execute_sequential(
+        self, candidates: list[ProviderCall], forced: bool
+    ) -> tuple[Any, str]:
+        """Try each candidate in order until one succeeds."""
+        remaining = list(candidates)
+        provider_call = self._reserve(remaining, forced, first=True)
+        while True:
+            try:
+                return self._timed_call(provider_call), provider_call.name
+            except Exception as error:
+                next_call = self._reserve(remaining, forced)
+                if next_call is None:
+                    raise
+                logger.warning(
+                    f"LLM provider '{provider_call.name}' failed: {error}. "
+                    f"Trying '{next_call.name}'."
+                )
+                provider_call = next_call
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the shared executor used for hedged requests."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="llm-hedge"
+                )
+            return self._executor
+
+    def _execute_hedged(
+        self, candidates: list[ProviderCall], forced: bool
+    ) -> tuple[Any, str]:
+        """
+        Race the primary against the next provider once the budget expires.
+
+        A failed request immediately starts the next candidate instead of
+        waiting for the budget. The losing request keeps running in the
+        background so its latency is still recorded.
+        """
+        executor = self._get_executor()
+        pending: dict[Future, str] = {}
+        remaining = list(candidates)
+        last_error: Exception | None = None
+
+        def launch_next(first: bool = False) -> ProviderCall | None:
+            provider_call = self._reserve(remaining, forced, first)
+            if provider_call is not None:
+                future = executor.submit(self._timed_call, provider_call)
+                pending[future] = provider_call.name
+            return provider_call
+
+        launch_next(first=True)
+        while pending:
+            primary_name = next(iter(pending.values()))
+            timeout = self.hedge_budget(primary_name) if remaining else None
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                hedged = launch_next()
+                if hedged is not None:
+                    self.hedge_count += 1
+                    logger.info(
+                        f"LLM provider '{primary_name}' exceeded {timeout:.2f}s budget, "
+                        f"hedging with '{hedged.name}'"
+                    )
+                continue
+
+            for future in done:
+                name = pending.pop(future)
+                error = future.exception()
+                if error is None:
+                    return future.result(), name
+                last_error = error
+                logger.warning(f"LLM provider '{name}' failed: {error}")
+
+            if not pending and remaining:
+                launch_next()
+
+        raise last_error
+
+    async def aexecute(self, calls: list[ProviderCall]) -> tuple[Any, str]:
+        """
+        Async variant of execute() for calls that return awaitables.
+
+        Hedging races asyncio tasks, and the losing request is cancelled
+        (aborting its HTTP request) as soon as a winner is found.
+
+        Args:
+            calls: Provider calls in priority order
+
+        Returns:
+            Tuple of (result, name of the provider that served it)
+        """
+        candidates, forced = self._select_candidates(calls)
+        hedge = self.hedge_enabled and len(candidates) > 1
+        pending: dict[asyncio.Task, str] = {}
+        remaining = list(candidates)
+        last_error: Exception | None = None
+
+        def launch_next(first: bool = False) -> ProviderCall | None:
+            provider_call = self._reserve(remaining, forced, first)
+            if provider_call is not None:
+                task = asyncio.ensure_future(self._atimed_call(provider_call))
+                pending[task] = provider_call.name
+            return provider_call
+
+        launch_next(first=True)
+        try:
+            while pending:
+                primary_name = next(iter(pending.values()))
+                timeout = self.hedge_budget(primary_name) if hedge and remaining else None
+                done, _ = await asyncio.wait(
+                    list(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    hedged = launch_next()
+                    if hedged is not None:
+                        self.hedge_count += 1
+                        logger.info(
+                            f"LLM provider '{primary_name}' exceeded {timeout:.2f}s budget, "
+                            f"hedging with '{hedged.name}'"
+                        )
+                    continue
+
+                for task in done:
+                    name = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        return task.result(), name
+                    last_error = error
+                    logger.warning(f"LLM provider '{name}' failed: {error}")
+
+                if not pending and remaining:
+                    launch_next()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise last_error
+
+    async def _atimed_call(self, provider_call: ProviderCall) -> Any:
+        """Await a provider call, recording latency and outcome (not cancellation)."""
+        health = self.get_health(provider_call.name)
+        start_time = time.monotonic()
+        try:
+            result = await provider_call.call()
+        except asyncio.CancelledError:
+            health.release_probe()
+            raise
+        except Exception:
+            health.record_failure(time.monotonic() - start_time)
+            raise
+        health.record_success(time.monotonic() - start_time)
+        return result
@@ -176,6 +176,30 @@ class LocationManager:
         resolved = self.resolve_room_alias(room_name)
         return resolved in ROOM_ENTITY_MAP
 
+    def get_room_entities(self, room_name: str) -> list[str]:
+        """
+        Get the light, blind and media entity IDs configured for a room.
+
+        Args:
+            room_name: Room name or alias
+
+        Returns:
+            List of entity IDs (empty if room not found)
+        """
+        room_config = ROOM_ENTITY_MAP.get(self.resolve_room_alias(room_name))
+        if not room_config:
+            return []
+
+        entity_ids = list(room_config.get("lights", []))
+        for device_type in ("blinds", "media"):
+            configured = room_config.get(device_type)
+            if isinstance(configured, str):
+                entity_ids.append(configured)
+            elif configured:
+                entity_ids.extend(configured)
+
+        return list(dict.fromkeys(entity_ids))
+
     # ========== Voice Puck Management ==========
 
     def register_voice_puck(
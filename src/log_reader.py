@@ -3,11 +3,19 @@ Smart Home Assistant - Log Reader Module
 
 Provides utilities for reading, parsing, filtering, and exporting log files.
 Supports pagination, search, real-time tailing, and statistics.
+
+export_stream() yields an export in chunks while reading the file line by
+line, so exports of large logs don't build the whole result in memory.
+NDJSON and CSV exports carry a cursor per entry ("byte offset:line number")
+that resumes the export after that entry.
 """
 
+import csv
 import fnmatch
+import io
 import json
 import re
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -17,6 +25,36 @@ from typing import Optional
 from src.config import LOGS_DIR
 
 
+# Formats supported by LogReader.export_stream()
+EXPORT_FORMATS = ("json", "ndjson", "csv", "text")
+
+# Entries written per chunk when streaming an export
+EXPORT_CHUNK_ENTRIES = 500
+
+CSV_COLUMNS = ["timestamp", "level", "module", "function", "message", "line_number", "_cursor"]
+
+
+def parse_log_cursor(cursor: str | None) -> tuple[int, int]:
+    """
+    Parse a log export cursor of the form "offset:line_number".
+
+    Args:
+        cursor: Cursor from a previously streamed entry, or None
+
+    Returns:
+        (byte offset to resume at, line number of the entry before it)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return 0, 0
+    offset, _, line_number = cursor.partition(":")
+    if not offset.isdigit() or not line_number.isdigit():
+        raise ValueError(f"Invalid log cursor: {cursor!r}")
+    return int(offset), int(line_number)
+
+
 class LogLevel(Enum):
     """Log severity levels with associated severity values."""
 
@@ -223,43 +261,23 @@ class LogReader:
         if not file_path.exists():
             return []
 
-        entries: list[LogEntry] = []
-        compiled_regex = None
-        if search_regex:
-            compiled_regex = re.compile(search_regex, re.IGNORECASE)
+        matches = self._entry_filter(
+            min_level=min_level,
+            levels=levels,
+            start_time=start_time,
+            end_time=end_time,
+            module=module,
+            module_pattern=module_pattern,
+            search=search,
+            search_regex=search_regex,
+        )
 
+        entries: list[LogEntry] = []
         with open(file_path, encoding="utf-8", errors="replace") as file:
             for line_num, line in enumerate(file, start=1):
                 entry = self.parse_log_line(line, line_number=line_num)
-                if entry is None:
-                    continue
-
-                # Apply filters
-                if min_level and entry.level.severity < min_level.severity:
-                    continue
-
-                if levels and entry.level not in levels:
-                    continue
-
-                if start_time and entry.timestamp < start_time:
-                    continue
-
-                if end_time and entry.timestamp > end_time:
-                    continue
-
-                if module and entry.module != module:
-                    continue
-
-                if module_pattern and not fnmatch.fnmatch(entry.module, module_pattern):
-                    continue
-
-                if search and search.lower() not in entry.message.lower():
-                    continue
-
-                if compiled_regex and not compiled_regex.search(entry.message):
-                    continue
-
-                entries.append(entry)
+                if entry is not None and matches(entry):
+                    entries.append(entry)
 
         # Sort by timestamp
         entries.sort(key=lambda e: e.timestamp, reverse=reverse)
@@ -272,6 +290,42 @@ class LogReader:
 
         return entries
 
+    def _entry_filter(
+        self,
+        min_level: LogLevel | None = None,
+        levels: list[LogLevel] | None = None,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+        module: str | None = None,
+        module_pattern: str | None = None,
+        search: str | None = None,
+        search_regex: str | None = None,
+    ) -> Callable[[LogEntry], bool]:
+        """Build a predicate applying read()'s filters to one entry."""
+        compiled_regex = re.compile(search_regex, re.IGNORECASE) if search_regex else None
+        search_lower = search.lower() if search else None
+
+        def matches(entry: LogEntry) -> bool:
+            if min_level and entry.level.severity < min_level.severity:
+                return False
+            if levels and entry.level not in levels:
+                return False
+            if start_time and entry.timestamp < start_time:
+                return False
+            if end_time and entry.timestamp > end_time:
+                return False
+            if module and entry.module != module:
+                return False
+            if module_pattern and not fnmatch.fnmatch(entry.module, module_pattern):
+                return False
+            if search_lower and search_lower not in entry.message.lower():
+                return False
+            if compiled_regex and not compiled_regex.search(entry.message):
+                return False
+            return True
+
+        return matches
+
     def get_stats(self, file_path: Path | None = None) -> dict:
         """
         Get statistics for a log file.
@@ -333,14 +387,153 @@ class LogReader:
                 indent=2,
             )
         else:  # text format
-            lines = []
-            for entry in entries:
-                lines.append(
-                    f"{entry.timestamp.strftime('%Y-%m-%d %H:%M:%S,%f')[:-3]} | "
-                    f"{entry.level.value:8} | {entry.module:25} | "
-                    f"{entry.function:20} | {entry.message}"
+            return "\n".join(self._format_text(entry) for entry in entries)
+
+    def export_stream(
+        self,
+        file_path: Path | None = None,
+        format: str = "ndjson",
+        cursor: str | None = None,
+        **filter_kwargs,
+    ) -> Iterator[str]:
+        """
+        Export log entries as a stream of text chunks.
+
+        The file is read once, line by line, in file order. Formats:
+        - json: the same document as export(), {"entries": [...], "stats": {...}}
+        - ndjson: {"type": "entry", "cursor": ..., "entry": {...}} per entry,
+          then {"type": "end", "stats": {...}}
+        - csv: CSV_COLUMNS header, then one row per entry
+        - text: one pipe-separated line per entry
+
+        Stats cover every entry read (before filtering), like get_stats().
+
+        Args:
+            file_path: Path to log file. Defaults to main log.
+            format: One of EXPORT_FORMATS
+            cursor: Cursor of the last entry already received; reading
+                resumes after it
+            **filter_kwargs: Filter arguments as for read() (no pagination)
+
+        Yields:
+            Chunks of the export
+
+        Raises:
+            ValueError: If the format or cursor is invalid (raised before
+                the first chunk)
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format!r}")
+        position, line_number = parse_log_cursor(cursor)
+        matches = self._entry_filter(**filter_kwargs)
+
+        if file_path is None:
+            main_files = self.list_log_files(log_type="main")
+            file_path = main_files[0] if main_files else None
+
+        return self._stream_export(file_path, format, position, line_number, matches)
+
+    def _stream_export(
+        self,
+        file_path: Path | None,
+        format: str,
+        position: int,
+        line_number: int,
+        matches: Callable[[LogEntry], bool],
+    ) -> Iterator[str]:
+        level_counts = {level.value: 0 for level in LogLevel}
+        first_entry = last_entry = None
+        csv_output = io.StringIO()
+        csv_writer = csv.writer(csv_output)
+
+        if format == "json":
+            yield '{"entries": ['
+        elif format == "csv":
+            csv_writer.writerow(CSV_COLUMNS)
+
+        chunk: list[str] = []
+        separator = ""
+        for entry, entry_cursor in self._iter_entries(file_path, position, line_number):
+            level_counts[entry.level.value] += 1
+            first_entry = min(first_entry or entry.timestamp, entry.timestamp)
+            last_entry = max(last_entry or entry.timestamp, entry.timestamp)
+            if not matches(entry):
+                continue
+
+            if format == "json":
+                chunk.append(separator + json.dumps(entry.to_dict()))
+                separator = ", "
+            elif format == "ndjson":
+                chunk.append(
+                    json.dumps({"type": "entry", "cursor": entry_cursor, "entry": entry.to_dict()})
+                    + "\n"
                 )
-            return "\n".join(lines)
+            elif format == "csv":
+                entry_dict = entry.to_dict()
+                csv_writer.writerow([*entry_dict.values(), entry_cursor])
+            else:
+                chunk.append(self._format_text(entry) + "\n")
+
+            if len(chunk) >= EXPORT_CHUNK_ENTRIES or csv_output.tell() >= 64 * 1024:
+                yield self._flush_chunk(chunk, csv_output)
+
+        tail = self._flush_chunk(chunk, csv_output)
+        if tail:
+            yield tail
+
+        stats = {
+            "total_entries": sum(level_counts.values()),
+            "level_counts": level_counts,
+            "first_entry": first_entry.isoformat() if first_entry else None,
+            "last_entry": last_entry.isoformat() if last_entry else None,
+        }
+        if format == "json":
+            yield '], "stats": ' + json.dumps(stats) + "}"
+        elif format == "ndjson":
+            yield json.dumps({"type": "end", "stats": stats}) + "\n"
+
+    def _iter_entries(
+        self,
+        file_path: Path | None,
+        position: int = 0,
+        line_number: int = 0,
+    ) -> Iterator[tuple[LogEntry, str]]:
+        """
+        Parse a log file from a byte position.
+
+        Yields:
+            (entry, cursor) pairs, the cursor pointing just past the entry
+        """
+        if file_path is None or not file_path.exists():
+            return
+
+        with open(file_path, "rb") as file:
+            file.seek(position)
+            for raw_line in file:
+                position += len(raw_line)
+                line_number += 1
+                line = raw_line.decode("utf-8", errors="replace")
+                entry = self.parse_log_line(line, line_number=line_number)
+                if entry is not None:
+                    yield entry, f"{position}:{line_number}"
+
+    @staticmethod
+    def _flush_chunk(chunk: list[str], csv_output: io.StringIO) -> str:
+        """Join and clear buffered export text."""
+        text = "".join(chunk) + csv_output.getvalue()
+        chunk.clear()
+        csv_output.seek(0)
+        csv_output.truncate()
+        return text
+
+    @staticmethod
+    def _format_text(entry: LogEntry) -> str:
+        """Format an entry as a pipe-separated text line."""
+        return (
+            f"{entry.timestamp.strftime('%Y-%m-%d %H:%M:%S,%f')[:-3]} | "
+            f"{entry.level.value:8} | {entry.module:25} | "
+            f"{entry.function:20} | {entry.message}"
+        )
 
     def tail(
         self,
@@ -395,27 +588,33 @@ class LogReader:
         self,
         file_path: Path,
         position: int,
-    ) -> list[LogEntry]:
+    ) -> tuple[list[LogEntry], int]:
         """
         Read new entries from a given file position.
 
+        Stops after the last complete line, so a line still being written
+        is left for the next read.
+
         Args:
             file_path: Path to log file
             position: File position to read from
 
         Returns:
-            List of new LogEntry objects
+            Tuple of (new entries, file position after the last complete line)
         """
         if not file_path.exists():
-            return []
+            return [], position
 
         entries: list[LogEntry] = []
 
-        with open(file_path, encoding="utf-8", errors="replace") as file:
+        with open(file_path, "rb") as file:
             file.seek(position)
-            for line in file:
-                entry = self.parse_log_line(line)
+            for raw_line in file:
+                if not raw_line.endswith(b"\n"):
+                    break
+                position += len(raw_line)
+                entry = self.parse_log_line(raw_line.decode("utf-8", errors="replace"))
                 if entry:
                     entries.append(entry)
 
-        return entries
+        return entries, position
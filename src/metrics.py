@@ -8,6 +8,7 @@ Metrics exposed:
 - API usage (tokens, cost, requests)
 - Component health status
 - Cache performance
+- Per-request time by component (LLM, Home Assistant, SQLite, tools)
 
 Usage:
     from src.metrics import init_metrics, track_request_duration, track_api_cost
@@ -22,6 +23,7 @@ Usage:
     track_api_cost("claude-sonnet", 0.05)
 """
 
+import os
 import time
 import logging
 from functools import wraps
@@ -42,6 +44,10 @@ logger = logging.getLogger(__name__)
 # Metric prefix for namespacing
 METRIC_PREFIX = "smarthome"
 
+# Gauges declare how per-worker values combine when the server runs with
+# several worker processes (PROMETHEUS_MULTIPROC_DIR, see src/web_server.py);
+# the mode is ignored in a single process
+
 # =============================================================================
 # Prometheus Metrics Definitions
 # =============================================================================
@@ -88,6 +94,7 @@ API_REQUESTS_TOTAL = Counter(
 DAILY_COST_USD = Gauge(
     f"{METRIC_PREFIX}_daily_cost_usd",
     "Current day API cost in USD",
+    multiprocess_mode="mostrecent",
 )
 
 # Health metrics
@@ -95,12 +102,14 @@ COMPONENT_HEALTH = Gauge(
     f"{METRIC_PREFIX}_component_health",
     "Component health status (1=healthy, 0=unhealthy)",
     ["component"],
+    multiprocess_mode="mostrecent",
 )
 
 COMPONENT_LATENCY_MS = Gauge(
     f"{METRIC_PREFIX}_component_latency_ms",
     "Component response latency in milliseconds",
     ["component"],
+    multiprocess_mode="mostrecent",
 )
 
 HOME_ASSISTANT_RESPONSE_MS = Histogram(
@@ -113,16 +122,74 @@ HOME_ASSISTANT_RESPONSE_MS = Histogram(
 CACHE_HIT_RATE = Gauge(
     f"{METRIC_PREFIX}_cache_hit_rate",
     "Cache hit rate (0.0-1.0)",
+    multiprocess_mode="livemostrecent",
 )
 
 CACHE_SIZE = Gauge(
     f"{METRIC_PREFIX}_cache_size",
     "Current cache size (entries)",
+    multiprocess_mode="livesum",
 )
 
 CACHE_CAPACITY_RATIO = Gauge(
     f"{METRIC_PREFIX}_cache_capacity_ratio",
     "Cache capacity utilization ratio (0.0-1.0)",
+    multiprocess_mode="livemax",
+)
+
+# Voice worker pool metrics
+VOICE_POOL_QUEUE_DEPTH = Gauge(
+    f"{METRIC_PREFIX}_voice_pool_queue_depth",
+    "Voice commands waiting for a worker",
+    multiprocess_mode="livesum",
+)
+
+VOICE_POOL_ACTIVE_WORKERS = Gauge(
+    f"{METRIC_PREFIX}_voice_pool_active_workers",
+    "Voice commands currently executing",
+    multiprocess_mode="livesum",
+)
+
+VOICE_POOL_REJECTED_TOTAL = Counter(
+    f"{METRIC_PREFIX}_voice_pool_rejected_total",
+    "Voice commands rejected because the queue was full",
+)
+
+# Speculative state prefetch metrics
+STATE_PREFETCH_TOTAL = Counter(
+    f"{METRIC_PREFIX}_state_prefetch_total",
+    "Speculatively prefetched entity states by outcome",
+    ["outcome"],  # issued, used, wasted
+)
+
+# Database metrics
+DB_QUERY_DURATION = Histogram(
+    f"{METRIC_PREFIX}_db_query_duration_seconds",
+    "SQLite read query duration in seconds",
+    ["statement"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+
+# Request breakdown metrics (see src/tracing.py)
+REQUEST_COMPONENT_DURATION = Histogram(
+    f"{METRIC_PREFIX}_request_component_seconds",
+    "Time spent per component within an HTTP request, excluding nested components",
+    ["endpoint", "component"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+# Response compression metrics (see src/compression.py)
+RESPONSE_COMPRESSION_RATIO = Histogram(
+    f"{METRIC_PREFIX}_response_compression_ratio",
+    "Compressed size divided by original size of compressed responses",
+    ["encoding"],
+    buckets=(0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.7, 0.9, 1.0),
+)
+
+RESPONSE_BYTES_SAVED_TOTAL = Counter(
+    f"{METRIC_PREFIX}_response_bytes_saved_total",
+    "Response body bytes saved by compression or 304 Not Modified",
+    ["endpoint", "reason"],  # reason: gzip, br, not_modified
 )
 
 # =============================================================================
@@ -260,6 +327,85 @@ def update_cache_metrics(
     CACHE_CAPACITY_RATIO.set(capacity_ratio)
 
 
+def update_voice_pool_metrics(queue_depth: int, active_workers: int) -> None:
+    """
+    Update voice worker pool gauges.
+
+    Args:
+        queue_depth: Commands waiting for a worker
+        active_workers: Commands currently executing
+    """
+    VOICE_POOL_QUEUE_DEPTH.set(queue_depth)
+    VOICE_POOL_ACTIVE_WORKERS.set(active_workers)
+
+
+def track_voice_pool_rejection() -> None:
+    """Count a voice command rejected because the pool queue was full."""
+    VOICE_POOL_REJECTED_TOTAL.inc()
+
+
+def track_state_prefetch(outcome: str, count: int = 1) -> None:
+    """
+    Count prefetched entity states.
+
+    Args:
+        outcome: "issued" (fetched ahead), "used" (later read via get_state),
+                 or "wasted" (never read before the tracking window closed)
+        count: Number of states
+    """
+    if count > 0:
+        STATE_PREFETCH_TOTAL.labels(outcome=outcome).inc(count)
+
+
+def track_db_query(statement: str, duration_seconds: float) -> None:
+    """
+    Record a database query's latency.
+
+    Args:
+        statement: Stable query name (e.g. "get_all_devices")
+        duration_seconds: Time spent executing and fetching
+    """
+    DB_QUERY_DURATION.labels(statement=statement).observe(duration_seconds)
+
+
+def track_request_components(endpoint: str, component_seconds: dict[str, float]) -> None:
+    """
+    Record how a request's time was split between components.
+
+    Args:
+        endpoint: Normalized request path
+        component_seconds: Exclusive seconds per component ("llm",
+            "home_assistant", "database", "tool", "app")
+    """
+    for component, seconds in component_seconds.items():
+        REQUEST_COMPONENT_DURATION.labels(endpoint=endpoint, component=component).observe(seconds)
+
+
+def track_response_compression(
+    endpoint: str, encoding: str, original_bytes: int, compressed_bytes: int
+) -> None:
+    """
+    Record a compressed response.
+
+    Args:
+        endpoint: Normalized request path
+        encoding: Content-Encoding used ("gzip" or "br")
+        original_bytes: Body size before compression
+        compressed_bytes: Body size sent
+    """
+    RESPONSE_COMPRESSION_RATIO.labels(encoding=encoding).observe(
+        compressed_bytes / original_bytes
+    )
+    RESPONSE_BYTES_SAVED_TOTAL.labels(endpoint=endpoint, reason=encoding).inc(
+        max(original_bytes - compressed_bytes, 0)
+    )
+
+
+def track_not_modified(endpoint: str, body_bytes: int) -> None:
+    """Record a 304 response that replaced a body of body_bytes."""
+    RESPONSE_BYTES_SAVED_TOTAL.labels(endpoint=endpoint, reason="not_modified").inc(body_bytes)
+
+
 # =============================================================================
 # Getter Functions (for testing and internal use)
 # =============================================================================
@@ -322,8 +468,11 @@ def metrics_middleware():
     """
     from flask import request, g
 
+    from src.tracing import finish_trace, start_trace
+
     def before_request():
         g.start_time = time.perf_counter()
+        g.trace_token = start_trace(request.method, _normalize_endpoint(request.path))
 
     def after_request(response):
         if hasattr(g, "start_time"):
@@ -334,11 +483,25 @@ def metrics_middleware():
                 status=response.status_code,
                 duration=duration,
             )
+        token = g.pop("trace_token", None)
+        if token is not None:
+            finish_trace(token, response.status_code)
         return response
 
     return before_request, after_request
 
 
+def _close_abandoned_trace(error=None):
+    """Close a trace whose request raised before after_request ran."""
+    from flask import g
+
+    from src.tracing import finish_trace
+
+    token = g.pop("trace_token", None)
+    if token is not None:
+        finish_trace(token, 500)
+
+
 def get_metrics_response():
     """
     Generate Prometheus metrics response.
@@ -346,6 +509,13 @@ def get_metrics_response():
     Returns:
         Tuple of (response_body, content_type)
     """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        # Pre-fork server: aggregate the values written by every worker
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
     return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
 
 
@@ -363,6 +533,7 @@ def init_metrics(app, limiter=None):
     before_request, after_request = metrics_middleware()
     app.before_request(before_request)
     app.after_request(after_request)
+    app.teardown_request(_close_abandoned_trace)
 
     # Register /metrics endpoint (rate limit exempt)
     @app.route("/metrics")
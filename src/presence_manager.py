@@ -20,6 +20,7 @@ from typing import Any
 
 from src.config import DATA_DIR
 from src.ha_client import get_ha_client
+from src.settings_cache import SettingsCache
 from src.utils import send_health_alert
 
 
@@ -121,6 +122,7 @@ class PresenceManager:
 
         # Initialize database
         self._init_db()
+        self._settings = SettingsCache(self.db_path, "presence_settings")
 
         logger.info(f"PresenceManager initialized with database at {self.db_path}")
 
@@ -988,15 +990,12 @@ class PresenceManager:
                 (key, value),
             )
             conn.commit()
+        self._settings.invalidate()
         return True
 
     def _get_setting(self, key: str) -> str | None:
-        """Get a setting value."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT value FROM presence_settings WHERE key = ?", (key,))
-            row = cursor.fetchone()
-            return row["value"] if row else None
+        """Get a setting value (cached; see src/settings_cache.py)."""
+        return self._settings.get(key)
 
     # ========== Home Assistant Integration ==========
 
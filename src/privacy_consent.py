@@ -282,6 +282,14 @@ def apply_retention_policy() -> dict[str, int]:
                     (f"-{retention_days} days",),
                 )
                 deleted["device_state_history"] = cursor.rowcount
+                cursor.execute(
+                    """
+                    DELETE FROM device_state_rollups
+                    WHERE bucket_start < datetime('now', ?)
+                    """,
+                    (f"-{retention_days} days",),
+                )
+                deleted["device_state_history"] += cursor.rowcount
 
     if any(deleted.values()):
         logger.info(f"Applied retention policy: deleted {deleted}")
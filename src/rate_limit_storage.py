@@ -0,0 +1,221 @@
+"""
+Smart Home Assistant - Rate Limit Storage
+
+SQLite storage for flask-limiter (through the limits package), so every
+gunicorn worker and daemon on the host counts against the same limits:
+- Registered as the "sqlite" storage scheme: sqlite:///path/to/file.db
+- Supports the sliding window counter strategy (and fixed window)
+- Each counter update is a single UPSERT ... RETURNING statement, so
+  increments are atomic across processes without a transaction
+- Checks are plain SELECTs; in WAL mode they never wait for writers, and
+  requests over a limit are refused without writing at all
+- One connection per thread (reopened after fork), no Python-level locks
+
+Counters are disposable, so the file is opened with synchronous=OFF; in
+production it lives in /dev/shm by default to keep writes off the SD card.
+
+Usage:
+    from src.rate_limit_storage import default_storage_uri
+
+    Limiter(..., storage_uri=default_storage_uri(), strategy="sliding-window-counter")
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from math import floor
+from pathlib import Path
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+
+from src.config import DATA_DIR, RATE_LIMIT_STORAGE_URI, SERVER_MODE
+
+
+logger = logging.getLogger(__name__)
+
+STORAGE_FILENAME = "smarthome-ratelimits.db"
+
+# How long a request waits for another process's write before failing
+BUSY_TIMEOUT_SECONDS = 2.0
+
+# Expired counters are deleted every this many writes per connection
+PURGE_EVERY_WRITES = 1000
+
+_INCREMENT_SQL = """
+    INSERT INTO rate_limits (key, count, expires_at) VALUES (:key, :amount, :expires_at)
+    ON CONFLICT (key) DO UPDATE SET
+        count = CASE WHEN expires_at <= :now THEN excluded.count ELSE count + excluded.count END,
+        expires_at = CASE WHEN expires_at <= :now OR :elastic THEN excluded.expires_at
+                          ELSE expires_at END
+    RETURNING count
+"""
+
+
+def default_storage_uri() -> str:
+    """
+    Storage URI for the app's limiter.
+
+    Returns:
+        RATE_LIMIT_STORAGE_URI if set; otherwise memory:// in development
+        (one process) and a shared SQLite file in production
+    """
+    if RATE_LIMIT_STORAGE_URI:
+        return RATE_LIMIT_STORAGE_URI
+    if SERVER_MODE != "production":
+        return "memory://"
+    shm = Path("/dev/shm")
+    directory = shm if shm.is_dir() else DATA_DIR
+    return f"sqlite://{directory / STORAGE_FILENAME}"
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """
+    Rate limit counters in a SQLite file shared between processes.
+
+    Each counter is a (key, count, expires_at) row; an expired row is
+    reset by the next increment instead of being deleted first.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        """
+        Initialize the storage.
+
+        Args:
+            uri: sqlite:///absolute/path.db
+            wrap_exceptions: Raise limits.errors.StorageError instead of
+                sqlite3 errors
+        """
+        self.path = Path(uri.removeprefix("sqlite://"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+        self._connection().execute("""
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                key TEXT PRIMARY KEY,
+                count INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        logger.info(f"Rate limit counters stored in {self.path}")
+
+    @property
+    def base_exceptions(self) -> type[Exception]:
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection (a forked child opens its own)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+            self._local.writes = 0
+        return connection
+
+    def incr(self, key: str, expiry: int, amount: int = 1, elastic_expiry: bool = False) -> int:
+        # elastic_expiry is passed (as a keyword) by limits 4.x strategies
+        now = time.time()
+        connection = self._connection()
+        count = connection.execute(
+            _INCREMENT_SQL,
+            {
+                "key": key,
+                "amount": amount,
+                "expires_at": now + expiry,
+                "now": now,
+                "elastic": elastic_expiry,
+            },
+        ).fetchone()[0]
+
+        self._local.writes += 1
+        if self._local.writes % PURGE_EVERY_WRITES == 0:
+            connection.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+        return count
+
+    def get(self, key: str) -> int:
+        row = self._connection().execute(
+            "SELECT count FROM rate_limits WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        row = self._connection().execute(
+            "SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ).fetchone()
+        return row[0] if row else now
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute("SELECT 1 FROM rate_limits LIMIT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int | None:
+        return self._connection().execute("DELETE FROM rate_limits").rowcount
+
+    def clear(self, key: str) -> None:
+        self._connection().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count, previous_ttl, current_count, _ = self._sliding_window(
+            previous_key, current_key, expiry, now
+        )
+        weighted_count = previous_count * previous_ttl / expiry + current_count
+        if floor(weighted_count) + amount > limit:
+            return False
+
+        # The current window's counter lives on as the next one's previous
+        current_count = self.incr(current_key, 2 * expiry, amount)
+        weighted_count = previous_count * previous_ttl / expiry + current_count
+        if floor(weighted_count) > limit:
+            # Another process took the last slot first: give ours back
+            self.incr(current_key, 2 * expiry, -amount)
+            return False
+        return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        return self._sliding_window(previous_key, current_key, expiry, now)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self._connection().execute(
+            "DELETE FROM rate_limits WHERE key IN (?, ?)", (previous_key, current_key)
+        )
+
+    def _sliding_window(
+        self, previous_key: str, current_key: str, expiry: int, now: float
+    ) -> tuple[int, float, int, float]:
+        """Both windows' counts in one read, with the TTLs the strategy expects."""
+        counts = dict(
+            self._connection().execute(
+                "SELECT key, count FROM rate_limits WHERE key IN (?, ?) AND expires_at > ?",
+                (previous_key, current_key, now),
+            )
+        )
+        previous_count = counts.get(previous_key, 0)
+        current_count = counts.get(current_key, 0)
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
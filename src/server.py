@@ -9,14 +9,25 @@ WP-10.18: API Documentation with Swagger/OpenAPI
 WP-10.20: Prometheus Metrics Exporter
 """
 
+import hashlib
+import itertools
 import os
 import secrets
-import sqlite3
 import threading
+import time
 from datetime import date, datetime
 
 from flasgger import Swagger
-from flask import Flask, jsonify, redirect, render_template, request, send_from_directory
+from flask import (
+    Flask,
+    Response,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    send_from_directory,
+    stream_with_context,
+)
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_login import current_user, login_required
@@ -28,6 +39,17 @@ from src.config import (
     RATE_LIMIT_DEFAULT_PER_DAY,
     RATE_LIMIT_DEFAULT_PER_HOUR,
     ROOM_ENTITY_MAP,
+    SSE_MAX_STREAM_SECONDS,
+    SSE_STATUS_POLL_SECONDS,
+)
+from src.event_stream import (
+    DatabaseSnapshotSource,
+    LogTailSource,
+    SnapshotSource,
+    StreamFullError,
+    command_progress,
+    finished_items,
+    get_event_hub,
 )
 from src.ha_client import get_ha_client
 from src.health_monitor import get_health_monitor
@@ -38,7 +60,17 @@ from src.utils import get_daily_usage, log_command, setup_logging
 from src.voice_handler import VoiceHandler
 from src.voice_response import ResponseFormatter
 from src.metrics import init_metrics
-from src.database import record_feedback
+from src.compression import init_compression
+from src.static_assets import init_static_assets
+from src.rate_limit_storage import default_storage_uri
+from src.database import (
+    COMMAND_SOURCES,
+    HISTORY_PAGE_SIZE,
+    MAX_HISTORY_PAGE_SIZE,
+    get_command_history_page,
+    record_command_result,
+    record_feedback,
+)
 from src.feedback_handler import (
     file_bug_in_vikunja,
     alert_developers_via_nats,
@@ -141,7 +173,10 @@ limiter = Limiter(
         f"{RATE_LIMIT_DEFAULT_PER_DAY} per day",
         f"{RATE_LIMIT_DEFAULT_PER_HOUR} per hour",
     ],
-    storage_uri="memory://",
+    # Shared across workers in production; sliding windows avoid the burst
+    # a fixed window allows at each boundary
+    storage_uri=default_storage_uri(),
+    strategy="sliding-window-counter",
     headers_enabled=True,  # Enable X-RateLimit-* headers
 )
 
@@ -185,6 +220,14 @@ swagger = Swagger(app, config=swagger_config, template=swagger_template)
 # WP-10.20: Initialize Prometheus metrics (rate limit exempt)
 init_metrics(app, limiter=limiter)
 
+# Weak ETags, 304s and gzip/brotli for text and JSON responses. Registered
+# after the metrics middleware so request metrics record the final status.
+init_compression(app)
+
+# Content-hashed bundles from scripts/build_assets.py (asset_url() in
+# templates), served immutable and precompressed
+init_static_assets(app)
+
 
 @app.after_request
 def add_security_headers(response):
@@ -257,6 +300,23 @@ def process_command(command: str) -> dict:
     log_command(command, source="web")
     logger.info(f"Processing command: {command}")
 
+    started = time.monotonic()
+    with command_progress(command) as progress:
+        result = _run_command(command)
+        progress["success"] = result["success"]
+    record_command_result(
+        command,
+        source="web",
+        success=result["success"],
+        response_text=result["response"],
+        error_message=result.get("error"),
+        latency_ms=int((time.monotonic() - started) * 1000),
+    )
+    return result
+
+
+def _run_command(command: str) -> dict:
+    """Run the agent for process_command(), converting errors to a response."""
     try:
         # Import here to avoid circular imports
         from agent import run_agent
@@ -492,6 +552,73 @@ def submit_feedback():
         return jsonify({"success": False, "error": error_detail}), 500
 
 
+def collect_status() -> dict:
+    """
+    Build the /api/status payload (also pushed as "status" events).
+
+    Returns:
+        System, Home Assistant and device status
+    """
+    return _build_status()[0]
+
+
+def _build_status() -> tuple[dict, str]:
+    """
+    Build the status payload and its ETag.
+
+    Devices are looked up in the cached entity store (one /api/states
+    read shared by all rooms) rather than requested per room. The ETag is derived from the state versions
+    (last_updated) of the listed devices plus the system fields, so it
+    changes exactly when the payload does.
+
+    Returns:
+        Tuple of (payload, etag)
+    """
+    ha_client = get_ha_client()
+    store = ha_client.get_entity_store()
+    # States may be served stale after HA goes down, so go by the outcome of
+    # the latest fetch; only ping when it failed (or none has completed)
+    ha_connected = ha_client.last_fetch_ok or ha_client.check_connection()
+
+    devices = []
+    versions = []
+    system_status = "operational"
+
+    if ha_connected:
+        # Light states for configured rooms
+        for room_name, room_config in ROOM_ENTITY_MAP.items():
+            entity_id = room_config.get("default_light")
+            entity = store.get(entity_id) if entity_id else None
+            if entity:
+                device = {
+                    "entity_id": entity_id,
+                    "name": entity.get_attribute(
+                        "friendly_name", room_name.replace("_", " ").title()
+                    ),
+                    "type": "light",
+                    "state": entity.state,
+                    "brightness": entity.get_attribute("brightness"),
+                    "room": room_name,
+                }
+                devices.append(device)
+                versions.append(
+                    (entity_id, entity.last_updated, device["state"], device["brightness"])
+                )
+    else:
+        system_status = "warning"
+
+    daily_cost = round(get_daily_usage(), 4)
+    payload = {
+        "system": system_status,
+        "agent": "ready",
+        "home_assistant": "connected" if ha_connected else "disconnected",
+        "daily_cost_usd": daily_cost,
+        "devices": devices,
+    }
+    version_key = repr((system_status, ha_connected, daily_cost, versions))
+    return payload, hashlib.sha1(version_key.encode()).hexdigest()[:20]
+
+
 @app.route("/api/status")
 @login_required
 @limiter.limit("30 per minute")
@@ -503,9 +630,15 @@ def get_status():
       - System
     security:
       - SessionAuth: []
+    parameters:
+      - name: If-None-Match
+        in: header
+        type: string
+        required: false
+        description: ETag from a previous response
     responses:
       200:
-        description: System status
+        description: System status (with an ETag header)
         schema:
           type: object
           properties:
@@ -532,49 +665,18 @@ def get_status():
                     type: string
                   state:
                     type: string
+      304:
+        description: Status unchanged since the ETag in If-None-Match
       500:
         description: Server error
     """
     try:
-        ha_client = get_ha_client()
-        ha_connected = ha_client.check_connection()
-
-        devices = []
-        system_status = "operational"
-
-        if ha_connected:
-            # Get light states from configured rooms
-            for room_name, room_config in ROOM_ENTITY_MAP.items():
-                entity_id = room_config.get("default_light")
-                if entity_id:
-                    state = ha_client.get_light_state(entity_id)
-                    if state:
-                        devices.append(
-                            {
-                                "entity_id": entity_id,
-                                "name": state.get(
-                                    "friendly_name", room_name.replace("_", " ").title()
-                                ),
-                                "type": "light",
-                                "state": state.get("state", "unknown"),
-                                "brightness": state.get("brightness"),
-                                "room": room_name,
-                            }
-                        )
-        else:
-            system_status = "warning"
-
-        daily_cost = get_daily_usage()
-
-        return jsonify(
-            {
-                "system": system_status,
-                "agent": "ready",
-                "home_assistant": "connected" if ha_connected else "disconnected",
-                "daily_cost_usd": round(daily_cost, 4),
-                "devices": devices,
-            }
-        )
+        payload, etag = _build_status()
+        response = jsonify(payload)
+        response.set_etag(etag, weak=True)
+        # Clients must revalidate, but unchanged polls get an empty 304
+        response.headers["Cache-Control"] = "no-cache"
+        return response.make_conditional(request)
 
     except Exception as error:
         logger.error(f"Status check error: {error}")
@@ -591,6 +693,132 @@ def get_status():
         )
 
 
+# Seconds between keepalive comments on an idle event stream
+EVENT_STREAM_KEEPALIVE_SECONDS = 15
+
+
+def _timer_snapshot() -> dict:
+    from src.timer_manager import get_timer_manager
+
+    manager = get_timer_manager()
+    return {"timers": manager.get_active_timers(), "alarms": manager.get_active_alarms()}
+
+
+def _annotate_timers(previous: dict, current: dict) -> dict:
+    return {
+        **current,
+        "finished_timers": finished_items(previous["timers"], current["timers"], "end_time"),
+        "finished_alarms": finished_items(previous["alarms"], current["alarms"], "alarm_time"),
+    }
+
+
+def _reminder_snapshot() -> dict:
+    from src.reminder_manager import get_reminder_manager
+
+    return {"reminders": get_reminder_manager().get_pending_reminders()}
+
+
+def _annotate_reminders(previous: dict, current: dict) -> dict:
+    return {
+        **current,
+        "fired": finished_items(previous["reminders"], current["reminders"], "remind_at"),
+    }
+
+
+def _register_event_sources() -> None:
+    """Attach the status, log, timer and reminder sources to the event hub."""
+    from src.log_reader import LogReader
+    from src.reminder_manager import get_reminder_manager
+    from src.timer_manager import get_timer_manager
+
+    hub = get_event_hub()
+    hub.add_source(SnapshotSource("status", collect_status, interval=SSE_STATUS_POLL_SECONDS))
+    hub.add_source(LogTailSource(LogReader()))
+    hub.add_source(
+        DatabaseSnapshotSource(
+            "timers",
+            lambda: get_timer_manager().database_path,
+            _timer_snapshot,
+            annotate=_annotate_timers,
+        )
+    )
+    hub.add_source(
+        DatabaseSnapshotSource(
+            "reminders",
+            lambda: get_reminder_manager().database_path,
+            _reminder_snapshot,
+            annotate=_annotate_reminders,
+        )
+    )
+
+
+_register_event_sources()
+
+
+@app.route("/api/events")
+@login_required
+@limiter.limit("30 per minute")
+def stream_events():
+    """
+    Live updates as server-sent events
+    ---
+    tags:
+      - System
+    security:
+      - SessionAuth: []
+    parameters:
+      - name: topics
+        in: query
+        type: string
+        required: false
+        description: Comma-separated event types (status, log, timers, reminders, command)
+      - name: Last-Event-ID
+        in: header
+        type: string
+        required: false
+        description: Resume after this event (sent automatically by EventSource)
+    produces:
+      - text/event-stream
+    responses:
+      200:
+        description: Event stream; starts with the current status, timers and reminders
+      503:
+        description: Too many open streams; poll /api/status instead
+    """
+    topics = [topic for topic in request.args.get("topics", "").split(",") if topic]
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    hub = get_event_hub()
+
+    if hub.subscriber_count >= hub.max_clients:
+        return jsonify({"success": False, "error": "Too many live connections"}), 503, {
+            "Retry-After": str(EVENT_STREAM_KEEPALIVE_SECONDS)
+        }
+
+    def generate():
+        try:
+            with hub.subscribe(last_event_id, topics or None) as subscription:
+                # Browsers reconnect after this many milliseconds
+                yield "retry: 3000\n\n"
+                for event in subscription.initial_events():
+                    yield event.encode()
+                deadline = time.monotonic() + SSE_MAX_STREAM_SECONDS
+                while time.monotonic() < deadline:
+                    events = subscription.wait(timeout=EVENT_STREAM_KEEPALIVE_SECONDS)
+                    if not events:
+                        yield ": keepalive\n\n"
+                    for event in events:
+                        yield event.encode()
+        except StreamFullError:
+            # Lost a race for the last slot; the client retries or polls
+            yield "event: busy\ndata: {}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.route("/api/health")
 @login_required
 @limiter.limit("30 per minute")
@@ -604,9 +832,16 @@ def get_health():
       - SessionAuth: []
     description: |
       Returns health status of all system components with automatic
-      self-healing for degraded components.
+      self-healing for degraded components. Component results are reused
+      while within their freshness budget unless refresh=true.
 
       REQ-021: Self-Monitoring & Self-Healing
+    parameters:
+      - name: refresh
+        in: query
+        type: boolean
+        default: false
+        description: Re-run every check instead of using recent results (the billed LLM check only runs when this is true)
     responses:
       200:
         description: System health status
@@ -641,10 +876,12 @@ def get_health():
     """
     try:
         health_monitor = get_health_monitor()
+        health_monitor.start_background_refresh()
         self_healer = get_self_healer()
 
         # Get system health
-        health_data = health_monitor.get_system_health()
+        refresh = request.args.get("refresh", "false").lower() == "true"
+        health_data = health_monitor.get_system_health(refresh=refresh)
 
         # Attempt healing for any unhealthy/degraded components
         healing_results = []
@@ -864,7 +1101,8 @@ def readyz():
       - Health & Monitoring
     description: |
       Kubernetes-style readiness check. Returns 200 if all critical dependencies
-      are healthy and the service can accept traffic.
+      are healthy and the service can accept traffic. Answers from the
+      health monitor's last results, which a background thread keeps fresh.
       Does NOT require authentication - this is intentional for k8s probes.
     responses:
       200:
@@ -893,6 +1131,7 @@ def readyz():
     """
     try:
         health_monitor = get_health_monitor()
+        health_monitor.start_background_refresh()
         readiness = health_monitor.get_readiness()
 
         if readiness["ready"]:
@@ -961,12 +1200,28 @@ def trigger_healing(component: str):
 @limiter.limit("30 per minute")
 def get_history():
     """
-    Get recent command history
+    Get command history, newest first, one page at a time
     ---
     tags:
       - Voice & Commands
     security:
       - SessionAuth: []
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        default: 20
+        maximum: 100
+        description: Commands per page
+      - name: cursor
+        in: query
+        type: string
+        description: next_cursor from the previous page
+      - name: source
+        in: query
+        type: string
+        enum: [web, voice, automation]
+        description: Only commands from this source
     responses:
       200:
         description: Command history
@@ -978,36 +1233,50 @@ def get_history():
               items:
                 type: object
                 properties:
+                  id:
+                    type: integer
                   command:
                     type: string
                   timestamp:
                     type: string
-                    format: date-time
+                    description: UTC, "YYYY-MM-DD HH:MM:SS"
+                  source:
+                    type: string
+                  result:
+                    type: string
+            next_cursor:
+              type: string
+              description: Cursor for the next page (null on the last page)
+      400:
+        description: Invalid limit, cursor or source
     """
+    source = request.args.get("source") or None
+    cursor = request.args.get("cursor") or None
     try:
-        usage_db = DATA_DIR / "usage.db"
-
-        if not usage_db.exists():
-            return jsonify({"history": []})
-
-        with sqlite3.connect(usage_db) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT DISTINCT command, timestamp
-                FROM api_usage
-                WHERE command IS NOT NULL AND command != ''
-                ORDER BY timestamp DESC
-                LIMIT 20
-            """)
-            rows = cursor.fetchall()
-
-            history = [
-                {"command": row[0], "timestamp": row[1]}
-                for row in rows
-                if row[0]  # Filter out any null/empty
-            ]
+        limit = int(request.args.get("limit", HISTORY_PAGE_SIZE))
+        before_id = int(cursor) if cursor else None
+    except ValueError:
+        return jsonify({"history": [], "error": "Invalid limit or cursor"}), 400
+    if not 1 <= limit <= MAX_HISTORY_PAGE_SIZE or (before_id is not None and before_id < 1):
+        return jsonify({"history": [], "error": "Invalid limit or cursor"}), 400
+    if source and source not in COMMAND_SOURCES:
+        return jsonify({"history": [], "error": f"Unknown source: {source}"}), 400
 
-        return jsonify({"history": history})
+    try:
+        rows, next_id = get_command_history_page(limit=limit, before_id=before_id, source=source)
+        history = [
+            {
+                "id": row["id"],
+                "command": row["command_text"],
+                "timestamp": row["created_at"],
+                "source": row["command_type"],
+                "result": row["result"],
+            }
+            for row in rows
+        ]
+        return jsonify(
+            {"history": history, "next_cursor": str(next_id) if next_id is not None else None}
+        )
 
     except Exception as error:
         logger.error(f"History fetch error: {error}")
@@ -1187,6 +1456,13 @@ def _get_voice_handler() -> VoiceHandler:
     Returns:
         Configured VoiceHandler instance
     """
+    from src.config import VOICE_ASYNC_AGENT
+
+    if VOICE_ASYNC_AGENT:
+        from agent import arun_agent
+
+        return VoiceHandler(agent_callback=arun_agent)
+
     from agent import run_agent
 
     return VoiceHandler(agent_callback=run_agent)
@@ -1279,10 +1555,29 @@ def handle_voice_command():
             context["conversation_id"] = validated.conversation_id
 
         # Process through voice handler
-        handler = _get_voice_handler()
-        result = handler.process_command(text, context)
+        started = time.monotonic()
+        try:
+            result = _get_voice_handler().process_command(text, context)
+        except Exception as error:
+            log_command(text, source="voice")
+            record_command_result(
+                text,
+                source="voice",
+                success=False,
+                error_message=str(error),
+                latency_ms=int((time.monotonic() - started) * 1000),
+            )
+            raise
 
         log_command(text, source="voice")
+        record_command_result(
+            text,
+            source="voice",
+            success=bool(result.get("success")),
+            response_text=result.get("response"),
+            error_message=result.get("error"),
+            latency_ms=int((time.monotonic() - started) * 1000),
+        )
         return jsonify(result)
 
     except Exception as error:
@@ -2402,9 +2697,13 @@ def export_logs():
       - name: format
         in: query
         type: string
-        enum: [json, text]
+        enum: [json, ndjson, csv, text]
         default: json
-        description: Export format
+        description: Export format (streamed)
+      - name: cursor
+        in: query
+        type: string
+        description: Resume after the entry with this cursor (ndjson/csv)
       - name: download
         in: query
         type: boolean
@@ -2421,10 +2720,10 @@ def export_logs():
     responses:
       200:
         description: Log data in requested format
+      400:
+        description: Invalid cursor
     """
-    from flask import Response
-
-    from src.log_reader import LogLevel, LogReader
+    from src.log_reader import EXPORT_FORMATS, LogLevel, LogReader
 
     try:
         reader = LogReader()
@@ -2437,8 +2736,10 @@ def export_logs():
 
         file_path = log_files[0]
 
-        # Format
-        export_format = request.args.get("format", "json")
+        # Format (anything unrecognised gets the text format)
+        export_format = request.args.get("format", "json").lower()
+        if export_format not in EXPORT_FORMATS:
+            export_format = "text"
         download = request.args.get("download", "false").lower() == "true"
 
         # Level filtering for export
@@ -2447,22 +2748,19 @@ def export_logs():
         if min_level_str:
             min_level = LogLevel.from_string(min_level_str)
 
-        # Export
-        output = reader.export(
-            file_path=file_path,
-            format=export_format,
-            min_level=min_level,
-        )
-
-        # Set response type
-        if export_format == "json":
-            content_type = "application/json"
-            filename = f"logs_{date.today().isoformat()}.json"
-        else:
-            content_type = "text/plain"
-            filename = f"logs_{date.today().isoformat()}.log"
+        try:
+            chunks = reader.export_stream(
+                file_path=file_path,
+                format=export_format,
+                cursor=request.args.get("cursor"),
+                min_level=min_level,
+            )
+        except ValueError as error:
+            return jsonify({"success": False, "error": str(error)}), 400
 
-        response = Response(output, mimetype=content_type)
+        content_type, extension = EXPORT_CONTENT_TYPES[export_format]
+        filename = f"logs_{date.today().isoformat()}.{extension}"
+        response = Response(_logged_stream(chunks, "log export"), mimetype=content_type)
 
         if download:
             response.headers["Content-Disposition"] = f"attachment; filename={filename}"
@@ -2542,8 +2840,9 @@ def tail_logs():
         if from_position:
             # Follow mode - read from position
             position = int(from_position)
-            entries = reader.read_from_position(file_path=file_path, position=position)
-            new_position = file_path.stat().st_size
+            entries, new_position = reader.read_from_position(
+                file_path=file_path, position=position
+            )
         else:
             # Initial tail
             entries, new_position = reader.tail_with_position(file_path=file_path, lines=lines)
@@ -2640,6 +2939,29 @@ def get_log_stats():
         ), 500
 
 
+# Streamed export formats: format -> (mimetype, download file extension)
+EXPORT_CONTENT_TYPES = {
+    "json": ("application/json", "json"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "text": ("text/plain", "log"),
+}
+
+
+def _logged_stream(chunks, label: str):
+    """
+    Pass through a streamed export, logging errors raised mid-stream.
+
+    Once the first chunk is sent the status can't change, so a failure just
+    ends the response early; NDJSON/CSV clients resume from the last cursor
+    they received.
+    """
+    try:
+        yield from chunks
+    except Exception as error:
+        logger.error(f"Error streaming {label}: {error}")
+
+
 @app.route("/api/export", methods=["GET"])
 @login_required
 @limiter.limit("5 per minute")
@@ -2655,9 +2977,26 @@ def export_data():
       - name: format
         in: query
         type: string
-        enum: [json, csv]
+        enum: [json, ndjson, csv]
         default: json
-        description: Export format
+        description: >
+          Export format. json and ndjson are streamed; csv is streamed when a
+          section is given, otherwise all sections are returned in one JSON
+          object.
+      - name: section
+        in: query
+        type: string
+        enum: [todos, automations, reminders, command_history, timers, locations]
+        description: Section to export as CSV
+      - name: cursor
+        in: query
+        type: string
+        description: Resume after the record with this cursor (ndjson/csv)
+      - name: download
+        in: query
+        type: boolean
+        default: false
+        description: Set Content-Disposition for download
     responses:
       200:
         description: Exported data
@@ -2668,6 +3007,8 @@ def export_data():
               type: boolean
             data:
               type: object
+      400:
+        description: Invalid section or cursor
       500:
         description: Server error
     """
@@ -2676,14 +3017,37 @@ def export_data():
     try:
         exporter = DataExporter()
         export_format = request.args.get("format", "json").lower()
+        section = request.args.get("section")
+        cursor = request.args.get("cursor")
 
-        if export_format == "csv":
+        if export_format == "csv" and not section:
             csv_data = exporter.export_as_csv()
             return jsonify({"success": True, "format": "csv", "data": csv_data})
-        else:
-            # Default to JSON
-            data = exporter.export_all()
-            return jsonify({"success": True, "format": "json", "data": data})
+
+        try:
+            if export_format == "ndjson":
+                chunks = exporter.stream_ndjson(cursor=cursor)
+            elif export_format == "csv":
+                chunks = exporter.stream_csv(section, cursor=cursor)
+            else:
+                # Default to JSON, in the same envelope as before streaming
+                export_format = "json"
+                chunks = itertools.chain(
+                    ['{"success": true, "format": "json", "data": '],
+                    exporter.stream_json(),
+                    ["}"],
+                )
+        except ValueError as error:
+            return jsonify({"success": False, "error": str(error)}), 400
+
+        content_type, extension = EXPORT_CONTENT_TYPES[export_format]
+        response = Response(_logged_stream(chunks, "data export"), mimetype=content_type)
+        if request.args.get("download", "false").lower() == "true":
+            name = f"smarthome_{section}" if section else "smarthome_export"
+            response.headers["Content-Disposition"] = (
+                f"attachment; filename={name}_{date.today().isoformat()}.{extension}"
+            )
+        return response
 
     except Exception as error:
         logger.error(f"Error exporting data: {error}")
@@ -2713,13 +3077,21 @@ def import_data():
         in: query
         type: boolean
         default: true
-        description: Merge with existing data (false = replace)
+        description: Add to existing data, skipping records whose id exists (false = replace)
     requestBody:
       required: true
+      description: >
+        An export from GET /api/export as JSON, or as NDJSON
+        (Content-Type application/x-ndjson). NDJSON uploads are imported as
+        they are read, with progress published as "import" events on
+        /api/events.
       content:
         application/json:
           schema:
             type: object
+        application/x-ndjson:
+          schema:
+            type: string
     responses:
       200:
         description: Import result or preview
@@ -2739,6 +3111,18 @@ def import_data():
 
     try:
         importer = DataImporter()
+        preview = request.args.get("preview", "false").lower() == "true"
+        merge = request.args.get("merge", "true").lower() == "true"
+
+        if request.mimetype == "application/x-ndjson":
+            result = importer.import_ndjson(
+                request.stream,
+                merge=merge,
+                dry_run=preview,
+                progress=lambda progress: get_event_hub().publish("import", progress.to_dict()),
+            )
+            return jsonify({"success": True, "preview": preview, "result": result.to_dict()})
+
         data = request.get_json()
 
         if not data:
@@ -2749,13 +3133,11 @@ def import_data():
         if not is_valid:
             return jsonify({"success": False, "errors": errors}), 400
 
-        preview = request.args.get("preview", "false").lower() == "true"
         if preview:
             preview_data = importer.get_import_preview(data)
             return jsonify({"success": True, "preview": True, "changes": preview_data})
 
         # Perform import
-        merge = request.args.get("merge", "true").lower() == "true"
         imported = importer.import_data(data, merge=merge)
         return jsonify({"success": True, "preview": False, "imported": imported})
 
@@ -3196,6 +3578,12 @@ def run_server(
 
 
 if __name__ == "__main__":
+    if os.getenv("SERVER_MODE", "development").lower() == "production":
+        logger.warning(
+            "SERVER_MODE=production is served by 'python -m src.web_server'; "
+            "starting the development server"
+        )
+
     # Read configuration from environment variables
     debug = os.getenv("FLASK_DEBUG", "False").lower() == "true"
     use_https = os.getenv("USE_HTTPS", "True").lower() == "true"
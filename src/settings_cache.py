@@ -0,0 +1,191 @@
+"""
+Smart Home Assistant - Settings Cache
+
+In-memory cache for small key/value settings tables.
+
+Settings change rarely but are read on hot paths (privacy checks before
+every third-party call, presence thresholds on every location update).
+SettingsCache keeps a whole settings table in a dict:
+- writes in this process call invalidate(), so the next read reloads
+- writes from other processes (the automation scheduler, notification
+  worker, CLI scripts) are detected by polling SQLite's data_version,
+  which changes whenever another connection commits to the database
+
+Listeners registered with add_listener() are called with the changed keys
+after each reload that changed something.
+
+Usage:
+    from src.settings_cache import SettingsCache
+
+    cache = SettingsCache(lambda: DATABASE_PATH, "settings", decode=json.loads)
+    theme = cache.get("theme", default="dark")
+"""
+
+import copy
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from src.config import SETTINGS_CACHE_POLL_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class SettingsCache:
+    """Process-wide cache of one key/value settings table."""
+
+    def __init__(
+        self,
+        database_path: str | Path | Callable[[], str | Path],
+        table: str,
+        decode: Callable[[str], Any] | None = None,
+        poll_interval: float = SETTINGS_CACHE_POLL_SECONDS,
+    ):
+        """
+        Initialize the cache (nothing is read until first use or load()).
+
+        Args:
+            database_path: SQLite file, or a callable returning it (re-read on
+                each access so a changed path switches databases)
+            table: Table with key and value columns
+            decode: Converts stored values (e.g. json.loads); None keeps text
+            poll_interval: Minimum seconds between data_version checks
+        """
+        self._path_source = database_path
+        self.table = table
+        self.decode = decode
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._values: dict[str, Any] | None = None
+        self._path: Path | None = None
+        self._connection: sqlite3.Connection | None = None
+        self._data_version: int | None = None
+        self._next_check = 0.0
+        self._listeners: list[Callable[[set[str]], None]] = []
+        self._stats = {"hits": 0, "reloads": 0}
+
+    def _current_path(self) -> Path:
+        source = self._path_source
+        return Path(source() if callable(source) else source)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a setting.
+
+        Args:
+            key: Setting key
+            default: Returned if the key is not set
+
+        Returns:
+            Decoded value or default
+        """
+        value = self._snapshot().get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        # Callers may modify what they get back; keep the cached copy intact
+        return copy.deepcopy(value) if isinstance(value, dict | list) else value
+
+    def get_all(self) -> dict[str, Any]:
+        """Get a copy of every setting."""
+        return copy.deepcopy(self._snapshot())
+
+    def load(self) -> None:
+        """Read the table now (e.g. at startup) instead of on first use."""
+        self.invalidate()
+        self._snapshot()
+
+    def invalidate(self) -> None:
+        """Mark the cached table stale; the next read reloads it."""
+        with self._lock:
+            self._data_version = None
+            self._next_check = 0.0
+
+    def add_listener(self, callback: Callable[[set[str]], None]) -> None:
+        """
+        Register a callback for setting changes.
+
+        Args:
+            callback: Called with the set of added, changed or removed keys
+        """
+        self._listeners.append(callback)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit and reload counters."""
+        return {**self._stats, "loaded": self._values is not None}
+
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the cached table, reloading it if it may be stale."""
+        values = self._values
+        if (
+            values is not None
+            and time.monotonic() < self._next_check
+            and self._path == self._current_path()
+        ):
+            self._stats["hits"] += 1
+            return values
+
+        with self._lock:
+            changed, values = self._refresh()
+
+        if changed:
+            self._notify(changed)
+        return values
+
+    def _refresh(self) -> tuple[set[str], dict[str, Any]]:
+        """Check data_version and reload if needed. Caller holds the lock."""
+        path = self._current_path()
+        if path != self._path:
+            self._close()
+            self._path = path
+            self._values = None
+
+        if self._connection is None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._data_version = None
+
+        version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+        self._next_check = time.monotonic() + self.poll_interval
+        if self._values is not None and version == self._data_version:
+            self._stats["hits"] += 1
+            return set(), self._values
+
+        rows = self._connection.execute(
+            f"SELECT key, value FROM {self.table}"
+        ).fetchall()
+        decode = self.decode
+        values = {key: decode(value) if decode else value for key, value in rows}
+
+        previous = self._values
+        self._values = values
+        self._data_version = version
+        self._stats["reloads"] += 1
+
+        if previous is None:
+            return set(), values
+        changed = {
+            key
+            for key in previous.keys() | values.keys()
+            if previous.get(key, _MISSING) != values.get(key, _MISSING)
+        }
+        return changed, values
+
+    def _notify(self, changed: set[str]) -> None:
+        logger.debug(f"Settings changed in {self.table}: {sorted(changed)}")
+        for callback in list(self._listeners):
+            try:
+                callback(changed)
+            except Exception as error:
+                logger.warning(f"Settings listener failed: {error}")
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
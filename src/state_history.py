@@ -0,0 +1,560 @@
+"""
+Smart Home Assistant - Device State History
+
+Buffered ingestion and tiered retention for device state snapshots.
+
+Snapshots are buffered in memory and written in batched transactions. A
+snapshot identical to the entity's previous one (same state and attributes)
+is dropped, so polling an unchanged device adds no rows.
+
+Retention tiers:
+- raw: every state change, for STATE_HISTORY_RAW_HOURS
+- minute: per-minute rollups, for STATE_HISTORY_MINUTE_DAYS
+- hour: per-hour rollups, for STATE_HISTORY_HOUR_DAYS
+
+Compaction moves expired raw rows into minute rollups and expired minute
+rollups into hour rollups, so each change lives in exactly one tier and a
+range query reads each span from whichever tier holds it.
+
+Usage:
+    from src.state_history import get_state_history
+
+    history = get_state_history()
+    history.record("sensor.desk_power", "42.5", {"unit_of_measurement": "W"})
+    points = history.query_range("sensor.desk_power", start=datetime(2026, 1, 1))
+"""
+
+import atexit
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from itertools import groupby
+from pathlib import Path
+from typing import Any
+
+from src import database
+from src.config import (
+    STATE_HISTORY_BATCH_SIZE,
+    STATE_HISTORY_FLUSH_SECONDS,
+    STATE_HISTORY_HOUR_DAYS,
+    STATE_HISTORY_MINUTE_DAYS,
+    STATE_HISTORY_RAW_HOURS,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Same format as SQLite's CURRENT_TIMESTAMP (UTC)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+# How often the background thread compacts old history
+COMPACTION_INTERVAL_SECONDS = 3600
+# Rows per executemany() when writing rollups
+ROLLUP_CHUNK_SIZE = 1000
+# Entity IDs per IN (...) lookup of previous states
+LOOKUP_CHUNK_SIZE = 500
+# Batches kept buffered while writes fail (e.g. database is locked)
+MAX_BUFFERED_BATCHES = 10
+
+RESOLUTION_MINUTE = "minute"
+RESOLUTION_HOUR = "hour"
+
+_UPSERT_ROLLUP = """
+    INSERT INTO device_state_rollups (
+        entity_id, resolution, bucket_start, last_state, last_recorded_at,
+        samples, value_count, value_sum, value_min, value_max
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (entity_id, resolution, bucket_start) DO UPDATE SET
+        last_state = CASE WHEN excluded.last_recorded_at >= last_recorded_at
+                          THEN excluded.last_state ELSE last_state END,
+        last_recorded_at = MAX(last_recorded_at, excluded.last_recorded_at),
+        samples = samples + excluded.samples,
+        value_count = value_count + excluded.value_count,
+        value_sum = COALESCE(value_sum + excluded.value_sum, value_sum, excluded.value_sum),
+        value_min = MIN(COALESCE(value_min, excluded.value_min),
+                        COALESCE(excluded.value_min, value_min)),
+        value_max = MAX(COALESCE(value_max, excluded.value_max),
+                        COALESCE(excluded.value_max, value_max))
+"""
+
+
+def format_timestamp(moment: datetime) -> str:
+    """
+    Format a datetime the way history rows store it.
+
+    Naive datetimes are taken to be UTC, matching CURRENT_TIMESTAMP.
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(UTC)
+    return moment.strftime(TIMESTAMP_FORMAT)
+
+
+def _numeric_value(state: str) -> float | None:
+    """Parse a numeric state (e.g. a sensor reading), or None."""
+    try:
+        value = float(state)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+class StateHistory:
+    """
+    Buffered writer, compactor and range reader for device state history.
+
+    record() only appends to an in-memory buffer; the buffer is written
+    when it reaches batch_size, every flush_interval seconds by a
+    background thread, or on an explicit flush(). The same thread runs
+    compact() hourly.
+    """
+
+    def __init__(
+        self,
+        database_path: Path | None = None,
+        batch_size: int = STATE_HISTORY_BATCH_SIZE,
+        flush_interval: float = STATE_HISTORY_FLUSH_SECONDS,
+    ):
+        """
+        Initialize the history writer.
+
+        Args:
+            database_path: SQLite database (defaults to the main database)
+            batch_size: Buffered snapshots that trigger a write
+            flush_interval: Seconds between background flushes
+        """
+        self.database_path = Path(database_path or database.DATABASE_PATH)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._buffer: list[tuple[str, str, str | None, str]] = []
+        self._buffer_lock = threading.Lock()
+        # Serializes flushes and compaction so dedupe sees snapshots in order
+        self._write_lock = threading.Lock()
+        # entity_id -> (state, attributes JSON) of the last stored snapshot,
+        # or None if the entity has no stored history
+        self._last_stored: dict[str, tuple[str, str | None] | None] = {}
+
+        self._stats = {"recorded": 0, "written": 0, "deduplicated": 0, "batches": 0}
+        self._last_compaction: dict[str, int] | None = None
+
+        self._stop_event = threading.Event()
+        self._flush_thread: threading.Thread | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.database_path, timeout=5)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    # =========================================================================
+    # Ingestion
+    # =========================================================================
+
+    def record(
+        self,
+        entity_id: str,
+        state: str,
+        attributes: dict | None = None,
+        recorded_at: datetime | None = None,
+        flush: bool = False,
+    ) -> None:
+        """
+        Buffer a state snapshot.
+
+        Args:
+            entity_id: Device entity ID
+            state: State value
+            attributes: State attributes
+            recorded_at: When the state was observed (defaults to now)
+            flush: Write the buffer immediately
+        """
+        snapshot = (
+            entity_id,
+            str(state),
+            json.dumps(attributes, sort_keys=True) if attributes else None,
+            format_timestamp(recorded_at or datetime.now(UTC)),
+        )
+        with self._buffer_lock:
+            self._buffer.append(snapshot)
+            self._stats["recorded"] += 1
+            flush = flush or len(self._buffer) >= self.batch_size
+
+        self._ensure_flush_thread()
+        if flush:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write buffered snapshots in one transaction.
+
+        Returns:
+            Number of rows written (after dropping unchanged snapshots)
+
+        Raises:
+            sqlite3.Error: If the write fails (the batch is put back in the
+                buffer for the next flush)
+        """
+        with self._write_lock:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+
+            connection = None
+            try:
+                connection = self._connect()
+                unseen = {snapshot[0] for snapshot in batch} - self._last_stored.keys()
+                # Last-stored entries changed by this batch, applied once it commits
+                updates = self._load_last_states(connection, unseen)
+
+                rows = []
+                for snapshot in batch:
+                    entity_id, state, attributes, _ = snapshot
+                    if entity_id in updates:
+                        previous = updates[entity_id]
+                    else:
+                        previous = self._last_stored.get(entity_id)
+                    if previous == (state, attributes):
+                        continue
+                    updates[entity_id] = (state, attributes)
+                    rows.append(snapshot)
+
+                with connection:
+                    connection.executemany(
+                        """
+                        INSERT INTO device_state_history
+                            (entity_id, state, attributes, recorded_at)
+                        VALUES (?, ?, ?, ?)
+                        """,
+                        rows,
+                    )
+            except sqlite3.Error as error:
+                logger.error(f"Failed to write {len(batch)} state snapshots: {error}")
+                self._requeue(batch)
+                raise
+            finally:
+                if connection is not None:
+                    connection.close()
+
+            self._last_stored.update(updates)
+            with self._buffer_lock:
+                self._stats["written"] += len(rows)
+                self._stats["deduplicated"] += len(batch) - len(rows)
+                self._stats["batches"] += 1
+
+        logger.debug(f"Wrote {len(rows)} of {len(batch)} buffered state snapshots")
+        return len(rows)
+
+    def _requeue(self, batch: list[tuple[str, str, str | None, str]]) -> None:
+        """Put a failed batch back ahead of newer snapshots, oldest dropped past the cap."""
+        limit = self.batch_size * MAX_BUFFERED_BATCHES
+        with self._buffer_lock:
+            buffer = batch + self._buffer
+            if len(buffer) > limit:
+                logger.warning(
+                    f"State history buffer full; dropping {len(buffer) - limit} oldest snapshots"
+                )
+                buffer = buffer[-limit:]
+            self._buffer = buffer
+
+    def _load_last_states(
+        self, connection: sqlite3.Connection, entity_ids: set[str]
+    ) -> dict[str, tuple[str, str | None] | None]:
+        """Look up the latest stored snapshot for entities not seen yet."""
+        found: dict[str, tuple[str, str | None] | None] = dict.fromkeys(entity_ids)
+        pending = list(entity_ids)
+
+        for offset in range(0, len(pending), LOOKUP_CHUNK_SIZE):
+            chunk = pending[offset : offset + LOOKUP_CHUNK_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = connection.execute(
+                f"""
+                SELECT entity_id, state, attributes FROM device_state_history
+                WHERE id IN (
+                    SELECT MAX(id) FROM device_state_history
+                    WHERE entity_id IN ({placeholders})
+                    GROUP BY entity_id
+                )
+                """,
+                chunk,
+            ).fetchall()
+            for row in rows:
+                found[row["entity_id"]] = (row["state"], row["attributes"])
+
+        return found
+
+    def _ensure_flush_thread(self) -> None:
+        """Start the background flush thread on first use."""
+        if self._flush_thread is not None:
+            return
+        with self._buffer_lock:
+            if self._flush_thread is not None or self._stop_event.is_set():
+                return
+            self._flush_thread = threading.Thread(
+                target=self._flush_loop, name="state-history-flush", daemon=True
+            )
+            self._flush_thread.start()
+        atexit.register(self.stop)
+
+    def _flush_loop(self) -> None:
+        next_compaction = time.monotonic() + COMPACTION_INTERVAL_SECONDS
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+                if time.monotonic() >= next_compaction:
+                    next_compaction = time.monotonic() + COMPACTION_INTERVAL_SECONDS
+                    self.compact()
+            except sqlite3.Error:
+                pass  # Already logged; retry on the next tick
+
+    def stop(self) -> None:
+        """Stop the background thread and write anything still buffered."""
+        self._stop_event.set()
+        if self._flush_thread is not None:
+            self._flush_thread.join(timeout=self.flush_interval + 1)
+        try:
+            self.flush()
+        except sqlite3.Error:
+            pass
+
+    # =========================================================================
+    # Retention
+    # =========================================================================
+
+    def compact(self, now: datetime | None = None) -> dict[str, int]:
+        """
+        Apply the retention tiers.
+
+        Raw snapshots older than STATE_HISTORY_RAW_HOURS become minute
+        rollups, minute rollups older than STATE_HISTORY_MINUTE_DAYS become
+        hour rollups, and hour rollups older than STATE_HISTORY_HOUR_DAYS
+        are deleted.
+
+        Args:
+            now: Reference time (defaults to now)
+
+        Returns:
+            Dict with raw_rolled_up, minutes_rolled_up and hours_expired counts
+        """
+        now = now or datetime.now(UTC)
+        raw_cutoff = format_timestamp(now - timedelta(hours=STATE_HISTORY_RAW_HOURS))
+        minute_cutoff = format_timestamp(now - timedelta(days=STATE_HISTORY_MINUTE_DAYS))
+        hour_cutoff = format_timestamp(now - timedelta(days=STATE_HISTORY_HOUR_DAYS))
+
+        with self._write_lock:
+            connection = self._connect()
+            try:
+                with connection:
+                    counts = {
+                        "raw_rolled_up": self._roll_up_raw(connection, raw_cutoff),
+                        "minutes_rolled_up": self._roll_up_minutes(connection, minute_cutoff),
+                    }
+                    counts["hours_expired"] = connection.execute(
+                        """
+                        DELETE FROM device_state_rollups
+                        WHERE resolution = ? AND bucket_start < ?
+                        """,
+                        (RESOLUTION_HOUR, hour_cutoff),
+                    ).rowcount
+            except sqlite3.Error as error:
+                logger.error(f"State history compaction failed: {error}")
+                raise
+            finally:
+                connection.close()
+
+            # Rows holding the last known state may have been rolled up
+            self._last_stored.clear()
+            self._last_compaction = counts
+
+        if any(counts.values()):
+            logger.info(f"Compacted device state history: {counts}")
+        return counts
+
+    def _roll_up_raw(self, connection: sqlite3.Connection, cutoff: str) -> int:
+        """Fold raw snapshots older than cutoff into minute rollups."""
+        rows = connection.execute(
+            """
+            SELECT entity_id, state, recorded_at FROM device_state_history
+            WHERE recorded_at < ?
+            ORDER BY entity_id, recorded_at, id
+            """,
+            (cutoff,),
+        )
+
+        def bucket_key(row: sqlite3.Row) -> tuple[str, str]:
+            return row["entity_id"], row["recorded_at"][:16] + ":00"
+
+        rollups = []
+        for (entity_id, bucket_start), group in groupby(rows, key=bucket_key):
+            group = list(group)
+            values = [
+                value for value in (_numeric_value(row["state"]) for row in group)
+                if value is not None
+            ]
+            rollups.append((
+                entity_id,
+                RESOLUTION_MINUTE,
+                bucket_start,
+                group[-1]["state"],
+                group[-1]["recorded_at"],
+                len(group),
+                len(values),
+                sum(values) if values else None,
+                min(values) if values else None,
+                max(values) if values else None,
+            ))
+            if len(rollups) >= ROLLUP_CHUNK_SIZE:
+                connection.executemany(_UPSERT_ROLLUP, rollups)
+                rollups = []
+        if rollups:
+            connection.executemany(_UPSERT_ROLLUP, rollups)
+
+        return connection.execute(
+            "DELETE FROM device_state_history WHERE recorded_at < ?", (cutoff,)
+        ).rowcount
+
+    def _roll_up_minutes(self, connection: sqlite3.Connection, cutoff: str) -> int:
+        """Fold minute rollups older than cutoff into hour rollups."""
+        # last_state comes from each hour's latest minute (rank 1)
+        hourly = connection.execute(
+            """
+            SELECT entity_id, ? AS resolution, hour_start,
+                   MAX(CASE WHEN latest = 1 THEN last_state END),
+                   MAX(last_recorded_at),
+                   SUM(samples), SUM(value_count), SUM(value_sum),
+                   MIN(value_min), MAX(value_max)
+            FROM (
+                SELECT *, substr(bucket_start, 1, 13) || ':00:00' AS hour_start,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY entity_id, substr(bucket_start, 1, 13)
+                           ORDER BY last_recorded_at DESC
+                       ) AS latest
+                FROM device_state_rollups
+                WHERE resolution = ? AND bucket_start < ?
+            )
+            GROUP BY entity_id, hour_start
+            """,
+            (RESOLUTION_HOUR, RESOLUTION_MINUTE, cutoff),
+        ).fetchall()
+        connection.executemany(_UPSERT_ROLLUP, [tuple(row) for row in hourly])
+
+        return connection.execute(
+            "DELETE FROM device_state_rollups WHERE resolution = ? AND bucket_start < ?",
+            (RESOLUTION_MINUTE, cutoff),
+        ).rowcount
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    def query_range(
+        self,
+        entity_id: str,
+        start: datetime,
+        end: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get an entity's history between two times, oldest first.
+
+        Each span of the range comes from the tier that holds it: raw
+        snapshots for recent history, minute and hour rollups further back.
+        Rollup points carry samples and, for numeric states, min/max/avg.
+
+        Args:
+            entity_id: Device entity ID
+            start: Range start (naive datetimes are UTC)
+            end: Range end (defaults to now)
+
+        Returns:
+            List of point dicts with recorded_at, state and resolution
+            ("raw", "minute" or "hour")
+        """
+        self.flush()
+
+        start_text = format_timestamp(start)
+        end_text = format_timestamp(end or datetime.now(UTC))
+        # A bucket that started before the range can still hold changes inside it
+        minute_start = start_text[:16] + ":00"
+        hour_start = start_text[:13] + ":00:00"
+
+        connection = self._connect()
+        try:
+            raw_rows = connection.execute(
+                """
+                SELECT recorded_at, state, attributes FROM device_state_history
+                WHERE entity_id = ? AND recorded_at BETWEEN ? AND ?
+                ORDER BY recorded_at, id
+                """,
+                (entity_id, start_text, end_text),
+            ).fetchall()
+            rollup_rows = connection.execute(
+                """
+                SELECT * FROM device_state_rollups
+                WHERE entity_id = ? AND bucket_start <= ? AND (
+                    (resolution = ? AND bucket_start >= ?)
+                    OR (resolution = ? AND bucket_start >= ?)
+                )
+                """,
+                (entity_id, end_text, RESOLUTION_MINUTE, minute_start, RESOLUTION_HOUR, hour_start),
+            ).fetchall()
+        finally:
+            connection.close()
+
+        points = [
+            {
+                "recorded_at": row["recorded_at"],
+                "state": row["state"],
+                "attributes": json.loads(row["attributes"]) if row["attributes"] else None,
+                "resolution": "raw",
+            }
+            for row in raw_rows
+        ]
+        for row in rollup_rows:
+            value_count = row["value_count"]
+            points.append({
+                "recorded_at": row["bucket_start"],
+                "state": row["last_state"],
+                "resolution": row["resolution"],
+                "samples": row["samples"],
+                "min": row["value_min"],
+                "max": row["value_max"],
+                "avg": row["value_sum"] / value_count if value_count else None,
+            })
+
+        points.sort(key=lambda point: point["recorded_at"])
+        return points
+
+    def get_stats(self) -> dict[str, Any]:
+        """Ingestion counters, buffer depth and the last compaction result."""
+        with self._buffer_lock:
+            return {
+                **self._stats,
+                "buffered": len(self._buffer),
+                "last_compaction": self._last_compaction,
+            }
+
+
+# Singleton instance
+_state_history: StateHistory | None = None
+_state_history_lock = threading.Lock()
+
+
+def get_state_history() -> StateHistory:
+    """
+    Get the StateHistory instance for the current database.
+
+    A new instance is created if DATABASE_PATH has changed since the last
+    call (the old one is flushed and stopped).
+    """
+    global _state_history
+    with _state_history_lock:
+        current = _state_history
+        if current is not None and current.database_path == Path(database.DATABASE_PATH):
+            return current
+        _state_history = StateHistory()
+
+    if current is not None:
+        current.stop()
+    return _state_history
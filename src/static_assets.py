@@ -0,0 +1,135 @@
+"""
+Smart Home Assistant - Static Assets
+
+Serves the bundles built by scripts/build_assets.py:
+- asset_url() (a template global) resolves a minified name such as
+  "app.min.js" to its content-hashed file from build-manifest.json
+- /static/build/<file> serves hashed files with a one-year immutable
+  Cache-Control, picking the precompressed .br/.gz variant the client
+  accepts; other build files are served like any static file
+
+The manifest is re-read when its modification time changes, so a rebuild
+takes effect without restarting the server.
+
+Usage:
+    from src.static_assets import init_static_assets
+
+    init_static_assets(app)
+"""
+
+import json
+import logging
+import mimetypes
+from pathlib import Path
+
+from flask import Flask, request, send_from_directory
+
+
+logger = logging.getLogger(__name__)
+
+BUILD_URL_PATH = "/static/build"
+MANIFEST_NAME = "build-manifest.json"
+
+# Cache lifetime for content-hashed files (they never change)
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Precompressed variants in order of preference: content coding -> suffix
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+class AssetManifest:
+    """build-manifest.json, reloaded when the file changes."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize the manifest.
+
+        Args:
+            path: Path to build-manifest.json (it may not exist yet)
+        """
+        self.path = path
+        self._mtime: float | None = None
+        self._data: dict = {}
+
+    def _current(self) -> dict:
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            self._mtime, self._data = None, {}
+            return self._data
+
+        if mtime != self._mtime:
+            try:
+                self._data = json.loads(self.path.read_text())
+            except (OSError, ValueError) as error:
+                logger.warning(f"Could not read asset manifest {self.path}: {error}")
+                self._data = {}
+            self._mtime = mtime
+        return self._data
+
+    def hashed_name(self, name: str) -> str | None:
+        """Content-hashed file for a minified name, if it was built."""
+        return self._current().get("assets", {}).get(name)
+
+    def encodings(self, filename: str) -> list[str]:
+        """Precompressed codings available for a hashed file ([] if not hashed)."""
+        return self._current().get("precompressed", {}).get(filename, [])
+
+    def is_hashed(self, filename: str) -> bool:
+        """Whether a build file is one of the content-hashed bundles."""
+        return filename in self._current().get("precompressed", {})
+
+
+def choose_precompressed(accept_encodings, available: list[str]) -> str | None:
+    """
+    Pick a precompressed variant the client accepts.
+
+    Args:
+        accept_encodings: request.accept_encodings
+        available: Codings built for the file
+
+    Returns:
+        "br", "gzip" or None for the uncompressed file
+    """
+    for encoding in PRECOMPRESSED_SUFFIXES:
+        if encoding in available and accept_encodings.quality(encoding) > 0:
+            return encoding
+    return None
+
+
+def init_static_assets(app: Flask) -> AssetManifest:
+    """
+    Register asset_url() and the /static/build route on a Flask app.
+
+    Returns:
+        The manifest the app resolves asset names with
+    """
+    build_dir = Path(app.static_folder) / "build"
+    manifest = AssetManifest(build_dir / MANIFEST_NAME)
+
+    def asset_url(name: str) -> str:
+        return f"{BUILD_URL_PATH}/{manifest.hashed_name(name) or name}"
+
+    def serve_build_asset(filename: str):
+        if not manifest.is_hashed(filename):
+            return send_from_directory(build_dir, filename)
+
+        encoding = choose_precompressed(request.accept_encodings, manifest.encodings(filename))
+        mimetype = mimetypes.guess_type(filename)[0]
+        if encoding:
+            response = send_from_directory(
+                build_dir, filename + PRECOMPRESSED_SUFFIXES[encoding], mimetype=mimetype
+            )
+            response.headers["Content-Encoding"] = encoding
+        else:
+            response = send_from_directory(build_dir, filename, mimetype=mimetype)
+
+        response.vary.add("Accept-Encoding")
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+        return response
+
+    app.jinja_env.globals["asset_url"] = asset_url
+    app.add_url_rule(f"{BUILD_URL_PATH}/<path:filename>", "build_asset", serve_build_asset)
+    return manifest
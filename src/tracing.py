@@ -0,0 +1,254 @@
+"""
+Smart Home Assistant - Request Tracing
+
+Request-scoped timing spans, so a slow request can be broken down into
+LLM time, Home Assistant round trips, SQLite and tool execution.
+
+The current span lives in a contextvar: the Flask middleware starts a trace
+per request, and span() blocks opened anywhere below it (in the same thread,
+or in threads/tasks that copied the context) nest under it. Outside a
+trace, span() costs one contextvar lookup and records nothing.
+
+When a request finishes, each component's exclusive time (span duration
+minus nested spans) is exported to the
+smarthome_request_component_seconds{endpoint, component} histogram. Time
+not covered by any span is reported as the "app" component, so the
+components of a request add up to its total duration. Requests slower than
+SLOW_REQUEST_LOG_MS are logged with their span tree.
+
+Usage:
+    from src.tracing import span, traced
+
+    with span("home_assistant", f"GET {endpoint}"):
+        response = requests.get(url)
+
+    @traced("llm")
+    def complete(...):
+        ...
+"""
+
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections.abc import Callable, Coroutine, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, TypeVar
+
+from src.config import SLOW_REQUEST_LOG_MS
+from src.metrics import track_request_components
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Component for request time not covered by any span
+APP_COMPONENT = "app"
+
+# Span tree nodes kept per trace for the slow-request log; time is still
+# attributed for spans beyond this, they are just not listed
+MAX_SPANS_PER_TRACE = 200
+
+
+class Trace:
+    """Per-request span bookkeeping."""
+
+    __slots__ = ("method", "endpoint", "component_seconds", "span_count", "dropped", "_lock")
+
+    def __init__(self, method: str, endpoint: str):
+        self.method = method
+        self.endpoint = endpoint
+        self.component_seconds: dict[str, float] = {}
+        self.span_count = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def add_time(self, component: str, seconds: float) -> None:
+        with self._lock:
+            self.component_seconds[component] = (
+                self.component_seconds.get(component, 0.0) + seconds
+            )
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = ("component", "name", "trace", "started", "duration", "child_time", "children")
+
+    def __init__(self, component: str, name: str, trace: Trace):
+        self.component = component
+        self.name = name
+        self.trace = trace
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.child_time = 0.0
+        self.children: list[Span] = []
+
+    @property
+    def self_time(self) -> float:
+        """Duration minus nested spans (0 if children ran in parallel)."""
+        return max(self.duration - self.child_time, 0.0)
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    """The innermost open span, or None outside a trace."""
+    return _current_span.get()
+
+
+@contextmanager
+def span(component: str, name: str | None = None) -> Generator[Span | None, None, None]:
+    """
+    Time a block as a child of the current span.
+
+    Args:
+        component: Metrics component ("llm", "home_assistant", "database",
+            "tool", ...)
+        name: Label in the slow-request log (defaults to the component)
+
+    Yields:
+        The new Span, or None when no trace is active
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    trace = parent.trace
+    child = Span(component, name or component, trace)
+    token = _current_span.set(child)
+    try:
+        yield child
+    finally:
+        child.duration = time.perf_counter() - child.started
+        _current_span.reset(token)
+        trace.add_time(component, child.self_time)
+        with trace._lock:
+            parent.child_time += child.duration
+            trace.span_count += 1
+            if trace.span_count <= MAX_SPANS_PER_TRACE:
+                parent.children.append(child)
+            else:
+                trace.dropped += 1
+
+
+def traced(component: str, name: str | None = None) -> Callable:
+    """
+    Decorator form of span() for functions and coroutine functions.
+
+    Args:
+        component: Metrics component
+        name: Log label (defaults to the function's qualified name)
+    """
+    def decorator(function: Callable) -> Callable:
+        label = name or function.__qualname__
+
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with span(component, label):
+                    return await function(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(component, label):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def bind_current_span(coroutine: Coroutine[Any, Any, T]) -> Coroutine[Any, Any, T]:
+    """
+    Carry the caller's span into a coroutine run on another thread's loop.
+
+    asyncio.run_coroutine_threadsafe() runs the task in the loop thread's
+    context, so without this spans opened inside it would be dropped.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return coroutine
+
+    async def run_in_span() -> T:
+        _current_span.set(parent)
+        return await coroutine
+
+    return run_in_span()
+
+
+def start_trace(method: str, endpoint: str) -> Token:
+    """
+    Open a trace for a request.
+
+    Args:
+        method: HTTP method
+        endpoint: Normalized endpoint (metrics label)
+
+    Returns:
+        Token to pass to finish_trace()
+    """
+    trace = Trace(method, endpoint)
+    return _current_span.set(Span(APP_COMPONENT, f"{method} {endpoint}", trace))
+
+
+def finish_trace(token: Token, status: int | None = None) -> Span | None:
+    """
+    Close a request's trace, export its breakdown and log it if slow.
+
+    Args:
+        token: Token from start_trace()
+        status: HTTP status code (for the log line)
+
+    Returns:
+        The root span, or None if the trace was already closed
+    """
+    root = _current_span.get()
+    try:
+        _current_span.reset(token)
+    except ValueError:
+        # Finished from a different context than it was started in
+        _current_span.set(None)
+    if root is None or root.component != APP_COMPONENT:
+        return None
+
+    root.duration = time.perf_counter() - root.started
+    trace = root.trace
+    trace.add_time(APP_COMPONENT, root.self_time)
+    track_request_components(trace.endpoint, trace.component_seconds)
+
+    if SLOW_REQUEST_LOG_MS > 0 and root.duration * 1000 >= SLOW_REQUEST_LOG_MS:
+        logger.warning(format_span_tree(root, status))
+    return root
+
+
+def format_span_tree(root: Span, status: int | None = None) -> str:
+    """Render a finished trace as an indented tree with a component summary."""
+    trace = root.trace
+    header = f"Slow request {root.name} -> {status} took {root.duration * 1000:.1f}ms"
+    breakdown = ", ".join(
+        f"{component}={seconds * 1000:.1f}ms"
+        for component, seconds in sorted(
+            trace.component_seconds.items(), key=lambda item: item[1], reverse=True
+        )
+    )
+    lines = [header, f"  breakdown: {breakdown}"]
+
+    def walk(node: Span, depth: int) -> None:
+        for child in node.children:
+            lines.append(
+                f"  {'  ' * depth}{child.component} {child.name} {child.duration * 1000:.1f}ms"
+            )
+            walk(child, depth + 1)
+
+    walk(root, 0)
+    if trace.dropped:
+        lines.append(f"  ... {trace.dropped} more spans not shown")
+    return "\n".join(lines)
@@ -0,0 +1,297 @@
+"""
+Smart Home Assistant - Vibe Interpretation Memo
+
+Persistent SQLite-backed memo of LLM vibe interpretations used by the Hue
+specialist. Entries are keyed by (normalized description, room, time-of-day
+bucket) so repeated creative vibes ("cozy rainy reading nook") are served
+without another LLM call, across restarts.
+
+Features:
+- TTL expiration (interpretations are re-asked after VIBE_MEMO_TTL_SECONDS)
+- LRU eviction once VIBE_MEMO_MAX_ENTRIES is exceeded
+- Hit/miss statistics
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from src.config import DATA_DIR
+from src.utils import setup_logging
+
+
+logger = setup_logging("vibe_memo")
+
+DEFAULT_DATABASE_PATH = DATA_DIR / "vibe_memo.db"
+
+VIBE_MEMO_MAX_ENTRIES = 500
+VIBE_MEMO_TTL_SECONDS = 30 * 24 * 60 * 60  # 30 days
+
+# Words that don't change the meaning of a vibe request. Nothing that can be
+# an adjective or a verb ("light", "set", "dim") belongs here, or different
+# vibes would share a memo key.
+_FILLER_WORDS = frozenset({"a", "an", "the", "please", "it", "some", "vibe", "vibes"})
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+# Time-of-day buckets, checked in order against the free-text time context
+_TIME_BUCKET_KEYWORDS = (
+    ("morning", ("morning", "sunrise", "dawn", "breakfast")),
+    ("afternoon", ("afternoon", "midday", "noon", "lunch")),
+    ("evening", ("evening", "sunset", "dusk", "dinner")),
+    ("night", ("night", "midnight", "late", "bedtime")),
+)
+_HOUR_PATTERN = re.compile(r"\b(\d{1,2})(?::\d{2})?\s*(am|pm)?\b")
+
+
+def normalize_description(description: str) -> str:
+    """
+    Normalize a vibe description for memo lookup.
+
+    Lowercases, strips punctuation, collapses whitespace, and drops filler
+    words, so "A cozy, rainy vibe, please!" and "cozy rainy" share a key.
+    """
+    words = _NON_ALPHANUMERIC.sub(" ", description.lower()).split()
+    meaningful = [word for word in words if word not in _FILLER_WORDS]
+    return " ".join(meaningful or words)
+
+
+def time_of_day_bucket(time_of_day: str | None) -> str:
+    """
+    Reduce a free-text time context to morning/afternoon/evening/night.
+
+    Accepts keywords ("late evening") or clock times ("21:30", "9pm").
+    Returns "" when no time context is given.
+    """
+    if not time_of_day:
+        return ""
+
+    text = time_of_day.lower().strip()
+    for bucket, keywords in _TIME_BUCKET_KEYWORDS:
+        if any(keyword in text for keyword in keywords):
+            return bucket
+
+    match = _HOUR_PATTERN.search(text)
+    if match:
+        hour = int(match.group(1)) % 24
+        if match.group(2) == "pm" and hour < 12:
+            hour += 12
+        elif match.group(2) == "am" and hour == 12:
+            hour = 0
+        if 5 <= hour < 12:
+            return "morning"
+        if 12 <= hour < 17:
+            return "afternoon"
+        if 17 <= hour < 21:
+            return "evening"
+        return "night"
+
+    return normalize_description(text)
+
+
+class VibeMemo:
+    """
+    Persistent LRU/TTL memo of vibe interpretations.
+
+    Thread-safe: each operation opens its own connection, and eviction is
+    serialized by a lock.
+    """
+
+    def __init__(
+        self,
+        database_path: Path | None = None,
+        max_entries: int = VIBE_MEMO_MAX_ENTRIES,
+        ttl_seconds: int = VIBE_MEMO_TTL_SECONDS,
+    ):
+        """
+        Initialize the memo.
+
+        Args:
+            database_path: Path to SQLite database (defaults to DATA_DIR/vibe_memo.db)
+            max_entries: Maximum entries before least-recently-used eviction
+            ttl_seconds: Seconds before an interpretation expires
+        """
+        self.database_path = database_path or DEFAULT_DATABASE_PATH
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._initialize_database()
+
+    @contextmanager
+    def _get_cursor(self) -> Generator[sqlite3.Cursor, None, None]:
+        """Context manager for database operations."""
+        connection = sqlite3.connect(self.database_path, timeout=5)
+        try:
+            cursor = connection.cursor()
+            yield cursor
+            connection.commit()
+        except Exception as error:
+            connection.rollback()
+            logger.error(f"Vibe memo database error: {error}")
+            raise
+        finally:
+            connection.close()
+
+    def _initialize_database(self) -> None:
+        """Create the memo table if it doesn't exist."""
+        Path(self.database_path).parent.mkdir(parents=True, exist_ok=True)
+        with self._get_cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS vibe_memo (
+                    description TEXT NOT NULL,
+                    room TEXT NOT NULL,
+                    time_bucket TEXT NOT NULL,
+                    settings TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    hit_count INTEGER DEFAULT 0,
+                    PRIMARY KEY (description, room, time_bucket)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_vibe_memo_last_used
+                ON vibe_memo(last_used)
+            """)
+
+    @staticmethod
+    def make_key(
+        description: str, room: str | None = None, time_of_day: str | None = None
+    ) -> tuple[str, str, str]:
+        """Build the (description, room, time bucket) memo key."""
+        return (
+            normalize_description(description),
+            (room or "").lower().strip().replace(" ", "_"),
+            time_of_day_bucket(time_of_day),
+        )
+
+    def get(
+        self, description: str, room: str | None = None, time_of_day: str | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Look up a memoized interpretation.
+
+        Returns:
+            The stored settings dict, or None on miss/expiry
+        """
+        key = self.make_key(description, room, time_of_day)
+        now = time.time()
+
+        try:
+            with self._get_cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT settings, created_at FROM vibe_memo
+                    WHERE description = ? AND room = ? AND time_bucket = ?
+                    """,
+                    key,
+                )
+                row = cursor.fetchone()
+
+                if row is None:
+                    self._stats["misses"] += 1
+                    return None
+
+                settings_json, created_at = row
+                if now - created_at > self.ttl_seconds:
+                    cursor.execute(
+                        "DELETE FROM vibe_memo WHERE description = ? AND room = ? AND time_bucket = ?",
+                        key,
+                    )
+                    self._stats["misses"] += 1
+                    return None
+
+                cursor.execute(
+                    """
+                    UPDATE vibe_memo SET last_used = ?, hit_count = hit_count + 1
+                    WHERE description = ? AND room = ? AND time_bucket = ?
+                    """,
+                    (now, *key),
+                )
+        except sqlite3.Error:
+            self._stats["misses"] += 1
+            return None
+
+        self._stats["hits"] += 1
+        return json.loads(settings_json)
+
+    def set(
+        self,
+        description: str,
+        settings: dict[str, Any],
+        room: str | None = None,
+        time_of_day: str | None = None,
+    ) -> None:
+        """Store an interpretation, evicting least-recently-used entries if full."""
+        key = self.make_key(description, room, time_of_day)
+        now = time.time()
+
+        try:
+            with self._lock, self._get_cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO vibe_memo
+                        (description, room, time_bucket, settings, created_at, last_used)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (*key, json.dumps(settings), now, now),
+                )
+
+                cursor.execute("SELECT COUNT(*) FROM vibe_memo")
+                overflow = cursor.fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    cursor.execute(
+                        """
+                        DELETE FROM vibe_memo WHERE rowid IN (
+                            SELECT rowid FROM vibe_memo ORDER BY last_used ASC LIMIT ?
+                        )
+                        """,
+                        (overflow,),
+                    )
+                    self._stats["evictions"] += overflow
+        except sqlite3.Error:
+            # Memo is best-effort; the interpretation itself already succeeded
+            pass
+
+    def clear(self) -> None:
+        """Remove all memoized interpretations."""
+        with self._lock, self._get_cursor() as cursor:
+            cursor.execute("DELETE FROM vibe_memo")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get memo statistics."""
+        with self._get_cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM vibe_memo")
+            size = cursor.fetchone()[0]
+
+        total = self._stats["hits"] + self._stats["misses"]
+        return {
+            "hits": self._stats["hits"],
+            "misses": self._stats["misses"],
+            "evictions": self._stats["evictions"],
+            "size": size,
+            "max_entries": self.max_entries,
+            "hit_rate": self._stats["hits"] / total if total > 0 else 0.0,
+        }
+
+
+# Global memo instance
+_vibe_memo: VibeMemo | None = None
+_vibe_memo_lock = threading.Lock()
+
+
+def get_vibe_memo() -> VibeMemo:
+    """Get the global VibeMemo instance."""
+    global _vibe_memo
+    with _vibe_memo_lock:
+        if _vibe_memo is None:
+            _vibe_memo = VibeMemo()
+        return _vibe_memo
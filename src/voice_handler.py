@@ -13,11 +13,18 @@ WP-9.1: Conversational Automation Setup via Voice
 """
 
 import concurrent.futures
+import contextvars
+import inspect
+import threading
 import uuid
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from typing import Any
 
+from src.async_loop import run_sync
+from src.config import VOICE_MAX_QUEUE_DEPTH, VOICE_PREFETCH_ENABLED, VOICE_WORKER_POOL_SIZE
 from src.conversation_manager import get_conversation_manager
+from src.deadline import Deadline
+from src.metrics import track_voice_pool_rejection, update_voice_pool_metrics
 from src.utils import setup_logging
 from src.voice_response import ResponseFormatter
 
@@ -25,6 +32,143 @@ from src.voice_response import ResponseFormatter
 logger = setup_logging("voice_handler")
 
 
+class VoicePoolFullError(RuntimeError):
+    """Raised when the voice worker pool queue is full."""
+
+
+class VoiceExecutorPool:
+    """
+    Bounded, process-wide worker pool for synchronous voice commands.
+
+    Replaces a per-command ThreadPoolExecutor so that threads are reused and
+    a burst of commands queues (up to max_queue) instead of spawning threads
+    without limit. Commands beyond the queue bound are rejected immediately.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = VOICE_WORKER_POOL_SIZE,
+        max_queue: int = VOICE_MAX_QUEUE_DEPTH,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers: Commands executed concurrently
+            max_queue: Commands allowed to wait for a worker
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="voice-worker"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> concurrent.futures.Future:
+        """
+        Submit a command to the pool.
+
+        Raises:
+            VoicePoolFullError: If max_queue commands are already waiting
+        """
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                track_voice_pool_rejection()
+                raise VoicePoolFullError(
+                    f"Voice queue full ({self._queued} waiting, {self._active} active)"
+                )
+            self._queued += 1
+            self._publish_metrics()
+
+        def run() -> Any:
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._publish_metrics()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+                    self._publish_metrics()
+
+        # Run in the caller's context so the command's spans join its request
+        future = self._executor.submit(contextvars.copy_context().run, run)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: concurrent.futures.Future) -> None:
+        """Release the queue slot of a command cancelled before it started."""
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._publish_metrics()
+
+    def _publish_metrics(self) -> None:
+        """Push queue depth and active workers to Prometheus. Lock held."""
+        update_voice_pool_metrics(self._queued, self._active)
+
+    def get_stats(self) -> dict[str, int]:
+        """Get pool statistics."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "active": self._active,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Shut down the worker threads, cancelling queued commands."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global pool instance
+_voice_pool: VoiceExecutorPool | None = None
+_voice_pool_lock = threading.Lock()
+
+
+def get_voice_pool() -> VoiceExecutorPool:
+    """Get the global VoiceExecutorPool instance."""
+    global _voice_pool
+    with _voice_pool_lock:
+        if _voice_pool is None:
+            _voice_pool = VoiceExecutorPool()
+        return _voice_pool
+
+
+# Background threads for speculative state prefetch (kept off the voice pool)
+_prefetch_executor: concurrent.futures.ThreadPoolExecutor | None = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _get_prefetch_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Get the shared executor used for state prefetch."""
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="state-prefetch"
+            )
+        return _prefetch_executor
+
+
+def _accepts_deadline(callback: Callable[..., Any]) -> bool:
+    """Check whether a callback declares a ``deadline`` parameter."""
+    try:
+        return "deadline" in inspect.signature(callback).parameters
+    except (TypeError, ValueError):
+        return False
+
+
 class VoiceHandler:
     """
     Handle voice commands from Home Assistant webhook.
@@ -35,22 +179,39 @@ class VoiceHandler:
 
     def __init__(
         self,
-        agent_callback: Callable[[str], str],
+        agent_callback: Callable[[str], str] | Callable[[str], Awaitable[str]],
         timeout_seconds: int = 30,
         response_formatter: ResponseFormatter | None = None,
+        executor_pool: VoiceExecutorPool | None = None,
+        location_manager: Any | None = None,
+        prefetch_enabled: bool = VOICE_PREFETCH_ENABLED,
     ):
         """
         Initialize the VoiceHandler.
 
         Args:
             agent_callback: Function to call with voice command text.
-                           Should accept str and return str response.
+                           Should accept str and return str response. May be
+                           an async function, in which case it runs on the
+                           shared event loop and is cancelled on timeout.
+                           If it accepts a ``deadline`` keyword, a Deadline
+                           is passed so it can skip work once we give up.
             timeout_seconds: Maximum time to wait for agent response.
             response_formatter: Optional custom ResponseFormatter instance.
+            executor_pool: Worker pool for sync callbacks (defaults to the
+                           shared global pool).
+            location_manager: LocationManager used to resolve the puck's room
+                              (defaults to the shared instance).
+            prefetch_enabled: Prefetch the room's device states into the HA
+                              cache while the agent is running.
         """
         self.agent_callback = agent_callback
         self.timeout_seconds = timeout_seconds
         self.formatter = response_formatter or ResponseFormatter()
+        self.executor_pool = executor_pool
+        self._passes_deadline = _accepts_deadline(agent_callback)
+        self.location_manager = location_manager
+        self.prefetch_enabled = prefetch_enabled
 
     def process_command(self, text: str, context: dict[str, Any] | None = None) -> dict[str, Any]:
         """
@@ -85,6 +246,9 @@ class VoiceHandler:
                 logger.info(f"Conversation response: {conversation_result[:50]}...")
                 return result
 
+            # Warm the HA cache for the puck's room while the LLM decides
+            self._prefetch_room_states(context)
+
             # Normal flow: execute agent with timeout
             response = self._execute_with_timeout(clean_text)
 
@@ -103,6 +267,9 @@ class VoiceHandler:
         except TimeoutError:
             logger.warning(f"Voice command timeout: {clean_text[:50]}...")
             return {"success": False, "error": self.formatter.error_timeout()}
+        except VoicePoolFullError as error:
+            logger.warning(f"Voice command rejected: {error}")
+            return {"success": False, "error": self.formatter.error_busy()}
         except Exception as error:
             logger.error(f"Voice command error: {error}")
             return {"success": False, "error": self.formatter.error(str(error))}
@@ -122,6 +289,46 @@ class VoiceHandler:
         # Generate a new ID for this session
         return f"voice-{uuid.uuid4().hex[:8]}"
 
+    def _prefetch_room_states(self, context: dict[str, Any] | None) -> None:
+        """
+        Start a background fetch of the puck room's light, blind and media states.
+
+        Best-effort: failures are logged and never affect the command.
+
+        Args:
+            context: Context dict from HA webhook (uses device_id)
+        """
+        if not self.prefetch_enabled or not context or not context.get("device_id"):
+            return
+
+        try:
+            location_manager = self.location_manager
+            if location_manager is None:
+                from tools.location import get_location_manager
+
+                location_manager = get_location_manager()
+
+            room = location_manager.get_room_from_context(context)
+            if not room:
+                return
+
+            entity_ids = location_manager.get_room_entities(room)
+            if entity_ids:
+                logger.debug(f"Prefetching {len(entity_ids)} states for {room}")
+                _get_prefetch_executor().submit(self._run_prefetch, entity_ids)
+        except Exception as error:
+            logger.debug(f"State prefetch skipped: {error}")
+
+    @staticmethod
+    def _run_prefetch(entity_ids: list[str]) -> None:
+        """Fetch states into the HA client cache (runs on the prefetch executor)."""
+        from src.ha_client import get_ha_client
+
+        try:
+            get_ha_client().prefetch_states(entity_ids)
+        except Exception as error:
+            logger.debug(f"State prefetch failed: {error}")
+
     def _handle_conversation(self, text: str, conversation_id: str) -> str | None:
         """
         Handle multi-turn conversation for automation creation.
@@ -183,16 +390,33 @@ class VoiceHandler:
 
         Raises:
             TimeoutError: If agent doesn't respond in time
+            VoicePoolFullError: If the worker pool queue is full
             Exception: Any exception from agent
         """
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(self.agent_callback, text)
+        deadline = Deadline(self.timeout_seconds)
+        kwargs = {"deadline": deadline} if self._passes_deadline else {}
+
+        if inspect.iscoroutinefunction(self.agent_callback):
+            # Async agent: cancel the task on timeout so no further LLM/HA calls run
             try:
-                return future.result(timeout=self.timeout_seconds)
-            except concurrent.futures.TimeoutError:
-                logger.warning(f"Agent timeout after {self.timeout_seconds}s")
+                return run_sync(self.agent_callback(text, **kwargs), timeout=self.timeout_seconds)
+            except TimeoutError:
+                deadline.cancel()
+                logger.warning(f"Agent timeout after {self.timeout_seconds}s (task cancelled)")
                 raise TimeoutError(f"Agent did not respond within {self.timeout_seconds} seconds")
 
+        pool = self.executor_pool or get_voice_pool()
+        future = pool.submit(self.agent_callback, text, **kwargs)
+        try:
+            return future.result(timeout=deadline.remaining())
+        except concurrent.futures.TimeoutError:
+            # Unblock the caller now; the worker sees the cancelled deadline at
+            # its next checkpoint, and a still-queued command never starts.
+            deadline.cancel()
+            future.cancel()
+            logger.warning(f"Agent timeout after {self.timeout_seconds}s")
+            raise TimeoutError(f"Agent did not respond within {self.timeout_seconds} seconds")
+
     def parse_request(self, payload: dict[str, Any]) -> tuple[str, dict[str, Any]]:
         """
         Parse Home Assistant conversation webhook payload.
@@ -262,6 +262,15 @@ class ResponseFormatter:
         """
         return "Sorry, that took too long. Please try again."
 
+    def error_busy(self) -> str:
+        """
+        Generate a message for when too many commands are already queued.
+
+        Returns:
+            Busy error string for voice output
+        """
+        return "Sorry, I'm busy with other requests. Please try again in a moment."
+
     def error_not_understood(self) -> str:
         """
         Generate a "not understood" error message.
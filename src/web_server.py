@@ -0,0 +1,300 @@
+"""
+Smart Home Assistant - Web Server Launcher
+
+Starts the web UI/API in one of two modes, selected by SERVER_MODE:
+- development: Flask's built-in threaded server (src/server.py run_server)
+- production: a pre-fork gunicorn server with SERVER_WORKERS processes of
+  SERVER_THREADS threads each
+
+Production mode mirrors the development listeners: HTTPS on SERVER_PORT
+with the certificates from src/security/ssl_config.py, plus plain HTTP on
+SERVER_PORT - 1 for Tailscale clients. gunicorn applies TLS to every bind
+of an arbiter, so the HTTP listener runs as a second arbiter in a child
+process. Signals sent to the main arbiter are forwarded to it:
+- SIGHUP reloads gracefully (new workers start, old ones finish their
+  requests within SERVER_GRACEFUL_TIMEOUT)
+- SIGTERM/SIGINT shut both down
+
+Workers import the app themselves (no preload), so every worker opens its
+own SQLite connections and background threads. Prometheus metrics are
+aggregated across workers through the multiprocess registry in
+PROMETHEUS_MULTIPROC_DIR (default data/prometheus), which is cleared at
+startup.
+
+Usage:
+    SERVER_MODE=production python -m src.web_server
+    kill -HUP <master pid>    # graceful reload
+"""
+
+import logging
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+from src.config import (
+    DATA_DIR,
+    SERVER_GRACEFUL_TIMEOUT,
+    SERVER_HOST,
+    SERVER_HTTP_WORKERS,
+    SERVER_MODE,
+    SERVER_PORT,
+    SERVER_THREADS,
+    SERVER_TIMEOUT,
+    SERVER_WORKERS,
+)
+from src.security.ssl_config import CERT_FILE, KEY_FILE, certificates_exist, get_ssl_context
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_DIR = DATA_DIR / "prometheus"
+
+# Cap for the automatic worker count: each worker holds its own copy of the
+# app (HA state cache, LLM clients), which adds up on a Pi
+MAX_AUTO_WORKERS = 4
+
+# PID of the plain-HTTP arbiter forked when TLS is enabled
+_http_listener_pid: int | None = None
+
+
+def default_workers() -> int:
+    """Worker count when SERVER_WORKERS is 0: one per CPU, capped."""
+    return max(1, min(os.cpu_count() or 1, MAX_AUTO_WORKERS))
+
+
+def prepare_metrics_dir(path: str | Path | None = None) -> Path:
+    """
+    Point prometheus_client at a fresh multiprocess directory.
+
+    prometheus_client picks its storage when it is first imported, which
+    importing the src package already does; see main().
+
+    Args:
+        path: Directory to use (defaults to PROMETHEUS_MULTIPROC_DIR or
+            data/prometheus)
+
+    Returns:
+        The directory, emptied of files left by a previous run
+    """
+    metrics_dir = Path(path or os.environ.get("PROMETHEUS_MULTIPROC_DIR") or DEFAULT_METRICS_DIR)
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    for stale in metrics_dir.glob("*.db"):
+        stale.unlink()
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(metrics_dir)
+    return metrics_dir
+
+
+# =============================================================================
+# gunicorn hooks
+# =============================================================================
+
+
+def _child_exit(server, worker) -> None:
+    """Drop a dead worker's live gauges from the multiprocess registry."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def _ssl_context(config, default_ssl_context_factory):
+    """Use the same TLS settings as the development server."""
+    return get_ssl_context()
+
+
+def _forward_reload(server) -> None:
+    if _http_listener_pid is not None:
+        _signal_http_listener(signal.SIGHUP)
+
+
+def _stop_http_listener(server) -> None:
+    if _http_listener_pid is None:
+        return
+    _signal_http_listener(signal.SIGTERM)
+    # The main arbiter may reap the child itself, so poll instead of waitpid
+    deadline = time.monotonic() + SERVER_GRACEFUL_TIMEOUT + 5
+    while time.monotonic() < deadline and _signal_http_listener(0):
+        time.sleep(0.1)
+
+
+def _signal_http_listener(signum: int) -> bool:
+    """Send a signal to the HTTP arbiter. Returns False once it has exited."""
+    try:
+        os.kill(_http_listener_pid, signum)
+    except ProcessLookupError:
+        return False
+    try:
+        pid, _ = os.waitpid(_http_listener_pid, os.WNOHANG)
+    except ChildProcessError:
+        return False
+    return pid == 0
+
+
+# =============================================================================
+# Production server
+# =============================================================================
+
+
+def build_options(
+    bind: str,
+    workers: int,
+    threads: int,
+    use_tls: bool = False,
+    primary: bool = True,
+) -> dict:
+    """
+    Build the gunicorn settings for one listener.
+
+    Args:
+        bind: host:port to listen on
+        workers: Worker processes
+        threads: Threads per worker (gthread worker class)
+        use_tls: Terminate TLS with the ssl_config certificates
+        primary: Whether this is the main arbiter (forwards reload/exit to
+            the HTTP listener)
+
+    Returns:
+        Settings for ProductionApplication
+    """
+    options = {
+        "bind": [bind],
+        "workers": workers,
+        "threads": threads,
+        "worker_class": "gthread",
+        "timeout": SERVER_TIMEOUT,
+        "graceful_timeout": SERVER_GRACEFUL_TIMEOUT,
+        "keepalive": 5,
+        "preload_app": False,
+        "accesslog": "-",
+        "errorlog": "-",
+        "child_exit": _child_exit,
+    }
+    # Worker heartbeats are files touched every second; keep them off the SD card
+    if Path("/dev/shm").is_dir():
+        options["worker_tmp_dir"] = "/dev/shm"
+    if use_tls:
+        options["certfile"] = str(CERT_FILE)
+        options["keyfile"] = str(KEY_FILE)
+        options["ssl_context"] = _ssl_context
+    if primary:
+        options["on_reload"] = _forward_reload
+        options["on_exit"] = _stop_http_listener
+    return options
+
+
+def _serve(options: dict) -> None:
+    """Run one gunicorn arbiter until it is stopped."""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError as error:
+        raise RuntimeError(
+            "Production mode needs gunicorn: pip install -r requirements.txt"
+        ) from error
+
+    class ProductionApplication(BaseApplication):
+        """gunicorn application serving src.server:app."""
+
+        def __init__(self, settings: dict):
+            self.settings = settings
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.settings.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from src.server import app
+
+            return app
+
+    ProductionApplication(options).run()
+
+
+def run_production_server(
+    host: str = SERVER_HOST,
+    port: int = SERVER_PORT,
+    workers: int = SERVER_WORKERS,
+    threads: int = SERVER_THREADS,
+    use_https: bool = True,
+    http_listener: bool = True,
+    http_workers: int = SERVER_HTTP_WORKERS,
+) -> None:
+    """
+    Run the pre-fork production server (blocks until shutdown).
+
+    Args:
+        host: Host to bind to
+        port: Port (HTTPS port when certificates exist)
+        workers: Worker processes (0 picks one per CPU, up to 4)
+        threads: Threads per worker
+        use_https: Terminate TLS if certificates exist
+        http_listener: Also serve plain HTTP on port - 1 (for Tailscale)
+            when TLS is enabled
+        http_workers: Worker processes for the plain-HTTP listener
+    """
+    global _http_listener_pid
+
+    workers = workers or default_workers()
+    use_tls = use_https and certificates_exist()
+    if use_https and not use_tls:
+        logger.warning(
+            "HTTPS requested but no certificates found. Run: python scripts/generate_cert.py"
+        )
+
+    metrics_dir = prepare_metrics_dir()
+    logger.info(
+        f"Starting production server on {host}:{port} "
+        f"({'HTTPS' if use_tls else 'HTTP'}, {workers} workers x {threads} threads, "
+        f"metrics in {metrics_dir})"
+    )
+
+    if use_tls and http_listener:
+        http_options = build_options(
+            f"{host}:{port - 1}", max(1, http_workers), threads, primary=False
+        )
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _serve(http_options)
+            finally:
+                os._exit(0)
+        _http_listener_pid = pid
+        logger.info(
+            f"HTTP listener for Tailscale on {host}:{port - 1} "
+            f"({http_options['workers']} workers, pid {pid})"
+        )
+
+    _serve(build_options(f"{host}:{port}", workers, threads, use_tls=use_tls))
+
+
+def main() -> None:
+    """Start the server in the mode selected by SERVER_MODE."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    use_https = os.getenv("USE_HTTPS", "True").lower() == "true"
+    http_redirect = os.getenv("HTTP_REDIRECT", "True").lower() == "true"
+
+    if SERVER_MODE == "production":
+        if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+            # The src package has already imported prometheus_client in
+            # single-process mode; restart the interpreter with the shared
+            # directory set so the workers inherit multiprocess storage
+            prepare_metrics_dir()
+            os.execv(sys.executable, [sys.executable, "-m", "src.web_server", *sys.argv[1:]])
+        run_production_server(use_https=use_https, http_listener=http_redirect)
+        return
+
+    from src.server import run_server
+
+    debug = os.getenv("FLASK_DEBUG", "False").lower() == "true"
+    run_server(
+        host=SERVER_HOST,
+        port=SERVER_PORT,
+        debug=debug,
+        use_https=use_https,
+        http_redirect=http_redirect,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -44,8 +44,8 @@ function init() {
     registerServiceWorker();
     initNotifications();
 
-    // Refresh device status every 30 seconds
-    setInterval(checkSystemStatus, 30000);
+    // Live updates over /api/events (falls back to polling every 30 seconds)
+    startLiveUpdates();
 
     // Check for voice shortcut parameter (?voice=true)
     const urlParams = new URLSearchParams(window.location.search);
@@ -515,6 +515,7 @@ function setLoading(loading) {
     if (loading) {
         elements.submitBtn.innerHTML = '<span class="spinner"></span>';
     } else {
+        showCommandProgress(null);
         elements.submitBtn.innerHTML = `
             <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
                 <path d="M22 2L11 13M22 2L15 22L11 13L2 9L22 2Z"/>
@@ -531,14 +532,21 @@ async function checkSystemStatus() {
         const response = await fetch("/api/status");
         const data = await response.json();
 
-        updateStatusIndicator(data.system);
-        renderDevices(data.devices || []);
+        applyStatus(data);
     } catch (error) {
         updateStatusIndicator("error");
         renderDevices([]);
     }
 }
 
+/**
+ * Show a status payload (from /api/status or a "status" event)
+ */
+function applyStatus(data) {
+    updateStatusIndicator(data.system);
+    renderDevices(data.devices || []);
+}
+
 /**
  * Render device cards in the dashboard
  */
@@ -1239,13 +1247,29 @@ function toggleTailMode() {
         // Start polling for new entries
         logState.currentPage = 0;
         loadLogs();
-        logState.tailInterval = setInterval(tailLogs, 3000);
+        // New lines arrive as "log" events while the live stream is up
+        if (!liveState.connected) {
+            startTailPolling();
+        }
     } else {
         // Stop polling
-        if (logState.tailInterval) {
-            clearInterval(logState.tailInterval);
-            logState.tailInterval = null;
-        }
+        stopTailPolling();
+    }
+}
+
+/**
+ * Poll /api/logs/tail every 3 seconds (used when the live stream is down)
+ */
+function startTailPolling() {
+    if (!logState.tailInterval) {
+        logState.tailInterval = setInterval(tailLogs, 3000);
+    }
+}
+
+function stopTailPolling() {
+    if (logState.tailInterval) {
+        clearInterval(logState.tailInterval);
+        logState.tailInterval = null;
     }
 }
 
@@ -1269,41 +1293,46 @@ async function tailLogs() {
 
         if (data.success !== false && data.entries && data.entries.length > 0) {
             logState.lastPosition = data.position || 0;
-
-            // Prepend new entries
-            const container = document.getElementById('logs-container');
-            if (container) {
-                const newHtml = data.entries.map(entry => {
-                    const levelClass = `log-level-${entry.level.toLowerCase()}`;
-                    const time = new Date(entry.timestamp).toLocaleTimeString();
-                    const date = new Date(entry.timestamp).toLocaleDateString();
-
-                    return `
-                        <div class="log-entry ${levelClass} log-entry-new">
-                            <span class="log-time" title="${date}">${time}</span>
-                            <span class="log-level">${entry.level}</span>
-                            <span class="log-module">${escapeHtml(entry.module)}</span>
-                            <span class="log-message">${escapeHtml(entry.message)}</span>
-                        </div>
-                    `;
-                }).join('');
-
-                container.insertAdjacentHTML('afterbegin', newHtml);
-
-                // Limit displayed entries
-                const allEntries = container.querySelectorAll('.log-entry');
-                if (allEntries.length > 100) {
-                    for (let i = 100; i < allEntries.length; i++) {
-                        allEntries[i].remove();
-                    }
-                }
-            }
+            prependLogEntries(data.entries);
         }
     } catch (error) {
         console.error('Error tailing logs:', error);
     }
 }
 
+/**
+ * Prepend new entries to the log view (tail mode)
+ */
+function prependLogEntries(entries) {
+    const container = document.getElementById('logs-container');
+    if (!container) return;
+
+    const newHtml = entries.map(entry => {
+        const levelClass = `log-level-${entry.level.toLowerCase()}`;
+        const time = new Date(entry.timestamp).toLocaleTimeString();
+        const date = new Date(entry.timestamp).toLocaleDateString();
+
+        return `
+            <div class="log-entry ${levelClass} log-entry-new">
+                <span class="log-time" title="${date}">${time}</span>
+                <span class="log-level">${entry.level}</span>
+                <span class="log-module">${escapeHtml(entry.module)}</span>
+                <span class="log-message">${escapeHtml(entry.message)}</span>
+            </div>
+        `;
+    }).join('');
+
+    container.insertAdjacentHTML('afterbegin', newHtml);
+
+    // Limit displayed entries
+    const allEntries = container.querySelectorAll('.log-entry');
+    if (allEntries.length > 100) {
+        for (let i = 100; i < allEntries.length; i++) {
+            allEntries[i].remove();
+        }
+    }
+}
+
 /**
  * Export logs to file
  */
@@ -1332,6 +1361,147 @@ async function exportLogs() {
     }
 }
 
+// =============================================================================
+// LIVE UPDATES (server-sent events)
+// =============================================================================
+
+// One /api/events stream replaces the status and log-tail polling; polling
+// resumes whenever the stream is unavailable
+const liveState = {
+    source: null,
+    connected: false,
+    statusInterval: null,
+    retryTimeout: null
+};
+
+// Wait before reopening a stream the server refused (e.g. too many clients)
+const LIVE_RETRY_MS = 60000;
+
+/**
+ * Open the event stream, or poll if the browser has no EventSource
+ */
+function startLiveUpdates() {
+    if (!window.EventSource) {
+        startStatusPolling();
+        return;
+    }
+
+    const source = new EventSource('/api/events');
+    liveState.source = source;
+
+    source.addEventListener('open', () => {
+        liveState.connected = true;
+        stopStatusPolling();
+        stopTailPolling();
+    });
+
+    source.addEventListener('error', () => {
+        liveState.connected = false;
+        startStatusPolling();
+        if (logState.tailMode) {
+            startTailPolling();
+        }
+        // CONNECTING means the browser is already retrying; CLOSED means
+        // the server refused the stream, so try again later
+        if (source.readyState === EventSource.CLOSED) {
+            scheduleLiveRetry();
+        }
+    });
+
+    source.addEventListener('busy', () => {
+        source.close();
+        source.dispatchEvent(new Event('error'));
+    });
+
+    source.addEventListener('resync', () => checkSystemStatus());
+    source.addEventListener('status', (event) => applyStatus(JSON.parse(event.data)));
+    source.addEventListener('log', (event) => {
+        if (logState.tailMode) {
+            prependLogEntries(JSON.parse(event.data).entries.reverse());
+        }
+    });
+    source.addEventListener('timers', (event) => handleTimerEvent(JSON.parse(event.data)));
+    source.addEventListener('reminders', (event) => handleReminderEvent(JSON.parse(event.data)));
+    source.addEventListener('command', (event) => handleCommandEvent(JSON.parse(event.data)));
+}
+
+function scheduleLiveRetry() {
+    if (liveState.retryTimeout) return;
+    liveState.retryTimeout = setTimeout(() => {
+        liveState.retryTimeout = null;
+        startLiveUpdates();
+    }, LIVE_RETRY_MS);
+}
+
+/**
+ * Poll /api/status every 30 seconds (used when the live stream is down)
+ */
+function startStatusPolling() {
+    if (!liveState.statusInterval) {
+        liveState.statusInterval = setInterval(checkSystemStatus, 30000);
+    }
+}
+
+function stopStatusPolling() {
+    if (liveState.statusInterval) {
+        clearInterval(liveState.statusInterval);
+        liveState.statusInterval = null;
+    }
+}
+
+/**
+ * Notify about timers and alarms that just went off
+ */
+function handleTimerEvent(data) {
+    (data.finished_timers || []).forEach(timer => {
+        showNotification('Timer done', {
+            body: timer.name || 'Your timer has finished',
+            tag: `timer-${timer.id}`
+        });
+    });
+    (data.finished_alarms || []).forEach(alarm => {
+        showNotification('Alarm', {
+            body: alarm.name || 'Your alarm is going off',
+            tag: `alarm-${alarm.id}`
+        });
+    });
+}
+
+/**
+ * Notify about reminders that just fired
+ */
+function handleReminderEvent(data) {
+    (data.fired || []).forEach(reminder => {
+        showNotification('Reminder', {
+            body: reminder.message,
+            tag: `reminder-${reminder.id}`
+        });
+    });
+}
+
+/**
+ * Show progress for the command this page is waiting on
+ */
+function handleCommandEvent(data) {
+    const waiting = elements.submitBtn.disabled &&
+        data.command === elements.commandInput.value.trim();
+    if (!waiting) return;
+
+    if (data.stage === 'started') {
+        showCommandProgress('Thinking...');
+    } else if (data.stage === 'tool') {
+        showCommandProgress(`Running ${data.tool.replace(/_/g, ' ')}...`);
+    }
+}
+
+function showCommandProgress(text) {
+    const progress = document.getElementById('command-progress');
+    if (!progress) return;
+
+    progress.textContent = text || '';
+    progress.classList.toggle('hidden', !text);
+}
+
 // Make functions available globally
 window.useHistoryCommand = useHistoryCommand;
 window.toggleDevice = toggleDevice;
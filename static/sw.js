@@ -5,8 +5,12 @@
  * Part of PWA implementation for mobile-optimized experience.
  */
 
-const CACHE_NAME = 'smarthome-v1';
-const CACHE_URLS = [
+// {version, urls} from build-manifest.json, injected into sw.min.js by
+// scripts/build_assets.py; null when serving the unbuilt source
+const PRECACHE_MANIFEST = null;
+
+const CACHE_NAME = PRECACHE_MANIFEST ? 'smarthome-' + PRECACHE_MANIFEST.version : 'smarthome-v2';
+const CACHE_URLS = PRECACHE_MANIFEST ? PRECACHE_MANIFEST.urls : [
     '/',
     '/static/style.css',
     '/static/app.js',
@@ -14,6 +18,9 @@ const CACHE_URLS = [
     '/manifest.json'
 ];
 
+// Content-hashed bundles never change, so cached copies need no refresh
+const IMMUTABLE_PATTERN = /^\/static\/build\/.+\.[0-9a-f]{8}\.min\.(css|js)$/;
+
 // API requests that should never be cached
 const NO_CACHE_PATTERNS = [
     '/api/command',
@@ -23,6 +30,11 @@ const NO_CACHE_PATTERNS = [
     '/api/notifications'
 ];
 
+// Streaming responses the service worker must not touch
+const PASSTHROUGH_PATTERNS = [
+    '/api/events'
+];
+
 /**
  * Install Event - Cache static assets
  */
@@ -80,6 +92,11 @@ self.addEventListener('fetch', (event) => {
         return;
     }
 
+    // Let the browser handle the live event stream directly
+    if (PASSTHROUGH_PATTERNS.some(pattern => url.pathname.startsWith(pattern))) {
+        return;
+    }
+
     // Check if this is an API request that shouldn't be cached
     const isApiRequest = NO_CACHE_PATTERNS.some(pattern =>
         url.pathname.includes(pattern)
@@ -103,7 +120,9 @@ async function cacheFirst(request) {
 
     if (cachedResponse) {
         // Return cached version, but update cache in background
-        fetchAndCache(request);
+        if (!IMMUTABLE_PATTERN.test(new URL(request.url).pathname)) {
+            fetchAndCache(request);
+        }
         return cachedResponse;
     }
 
@@ -358,11 +358,101 @@ def test_api_status_includes_daily_cost(client, authenticated_user, mock_ha_api,
     assert data['daily_cost_usd'] >= 0
 
 
+def test_api_status_reads_states_in_bulk(client, authenticated_user, mock_ha_full):
+    """
+    Test status endpoint uses one state read for all rooms.
+
+    Verifies:
+    - Devices come from a single /api/states request
+    - No per-entity state requests or connection pings are made
+    """
+    from src.cache import get_cache
+
+    get_cache().clear()
+
+    response = client.get('/api/status')
+
+    assert response.status_code == 200
+    assert response.get_json()['devices']
+    urls = [call.request.url for call in mock_ha_full.calls]
+    assert urls == ["http://test-ha.local:8123/api/states"]
+
+
+def test_api_status_etag_not_modified(client, authenticated_user, mock_ha_full):
+    """
+    Test unchanged status polls get 304 Not Modified.
+
+    Verifies:
+    - Response carries an ETag
+    - Revalidating with it returns 304 with no body
+    """
+    first = client.get('/api/status')
+    etag = first.headers.get('ETag')
+
+    second = client.get('/api/status', headers={'If-None-Match': etag})
+
+    assert etag
+    assert second.status_code == 304
+    assert second.data == b''
+
+
+def test_api_status_uses_entity_store_and_weak_etag(client, authenticated_user, mock_ha_full):
+    """
+    Test status looks devices up in the entity store.
+
+    Verifies:
+    - The states list is never rebuilt for a status poll
+    - The ETag is weak, since compression may re-encode the body
+    """
+    from unittest.mock import patch
+
+    from src.ha_client import HomeAssistantClient
+
+    with patch.object(HomeAssistantClient, "get_all_states", side_effect=AssertionError):
+        response = client.get('/api/status')
+
+    assert response.status_code == 200
+    assert response.get_json()['devices']
+    assert response.headers['ETag'].startswith('W/')
+
+
+def test_api_status_disconnected_while_states_served_stale(
+    client, authenticated_user, mock_ha_full
+):
+    """
+    Test status reports HA down when a refresh fails behind cached states.
+
+    Verifies:
+    - A failed /api/states refresh marks HA disconnected even though the
+      cached entity store is still served
+    - The ETag changes, so pollers see the new status
+    """
+    import responses
+
+    from src.ha_client import get_ha_client
+
+    first = client.get('/api/status')
+    assert first.get_json()['home_assistant'] == 'connected'
+
+    mock_ha_full.replace(responses.GET, "http://test-ha.local:8123/api/states", status=503)
+    mock_ha_full.replace(responses.GET, "http://test-ha.local:8123/api/", status=503)
+    ha_client = get_ha_client()
+    # What the background refresh of the stale store does when HA is down
+    assert ha_client._load_all_states() is None
+    assert ha_client.get_all_states()
+
+    second = client.get('/api/status', headers={'If-None-Match': first.headers['ETag']})
+
+    assert second.status_code == 200
+    assert second.get_json()['home_assistant'] == 'disconnected'
+    assert second.headers['ETag'] != first.headers['ETag']
+
+
 # =============================================================================
 # History API Tests
 # =============================================================================
 
-def test_api_history_with_data(client, authenticated_user, usage_db_with_data):
+def test_api_history_with_data(client, authenticated_user, usage_db_with_data, test_db):
     """
     Test history endpoint returns command history.
 
@@ -392,7 +482,7 @@ def test_api_history_with_data(client, authenticated_user, usage_db_with_data):
     assert "turn on living room lights" in data['history'][2]['command']
 
 
-def test_api_history_empty_database(client, authenticated_user, temp_data_dir):
+def test_api_history_empty_database(client, authenticated_user, temp_data_dir, test_db):
     """
     Test history endpoint when database doesn't exist.
 
@@ -411,6 +501,40 @@ def test_api_history_empty_database(client, authenticated_user, temp_data_dir):
     assert data['history'] == []
 
 
+def test_api_history_keyset_pages(client, authenticated_user, test_db):
+    """
+    Test history pages follow next_cursor until the last page.
+
+    Verifies:
+    - Pages are newest first and don't overlap
+    - next_cursor is null on the last page
+    - source filters the pages
+    """
+    from src.database import record_command
+
+    for number in range(5):
+        record_command(command_text=f"command {number}", command_type="web")
+        record_command(command_text=f"voice {number}", command_type="voice")
+
+    first = client.get('/api/history?limit=3&source=web').get_json()
+    second = client.get(f"/api/history?limit=3&source=web&cursor={first['next_cursor']}").get_json()
+
+    assert [entry['command'] for entry in first['history']] == [
+        "command 4", "command 3", "command 2"
+    ]
+    assert [entry['command'] for entry in second['history']] == ["command 1", "command 0"]
+    assert second['next_cursor'] is None
+    assert {entry['source'] for entry in first['history'] + second['history']} == {"web"}
+
+
+def test_api_history_rejects_bad_parameters(client, authenticated_user, test_db):
+    """Test invalid limit, cursor and source are rejected with 400."""
+    assert client.get('/api/history?limit=0').status_code == 400
+    assert client.get('/api/history?limit=500').status_code == 400
+    assert client.get('/api/history?cursor=abc').status_code == 400
+    assert client.get('/api/history?source=fax').status_code == 400
+
+
 # =============================================================================
 # Security Tests
 # =============================================================================
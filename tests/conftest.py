@@ -42,6 +42,13 @@ def mock_env_vars(monkeypatch):
     monkeypatch.setattr("src.config.OPENAI_API_KEY", "test-api-key")
 
 
+@pytest.fixture(autouse=True)
+def isolated_vibe_memo(tmp_path, monkeypatch):
+    """Keep the persistent vibe memo out of DATA_DIR and fresh for every test."""
+    monkeypatch.setattr("src.vibe_memo.DEFAULT_DATABASE_PATH", tmp_path / "vibe_memo.db")
+    monkeypatch.setattr("src.vibe_memo._vibe_memo", None)
+
+
 @pytest.fixture
 def temp_data_dir(tmp_path, monkeypatch):
     """Create a temporary data directory for tests."""
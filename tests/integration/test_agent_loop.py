@@ -448,3 +448,101 @@ class TestAgentConfiguration:
             result = run_agent("test command")
 
         assert "OPENAI_API_KEY" in result or "not configured" in result.lower()
+
+
+class TestAgentDeadline:
+    """Test that run_agent stops making calls once its deadline expires."""
+
+    def test_expired_deadline_skips_llm_call(self, mock_openai):
+        """No LLM request is made after the deadline has passed."""
+        from agent import run_agent, DEADLINE_EXCEEDED_MESSAGE
+        from src.deadline import Deadline
+
+        deadline = Deadline(30)
+        deadline.cancel()
+
+        with patch("agent.openai.OpenAI", return_value=mock_openai):
+            result = run_agent("turn on the lights", deadline=deadline)
+
+        assert result == DEADLINE_EXCEEDED_MESSAGE
+        mock_openai.chat.completions.create.assert_not_called()
+
+    def test_remaining_time_passed_as_timeout(self, mock_openai):
+        """Each LLM request is bounded by the time left on the deadline."""
+        from agent import run_agent
+        from src.deadline import Deadline
+
+        with patch("agent.openai.OpenAI", return_value=mock_openai):
+            run_agent("hello", deadline=Deadline(30))
+
+        timeout = mock_openai.chat.completions.create.call_args.kwargs["timeout"]
+        assert 0 < timeout <= 30
+
+    def test_deadline_expiring_mid_loop_skips_tools(self, mock_openai):
+        """Tool calls are skipped once the deadline expires during the LLM call."""
+        from agent import run_agent, DEADLINE_EXCEEDED_MESSAGE
+        from src.deadline import Deadline
+
+        deadline = Deadline(30)
+        tool_call = MagicMock()
+        tool_call.id = "tool_1"
+        tool_call.function = MagicMock()
+        tool_call.function.name = "get_current_time"
+        tool_call.function.arguments = "{}"
+        tool_msg = MagicMock(content=None, tool_calls=[tool_call])
+        tool_response = MagicMock(
+            choices=[MagicMock(message=tool_msg, finish_reason="tool_calls")],
+            usage=MagicMock(prompt_tokens=10, completion_tokens=5),
+        )
+
+        def create(**kwargs):
+            deadline.cancel()
+            return tool_response
+
+        mock_openai.chat.completions.create.side_effect = create
+
+        with patch("agent.openai.OpenAI", return_value=mock_openai):
+            with patch("agent.execute_tool") as execute_tool:
+                result = run_agent("what time is it?", deadline=deadline)
+
+        assert result == DEADLINE_EXCEEDED_MESSAGE
+        execute_tool.assert_not_called()
+
+
+class TestAsyncAgent:
+    """Test the async agent loop used for cancellable voice commands."""
+
+    def test_arun_agent_tool_then_stop(self, mock_ha_api):
+        """Async agent should execute tools off-loop and return the final text."""
+        from unittest.mock import AsyncMock
+        from agent import arun_agent
+        from src.async_loop import run_sync
+
+        tool_call = MagicMock()
+        tool_call.id = "tool_1"
+        tool_call.function = MagicMock()
+        tool_call.function.name = "get_current_time"
+        tool_call.function.arguments = json.dumps({})
+
+        tool_msg = MagicMock(content=None, tool_calls=[tool_call])
+        tool_response = MagicMock(
+            choices=[MagicMock(message=tool_msg, finish_reason="tool_calls")],
+            usage=MagicMock(prompt_tokens=10, completion_tokens=5),
+        )
+        final_msg = MagicMock(content="It is noon.", tool_calls=None)
+        final_response = MagicMock(
+            choices=[MagicMock(message=final_msg, finish_reason="stop")],
+            usage=MagicMock(prompt_tokens=10, completion_tokens=5),
+        )
+
+        async_client = MagicMock()
+        async_client.chat.completions.create = AsyncMock(
+            side_effect=[tool_response, final_response]
+        )
+
+        with patch("agent.OPENAI_API_KEY", "test-key"):
+            with patch("agent._get_async_openai_client", return_value=async_client):
+                result = run_sync(arun_agent("what time is it?"))
+
+        assert result == "It is noon."
+        assert async_client.chat.completions.create.await_count == 2
@@ -278,3 +278,186 @@ def test_cache_ttl_expiry_integration(ha_client, mock_ha_full, monkeypatch):
         state3 = ha_client.get_state(entity_id)
         # This would be a miss if TTL truly expired, but hard to test without
         # actually waiting or more complex mocking
+
+
+def test_prefetch_warms_cache_for_get_state(ha_client, mock_ha_full):
+    """Test that prefetched states are served from cache and counted as hits."""
+    fetched = ha_client.prefetch_states(["light.living_room", "light.bedroom"])
+    assert fetched == 2
+
+    state = ha_client.get_state("light.living_room")
+    assert state["entity_id"] == "light.living_room"
+
+    cache_stats = ha_client.get_cache_stats()
+    assert cache_stats["hits"] == 1
+    assert cache_stats["misses"] == 0
+
+    prefetch_stats = ha_client.get_prefetch_stats()
+    assert prefetch_stats["issued"] == 2
+    assert prefetch_stats["used"] == 1
+    assert prefetch_stats["pending"] == 1
+    assert prefetch_stats["hit_rate"] == 0.5
+
+
+def test_prefetch_skips_cached_states(ha_client, mock_ha_full):
+    """Test that already-cached states are not fetched again."""
+    ha_client.get_state("light.living_room")
+
+    fetched = ha_client.prefetch_states(["light.living_room"])
+
+    assert fetched == 0
+    assert ha_client.get_prefetch_stats()["skipped"] == 1
+
+
+def test_unused_prefetch_counted_as_wasted(ha_client, mock_ha_full):
+    """Test that prefetches never read within the window are counted as wasted."""
+    from unittest.mock import patch
+
+    import src.ha_client as ha_module
+
+    ha_client.prefetch_states(["light.bedroom"])
+
+    later = ha_module.time.monotonic() + ha_module.PREFETCH_TRACKING_SECONDS + 1
+    with patch("src.ha_client.time.monotonic", return_value=later):
+        stats = ha_client.get_prefetch_stats()
+
+    assert stats["wasted"] == 1
+    assert stats["pending"] == 0
+
+
+def test_prefetch_read_after_cache_expiry_is_wasted(ha_client, mock_ha_full):
+    """Test that a read refetched from HA does not count as a prefetch hit."""
+    import time
+    from unittest.mock import patch
+
+    ha_client.prefetch_states(["light.bedroom"])
+
+    with patch("src.cache.time.time", return_value=time.time() + 3600):
+        ha_client.get_state("light.bedroom")
+
+    stats = ha_client.get_prefetch_stats()
+    assert stats["used"] == 0
+    assert stats["wasted"] == 1
+    assert stats["pending"] == 0
+
+
+def test_service_call_invalidates_only_target_entity(ha_client, mock_ha_full):
+    """Test that a service call invalidates cached state for its entity only."""
+    ha_client.get_state("light.living_room")
+    ha_client.get_state("light.bedroom")
+
+    assert ha_client.turn_off_light("light.living_room") is True
+
+    cache_key = ha_client.cache.make_key("get_state", entity_id="light.living_room")
+    other_key = ha_client.cache.make_key("get_state", entity_id="light.bedroom")
+    assert ha_client.cache.has_key(cache_key) is False
+    assert ha_client.cache.has_key(other_key) is True
+
+
+def test_service_call_writes_changed_states_through(ha_client, mock_ha_full):
+    """Test that changed states returned by a service call update the cache."""
+    import responses
+
+    new_state = {"entity_id": "light.living_room", "state": "off", "attributes": {}}
+    mock_ha_full.replace(
+        responses.POST,
+        "http://test-ha.local:8123/api/services/light/turn_off",
+        json=[new_state],
+        status=200,
+    )
+
+    ha_client.get_state("light.living_room")
+    states_before = ha_client.get_all_states()
+    assert ha_client.turn_off_light("light.living_room") is True
+
+    assert ha_client.get_state("light.living_room")["state"] == "off"
+    states_after = ha_client.get_all_states()
+    assert len(states_after) == len(states_before)
+    living_room = next(s for s in states_after if s["entity_id"] == "light.living_room")
+    assert living_room["state"] == "off"
+
+    # Only the initial full fetch hit /api/states
+    full_fetches = [call for call in mock_ha_full.calls if call.request.url.endswith("/api/states")]
+    assert len(full_fetches) == 1
+
+
+def test_entity_store_cached_and_patched_in_place(ha_client, mock_ha_full):
+    """Test that the cache holds the entity store, not the raw payload."""
+    import responses
+
+    from src.entity_store import EntityStore
+
+    mock_ha_full.replace(
+        responses.POST,
+        "http://test-ha.local:8123/api/services/light/turn_off",
+        json=[{"entity_id": "light.living_room", "state": "off", "attributes": {}}],
+        status=200,
+    )
+
+    store = ha_client.get_entity_store()
+    assert isinstance(ha_client.cache.get("get_all_states"), EntityStore)
+
+    assert ha_client.turn_off_light("light.living_room") is True
+
+    assert ha_client.get_entity_store() is store
+    assert store.get("light.living_room").state == "off"
+
+
+def test_unreported_target_refreshed_individually(ha_client, mock_ha_full):
+    """Test that targets missing from the response are re-fetched one by one."""
+    import responses
+
+    mock_ha_full.replace(
+        responses.POST,
+        "http://test-ha.local:8123/api/services/light/turn_off",
+        json=[],
+        status=200,
+    )
+
+    ha_client.get_all_states()
+    assert ha_client.turn_off_light("light.bedroom") is True
+    ha_client.get_all_states()
+
+    urls = [call.request.url for call in mock_ha_full.calls]
+    assert sum(url.endswith("/api/states") for url in urls) == 1
+    assert any(url.endswith("/api/states/light.bedroom") for url in urls)
+
+
+def test_area_target_invalidates_all_states(ha_client, mock_ha_full):
+    """Test that service calls without entity targets drop cached states."""
+    import responses
+
+    mock_ha_full.add(
+        responses.POST,
+        "http://test-ha.local:8123/api/services/light/turn_on",
+        json=[],
+        status=200,
+    )
+
+    ha_client.get_all_states()
+    ha_client.call_service("light", "turn_on", target={"area_id": "kitchen"})
+
+    assert ha_client.cache.has_key("get_all_states") is False
+
+
+def test_expired_all_states_served_stale_and_refreshed_once(ha_client, mock_ha_full):
+    """Test that an expired state list is served stale with one background fetch."""
+    import time as time_module
+    from unittest.mock import patch
+
+    ha_client.get_all_states()
+    later = time_module.time() + ha_client.cache.default_ttl + 1
+
+    with patch("src.cache.time.time", return_value=later):
+        for _ in range(5):
+            assert len(ha_client.get_all_states()) > 0
+
+    deadline = time_module.time() + 2
+    while time_module.time() < deadline:
+        full_fetches = [c for c in mock_ha_full.calls if c.request.url.endswith("/api/states")]
+        if len(full_fetches) == 2:
+            break
+        time_module.sleep(0.01)
+
+    assert len(full_fetches) == 2
+    assert ha_client.get_cache_stats()["stale_hits"] == 5
@@ -12,6 +12,7 @@ from unittest.mock import Mock, patch
 
 from src.device_registry import DeviceRegistry, DeviceType
 from src.device_organizer import DeviceOrganizer, OrganizationPlan
+from src.entity_store import EntityStore
 from tools.devices import (
     list_devices,
     suggest_room,
@@ -337,7 +338,7 @@ class TestHASyncIntegration:
         """Syncing from HA adds devices to registry."""
         # Mock HA client
         mock_ha_client = Mock()
-        mock_ha_client.get_all_states.return_value = [
+        mock_ha_client.get_entity_store.return_value = EntityStore([
             {
                 "entity_id": "light.new_bulb",
                 "state": "on",
@@ -348,7 +349,7 @@ class TestHASyncIntegration:
                 "state": "off",
                 "attributes": {"friendly_name": "New Smart Plug"},
             },
-        ]
+        ])
 
         mocker.patch("tools.devices.get_device_registry", return_value=registry)
         mocker.patch("src.ha_client.get_ha_client", return_value=mock_ha_client)
@@ -372,13 +373,13 @@ class TestHASyncIntegration:
 
         # Mock HA returning same device
         mock_ha_client = Mock()
-        mock_ha_client.get_all_states.return_value = [
+        mock_ha_client.get_entity_store.return_value = EntityStore([
             {
                 "entity_id": "light.existing",
                 "state": "on",
                 "attributes": {"friendly_name": "Existing Light"},
             },
-        ]
+        ])
 
         new_devices = registry.sync_from_ha(mock_ha_client)
 
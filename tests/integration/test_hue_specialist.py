@@ -237,3 +237,54 @@ def test_list_available_effects():
     # Verify descriptions exist
     assert effects["hue_scenes"]["arctic_aurora"]  # Should have description
     assert "northern lights" in effects["hue_scenes"]["arctic_aurora"].lower()
+
+
+# =============================================================================
+# Memoization and Scene Keyword Matching Tests
+# =============================================================================
+
+def test_interpret_vibe_llm_result_is_memoized(mock_openai):
+    """Test that repeated creative vibes only call the LLM once."""
+    mock_response = create_openai_mock_response(
+        '{"type": "basic", "brightness": 35, "color_temp_kelvin": 2400}'
+    )
+    mock_openai.chat.completions.create.return_value = mock_response
+
+    with patch("tools.hue_specialist.OPENAI_API_KEY", "test-api-key"):
+        with patch("tools.hue_specialist.openai.OpenAI", return_value=mock_openai):
+            first = interpret_vibe_request("rainy bookshop afternoon", room="office")
+            second = interpret_vibe_request("Rainy bookshop afternoon!", room="office")
+
+    assert first["source"] == "llm"
+    assert second["source"] == "memo"
+    assert second["brightness"] == 35
+    mock_openai.chat.completions.create.assert_called_once()
+
+
+def test_interpret_vibe_fallback_is_not_memoized(mock_openai):
+    """Test that fallback interpretations are not stored in the memo."""
+    with patch("tools.hue_specialist.OPENAI_API_KEY", None):
+        interpret_vibe_request("warm and comfortable")
+
+    mock_response = create_openai_mock_response(
+        '{"type": "basic", "brightness": 42, "color_temp_kelvin": 2600}'
+    )
+    mock_openai.chat.completions.create.return_value = mock_response
+
+    with patch("tools.hue_specialist.OPENAI_API_KEY", "test-api-key"):
+        with patch("tools.hue_specialist.openai.OpenAI", return_value=mock_openai):
+            result = interpret_vibe_request("warm and comfortable")
+
+    assert result["source"] == "llm"
+
+
+@pytest.mark.parametrize(
+    "description",
+    ["campfire stories", "merry christmas eve", "aurora borealis", "spaceship disco", "ocean beach party"],
+)
+def test_scene_keyword_regex_matches_substring_scan(description):
+    """Test the compiled keyword regex picks the same scene as a dict-order substring scan."""
+    from tools.hue_specialist import HUE_SCENE_MAPPINGS, _match_scene_keyword
+
+    expected = next(keyword for keyword in HUE_SCENE_MAPPINGS if keyword in description)
+    assert _match_scene_keyword(description) == expected
@@ -9,6 +9,8 @@ Part of WP-7.1: Smart Plug Control.
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
+from src.entity_store import EntityStore
+
 
 # =============================================================================
 # Test Data for Integration Tests
@@ -70,7 +72,7 @@ def mock_ha_client():
         mock_get_client.return_value = client
 
         # Set up default returns
-        client.get_all_states.return_value = MOCK_ALL_STATES
+        client.get_entity_store.return_value = EntityStore(MOCK_ALL_STATES)
         client.call_service.return_value = True
 
         def mock_get_state(entity_id):
@@ -141,6 +141,28 @@ class TestVoiceFlowIntegration:
         # Should have error in response
         assert 'error' in data or 'response' in data
 
+    def test_voice_flow_records_failure_when_handler_raises(self, client, authenticated_user):
+        """
+        Test that a voice command that raises is still recorded in history.
+        """
+        handler = MagicMock()
+        handler.process_command.side_effect = RuntimeError("handler crashed")
+
+        with patch('src.server._get_voice_handler', return_value=handler), \
+                patch('src.server.record_command_result') as mock_record:
+            response = client.post(
+                '/api/voice_command',
+                json={"text": "turn on lights"},
+                content_type='application/json'
+            )
+
+        assert response.status_code == 500
+        mock_record.assert_called_once()
+        assert mock_record.call_args.args == ("turn on lights",)
+        assert mock_record.call_args.kwargs["source"] == "voice"
+        assert mock_record.call_args.kwargs["success"] is False
+        assert mock_record.call_args.kwargs["error_message"] == "handler crashed"
+
     def test_voice_flow_with_context(self, client, authenticated_user, mock_agent_response):
         """
         Test that device context is preserved through the flow.
@@ -289,6 +289,104 @@ class TestCommandHistory:
         # Due to DESC ordering, offset=5 skips newest 5
         assert history[0]["command_text"] == "command 4"
 
+    def test_get_command_history_page_cursor(self, test_db):
+        """Should page newest first from a keyset cursor."""
+        from src.database import get_command_history_page, record_command
+
+        for i in range(5):
+            record_command(command_text=f"command {i}")
+
+        first, cursor = get_command_history_page(limit=2)
+        second, _ = get_command_history_page(limit=2, before_id=cursor)
+        last, end = get_command_history_page(limit=2, before_id=second[-1]["id"])
+
+        assert [row["command_text"] for row in first] == ["command 4", "command 3"]
+        assert [row["command_text"] for row in second] == ["command 2", "command 1"]
+        assert [row["command_text"] for row in last] == ["command 0"]
+        assert end is None
+
+    def test_source_page_uses_covering_index(self, test_db):
+        """Source-filtered pages should be served from the covering index."""
+        from src.database import get_cursor
+
+        with get_cursor() as cursor:
+            plan = cursor.execute("""
+                EXPLAIN QUERY PLAN
+                SELECT id, command_text, command_type, result, created_at
+                FROM command_history
+                WHERE command_type = 'voice' AND id < 100
+                ORDER BY id DESC LIMIT 21
+            """).fetchall()
+
+        plan_text = " ".join(row["detail"] for row in plan)
+        assert "COVERING INDEX idx_command_history_source_page" in plan_text
+        assert "TEMP B-TREE" not in plan_text
+
+    def test_record_command_result_never_raises(self, test_db, monkeypatch):
+        """History failures shouldn't break command processing."""
+        import sqlite3
+
+        from src import database
+
+        def fail(**kwargs):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(database, "record_command", fail)
+
+        database.record_command_result("lights on", source="web", success=True)
+
+    def test_legacy_usage_commands_migrated(self, temp_data_dir, monkeypatch):
+        """Commands in usage.db should be copied into an empty history once."""
+        import sqlite3
+
+        from src import database
+
+        with sqlite3.connect(temp_data_dir / "usage.db") as conn:
+            conn.execute(
+                "CREATE TABLE api_usage (id INTEGER PRIMARY KEY, timestamp TEXT, command TEXT)"
+            )
+            conn.executemany(
+                "INSERT INTO api_usage (timestamp, command) VALUES (?, ?)",
+                [
+                    ("2025-12-18T10:00:00", "lights on"),
+                    ("2025-12-18T10:00:00", "lights on"),
+                    ("2025-12-18T10:05:00", "lights off"),
+                ],
+            )
+        monkeypatch.setattr(database, "DATABASE_PATH", temp_data_dir / "history.db")
+
+        database.initialize_database()
+        database.initialize_database()
+
+        history = database.get_command_history()
+        assert [row["command_text"] for row in history] == ["lights off", "lights on"]
+
+    def test_migrated_timestamps_match_new_rows(self, temp_data_dir, monkeypatch):
+        """Migrated local ISO timestamps should become UTC like CURRENT_TIMESTAMP."""
+        import re
+        import sqlite3
+        from datetime import datetime, timezone
+
+        from src import database
+
+        with sqlite3.connect(temp_data_dir / "usage.db") as conn:
+            conn.execute(
+                "CREATE TABLE api_usage (id INTEGER PRIMARY KEY, timestamp TEXT, command TEXT)"
+            )
+            conn.execute(
+                "INSERT INTO api_usage (timestamp, command) VALUES (?, ?)",
+                ("2025-12-18T10:05:00.123456", "lights off"),
+            )
+        monkeypatch.setattr(database, "DATABASE_PATH", temp_data_dir / "history.db")
+
+        database.initialize_database()
+        database.record_command(command_text="lights on", command_type="web")
+
+        rows, _ = database.get_command_history_page()
+        expected = datetime(2025, 12, 18, 10, 5).astimezone(timezone.utc)
+        assert rows[1]["created_at"] == expected.strftime("%Y-%m-%d %H:%M:%S")
+        assert re.fullmatch(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d", rows[0]["created_at"])
+
 
 class TestAPIUsageTracking:
     """Test API usage tracking and aggregation."""
@@ -449,3 +449,89 @@ class TestDatabaseStats:
         for index_stat in stats:
             assert "name" in index_stat
             assert "table" in index_stat
+
+
+class TestReadFastPath:
+    """Test the pooled, lazily decoded read path."""
+
+    def test_json_columns_decode_on_access(self, test_db):
+        """JSON columns should stay encoded until read."""
+        from src.database import get_all_devices, register_device
+
+        register_device(
+            entity_id="light.lazy", device_type="light", capabilities=["brightness"]
+        )
+
+        device = get_all_devices()[0]
+
+        assert dict.__getitem__(device, "capabilities") == '["brightness"]'
+        assert device["capabilities"] == ["brightness"]
+        assert device.get("metadata") is None
+
+    def test_lazy_rows_behave_like_decoded_dicts(self, test_db):
+        """Copies, comparisons and JSON encoding should see decoded values."""
+        import json
+        from src.database import get_device, register_device
+
+        register_device(
+            entity_id="light.lazy",
+            device_type="light",
+            metadata={"device_class": "bulb"},
+        )
+
+        device = get_device("light.lazy")
+
+        assert dict(device)["metadata"] == {"device_class": "bulb"}
+        assert {**device}["metadata"] == {"device_class": "bulb"}
+        assert json.loads(json.dumps(device))["metadata"] == {"device_class": "bulb"}
+        assert device == {**device}
+
+    def test_tuple_rows(self, test_db):
+        """Bulk paths should be able to skip dict construction."""
+        from src.database import fetch_rows, get_device_entity_ids, register_device
+
+        register_device(entity_id="light.a", device_type="light")
+        register_device(entity_id="switch.b", device_type="switch")
+
+        rows = fetch_rows(
+            "test_tuples", "SELECT entity_id FROM devices ORDER BY entity_id", as_tuples=True
+        )
+
+        assert rows == [("light.a",), ("switch.b",)]
+        assert sorted(get_device_entity_ids()) == ["light.a", "switch.b"]
+
+    def test_statement_latency_is_recorded(self, test_db):
+        """Each fast-path statement should feed its own histogram series."""
+        from prometheus_client import REGISTRY
+        from src.database import get_command_history, record_command
+
+        def observed():
+            return REGISTRY.get_sample_value(
+                "smarthome_db_query_duration_seconds_count",
+                {"statement": "get_command_history"},
+            ) or 0
+
+        before = observed()
+        record_command(command_text="lights on", interpreted_action={"action": "on"})
+
+        history = get_command_history(limit=1)
+
+        assert history[0]["interpreted_action"] == {"action": "on"}
+        assert observed() == before + 1
+
+    def test_pool_drops_connections_to_previous_database(self, test_db, tmp_path, monkeypatch):
+        """Pooled connections should follow DATABASE_PATH changes."""
+        from src import database
+
+        first = database.get_pooled_connection()
+        database.release_connection(first)
+
+        other_path = tmp_path / "other.db"
+        monkeypatch.setattr("src.database.DATABASE_PATH", other_path)
+        database.initialize_database()
+
+        connection = database.get_pooled_connection()
+        try:
+            assert connection.database_path == other_path
+        finally:
+            database.release_connection(connection)
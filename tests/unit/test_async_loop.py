@@ -0,0 +1,101 @@
+"""
+Tests for src/async_loop.py - Shared async event loop
+
+Covers running coroutines from sync code, cancellation on timeout, and
+reuse of a single long-lived loop.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.async_loop import EventLoopThread, get_event_loop_thread, run_sync
+
+
+class TestEventLoopThread:
+    """Tests for the background event loop thread."""
+
+    @pytest.fixture
+    def loop_thread(self):
+        """Create an isolated loop thread and stop it afterwards."""
+        loop_thread = EventLoopThread(name="test-async-loop")
+        yield loop_thread
+        loop_thread.stop()
+
+    def test_run_sync_returns_result(self, loop_thread):
+        """Coroutine results are returned to the sync caller."""
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        assert loop_thread.run_sync(add(2, 3)) == 5
+
+    def test_run_sync_propagates_exceptions(self, loop_thread):
+        """Exceptions raised in the coroutine reach the caller."""
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            loop_thread.run_sync(fail())
+
+    def test_timeout_cancels_task(self, loop_thread):
+        """A timeout raises TimeoutError and cancels the running task."""
+        cancelled = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            loop_thread.run_sync(slow(), timeout=0.1)
+
+        assert cancelled.wait(2)
+
+    def test_loop_is_reused(self, loop_thread):
+        """All coroutines run on the same loop."""
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = loop_thread.run_sync(current_loop())
+        second = loop_thread.run_sync(current_loop())
+
+        assert first is second is loop_thread.loop
+
+    def test_run_sync_from_loop_thread_raises(self, loop_thread):
+        """Blocking on the loop from the loop thread is rejected instead of deadlocking."""
+        async def nested():
+            async def inner():
+                return 1
+            return loop_thread.run_sync(inner())
+
+        with pytest.raises(RuntimeError):
+            loop_thread.run_sync(nested())
+
+    def test_stop_and_restart(self, loop_thread):
+        """A stopped loop thread restarts on next use."""
+        async def value():
+            return "ok"
+
+        loop_thread.run_sync(value())
+        loop_thread.stop()
+
+        assert loop_thread.run_sync(value()) == "ok"
+
+
+class TestSharedLoop:
+    """Tests for the process-wide singleton."""
+
+    def test_singleton(self):
+        """get_event_loop_thread returns the same instance."""
+        assert get_event_loop_thread() is get_event_loop_thread()
+
+    def test_module_run_sync(self):
+        """Module-level run_sync uses the shared loop."""
+        async def value():
+            return 42
+
+        assert run_sync(value()) == 42
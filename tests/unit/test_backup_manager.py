@@ -0,0 +1,135 @@
+"""
+Unit tests for online database backups.
+"""
+
+import gzip
+import json
+import sqlite3
+
+import pytest
+
+from src.backup_manager import BackupManager
+
+
+def make_database(path, rows=2000):
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("CREATE TABLE readings (id INTEGER PRIMARY KEY, payload TEXT)")
+    connection.executemany(
+        "INSERT INTO readings (payload) VALUES (?)", (("x" * 200,) for _ in range(rows))
+    )
+    connection.commit()
+    return connection
+
+
+def count_rows(path):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT COUNT(*) FROM readings").fetchone()[0]
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def manager():
+    return BackupManager(pages_per_step=16, step_sleep_seconds=0)
+
+
+class TestBackupDatabase:
+    """Tests for single-database backups."""
+
+    def test_copies_in_page_batches(self, manager, tmp_path):
+        source = make_database(tmp_path / "source.db")
+
+        result = manager.backup_database(tmp_path / "source.db", tmp_path / "out" / "source.db")
+        source.close()
+
+        assert result.success
+        assert result.steps > 1
+        assert result.pages_per_second > 0
+        assert count_rows(tmp_path / "out" / "source.db") == 2000
+        assert not (tmp_path / "out" / "source.db.partial").exists()
+
+    def test_includes_uncheckpointed_wal_writes(self, manager, tmp_path):
+        source = make_database(tmp_path / "source.db")
+        source.execute("INSERT INTO readings (payload) VALUES ('late')")
+        source.commit()
+
+        manager.backup_database(tmp_path / "source.db", tmp_path / "copy.db")
+        source.close()
+
+        assert count_rows(tmp_path / "copy.db") == 2001
+
+    def test_compressed_output(self, manager, tmp_path):
+        make_database(tmp_path / "source.db").close()
+
+        result = manager.backup_database(tmp_path / "source.db", tmp_path / "copy.db", compress=True)
+
+        assert result.destination == str(tmp_path / "copy.db.gz")
+        restored = tmp_path / "restored.db"
+        restored.write_bytes(gzip.decompress((tmp_path / "copy.db.gz").read_bytes()))
+        assert count_rows(restored) == 2000
+
+    def test_missing_source_is_skipped(self, manager, tmp_path):
+        result = manager.backup_database(tmp_path / "absent.db", tmp_path / "copy.db")
+
+        assert result.skipped
+        assert not result.success
+        assert not (tmp_path / "copy.db").exists()
+
+    def test_invalid_source_reports_failure(self, manager, tmp_path):
+        (tmp_path / "broken.db").write_bytes(b"not a database" * 100)
+
+        result = manager.backup_database(tmp_path / "broken.db", tmp_path / "copy.db")
+
+        assert not result.success
+        assert result.error
+        assert list(tmp_path.glob("copy.db*")) == []
+
+
+class TestBackupAll:
+    """Tests for backing up a set of databases."""
+
+    def test_writes_each_database_and_manifest(self, manager, tmp_path):
+        make_database(tmp_path / "timers.db").close()
+        make_database(tmp_path / "todos.db", rows=10).close()
+        databases = {
+            "timers": tmp_path / "timers.db",
+            "todos": tmp_path / "todos.db",
+            "presence": tmp_path / "presence.db",
+        }
+
+        results = manager.backup_all(tmp_path / "backup", databases=databases)
+
+        assert [result.success for result in results] == [True, True, False]
+        assert count_rows(tmp_path / "backup" / "todos.db") == 10
+        manifest = json.loads((tmp_path / "backup" / "manifest.json").read_text())
+        assert [entry["name"] for entry in manifest["databases"]] == ["timers", "todos", "presence"]
+        assert manifest["databases"][2]["skipped"] is True
+
+
+class TestProjectDatabases:
+    """Tests for project_databases()."""
+
+    def test_discovers_unlisted_databases(self, tmp_path, monkeypatch):
+        from src.backup_manager import project_databases
+
+        monkeypatch.setattr("src.config.DATA_DIR", tmp_path)
+        for filename in ("improvements.db", "new_feature.db", "shared_cache.db"):
+            make_database(tmp_path / filename, rows=1).close()
+
+        paths = project_databases()
+
+        assert paths["improvements"] == tmp_path / "improvements.db"
+        assert paths["new_feature"] == tmp_path / "new_feature.db"
+        assert tmp_path / "shared_cache.db" not in paths.values()
+
+
+class TestCreateBackup:
+    """Tests for database.create_backup on top of the backup manager."""
+
+    def test_compressed_backup_of_main_database(self, test_db, tmp_path):
+        from src.database import create_backup
+
+        assert create_backup(str(tmp_path / "smarthome.db"), compress=True) is True
+        assert (tmp_path / "smarthome.db.gz").exists()
@@ -359,3 +359,362 @@ def test_cache_with_none_values():
     result2 = cache.get("missing_key")
     assert result2 is None
     assert cache.get_stats()["misses"] == initial_misses + 1  # Miss
+
+
+def test_cache_invalidate_tag():
+    """Test that tag invalidation removes only the tagged keys."""
+    from src.cache import CacheManager, entity_tag
+
+    cache = CacheManager()
+
+    cache.set("get_state:aaa", "kitchen", tags=[entity_tag("light.kitchen")])
+    cache.set("light_detail:bbb", "kitchen detail", tags=[entity_tag("light.kitchen")])
+    cache.set("get_state:ccc", "bedroom", tags=[entity_tag("light.bedroom")])
+
+    assert cache.invalidate_tag(entity_tag("light.kitchen")) == 2
+
+    assert cache.get("get_state:aaa") is None
+    assert cache.get("light_detail:bbb") is None
+    assert cache.get("get_state:ccc") == "bedroom"
+    assert cache.invalidate_tag(entity_tag("light.kitchen")) == 0
+
+
+def test_cache_invalidate_namespace():
+    """Test namespace invalidation and the "<namespace>:*" pattern fast path."""
+    from src.cache import CacheManager
+
+    cache = CacheManager()
+
+    cache.set("get_state:aaa", 1)
+    cache.set("get_state:bbb", 2)
+    cache.set("get_all_states", 3)
+
+    assert cache.invalidate_namespace("get_state") == 2
+    assert cache.get("get_all_states") == 3
+
+    cache.set("get_state:ccc", 4)
+    assert cache.invalidate_pattern("get_state:*") == 1
+    assert cache.invalidate_pattern("get_all_states") == 1
+
+
+def test_cache_tag_index_cleaned_on_eviction_and_overwrite():
+    """Test that evicted or retagged keys are dropped from the tag index."""
+    from src.cache import CacheManager
+
+    cache = CacheManager(max_size=1, default_ttl=None)
+
+    cache.set("a", 1, tags=["t1"])
+    cache.set("a", 2, tags=["t2"])
+    assert cache.invalidate_tag("t1") == 0
+
+    cache.set("b", 3, tags=["t2"])  # Evicts "a"
+    assert cache._tag_index["t2"] == {"b"}
+
+
+def test_cache_sharded_operations():
+    """Test that a sharded cache behaves like a single cache."""
+    from src.cache import CacheManager
+
+    cache = CacheManager(max_size=100, default_ttl=None, num_shards=4)
+
+    for i in range(50):
+        cache.set(f"key:{i}", i, tags=["even" if i % 2 == 0 else "odd"])
+
+    assert cache.get("key:7") == 7
+    assert cache.get_stats()["size"] == 50
+
+    assert cache.invalidate_tag("even") == 25
+    assert cache.invalidate_pattern("key:1*") == 6  # 1, 11, 13, 15, 17, 19
+    assert cache.get_stats()["size"] == 19
+
+    cache.clear()
+    assert cache.get_stats()["size"] == 0
+    assert cache._tag_index == {}
+
+
+def test_cache_concurrent_access():
+    """Test concurrent get/set/invalidate from many threads."""
+    import threading
+
+    from src.cache import CacheManager
+
+    cache = CacheManager(max_size=50, default_ttl=None, num_shards=4)
+    errors = []
+
+    def worker(worker_id):
+        try:
+            for i in range(500):
+                key = f"state:{i % 60}"
+                cache.set(key, worker_id, tags=[f"entity:{i % 60}"])
+                cache.get(key)
+                if i % 25 == 0:
+                    cache.invalidate_tag(f"entity:{i % 60}")
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.get_stats()["size"] <= 52  # 4 shards x ceil(50 / 4)
+
+
+def test_cache_update_keeps_expiry_and_tags():
+    """Test that update() replaces the value in place without resetting TTL."""
+    from src.cache import CacheManager
+
+    cache = CacheManager(default_ttl=10)
+
+    with patch("src.cache.time.time", return_value=1000.0):
+        cache.set("states", [1], tags=["t"])
+
+    with patch("src.cache.time.time", return_value=1005.0):
+        assert cache.update("states", lambda value: value + [2]) == [1, 2]
+        assert cache.get("states") == [1, 2]
+
+    with patch("src.cache.time.time", return_value=1011.0):
+        assert cache.get("states") is None
+
+    assert cache.update("missing", lambda value: value, default="none") == "none"
+
+
+def test_get_or_load_caches_loader_result():
+    """Test that get_or_load only calls the loader on a miss."""
+    from unittest.mock import Mock
+
+    from src.cache import CacheManager
+
+    cache = CacheManager()
+    loader = Mock(return_value="value")
+
+    assert cache.get_or_load("key", loader) == "value"
+    assert cache.get_or_load("key", loader) == "value"
+    assert loader.call_count == 1
+
+
+def test_get_or_load_does_not_cache_none():
+    """Test that a None loader result is returned but not cached."""
+    from unittest.mock import Mock
+
+    from src.cache import CacheManager
+
+    cache = CacheManager()
+    loader = Mock(return_value=None)
+
+    assert cache.get_or_load("key", loader) is None
+    assert cache.get_or_load("key", loader) is None
+    assert loader.call_count == 2
+
+
+def test_get_or_load_single_flight():
+    """Test that concurrent misses share a single loader call."""
+    import threading
+
+    from src.cache import CacheManager
+
+    cache = CacheManager()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(2)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("key", loader)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+
+    # Wait until the followers are queued behind the leader
+    deadline = time.time() + 2
+    while cache.get_stats()["coalesced"] < 4 and time.time() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+    assert cache.get_stats()["coalesced"] == 4
+
+
+def test_get_or_load_single_flight_propagates_errors():
+    """Test that a failed load raises for the caller and leaves nothing in flight."""
+    from src.cache import CacheManager
+
+    cache = CacheManager()
+
+    def failing_loader():
+        raise RuntimeError("HA unavailable")
+
+    with pytest.raises(RuntimeError, match="HA unavailable"):
+        cache.get_or_load("key", failing_loader)
+
+    assert cache.get_or_load("key", lambda: "recovered") == "recovered"
+
+
+def test_get_or_load_serves_stale_while_revalidating():
+    """Test that expired values are served stale while one refresh runs."""
+    import threading
+
+    from src.cache import CacheManager, CachePolicy
+
+    cache = CacheManager(default_ttl=10)
+    cache.set_policy("states", CachePolicy(stale_seconds=30))
+
+    with patch("src.cache.time.time", return_value=1000.0):
+        cache.get_or_load("states", lambda: "old")
+
+    refreshed = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        release.wait(2)
+        refreshed.set()
+        return "new"
+
+    with patch("src.cache.time.time", return_value=1015.0):
+        assert cache.get_or_load("states", slow_loader) == "old"
+        assert cache.get_or_load("states", slow_loader) == "old"
+
+    release.set()
+    assert refreshed.wait(2)
+    deadline = time.time() + 2
+    while cache.get("states") != "new" and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert cache.get("states") == "new"
+    assert len(calls) == 1
+    assert cache.get_stats()["stale_hits"] == 2
+
+
+def test_get_or_load_past_stale_window_blocks():
+    """Test that values past the stale window are reloaded synchronously."""
+    from src.cache import CacheManager, CachePolicy
+
+    cache = CacheManager(default_ttl=10)
+    cache.set_policy("states", CachePolicy(stale_seconds=30))
+
+    with patch("src.cache.time.time", return_value=1000.0):
+        cache.get_or_load("states", lambda: "old")
+
+    with patch("src.cache.time.time", return_value=1050.0):
+        assert cache.get_or_load("states", lambda: "new") == "new"
+
+
+def test_load_does_not_overwrite_write_during_load():
+    """Test that a load started before a write-through doesn't replace it."""
+    from src.cache import CacheManager
+
+    cache = CacheManager()
+
+    def loader():
+        # A service call writes the new state while the old one is in flight
+        cache.set("state:light", "on")
+        return "off"
+
+    assert cache.get_or_load("state:light", loader) == "off"
+    assert cache.get("state:light") == "on"
+
+
+def test_load_not_cached_after_tag_invalidation():
+    """Test that invalidating a tag mid-load keeps the loaded value out."""
+    from src.cache import CacheManager, entity_tag
+
+    cache = CacheManager()
+
+    def loader():
+        cache.invalidate_tag(entity_tag("light.kitchen"))
+        return "stale"
+
+    tags = [entity_tag("light.kitchen")]
+    assert cache.get_or_load("state:kitchen", loader, tags=tags) == "stale"
+    assert cache.has_key("state:kitchen") is False
+    assert cache.get_or_load("state:kitchen", lambda: "fresh", tags=tags) == "fresh"
+
+
+def test_invalidation_drops_inflight_load():
+    """Test that callers after an invalidation don't join the older load."""
+    import threading
+
+    from src.cache import CacheManager
+
+    cache = CacheManager()
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def old_loader():
+        started.set()
+        release.wait(2)
+        return "old"
+
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_load("key", old_loader)))
+    leader.start()
+    assert started.wait(2)
+
+    cache.delete("key")
+    assert cache.get_or_load("key", lambda: "new") == "new"
+
+    release.set()
+    leader.join()
+    assert results == ["old"]
+    assert cache.get("key") == "new"
+
+
+def test_background_refresh_discarded_after_delete():
+    """Test that a stale refresh finishing after a delete isn't cached."""
+    import threading
+
+    from src.cache import CacheManager, CachePolicy
+
+    cache = CacheManager(default_ttl=10)
+    cache.set_policy("states", CachePolicy(stale_seconds=30))
+
+    with patch("src.cache.time.time", return_value=1000.0):
+        cache.get_or_load("states", lambda: "old")
+
+    started = threading.Event()
+    release = threading.Event()
+    finished = threading.Event()
+
+    def slow_loader():
+        started.set()
+        release.wait(2)
+        finished.set()
+        return "refreshed before delete"
+
+    with patch("src.cache.time.time", return_value=1015.0):
+        assert cache.get_or_load("states", slow_loader) == "old"
+    assert started.wait(2)
+
+    cache.delete("states")
+    release.set()
+    assert finished.wait(2)
+    deadline = time.time() + 2
+    while cache.get_stats()["size"] and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+
+    assert cache.has_key("states") is False
+
+
+def test_policy_applies_per_key_family():
+    """Test that policies are looked up by key namespace."""
+    from src.cache import DEFAULT_POLICY, CacheManager, CachePolicy
+
+    cache = CacheManager()
+    policy = CachePolicy(stale_seconds=5, single_flight=False)
+    cache.set_policy("get_state", policy)
+
+    assert cache.get_policy("get_state:abc123") is policy
+    assert cache.get_policy("get_all_states") is DEFAULT_POLICY
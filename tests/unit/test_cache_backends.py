@@ -0,0 +1,154 @@
+"""
+Tests for src/cache_backends.py - Shared L2 cache tier
+
+Covers the SQLite backend on its own and a CacheManager using it as L2,
+including two CacheManager instances sharing one file (as separate
+processes on one host would).
+"""
+
+import time
+
+import pytest
+
+from src.cache import CacheManager, entity_tag
+from src.cache_backends import SQLiteCacheBackend
+
+
+@pytest.fixture
+def backend(tmp_path):
+    """Create a SQLite backend in a temporary directory."""
+    return SQLiteCacheBackend(tmp_path / "shared_cache.db")
+
+
+class TestSQLiteCacheBackend:
+    """Tests for the SQLite backend."""
+
+    def test_set_and_get(self, backend):
+        """Values round-trip with their expiry and tags."""
+        backend.set("get_state:abc", {"state": "on"}, 123.0, ["entity:light.kitchen"])
+
+        value, expiry_time, tags = backend.get("get_state:abc")
+        assert value == {"state": "on"}
+        assert expiry_time == 123.0
+        assert tags == frozenset({"entity:light.kitchen"})
+
+    def test_missing_key(self, backend):
+        """Missing keys return None."""
+        assert backend.get("missing") is None
+
+    def test_unserializable_value_skipped(self, backend):
+        """Values that aren't JSON-serializable are not stored."""
+        backend.set("key", object(), None, [])
+        assert backend.get("key") is None
+
+    def test_delete_tag(self, backend):
+        """Deleting a tag removes every key carrying it."""
+        backend.set("a", 1, None, ["t1"])
+        backend.set("b", 2, None, ["t1", "t2"])
+        backend.set("c", 3, None, ["t2"])
+
+        backend.delete_tag("t1")
+
+        assert backend.get("a") is None
+        assert backend.get("b") is None
+        assert backend.get("c")[0] == 3
+
+    def test_delete_pattern(self, backend):
+        """Glob patterns delete matching keys."""
+        backend.set("user:1:profile", 1, None, [])
+        backend.set("user:2:profile", 2, None, [])
+
+        backend.delete_pattern("user:1:*")
+
+        assert backend.get("user:1:profile") is None
+        assert backend.get("user:2:profile") is not None
+
+    def test_purge_expired_and_trims(self, tmp_path):
+        """Purge drops long-expired rows and trims to max_entries."""
+        backend = SQLiteCacheBackend(tmp_path / "cache.db", max_entries=2)
+        backend.set("old", 1, time.time() - 3600, [])
+        for i in range(3):
+            backend.set(f"key{i}", i, time.time() + 60 + i, [])
+
+        backend.purge()
+
+        assert backend.get("old") is None
+        assert backend.size() == 2
+        assert backend.get("key0") is None
+
+
+class TestCacheManagerWithBackend:
+    """Tests for CacheManager using an L2 backend."""
+
+    def test_l1_miss_filled_from_l2(self, backend):
+        """A value written by one manager is visible to another sharing the backend."""
+        writer = CacheManager(backend=backend)
+        reader = CacheManager(backend=SQLiteCacheBackend(backend.database_path))
+
+        writer.set("get_all_states", [{"entity_id": "light.kitchen"}])
+
+        assert reader.get("get_all_states") == [{"entity_id": "light.kitchen"}]
+        assert reader.get_stats()["l2_hits"] == 1
+        assert reader.get_stats()["backend"] == "sqlite"
+
+    def test_get_or_load_uses_l2_before_loader(self, backend):
+        """get_or_load doesn't call the loader when L2 has the value."""
+        CacheManager(backend=backend).set("get_all_states", ["shared"])
+        reader = CacheManager(backend=backend)
+
+        assert reader.get_or_load("get_all_states", lambda: ["loaded"]) == ["shared"]
+
+    def test_tag_invalidation_reaches_l2(self, backend):
+        """Invalidating a tag removes the key for other managers too."""
+        writer = CacheManager(backend=backend)
+        other = CacheManager(backend=backend)
+        writer.set("get_state:abc", {"state": "on"}, tags=[entity_tag("light.kitchen")])
+
+        other.invalidate_tag(entity_tag("light.kitchen"))
+
+        assert CacheManager(backend=backend).get("get_state:abc") is None
+
+    def test_newer_l2_value_replaces_expired_l1(self, backend):
+        """An expired L1 entry is replaced by a fresher L2 copy."""
+        reader = CacheManager(default_ttl=10, backend=backend)
+        writer = CacheManager(default_ttl=10, backend=backend)
+        reader.set("key", "old")
+
+        later = time.time() + 15
+        from unittest.mock import patch
+
+        with patch("src.cache.time.time", return_value=later):
+            writer.set("key", "new")
+            assert reader.get("key") == "new"
+
+    def test_update_writes_through(self, backend):
+        """update() changes are visible through L2."""
+        writer = CacheManager(backend=backend)
+        writer.set("states", [1])
+
+        writer.update("states", lambda states: states + [2])
+
+        assert CacheManager(backend=backend).get("states") == [1, 2]
+
+    def test_policy_encodes_values_for_l2(self, backend):
+        """Values that aren't JSON are shared through the policy's codec."""
+        from src.cache import CachePolicy
+        from src.entity_store import EntityStore
+
+        policy = CachePolicy(backend_encode=EntityStore.to_states, backend_decode=EntityStore)
+        writer = CacheManager(backend=backend)
+        reader = CacheManager(backend=SQLiteCacheBackend(backend.database_path))
+        writer.set_policy("get_all_states", policy)
+        reader.set_policy("get_all_states", policy)
+
+        states = [{"entity_id": "light.kitchen", "state": "on", "attributes": {}}]
+        writer.set("get_all_states", EntityStore(states))
+        writer.update(
+            "get_all_states",
+            lambda store: store.update([{"entity_id": "light.kitchen", "state": "off"}]),
+        )
+
+        shared = reader.get("get_all_states")
+        assert isinstance(shared, EntityStore)
+        assert shared.get("light.kitchen").state == "off"
+        assert reader.get_stats()["l2_hits"] == 1
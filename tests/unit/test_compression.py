@@ -0,0 +1,126 @@
+"""
+Unit tests for response compression and conditional GET.
+"""
+
+import gzip
+import json
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask, Response, jsonify
+from prometheus_client import REGISTRY
+
+from src.compression import init_compression
+
+
+ENTRIES = [{"level": "INFO", "message": f"Turned on light {number}"} for number in range(200)]
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    init_compression(app)
+
+    @app.route("/large")
+    def large():
+        return jsonify({"entries": ENTRIES})
+
+    @app.route("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.route("/page")
+    def page():
+        return Response("<input name=csrf_token value=secret>" * 200, mimetype="text/html")
+
+    @app.route("/stream")
+    def stream():
+        return Response((chunk for chunk in ["data: 1\n\n"] * 200), mimetype="text/event-stream")
+
+    return app.test_client()
+
+
+def bytes_saved(endpoint, reason):
+    value = REGISTRY.get_sample_value(
+        "smarthome_response_bytes_saved_total", {"endpoint": endpoint, "reason": reason}
+    )
+    return value or 0
+
+
+class TestCompression:
+    """Tests for content negotiation and compression."""
+
+    def test_large_json_is_gzipped(self, client):
+        before = bytes_saved("/large", "gzip")
+
+        response = client.get("/large", headers={"Accept-Encoding": "gzip, deflate"})
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert json.loads(gzip.decompress(response.data)) == {"entries": ENTRIES}
+        assert int(response.headers["Content-Length"]) == len(response.data)
+        assert bytes_saved("/large", "gzip") > before
+
+    def test_small_response_is_not_compressed(self, client):
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "Content-Encoding" not in response.headers
+        assert response.get_json() == {"ok": True}
+
+    def test_no_accept_encoding_sends_identity(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "gzip;q=0"})
+
+        assert "Content-Encoding" not in response.headers
+        assert response.get_json() == {"entries": ENTRIES}
+
+    def test_brotli_preferred_when_available(self, client, monkeypatch):
+        monkeypatch.setattr("src.compression.HAS_BROTLI", True)
+        monkeypatch.setattr(
+            "src.compression.brotli",
+            SimpleNamespace(compress=lambda body, quality: b"br:" + gzip.compress(body)),
+            raising=False,
+        )
+
+        response = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+
+        assert response.headers["Content-Encoding"] == "br"
+
+    def test_html_is_not_compressed(self, client):
+        response = client.get("/page", headers={"Accept-Encoding": "gzip"})
+
+        assert "Content-Encoding" not in response.headers
+        assert response.data.startswith(b"<input name=csrf_token")
+
+    def test_streamed_responses_pass_through(self, client):
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert "Content-Encoding" not in response.headers
+        assert "ETag" not in response.headers
+
+
+class TestConditionalGet:
+    """Tests for weak ETags and 304 responses."""
+
+    def test_weak_etag_and_not_modified(self, client):
+        first = client.get("/large", headers={"Accept-Encoding": "gzip"})
+        etag = first.headers["ETag"]
+        before = bytes_saved("/large", "not_modified")
+
+        # A client that received the identity body revalidates the same tag
+        second = client.get("/large", headers={"If-None-Match": etag})
+
+        assert etag.startswith('W/"')
+        assert second.status_code == 304
+        assert second.data == b""
+        assert bytes_saved("/large", "not_modified") > before
+
+    def test_changed_body_gets_new_etag(self, client):
+        etag = client.get("/large").headers["ETag"]
+        ENTRIES.append({"level": "INFO", "message": "Turned off kitchen"})
+        try:
+            response = client.get("/large", headers={"If-None-Match": etag})
+        finally:
+            ENTRIES.pop()
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
@@ -8,7 +8,9 @@ These tests verify:
 4. All user data types are included in export
 """
 
+import csv
 import json
+import sqlite3
 import pytest
 from unittest.mock import MagicMock, patch
 
@@ -166,3 +168,297 @@ class TestExportMetadata:
         result = exporter.export_all()
 
         assert "counts" in result["metadata"]
+
+
+@pytest.fixture
+def populated_data_dir(tmp_path):
+    """Data directory with a few todos and reminders."""
+    with sqlite3.connect(tmp_path / "todos.db") as conn:
+        conn.execute("CREATE TABLE todos (id INTEGER PRIMARY KEY, content TEXT)")
+        conn.executemany(
+            "INSERT INTO todos (content) VALUES (?)", [(f"todo {n}",) for n in range(7)]
+        )
+    with sqlite3.connect(tmp_path / "reminders.db") as conn:
+        conn.execute(
+            "CREATE TABLE reminders (id INTEGER PRIMARY KEY, message TEXT, remind_at TIMESTAMP)"
+        )
+        conn.execute(
+            "INSERT INTO reminders (message, remind_at) VALUES ('water plants', '2025-12-30 09:00')"
+        )
+    return tmp_path
+
+
+class TestStreamingExport:
+    """Tests for the streamed export formats."""
+
+    def test_stream_json_matches_export_all(self, populated_data_dir, monkeypatch):
+        """The streamed JSON document has the export_all() layout."""
+        monkeypatch.setattr("src.data_export.EXPORT_BATCH_SIZE", 3)
+        exporter = DataExporter(data_dir=populated_data_dir)
+
+        streamed = json.loads("".join(exporter.stream_json()))
+        exported = exporter.export_all()
+
+        for section in ["todos", "reminders", "timers"]:
+            assert streamed[section] == exported[section]
+        assert streamed["metadata"]["counts"] == exported["metadata"]["counts"]
+
+    def test_ndjson_resume_from_cursor(self, populated_data_dir, monkeypatch):
+        """Resuming from a cursor sends exactly the records after it."""
+        monkeypatch.setattr("src.data_export.EXPORT_BATCH_SIZE", 2)
+        exporter = DataExporter(data_dir=populated_data_dir)
+
+        lines = [json.loads(line) for line in "".join(exporter.stream_ndjson()).splitlines()]
+        records = [line for line in lines if line["type"] == "record"]
+        assert lines[0]["type"] == "metadata"
+        assert lines[-1]["type"] == "end"
+        assert lines[-1]["counts"]["todos"] == 7
+        assert lines[-1]["counts"]["reminders"] == 1
+
+        resumed = [
+            json.loads(line)
+            for line in "".join(exporter.stream_ndjson(cursor=records[4]["cursor"])).splitlines()
+        ]
+
+        assert [line["data"] for line in resumed[1:-1]] == [r["data"] for r in records[5:]]
+
+    def test_csv_section_stream(self, populated_data_dir):
+        """A section streams as CSV with a resume cursor column."""
+        exporter = DataExporter(data_dir=populated_data_dir)
+
+        rows = list(csv.DictReader("".join(exporter.stream_csv("todos")).splitlines()))
+        resumed = list(
+            csv.DictReader(
+                "".join(exporter.stream_csv("todos", cursor=rows[2]["_cursor"])).splitlines()
+            )
+        )
+
+        assert len(rows) == 7
+        assert rows[0]["content"] == "todo 0"
+        assert [row["id"] for row in resumed] == [str(n) for n in range(4, 8)]
+
+    def test_command_history_exported(self, tmp_path, monkeypatch):
+        """Commands recorded in smarthome.db appear in every export format."""
+        from src import database
+
+        monkeypatch.setattr(database, "DATABASE_PATH", tmp_path / "smarthome.db")
+        database.initialize_database()
+        database.record_command(command_text="lights on", command_type="web")
+        database.record_command(command_text="lights off", command_type="voice")
+        exporter = DataExporter(data_dir=tmp_path)
+
+        lines = [json.loads(line) for line in "".join(exporter.stream_ndjson()).splitlines()]
+        records = [line["data"] for line in lines if line.get("section") == "command_history"]
+        rows = list(csv.DictReader("".join(exporter.stream_csv("command_history")).splitlines()))
+
+        assert [r["command_text"] for r in records] == ["lights on", "lights off"]
+        assert lines[-1]["counts"]["command_history"] == 2
+        assert [row["command_text"] for row in rows] == ["lights on", "lights off"]
+        assert len(exporter.export_all()["command_history"]) == 2
+
+    def test_invalid_cursor_rejected(self, populated_data_dir):
+        """Malformed cursors and unknown sections raise ValueError."""
+        exporter = DataExporter(data_dir=populated_data_dir)
+
+        with pytest.raises(ValueError):
+            exporter.stream_ndjson(cursor="passwords:1")
+        with pytest.raises(ValueError):
+            exporter.stream_csv("todos", cursor="reminders:1")
+
+    def test_endpoint_streams_ndjson(self, client, populated_data_dir, monkeypatch):
+        """GET /api/export?format=ndjson returns a streamed NDJSON body."""
+        monkeypatch.setattr("src.data_export.DATA_DIR", populated_data_dir)
+
+        response = client.get("/api/export?format=ndjson&download=true")
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        assert response.is_streamed
+        assert "attachment" in response.headers["Content-Disposition"]
+        lines = response.get_data(as_text=True).splitlines()
+        assert json.loads(lines[-1])["counts"]["todos"] == 7
+
+    def test_endpoint_json_keeps_envelope(self, client, populated_data_dir, monkeypatch):
+        """The default JSON export keeps the success/format/data envelope."""
+        monkeypatch.setattr("src.data_export.DATA_DIR", populated_data_dir)
+
+        body = client.get("/api/export").get_json()
+
+        assert body["success"] is True
+        assert body["format"] == "json"
+        assert len(body["data"]["todos"]) == 7
+
+    def test_endpoint_rejects_bad_cursor(self, client):
+        """An invalid cursor is a 400, not a broken stream."""
+        response = client.get("/api/export?format=ndjson&cursor=nope")
+
+        assert response.status_code == 400
+
+
+def export_lines(data_dir):
+    """NDJSON export of a data directory as a list of lines."""
+    return "".join(DataExporter(data_dir=data_dir).stream_ndjson()).splitlines(keepends=True)
+
+
+class TestStreamingImport:
+    """Tests for the NDJSON import pipeline."""
+
+    def test_round_trip(self, populated_data_dir, tmp_path_factory):
+        """An NDJSON export imports into an empty data directory."""
+        target = tmp_path_factory.mktemp("import")
+        importer = DataImporter(data_dir=target)
+
+        result = importer.import_ndjson(export_lines(populated_data_dir))
+
+        imported = DataExporter(data_dir=target).export_all()
+        original = DataExporter(data_dir=populated_data_dir).export_all()
+        assert [t["content"] for t in imported["todos"]] == [t["content"] for t in original["todos"]]
+        assert imported["reminders"][0]["message"] == "water plants"
+        assert result.written == {"todos": 7, "reminders": 1}
+        assert result.errors == []
+
+    def test_dry_run_validates_without_writing(self, tmp_path):
+        """A dry run counts valid records and reports invalid ones in one pass."""
+        lines = [
+            json.dumps({"type": "metadata", "version": "1.0"}),
+            json.dumps({"type": "record", "section": "todos", "data": {"content": "buy milk"}}),
+            json.dumps({"type": "record", "section": "todos", "data": {"priority": 1}}),
+            "{not json",
+            json.dumps({"type": "record", "section": "timers", "data": {"id": 1}}),
+        ]
+
+        result = DataImporter(data_dir=tmp_path).import_ndjson(lines, dry_run=True)
+
+        assert result.counts["todos"] == 1
+        assert result.skipped == {"timers": 1}
+        assert result.error_count == 2
+        assert result.samples["todos"] == {"content": "buy milk"}
+        assert not (tmp_path / "todos.db").exists()
+
+    def test_batches_and_progress(self, tmp_path, monkeypatch):
+        """Records are written in batches with progress after each one."""
+        monkeypatch.setattr("src.data_export.IMPORT_BATCH_SIZE", 2)
+        lines = [json.dumps({"type": "metadata", "version": "1.0"})] + [
+            json.dumps({"type": "record", "section": "todos", "data": {"id": n, "content": f"t{n}"}})
+            for n in range(1, 6)
+        ]
+        updates = []
+
+        result = DataImporter(data_dir=tmp_path).import_ndjson(
+            lines, progress=lambda progress: updates.append(dict(progress.written))
+        )
+
+        assert updates == [{"todos": 2}, {"todos": 4}, {"todos": 5}]
+        assert result.done
+        with sqlite3.connect(tmp_path / "todos.db") as conn:
+            assert conn.execute("SELECT COUNT(*) FROM todos").fetchone()[0] == 5
+
+    def test_reimport_skips_and_replace_clears(self, populated_data_dir, tmp_path_factory):
+        """Importing twice doesn't duplicate; merge=False replaces the table."""
+        target = tmp_path_factory.mktemp("import")
+        importer = DataImporter(data_dir=target)
+        importer.import_ndjson(export_lines(populated_data_dir))
+        result = importer.import_ndjson(export_lines(populated_data_dir))
+        with sqlite3.connect(target / "todos.db") as conn:
+            assert conn.execute("SELECT COUNT(*) FROM todos").fetchone()[0] == 7
+        assert result.written == {"todos": 0, "reminders": 0}
+        assert result.conflicts == {"todos": 7, "reminders": 1}
+
+        lines = [
+            json.dumps({"type": "metadata", "version": "1.0"}),
+            json.dumps({"type": "record", "section": "todos", "data": {"content": "only"}}),
+        ]
+        importer.import_ndjson(lines, merge=False)
+
+        with sqlite3.connect(target / "todos.db") as conn:
+            assert conn.execute("SELECT content FROM todos").fetchall() == [("only",)]
+
+    def test_merge_never_overwrites_existing_ids(self, tmp_path):
+        """A merged record whose id is taken locally is skipped and reported."""
+        importer = DataImporter(data_dir=tmp_path)
+        local = [
+            json.dumps({"type": "metadata", "version": "1.0"}),
+            json.dumps({"type": "record", "section": "todos", "data": {"id": 1, "content": "local"}}),
+        ]
+        importer.import_ndjson(local)
+        incoming = [
+            json.dumps({"type": "metadata", "version": "1.0"}),
+            json.dumps({"type": "record", "section": "todos", "data": {"id": 1, "content": "other"}}),
+            json.dumps({"type": "record", "section": "todos", "data": {"id": 2, "content": "new"}}),
+        ]
+
+        result = importer.import_ndjson(incoming)
+
+        with sqlite3.connect(tmp_path / "todos.db") as conn:
+            rows = conn.execute("SELECT id, content FROM todos ORDER BY id").fetchall()
+        assert rows == [(1, "local"), (2, "new")]
+        assert result.written == {"todos": 1}
+        assert result.conflicts == {"todos": 1}
+        assert result.to_dict()["conflicts"] == {"todos": 1}
+
+    def test_dry_run_reports_merge_conflicts(self, tmp_path):
+        """A preview reports the conflicts the merge import then skips."""
+        importer = DataImporter(data_dir=tmp_path)
+        importer.import_ndjson([
+            json.dumps({"type": "metadata", "version": "1.0"}),
+            json.dumps({"type": "record", "section": "todos", "data": {"id": 1, "content": "local"}}),
+        ])
+        incoming = [
+            json.dumps({"type": "metadata", "version": "1.0"}),
+            json.dumps({"type": "record", "section": "todos", "data": {"id": 1, "content": "other"}}),
+            json.dumps({"type": "record", "section": "todos", "data": {"id": 2, "content": "new"}}),
+            json.dumps({"type": "record", "section": "todos", "data": {"id": 2, "content": "dup"}}),
+        ]
+
+        preview = importer.import_ndjson(incoming, dry_run=True)
+        result = importer.import_ndjson(incoming)
+
+        assert preview.written == result.written == {"todos": 1}
+        assert preview.conflicts == result.conflicts == {"todos": 2}
+        with sqlite3.connect(tmp_path / "todos.db") as conn:
+            assert conn.execute("SELECT id, content FROM todos ORDER BY id").fetchall() == [
+                (1, "local"),
+                (2, "new"),
+            ]
+
+    def test_dry_run_leaves_database_unchanged(self, populated_data_dir, tmp_path_factory):
+        """A replacing preview is rolled back."""
+        target = tmp_path_factory.mktemp("import")
+        importer = DataImporter(data_dir=target)
+        importer.import_ndjson(export_lines(populated_data_dir))
+        lines = [
+            json.dumps({"type": "metadata", "version": "1.0"}),
+            json.dumps({"type": "record", "section": "todos", "data": {"content": "only"}}),
+        ]
+
+        preview = importer.import_ndjson(lines, merge=False, dry_run=True)
+
+        assert preview.written == {"todos": 1}
+        with sqlite3.connect(target / "todos.db") as conn:
+            assert conn.execute("SELECT COUNT(*) FROM todos").fetchone()[0] == 7
+
+    def test_requires_metadata_line(self, tmp_path):
+        """Streams without a compatible metadata line are rejected."""
+        importer = DataImporter(data_dir=tmp_path)
+
+        with pytest.raises(ValueError):
+            importer.import_ndjson([json.dumps({"type": "record", "section": "todos"})])
+        with pytest.raises(ValueError):
+            importer.import_ndjson([json.dumps({"type": "metadata", "version": "2.0"})])
+
+    def test_endpoint_imports_ndjson(self, client, populated_data_dir, tmp_path_factory, monkeypatch):
+        """POST /api/import with an NDJSON body imports it."""
+        target = tmp_path_factory.mktemp("import")
+        monkeypatch.setattr("src.data_export.DATA_DIR", target)
+
+        response = client.post(
+            "/api/import?preview=true",
+            data="".join(export_lines(populated_data_dir)),
+            content_type="application/x-ndjson",
+        )
+
+        body = response.get_json()
+        assert response.status_code == 200
+        assert body["preview"] is True
+        assert body["result"]["counts"]["todos"] == 7
+        assert not (target / "todos.db").exists()
@@ -0,0 +1,40 @@
+"""
+Tests for src/deadline.py - Request deadline propagation
+"""
+
+import pytest
+
+from src.deadline import Deadline, DeadlineExceeded
+
+
+class TestDeadline:
+    """Tests for the Deadline helper."""
+
+    def test_remaining_counts_down(self):
+        """A fresh deadline has (almost) its full budget left."""
+        deadline = Deadline(10)
+        assert 9 < deadline.remaining() <= 10
+        assert deadline.expired() is False
+
+    def test_zero_timeout_is_expired(self):
+        """A zero-second deadline is already expired."""
+        deadline = Deadline(0)
+        assert deadline.expired() is True
+        assert deadline.remaining() == 0.0
+
+    def test_cancel_expires_immediately(self):
+        """Cancelling marks the deadline expired with no time remaining."""
+        deadline = Deadline(10)
+        deadline.cancel()
+        assert deadline.expired() is True
+        assert deadline.remaining() == 0.0
+
+    def test_check_raises_when_expired(self):
+        """check() raises DeadlineExceeded, a TimeoutError subclass."""
+        deadline = Deadline(10)
+        deadline.check("llm call")
+
+        deadline.cancel()
+        with pytest.raises(DeadlineExceeded, match="llm call"):
+            deadline.check("llm call")
+        assert issubclass(DeadlineExceeded, TimeoutError)
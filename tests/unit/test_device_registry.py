@@ -16,6 +16,7 @@ from src.device_registry import (
     DeviceType,
     SUPPORTED_DEVICE_TYPES,
 )
+from src.entity_store import EntityStore
 
 
 @pytest.fixture
@@ -501,7 +502,7 @@ class TestHASynchronization:
         """Syncing from HA adds new devices to registry."""
         # Mock HA client
         mock_ha_client = mocker.Mock()
-        mock_ha_client.get_all_states.return_value = [
+        mock_ha_client.get_entity_store.return_value = EntityStore([
             {
                 "entity_id": "light.new_from_ha",
                 "state": "on",
@@ -509,7 +510,7 @@ class TestHASynchronization:
                     "friendly_name": "New HA Light",
                 },
             }
-        ]
+        ])
 
         new_devices = registry.sync_from_ha(mock_ha_client)
 
@@ -528,13 +529,13 @@ class TestHASynchronization:
 
         # Mock HA client returning the same device
         mock_ha_client = mocker.Mock()
-        mock_ha_client.get_all_states.return_value = [
+        mock_ha_client.get_entity_store.return_value = EntityStore([
             {
                 "entity_id": "light.existing",
                 "state": "on",
                 "attributes": {"friendly_name": "Existing Light"},
             }
-        ]
+        ])
 
         new_devices = registry.sync_from_ha(mock_ha_client)
 
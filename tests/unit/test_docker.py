@@ -64,6 +64,11 @@ class TestDockerfile:
         assert "FLASK_ENV=production" in dockerfile_content
         assert "LOG_LEVEL=INFO" in dockerfile_content
 
+    def test_dockerfile_runs_production_server(self, dockerfile_content: str):
+        """Dockerfile should start the pre-fork server through the launcher."""
+        assert "SERVER_MODE=production" in dockerfile_content
+        assert '"-m", "src.web_server"' in dockerfile_content
+
 
 class TestDockerCompose:
     """Tests for docker-compose.yml configuration."""
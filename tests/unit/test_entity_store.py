@@ -0,0 +1,219 @@
+"""
+Unit tests for the compact entity state store.
+"""
+
+import json
+
+import pytest
+
+from src.entity_store import (
+    EntityStore,
+    compare_memory,
+    configured_room_resolver,
+)
+
+
+def make_states():
+    return [
+        {
+            "entity_id": "switch.desk_plug",
+            "state": "on",
+            "attributes": {"friendly_name": "Desk Plug", "device_class": "outlet",
+                           "current_power_w": 12.5},
+            "last_changed": "2026-01-01T00:00:00+00:00",
+        },
+        {
+            "entity_id": "switch.porch",
+            "state": "off",
+            "attributes": {"friendly_name": "Porch"},
+        },
+        {
+            "entity_id": "light.living_room_lamp",
+            "state": "on",
+            "attributes": {"friendly_name": "Lamp", "brightness": 200},
+        },
+        {
+            "entity_id": "sensor.bedroom_temperature",
+            "state": "21.5",
+            "attributes": {"friendly_name": "Bedroom Temp", "device_class": "temperature",
+                           "unit_of_measurement": "°C"},
+        },
+        {"entity_id": "not_an_entity", "state": "on", "attributes": {}},
+    ]
+
+
+def room_from_name(entity_id, friendly_name):
+    for room in ("living_room", "bedroom"):
+        if room in entity_id:
+            return room
+    return None
+
+
+@pytest.fixture
+def store():
+    return EntityStore(make_states(), room_resolver=room_from_name)
+
+
+class TestEntityStore:
+    """Tests for building and querying the store."""
+
+    def test_skips_invalid_entity_ids(self, store):
+        assert len(store) == 4
+        assert "not_an_entity" not in store
+
+    def test_record_fields(self, store):
+        plug = store.get("switch.desk_plug")
+        assert plug.domain == "switch"
+        assert plug.state == "on"
+        assert plug.friendly_name == "Desk Plug"
+        assert plug.device_class == "outlet"
+        assert plug.get_attribute("current_power_w") == 12.5
+        assert plug.get_attribute("missing", "default") == "default"
+        assert plug.has_attribute("current_power_w")
+        assert not store.get("switch.porch").has_attribute("current_power_w")
+
+    def test_records_use_slots(self, store):
+        with pytest.raises(AttributeError):
+            store.get("switch.porch").__dict__
+
+    def test_to_dict_round_trips(self, store):
+        original = make_states()[0]
+        assert store.get("switch.desk_plug").to_dict() == original
+
+    def test_by_domain(self, store):
+        ids = [entity.entity_id for entity in store.by_domain("switch")]
+        assert ids == ["switch.desk_plug", "switch.porch"]
+        assert store.by_domain("vacuum") == ()
+
+    def test_by_domains(self, store):
+        ids = {entity.entity_id for entity in store.by_domains(["light", "sensor"])}
+        assert ids == {"light.living_room_lamp", "sensor.bedroom_temperature"}
+
+    def test_by_room(self, store):
+        assert [e.entity_id for e in store.by_room("bedroom")] == ["sensor.bedroom_temperature"]
+        assert sorted(store.rooms()) == ["bedroom", "living_room"]
+
+    def test_by_device_class(self, store):
+        assert [e.entity_id for e in store.by_device_class("outlet")] == ["switch.desk_plug"]
+
+    def test_query_combines_criteria(self, store):
+        assert [e.entity_id for e in store.query(domain="switch", device_class="outlet")] == [
+            "switch.desk_plug"
+        ]
+        assert store.query(domain="light", room="bedroom") == []
+        assert len(store.query()) == 4
+
+    def test_repeated_strings_are_shared(self):
+        states = [
+            {"entity_id": f"switch.plug_{i}", "state": "o" + "n",
+             "attributes": {"friendly_name": f"Plug {i}", "device_class": "out" + "let"}}
+            for i in range(3)
+        ]
+        first, second, _ = EntityStore(states, room_resolver=room_from_name)
+        assert first.state is second.state
+        assert first.device_class is second.device_class
+        assert first._shape is second._shape
+
+    def test_stats(self, store):
+        stats = store.get_stats()
+        assert stats["entities"] == 4
+        assert stats["domains"] == 3
+        assert stats["attribute_shapes"] == 4
+
+
+class TestRoomResolution:
+    """Tests for the default ROOM_ENTITY_MAP room resolver."""
+
+    def test_configured_entities_get_their_room(self):
+        resolver = configured_room_resolver()
+        assert resolver("light.reading_light", None) == "living_room"
+        assert resolver("light.unconfigured", None) is None
+
+
+class TestUpdate:
+    """Tests for patching changed states into a store in place."""
+
+    def test_changed_entity_keeps_position_and_indexes(self, store):
+        before = store.by_domain("switch")
+
+        result = store.update([
+            {"entity_id": "switch.porch", "state": "on",
+             "attributes": {"friendly_name": "Porch", "device_class": "outlet"}},
+        ])
+
+        assert result is store
+        assert store.get("switch.porch").state == "on"
+        assert [e.entity_id for e in store.by_domain("switch")] == [
+            "switch.desk_plug", "switch.porch"
+        ]
+        assert [e.entity_id for e in store.by_device_class("outlet")] == [
+            "switch.desk_plug", "switch.porch"
+        ]
+        # Readers holding the old group see a consistent snapshot
+        assert before[1].state == "off"
+
+    def test_entity_leaving_a_group(self, store):
+        store.update([
+            {"entity_id": "sensor.bedroom_temperature", "state": "22.0",
+             "attributes": {"friendly_name": "Bedroom Temp"}},
+        ])
+
+        assert store.by_device_class("temperature") == ()
+        assert store.by_room("bedroom")[0].state == "22.0"
+
+    def test_new_entity_is_appended(self, store):
+        store.update([{"entity_id": "light.bedroom_lamp", "state": "off", "attributes": {}}])
+
+        assert len(store) == 5
+        assert [e.entity_id for e in store.by_room("bedroom")] == [
+            "sensor.bedroom_temperature", "light.bedroom_lamp"
+        ]
+        assert store.to_states()[-1]["entity_id"] == "light.bedroom_lamp"
+
+    def test_states_list_is_reused_until_update(self, store):
+        states = store.to_states()
+        assert store.to_states() is states
+
+        store.update([{"entity_id": "switch.desk_plug", "state": "off", "attributes": {}}])
+
+        rebuilt = store.to_states()
+        assert rebuilt is not states
+        assert next(s for s in rebuilt if s["entity_id"] == "switch.desk_plug")["state"] == "off"
+
+    def test_context_is_kept(self):
+        context = {"id": "01HX", "parent_id": None, "user_id": None}
+        store = EntityStore(
+            [{"entity_id": "light.den", "state": "on", "attributes": {}, "context": context}],
+            room_resolver=lambda entity_id, name: None,
+        )
+
+        assert store.to_states()[0]["context"] == context
+
+
+class TestMemory:
+    """Tests for memory measurement."""
+
+    def test_store_is_smaller_than_raw_payload(self):
+        states = [
+            {
+                "entity_id": f"switch.plug_{i}",
+                "state": "on" if i % 2 else "off",
+                "attributes": {
+                    "friendly_name": f"Plug {i}",
+                    "device_class": "outlet",
+                    "icon": "mdi:power-plug",
+                    "unit_of_measurement": "W",
+                },
+                "last_changed": "2026-01-01T00:00:00+00:00",
+            }
+            for i in range(200)
+        ]
+        # Decode from JSON, as the HA client does, so strings aren't shared up front
+        states = json.loads(json.dumps(states))
+
+        result = compare_memory(states)
+
+        assert result["entities"] == 200
+        assert result["store_bytes"] < result["raw_bytes"]
+        assert result["peak_bytes"] > result["raw_bytes"]
+        assert 0 < result["ratio"] < 1
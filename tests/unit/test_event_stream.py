@@ -0,0 +1,269 @@
+"""
+Unit tests for the live event stream (/api/events).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.event_stream import (
+    DatabaseSnapshotSource,
+    EventHub,
+    LogTailSource,
+    SnapshotSource,
+    StreamFullError,
+    command_progress,
+    finished_items,
+    report_command_progress,
+)
+from src.log_reader import LogReader
+
+
+LOG_LINE = "2025-12-18 10:00:00,123 | INFO     | server | handle | {message}\n"
+
+
+class TestEventHub:
+    """Tests for publishing, waiting and replay."""
+
+    def test_event_encodes_as_sse_frame(self):
+        event = EventHub(max_clients=1).publish("status", {"system": "operational"})
+
+        frame = event.encode()
+
+        assert frame.startswith(f"id: {event.id}\nevent: status\n")
+        assert json.loads(frame.split("data: ")[1]) == {"system": "operational"}
+        assert frame.endswith("\n\n")
+
+    def test_waiting_subscriber_is_woken_by_publish(self):
+        hub = EventHub(max_clients=2)
+        with hub.subscribe() as subscription:
+            timer = threading.Timer(0.05, hub.publish, args=("log", {"entries": []}))
+            timer.start()
+            started = time.monotonic()
+            events = subscription.wait(timeout=5)
+
+        assert [event.type for event in events] == ["log"]
+        assert time.monotonic() - started < 1
+
+    def test_wait_times_out_without_events(self):
+        hub = EventHub(max_clients=1)
+        with hub.subscribe() as subscription:
+            assert subscription.wait(timeout=0.01) == []
+
+    def test_topic_filter(self):
+        hub = EventHub(max_clients=1)
+        with hub.subscribe(topics=["status"]) as subscription:
+            hub.publish("log", {})
+            hub.publish("status", {})
+            events = subscription.wait(timeout=0.01)
+
+        assert [event.type for event in events] == ["status"]
+
+    def test_resume_replays_missed_events(self):
+        hub = EventHub(max_clients=1)
+        seen = hub.publish("log", {"n": 1})
+        hub.publish("log", {"n": 2})
+        hub.publish("command", {"n": 3})
+
+        with hub.subscribe(last_event_id=seen.id) as subscription:
+            replayed = subscription.initial_events()
+            assert subscription.wait(timeout=0.01) == []
+
+        assert [event.data["n"] for event in replayed] == [2, 3]
+
+    def test_unknown_last_event_id_gets_snapshots(self):
+        hub = EventHub(max_clients=1)
+        hub.publish("status", {"system": "warning"}, snapshot=True)
+        hub.publish("log", {"entries": []})
+
+        with hub.subscribe(last_event_id="otherworker:42") as subscription:
+            initial = subscription.initial_events()
+
+        assert [event.type for event in initial] == ["status"]
+
+    def test_subscriber_behind_buffer_is_told_to_resync(self, monkeypatch):
+        monkeypatch.setattr("src.event_stream.REPLAY_BUFFER_SIZE", 4)
+        hub = EventHub(max_clients=1)
+        with hub.subscribe() as subscription:
+            for number in range(10):
+                hub.publish("log", {"n": number})
+            events = subscription.wait(timeout=0.01)
+
+        assert events[0].type == "resync"
+
+    def test_client_limit(self):
+        hub = EventHub(max_clients=1)
+        with hub.subscribe():
+            with pytest.raises(StreamFullError):
+                with hub.subscribe():
+                    pass
+        with hub.subscribe():
+            assert hub.subscriber_count == 1
+
+    def test_sources_polled_only_while_subscribed(self):
+        hub = EventHub(max_clients=1)
+        calls = []
+        hub.add_source(SnapshotSource("status", lambda: calls.append(1) or {"ok": True}, 0.01))
+
+        with hub.subscribe() as subscription:
+            events = subscription.wait(timeout=2)
+            assert [event.type for event in events] == ["status"]
+        time.sleep(0.1)
+        count = len(calls)
+        time.sleep(0.1)
+
+        assert count > 0
+        assert len(calls) == count
+
+
+class TestSources:
+    """Tests for the status, database and log sources."""
+
+    def test_snapshot_source_publishes_changes_only(self):
+        values = iter([{"on": 1}, {"on": 1}, {"on": 2}])
+        source = SnapshotSource("status", lambda: next(values), interval=1)
+        source.start()
+
+        assert source.poll() == {"on": 1}
+        assert source.poll() is None
+        assert source.poll() == {"on": 2}
+
+    def test_database_source_rereads_only_after_writes(self, tmp_path):
+        path = tmp_path / "timers.db"
+        writer = sqlite3.connect(path)
+        writer.execute("CREATE TABLE timers (id INTEGER)")
+        writer.commit()
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            return writer.execute("SELECT COUNT(*) FROM timers").fetchone()[0]
+
+        source = DatabaseSnapshotSource("timers", lambda: path, fetch)
+        source.start()
+        assert source.poll() == 0
+        assert source.poll() is None
+        assert len(fetches) == 1
+
+        writer.execute("INSERT INTO timers VALUES (1)")
+        writer.commit()
+        assert source.poll() == 1
+
+        source.stop()
+        writer.close()
+
+    def test_annotate_reports_items_that_came_due(self):
+        due = (datetime.now() - timedelta(seconds=1)).isoformat()
+        later = (datetime.now() + timedelta(hours=1)).isoformat()
+        snapshots = iter(
+            [
+                [{"id": 1, "end_time": due}, {"id": 2, "end_time": later}],
+                [],
+            ]
+        )
+        source = SnapshotSource(
+            "timers",
+            lambda: next(snapshots),
+            interval=1,
+            annotate=lambda previous, current: finished_items(previous, current, "end_time"),
+        )
+        source.start()
+        source.poll()
+
+        # Timer 2 was cancelled before it was due
+        assert source.poll() == [{"id": 1, "end_time": due}]
+
+    def test_log_source_sends_new_lines(self, tmp_path):
+        log_file = tmp_path / "smarthome.log"
+        log_file.write_text(LOG_LINE.format(message="before connect"))
+        source = LogTailSource(LogReader(log_dir=tmp_path))
+        source.start()
+
+        assert source.poll() is None
+
+        with open(log_file, "a") as file:
+            file.write(LOG_LINE.format(message="turned on lights"))
+        update = source.poll()
+
+        assert [entry["message"] for entry in update["entries"]] == ["turned on lights"]
+        assert source.poll() is None
+
+    def test_log_source_waits_for_complete_lines(self, tmp_path):
+        log_file = tmp_path / "smarthome.log"
+        log_file.write_text("")
+        source = LogTailSource(LogReader(log_dir=tmp_path))
+        source.start()
+
+        line = LOG_LINE.format(message="turned on lights")
+        with open(log_file, "a") as file:
+            file.write(line[:20])
+        assert source.poll() is None
+
+        with open(log_file, "a") as file:
+            file.write(line[20:] + LOG_LINE.format(message="turned off fan"))
+        update = source.poll()
+
+        assert [entry["message"] for entry in update["entries"]] == [
+            "turned on lights",
+            "turned off fan",
+        ]
+        assert source.poll() is None
+
+
+class TestCommandProgress:
+    """Tests for command progress events."""
+
+    def test_started_tool_and_completed_events(self, monkeypatch):
+        hub = EventHub(max_clients=1)
+        monkeypatch.setattr("src.event_stream.get_event_hub", lambda: hub)
+
+        with hub.subscribe() as subscription:
+            with command_progress("turn on the lights") as progress:
+                report_command_progress("tool", tool="control_lights")
+                progress["success"] = True
+            events = subscription.wait(timeout=0.01)
+
+        stages = [event.data["stage"] for event in events]
+        assert stages == ["started", "tool", "completed"]
+        assert {event.data["id"] for event in events} == {events[0].id}
+        assert events[1].data["tool"] == "control_lights"
+
+    def test_progress_outside_a_command_is_ignored(self, monkeypatch):
+        hub = EventHub(max_clients=1)
+        monkeypatch.setattr("src.event_stream.get_event_hub", lambda: hub)
+
+        report_command_progress("tool", tool="get_current_time")
+
+        assert hub.last_sequence == 0
+
+
+class TestEventsEndpoint:
+    """Tests for GET /api/events."""
+
+    def test_stream_starts_with_snapshots(self, client, monkeypatch):
+        hub = EventHub(max_clients=1)
+        hub.publish("status", {"system": "operational", "devices": []}, snapshot=True)
+        monkeypatch.setattr("src.server.get_event_hub", lambda: hub)
+
+        response = client.get("/api/events", buffered=False)
+        chunks = response.response
+        first = (next(chunks) + next(chunks)).decode()
+        response.close()
+
+        assert response.mimetype == "text/event-stream"
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert "retry: 3000" in first
+        assert "event: status" in first
+
+    def test_full_stream_returns_503(self, client, monkeypatch):
+        hub = EventHub(max_clients=0)
+        monkeypatch.setattr("src.server.get_event_hub", lambda: hub)
+
+        response = client.get("/api/events")
+
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
@@ -817,3 +817,171 @@ class TestImprovedHealingLogging:
         logs = monitor.get_healing_log(limit=10)
         assert logs[0]["success"] is False
         assert "error" in logs[0]["details"]
+
+
+class TestConcurrentCachedChecks:
+    """Tests for parallel checks, timeouts and the result cache."""
+
+    def _monitor_with(self, *checkers):
+        from src.health_monitor import HealthMonitor
+
+        monitor = HealthMonitor()
+        monitor._component_checkers = list(checkers)
+        return monitor
+
+    def _checker(self, name, delay=0.0, max_age=60.0, timeout=5.0):
+        from src.health_monitor import ComponentChecker, ComponentHealth, HealthStatus
+
+        calls = []
+
+        def check():
+            calls.append(time.monotonic())
+            time.sleep(delay)
+            return ComponentHealth(name, HealthStatus.HEALTHY, "OK", datetime.now())
+
+        return ComponentChecker(name, check, max_age=max_age, timeout=timeout), calls
+
+    def test_checks_run_concurrently(self):
+        """Total time should be the slowest check, not the sum."""
+        first, _ = self._checker("home_assistant", delay=0.2)
+        second, _ = self._checker("llm_provider", delay=0.2)
+        monitor = self._monitor_with(first, second)
+
+        started = time.monotonic()
+        result = monitor.get_system_health()
+
+        assert result["status"] == "healthy"
+        assert time.monotonic() - started < 0.35
+
+    def test_slow_check_times_out_as_unhealthy(self):
+        """A hung dependency should not hold up the response."""
+        slow, _ = self._checker("llm_provider", delay=0.5, timeout=0.05)
+        fast, _ = self._checker("cache")
+        monitor = self._monitor_with(slow, fast)
+
+        started = time.monotonic()
+        result = monitor.get_system_health()
+
+        assert time.monotonic() - started < 0.3
+        slow_result = next(c for c in result["components"] if c["name"] == "llm_provider")
+        assert slow_result["status"] == "unhealthy"
+        assert "timed out" in slow_result["message"]
+        assert monitor.get_consecutive_failures("llm_provider") == 1
+
+    def test_fresh_results_are_reused(self):
+        """refresh=False should only re-run components past their budget."""
+        cached, cached_calls = self._checker("database", max_age=60)
+        stale, stale_calls = self._checker("cache", max_age=0)
+        monitor = self._monitor_with(cached, stale)
+
+        monitor.get_system_health()
+        monitor.get_system_health(refresh=False)
+
+        assert len(cached_calls) == 1
+        assert len(stale_calls) == 2
+
+    def test_readiness_answers_from_snapshot(self):
+        """Readiness should not run checks that already have a result."""
+        checker, calls = self._checker("home_assistant", max_age=1)
+        monitor = self._monitor_with(checker)
+        monitor.get_system_health()
+
+        readiness = monitor.get_readiness()
+
+        assert readiness["ready"] is True
+        assert len(calls) == 1
+
+    def test_background_refresh_reruns_stale_checks(self):
+        """The refresher should keep results within their budget."""
+        checker, calls = self._checker("cache", max_age=0.05)
+        monitor = self._monitor_with(checker)
+
+        monitor.start_background_refresh()
+        monitor.start_background_refresh()  # idempotent
+        time.sleep(0.3)
+        monitor.stop_background_refresh()
+
+        assert len(calls) >= 3
+
+    def test_background_refresh_survives_runtime_error(self):
+        """A RuntimeError from a check pass should not stop the refresher."""
+        checker, calls = self._checker("cache", max_age=0.05)
+        monitor = self._monitor_with(checker)
+        collect = monitor._collect
+        failures = []
+
+        def flaky_collect(**kwargs):
+            if not failures:
+                failures.append(True)
+                raise RuntimeError("dictionary changed size during iteration")
+            return collect(**kwargs)
+
+        monitor._collect = flaky_collect
+        monitor.start_background_refresh()
+        time.sleep(0.3)
+        monitor.stop_background_refresh()
+
+        assert failures
+        assert len(calls) >= 2
+
+    def test_background_refresh_stops_when_executor_shut_down(self):
+        """The refresher should exit once the check executor is shut down."""
+        checker, calls = self._checker("cache", max_age=0.05)
+        monitor = self._monitor_with(checker)
+        monitor._executor.shutdown()
+
+        monitor.start_background_refresh()
+        monitor._refresher.join(timeout=1)
+
+        assert not monitor._refresher.is_alive()
+        assert calls == []
+
+    def test_on_demand_check_runs_only_when_refreshed(self):
+        """The billed LLM check should never run from the refresher or readiness."""
+        from src.health_monitor import ComponentChecker, HealthMonitor
+
+        assert next(
+            checker for checker in HealthMonitor()._component_checkers
+            if checker.name == "llm_provider"
+        ).on_demand
+        background, _ = self._checker("cache", max_age=0.05)
+        llm, llm_calls = self._checker("llm_provider", max_age=0)
+        llm = ComponentChecker(llm.name, llm.check_fn, max_age=0, on_demand=True)
+        monitor = self._monitor_with(background, llm)
+
+        monitor.get_readiness()
+        before_refresh = monitor.get_system_health(refresh=False)
+        monitor.start_background_refresh()
+        time.sleep(0.2)
+        monitor.stop_background_refresh()
+        assert llm_calls == []
+        assert [c["name"] for c in before_refresh["components"]] == ["cache"]
+
+        monitor.get_system_health(refresh=True)
+        cached = monitor.get_system_health(refresh=False)
+
+        assert len(llm_calls) == 1
+        assert [c["name"] for c in cached["components"]] == ["cache", "llm_provider"]
+
+    def test_refresher_runs_in_one_process_only(self, tmp_path, monkeypatch):
+        """A process that can't take the host lock should not start a refresher."""
+        import fcntl
+
+        import src.health_monitor as health_module
+
+        lock_path = tmp_path / "health_refresh.lock"
+        monkeypatch.setattr(health_module, "REFRESH_LOCK_PATH", lock_path)
+        monkeypatch.setattr(health_module, "_refresh_lock", None)
+        checker, _ = self._checker("cache", max_age=0.05)
+        monitor = self._monitor_with(checker)
+
+        with open(lock_path, "a") as other_process:
+            fcntl.flock(other_process, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            monitor.start_background_refresh()
+            assert monitor._refresher is None
+
+        # The holder went away: the next request takes over
+        monitor.start_background_refresh()
+        assert monitor._refresher is not None
+        monitor.stop_background_refresh()
+        health_module._refresh_lock[1].close()
@@ -6,7 +6,7 @@ interface for LLM calls supporting OpenAI, Anthropic, and local LLMs.
 """
 
 import pytest
-from unittest.mock import patch, Mock, MagicMock
+from unittest.mock import patch, Mock, MagicMock, AsyncMock
 from dataclasses import fields
 
 from src.llm_client import (
@@ -1204,3 +1204,106 @@ class TestAutomaticFallback:
 
                             # Model should still be restored to llama3
                             assert client.model == 'llama3'
+
+
+# =============================================================================
+# Async API Tests
+# =============================================================================
+
+
+class TestAsyncComplete:
+    """Tests for acomplete/acomplete_with_tools and the sync timeout facade."""
+
+    @pytest.fixture
+    def home_llm_client(self):
+        """Create an LLMClient configured for home_llm with an OpenAI fallback."""
+        with patch('src.llm_client.os.getenv') as mock_getenv:
+            mock_getenv.side_effect = lambda key, default=None: {
+                'LLM_PROVIDER': 'home_llm',
+                'LLM_MODEL': 'llama3',
+                'LLM_API_KEY': None,
+                'LLM_BASE_URL': 'http://100.75.232.36:11434/v1',
+                'HOME_LLM_URL': 'http://100.75.232.36:11434',
+            }.get(key, default)
+
+            with patch('src.config.OPENAI_API_KEY', 'fallback-key'):
+                with patch('src.config.OPENAI_MODEL', 'gpt-4o-mini'):
+                    yield LLMClient()
+
+    @staticmethod
+    def _response(content):
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = content
+        response.choices[0].message.tool_calls = None
+        response.usage.prompt_tokens = 3
+        response.usage.completion_tokens = 2
+        return response
+
+    def test_get_async_client_uses_base_url(self, home_llm_client):
+        """Async home-llm client is created with the Ollama base URL."""
+        with patch('openai.AsyncOpenAI') as mock_async_openai:
+            home_llm_client._get_async_client()
+            home_llm_client._get_async_client()
+
+            mock_async_openai.assert_called_once_with(
+                api_key='fallback-key', base_url='http://100.75.232.36:11434/v1'
+            )
+
+    def test_acomplete(self, home_llm_client):
+        """acomplete awaits the async client and parses the response."""
+        from src.async_loop import run_sync
+
+        async_client = Mock()
+        async_client.chat.completions.create = AsyncMock(return_value=self._response("async hi"))
+
+        with patch.object(home_llm_client, '_get_async_client', return_value=async_client):
+            with patch.object(home_llm_client, '_get_async_fallback_client', return_value=None):
+                result = run_sync(home_llm_client.acomplete("Hello"))
+
+        assert result.content == "async hi"
+        assert result.input_tokens == 3
+        assert result.model == "llama3"
+
+    def test_acomplete_with_tools_falls_back(self, home_llm_client):
+        """acomplete_with_tools falls back to OpenAI when home-llm fails."""
+        from src.async_loop import run_sync
+
+        home = Mock()
+        home.chat.completions.create = AsyncMock(side_effect=Exception("down"))
+        fallback = Mock()
+        fallback.chat.completions.create = AsyncMock(return_value=self._response("fallback"))
+        tools = [{"name": "test_tool", "description": "Test", "input_schema": {}}]
+
+        with patch.object(home_llm_client, '_get_async_client', return_value=home):
+            with patch.object(home_llm_client, '_get_async_fallback_client', return_value=fallback):
+                text, tool_calls = run_sync(home_llm_client.acomplete_with_tools("Hello", tools))
+
+        assert text == "fallback"
+        assert tool_calls == []
+        assert home_llm_client.fallback_count == 1
+        assert fallback.chat.completions.create.call_args.kwargs['model'] == 'gpt-4o-mini'
+
+    def test_complete_timeout_cancels_request(self, home_llm_client):
+        """complete(timeout=...) cancels the async request when it expires."""
+        import asyncio
+        import threading
+
+        cancelled = threading.Event()
+
+        async def hang(**kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async_client = Mock()
+        async_client.chat.completions.create = hang
+
+        with patch.object(home_llm_client, '_get_async_client', return_value=async_client):
+            with patch.object(home_llm_client, '_get_async_fallback_client', return_value=None):
+                with pytest.raises(TimeoutError):
+                    home_llm_client.complete("Hello", timeout=0.1)
+
+        assert cancelled.wait(2)
@@ -0,0 +1,356 @@
+"""
+Tests for src/llm_router.py - Health-aware LLM provider routing
+
+Covers rolling provider stats, the circuit breaker, and hedged requests,
+plus the router's integration with LLMClient's home-llm fallback path.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.llm_router import (
+    CircuitState,
+    ProviderCall,
+    ProviderHealth,
+    ProviderRouter,
+)
+
+
+# =============================================================================
+# ProviderHealth Tests
+# =============================================================================
+
+
+class TestProviderHealth:
+    """Tests for per-provider stats and circuit breaker."""
+
+    def test_starts_closed(self):
+        """New providers accept requests."""
+        health = ProviderHealth("home_llm")
+        assert health.circuit_state == CircuitState.CLOSED.value
+        assert health.allow_request() is True
+
+    def test_opens_after_consecutive_failures(self):
+        """Circuit opens once the failure threshold is reached."""
+        health = ProviderHealth("home_llm", failure_threshold=3)
+        health.record_failure(0.1)
+        health.record_failure(0.1)
+        assert health.allow_request() is True
+
+        health.record_failure(0.1)
+        assert health.circuit_state == CircuitState.OPEN.value
+        assert health.allow_request() is False
+
+    def test_success_resets_failure_streak(self):
+        """A success between failures keeps the circuit closed."""
+        health = ProviderHealth("home_llm", failure_threshold=2)
+        health.record_failure(0.1)
+        health.record_success(0.1)
+        health.record_failure(0.1)
+        assert health.circuit_state == CircuitState.CLOSED.value
+
+    def test_half_open_allows_single_probe(self):
+        """After cooldown only one probe request is let through."""
+        health = ProviderHealth("home_llm", failure_threshold=1, cooldown_seconds=0)
+        health.record_failure(0.1)
+
+        assert health.allow_request() is True
+        assert health.allow_request() is False
+
+    def test_probe_success_closes_circuit(self):
+        """A successful probe closes the circuit."""
+        health = ProviderHealth("home_llm", failure_threshold=1, cooldown_seconds=0)
+        health.record_failure(0.1)
+        health.allow_request()
+        health.record_success(0.2)
+
+        assert health.circuit_state == CircuitState.CLOSED.value
+
+    def test_probe_failure_reopens_circuit(self):
+        """A failed probe re-opens the circuit."""
+        health = ProviderHealth("home_llm", failure_threshold=1, cooldown_seconds=60)
+        health.record_failure(0.1)
+        health._circuit_opened_at -= 61
+        assert health.allow_request() is True
+
+        health.record_failure(0.1)
+        assert health.circuit_state == CircuitState.OPEN.value
+
+    def test_p95_requires_min_samples(self):
+        """p95 is unknown until enough successes are recorded."""
+        health = ProviderHealth("home_llm")
+        for _ in range(5):
+            health.record_success(0.1)
+        assert health.p95_latency(min_samples=10) is None
+
+    def test_p95_ignores_failures(self):
+        """p95 latency is computed from successful calls only."""
+        health = ProviderHealth("home_llm")
+        for latency in range(1, 21):
+            health.record_success(latency / 10)
+        health.record_failure(30.0)
+
+        assert health.p95_latency(min_samples=10) == pytest.approx(1.9)
+
+    def test_error_rate(self):
+        """Error rate reflects the rolling window."""
+        health = ProviderHealth("home_llm", failure_threshold=10)
+        health.record_success(0.1)
+        health.record_failure(0.1)
+        assert health.error_rate() == 0.5
+
+    def test_to_dict(self):
+        """Stats serialize for health reporting."""
+        health = ProviderHealth("openai")
+        health.record_success(0.25)
+
+        stats = health.to_dict()
+        assert stats["name"] == "openai"
+        assert stats["circuit_state"] == "closed"
+        assert stats["p95_latency_ms"] == 250
+        assert stats["total_requests"] == 1
+
+
+# =============================================================================
+# ProviderRouter Tests
+# =============================================================================
+
+
+class TestProviderRouter:
+    """Tests for sequential and hedged routing."""
+
+    def test_uses_primary_when_healthy(self):
+        """Primary provider serves the request when it succeeds."""
+        router = ProviderRouter(hedge_enabled=False)
+        fallback = Mock(return_value="fallback")
+
+        result, provider = router.execute([
+            ProviderCall("home_llm", lambda: "primary"),
+            ProviderCall("openai", fallback),
+        ])
+
+        assert (result, provider) == ("primary", "home_llm")
+        fallback.assert_not_called()
+
+    def test_falls_back_on_error(self):
+        """Next provider is tried when the primary raises."""
+        router = ProviderRouter(hedge_enabled=False)
+
+        result, provider = router.execute([
+            ProviderCall("home_llm", Mock(side_effect=Exception("down"))),
+            ProviderCall("openai", lambda: "fallback"),
+        ])
+
+        assert (result, provider) == ("fallback", "openai")
+
+    def test_raises_last_error_when_all_fail(self):
+        """The last provider error propagates when nothing succeeds."""
+        router = ProviderRouter(hedge_enabled=False)
+
+        with pytest.raises(Exception, match="openai down"):
+            router.execute([
+                ProviderCall("home_llm", Mock(side_effect=Exception("home down"))),
+                ProviderCall("openai", Mock(side_effect=Exception("openai down"))),
+            ])
+
+    def test_open_circuit_skips_provider(self):
+        """A provider with an open circuit is not called at all."""
+        router = ProviderRouter(hedge_enabled=False, failure_threshold=2)
+        primary = Mock(side_effect=Exception("down"))
+        calls = [ProviderCall("home_llm", primary), ProviderCall("openai", lambda: "ok")]
+
+        router.execute(calls)
+        router.execute(calls)
+        assert primary.call_count == 2
+
+        router.execute(calls)
+        assert primary.call_count == 2
+
+    def test_all_circuits_open_tries_primary(self):
+        """With every circuit open the primary is still attempted."""
+        router = ProviderRouter(hedge_enabled=False, failure_threshold=1)
+        router.get_health("home_llm").record_failure(0.1)
+        router.get_health("openai").record_failure(0.1)
+
+        result, provider = router.execute([
+            ProviderCall("home_llm", lambda: "recovered"),
+            ProviderCall("openai", lambda: "unused"),
+        ])
+
+        assert (result, provider) == ("recovered", "home_llm")
+
+    def test_unused_half_open_fallback_keeps_probe_slot(self):
+        """A half-open fallback that is never called can still be probed later."""
+        router = ProviderRouter(hedge_enabled=False, failure_threshold=1, cooldown_seconds=0)
+        router.get_health("openai").record_failure(0.1)
+        fallback = Mock(return_value="fallback")
+        calls = [ProviderCall("home_llm", lambda: "primary"), ProviderCall("openai", fallback)]
+
+        assert router.execute(calls) == ("primary", "home_llm")
+        assert router.get_health("openai").circuit_state == CircuitState.HALF_OPEN.value
+        assert router.get_health("openai").is_available() is True
+
+        calls[0] = ProviderCall("home_llm", Mock(side_effect=Exception("down")))
+        assert router.execute(calls) == ("fallback", "openai")
+        assert router.get_health("openai").circuit_state == CircuitState.CLOSED.value
+
+    def test_async_unlaunched_hedge_keeps_probe_slot(self):
+        """aexecute() does not reserve a probe for a hedge it never launches."""
+        router = ProviderRouter(hedge_enabled=True, failure_threshold=1, cooldown_seconds=0)
+        router.get_health("openai").record_failure(0.1)
+
+        async def primary():
+            return "primary"
+
+        async def fallback():
+            return "fallback"
+
+        calls = [ProviderCall("home_llm", primary), ProviderCall("openai", fallback)]
+        assert asyncio.run(router.aexecute(calls)) == ("primary", "home_llm")
+
+        assert router.get_health("openai").is_available() is True
+        assert router.hedge_count == 0
+
+    def test_empty_calls_raises(self):
+        """Routing with no providers is a configuration error."""
+        router = ProviderRouter(hedge_enabled=False)
+        with pytest.raises(ValueError):
+            router.execute([])
+
+    def test_hedge_budget_defaults_until_p95_known(self):
+        """Default budget is used until p95 has enough samples."""
+        router = ProviderRouter(hedge_enabled=True, hedge_default_budget=2.0)
+        assert router.hedge_budget("home_llm") == 2.0
+
+        for _ in range(20):
+            router.get_health("home_llm").record_success(1.0)
+        assert router.hedge_budget("home_llm") == pytest.approx(1.0)
+
+    def test_hedged_request_wins_when_primary_slow(self):
+        """A slow primary is raced against the next provider."""
+        router = ProviderRouter(hedge_enabled=True, hedge_default_budget=0.05)
+        release = threading.Event()
+
+        def slow_primary():
+            release.wait(2)
+            return "slow"
+
+        try:
+            result, provider = router.execute([
+                ProviderCall("home_llm", slow_primary),
+                ProviderCall("openai", lambda: "fast"),
+            ])
+        finally:
+            release.set()
+
+        assert (result, provider) == ("fast", "openai")
+        assert router.hedge_count == 1
+
+    def test_hedged_primary_failure_starts_next_immediately(self):
+        """A failed primary starts the next provider without waiting for the budget."""
+        router = ProviderRouter(hedge_enabled=True, hedge_default_budget=5.0)
+
+        start = time.monotonic()
+        result, provider = router.execute([
+            ProviderCall("home_llm", Mock(side_effect=Exception("down"))),
+            ProviderCall("openai", lambda: "fallback"),
+        ])
+
+        assert (result, provider) == ("fallback", "openai")
+        assert time.monotonic() - start < 1.0
+        assert router.hedge_count == 0
+
+    def test_get_stats(self):
+        """Router stats include every provider it has seen."""
+        router = ProviderRouter(hedge_enabled=False)
+        router.execute([ProviderCall("home_llm", lambda: "ok")])
+
+        stats = router.get_stats()
+        assert stats["hedge_enabled"] is False
+        assert "home_llm" in stats["providers"]
+
+
+# =============================================================================
+# LLMClient Integration Tests
+# =============================================================================
+
+
+class TestLLMClientRouting:
+    """Tests that LLMClient's home-llm path is driven by the router."""
+
+    @pytest.fixture
+    def home_llm_client(self):
+        """Create an LLMClient configured for home_llm with an OpenAI fallback."""
+        with patch('src.llm_client.os.getenv') as mock_getenv:
+            mock_getenv.side_effect = lambda key, default=None: {
+                'LLM_PROVIDER': 'home_llm',
+                'LLM_MODEL': 'llama3',
+                'LLM_API_KEY': None,
+                'LLM_BASE_URL': 'http://100.75.232.36:11434/v1',
+                'HOME_LLM_URL': 'http://100.75.232.36:11434',
+            }.get(key, default)
+
+            with patch('src.config.OPENAI_API_KEY', 'fallback-key'):
+                with patch('src.config.OPENAI_MODEL', 'gpt-4o-mini'):
+                    from src.llm_client import LLMClient
+                    client = LLMClient()
+                    client.router = ProviderRouter(hedge_enabled=False, failure_threshold=2)
+                    yield client
+
+    @staticmethod
+    def _response(content):
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = content
+        response.choices[0].message.tool_calls = None
+        response.usage.prompt_tokens = 1
+        response.usage.completion_tokens = 1
+        return response
+
+    def test_open_circuit_skips_home_llm(self, home_llm_client):
+        """Once home-llm's circuit opens, requests go straight to OpenAI."""
+        home = Mock()
+        home.chat.completions.create.side_effect = Exception("timeout")
+        fallback = Mock()
+        fallback.chat.completions.create.return_value = self._response("fallback")
+
+        with patch.object(home_llm_client, '_get_client', return_value=home):
+            with patch.object(home_llm_client, '_get_fallback_client', return_value=fallback):
+                for _ in range(4):
+                    assert home_llm_client.complete("Hello").content == "fallback"
+
+        assert home.chat.completions.create.call_count == 2
+        assert home_llm_client.fallback_count == 4
+
+    def test_tools_share_router_stats(self, home_llm_client):
+        """complete_with_tools records into the same provider stats."""
+        home = Mock()
+        home.chat.completions.create.return_value = self._response("done")
+        tools = [{"name": "test_tool", "description": "Test", "input_schema": {}}]
+
+        with patch.object(home_llm_client, '_get_client', return_value=home):
+            with patch.object(home_llm_client, '_get_fallback_client', return_value=None):
+                home_llm_client.complete("Hello")
+                home_llm_client.complete_with_tools("Hello", tools)
+
+        stats = home_llm_client.get_provider_health()
+        assert stats["providers"]["home_llm"]["total_requests"] == 2
+
+    def test_fallback_response_reports_fallback_model(self, home_llm_client):
+        """Responses served by OpenAI report the OpenAI model."""
+        home = Mock()
+        home.chat.completions.create.side_effect = Exception("down")
+        fallback = Mock()
+        fallback.chat.completions.create.return_value = self._response("fallback")
+
+        with patch('src.config.OPENAI_MODEL', 'gpt-4o-mini'):
+            with patch.object(home_llm_client, '_get_client', return_value=home):
+                with patch.object(home_llm_client, '_get_fallback_client', return_value=fallback):
+                    response = home_llm_client.complete("Hello")
+
+        assert response.model == "gpt-4o-mini"
+        assert home_llm_client.model == "llama3"
@@ -207,6 +207,29 @@ class TestLocationInference:
         room = manager.get_room_from_context(None)
         assert room is None
 
+    def test_get_room_entities_includes_lights_and_blinds(self, manager):
+        """Should list all lights plus blinds for a room."""
+        entities = manager.get_room_entities("bedroom")
+        assert "light.bed_north" in entities
+        assert "light.bubble" in entities
+        assert "cover.bedroom_blinds" in entities
+
+    def test_get_room_entities_resolves_alias(self, manager):
+        """Should resolve aliases before looking up entities."""
+        assert manager.get_room_entities("lounge") == manager.get_room_entities("living_room")
+
+    def test_get_room_entities_includes_media(self, manager):
+        """Should include media players configured for the room."""
+        from unittest.mock import patch
+
+        room_map = {"den": {"lights": ["light.den"], "media": "media_player.den"}}
+        with patch("src.location_manager.ROOM_ENTITY_MAP", room_map):
+            assert manager.get_room_entities("den") == ["light.den", "media_player.den"]
+
+    def test_get_room_entities_unknown_room(self, manager):
+        """Should return an empty list for unknown rooms."""
+        assert manager.get_room_entities("attic") == []
+
 
 class TestUserLocationTracking:
     """Tests for tracking and managing user's current location."""
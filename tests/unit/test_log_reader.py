@@ -400,6 +400,85 @@ class TestLogReaderTail:
             f.write("2025-12-18 10:02:00,000 | INFO     | test                      | new_entry            | New log entry\n")
 
         # Read from position
-        new_entries = reader.read_from_position(file_path=temp_log_file, position=position)
+        new_entries, new_position = reader.read_from_position(
+            file_path=temp_log_file, position=position
+        )
         assert len(new_entries) == 1
         assert new_entries[0].message == "New log entry"
+        assert new_position == temp_log_file.stat().st_size
+
+    def test_read_from_position_leaves_partial_line(self, temp_log_file: Path):
+        """A line still being written is not parsed or consumed."""
+        reader = LogReader(log_dir=temp_log_file.parent)
+        _, position = reader.tail_with_position(file_path=temp_log_file, lines=1)
+
+        with open(temp_log_file, "a") as f:
+            f.write("2025-12-18 10:02:00,000 | INFO     | test                      | new_entry            | Half wri")
+
+        entries, new_position = reader.read_from_position(file_path=temp_log_file, position=position)
+        assert entries == []
+        assert new_position == position
+
+        with open(temp_log_file, "a") as f:
+            f.write("tten entry\n")
+
+        entries, new_position = reader.read_from_position(file_path=temp_log_file, position=position)
+        assert [entry.message for entry in entries] == ["Half written entry"]
+        assert new_position == temp_log_file.stat().st_size
+
+
+class TestLogReaderExportStream:
+    """Tests for streamed log exports."""
+
+    def test_stream_json_matches_export(self, temp_log_file: Path):
+        """Streamed JSON parses to the same entries and stats as export()."""
+        import json
+
+        reader = LogReader(log_dir=temp_log_file.parent)
+        streamed = json.loads("".join(reader.export_stream(file_path=temp_log_file, format="json")))
+        exported = json.loads(reader.export(file_path=temp_log_file, format="json"))
+
+        assert streamed == exported
+
+    def test_stream_ndjson_resumes_from_cursor(self, temp_log_file: Path):
+        """An NDJSON export restarted from a cursor continues after that entry."""
+        import json
+
+        reader = LogReader(log_dir=temp_log_file.parent)
+        lines = [
+            json.loads(line)
+            for line in "".join(reader.export_stream(file_path=temp_log_file)).splitlines()
+        ]
+        entries = [line for line in lines if line["type"] == "entry"]
+        assert lines[-1]["type"] == "end"
+        assert lines[-1]["stats"]["total_entries"] == 6
+
+        resumed = [
+            json.loads(line)
+            for line in "".join(
+                reader.export_stream(file_path=temp_log_file, cursor=entries[1]["cursor"])
+            ).splitlines()
+        ]
+
+        assert [line["entry"] for line in resumed[:-1]] == [e["entry"] for e in entries[2:]]
+        assert resumed[0]["entry"]["line_number"] == 3
+
+    def test_stream_csv_with_filter(self, temp_log_file: Path):
+        """CSV exports have a header and only the matching entries."""
+        import csv
+
+        reader = LogReader(log_dir=temp_log_file.parent)
+        output = "".join(
+            reader.export_stream(file_path=temp_log_file, format="csv", min_level=LogLevel.ERROR)
+        )
+        rows = list(csv.DictReader(output.splitlines()))
+
+        assert [row["level"] for row in rows] == ["ERROR", "CRITICAL"]
+        assert rows[0]["_cursor"].endswith(":4")
+
+    def test_stream_rejects_bad_cursor(self, temp_log_file: Path):
+        """Invalid cursors are rejected before streaming starts."""
+        reader = LogReader(log_dir=temp_log_file.parent)
+
+        with pytest.raises(ValueError):
+            reader.export_stream(file_path=temp_log_file, cursor="end")
@@ -10,6 +10,8 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 from typing import Any
 
+from src.entity_store import EntityStore
+
 
 # =============================================================================
 # Test Data
@@ -325,7 +327,7 @@ class TestListPlugs:
 
     def test_list_all_plugs(self, mock_ha_client):
         """Lists all switch entities that are plugs."""
-        mock_ha_client.get_all_states.return_value = MOCK_ALL_PLUGS
+        mock_ha_client.get_entity_store.return_value = EntityStore(MOCK_ALL_PLUGS)
 
         from tools.plugs import list_plugs
         result = list_plugs()
@@ -347,7 +349,7 @@ class TestListPlugs:
                 },
             }
         ]
-        mock_ha_client.get_all_states.return_value = all_switches
+        mock_ha_client.get_entity_store.return_value = EntityStore(all_switches)
 
         from tools.plugs import list_plugs
         result = list_plugs(filter_device_class="outlet")
@@ -359,7 +361,7 @@ class TestListPlugs:
 
     def test_list_plugs_includes_state(self, mock_ha_client):
         """Listed plugs include their current state."""
-        mock_ha_client.get_all_states.return_value = MOCK_ALL_PLUGS
+        mock_ha_client.get_entity_store.return_value = EntityStore(MOCK_ALL_PLUGS)
 
         from tools.plugs import list_plugs
         result = list_plugs()
@@ -371,7 +373,7 @@ class TestListPlugs:
 
     def test_list_plugs_empty(self, mock_ha_client):
         """Returns empty list when no plugs found."""
-        mock_ha_client.get_all_states.return_value = []
+        mock_ha_client.get_entity_store.return_value = EntityStore([])
 
         from tools.plugs import list_plugs
         result = list_plugs()
@@ -475,7 +477,7 @@ class TestExecutePlugTool:
 
     def test_execute_list_plugs(self, mock_ha_client):
         """Dispatches list_plugs correctly."""
-        mock_ha_client.get_all_states.return_value = MOCK_ALL_PLUGS
+        mock_ha_client.get_entity_store.return_value = EntityStore(MOCK_ALL_PLUGS)
 
         from tools.plugs import execute_plug_tool
         result = execute_plug_tool("list_plugs", {})
@@ -0,0 +1,157 @@
+"""
+Unit tests for the shared SQLite rate limit storage.
+"""
+
+import threading
+import time
+
+import pytest
+from flask import Flask
+from flask_limiter import Limiter
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+
+from src.rate_limit_storage import SQLiteStorage, default_storage_uri
+
+
+@pytest.fixture
+def storage_uri(tmp_path):
+    return f"sqlite://{tmp_path / 'limits' / 'ratelimits.db'}"
+
+
+@pytest.fixture
+def storage(storage_uri):
+    return storage_from_string(storage_uri)
+
+
+class TestCounters:
+    """Tests for the fixed window counter operations."""
+
+    def test_scheme_is_registered(self, storage):
+        assert isinstance(storage, SQLiteStorage)
+        assert storage.check()
+
+    def test_incr_get_and_expiry(self, storage, monkeypatch):
+        assert storage.incr("key", 10) == 1
+        assert storage.incr("key", 10, amount=2) == 3
+        assert storage.get("key") == 3
+
+        # Once expired the counter reads as zero and restarts on increment
+        now = storage.get_expiry("key")
+        monkeypatch.setattr("src.rate_limit_storage.time.time", lambda: now + 1)
+
+        assert storage.get("key") == 0
+        assert storage.incr("key", 10) == 1
+
+    def test_elastic_expiry_extends_window(self, storage, monkeypatch):
+        storage.incr("key", 10)
+        expiry = storage.get_expiry("key")
+        monkeypatch.setattr("src.rate_limit_storage.time.time", lambda: expiry - 5)
+
+        assert storage.incr("key", 10, elastic_expiry=True) == 2
+        assert storage.get_expiry("key") == pytest.approx(expiry + 5)
+
+    def test_clear_and_reset(self, storage):
+        storage.incr("a", 10)
+        storage.incr("b", 10)
+
+        storage.clear("a")
+        assert storage.get("a") == 0
+        assert storage.reset() == 1
+        assert storage.get("b") == 0
+
+
+class TestSlidingWindow:
+    """Tests for the sliding window counter strategy."""
+
+    def test_allows_up_to_limit(self, storage):
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        item = parse("5 per minute")
+
+        results = [limiter.hit(item, "user:1") for _ in range(7)]
+
+        assert results == [True] * 5 + [False] * 2
+        assert limiter.get_window_stats(item, "user:1").remaining == 0
+        assert limiter.hit(item, "user:2")
+
+    def test_previous_window_is_weighted(self, storage):
+        previous_key, current_key = storage.sliding_window_keys("user:1", 60, time.time())
+        storage.incr(previous_key, 120, amount=10)
+
+        previous_count, previous_ttl, current_count, _ = storage.get_sliding_window("user:1", 60)
+
+        assert previous_count == 10 and current_count == 0
+        assert 0 < previous_ttl <= 60
+
+    def test_instances_share_one_file(self, storage_uri):
+        """Separate storages (as in separate workers) count together."""
+        first = SlidingWindowCounterRateLimiter(storage_from_string(storage_uri))
+        second = SlidingWindowCounterRateLimiter(storage_from_string(storage_uri))
+        item = parse("4 per minute")
+
+        results = [(first if n % 2 else second).hit(item, "user:1") for n in range(6)]
+
+        assert results.count(True) == 4
+
+    def test_concurrent_hits_never_exceed_limit(self, storage):
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        item = parse("50 per minute")
+        allowed = []
+
+        def worker():
+            allowed.extend(limiter.hit(item, "user:1") for _ in range(20))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert allowed.count(True) == 50
+
+
+class TestFlaskLimiter:
+    """Tests for the storage behind flask-limiter."""
+
+    def test_route_limit_returns_429(self, storage_uri):
+        app = Flask(__name__)
+        limiter = Limiter(
+            key_func=lambda: "user:1",
+            app=app,
+            storage_uri=storage_uri,
+            strategy="sliding-window-counter",
+            headers_enabled=True,
+        )
+
+        @app.route("/command")
+        @limiter.limit("2 per minute")
+        def command():
+            return "ok"
+
+        client = app.test_client()
+        statuses = [client.get("/command").status_code for _ in range(3)]
+
+        assert statuses == [200, 200, 429]
+
+
+class TestDefaultStorageUri:
+    """Tests for default_storage_uri()."""
+
+    def test_development_uses_memory(self, monkeypatch):
+        monkeypatch.setattr("src.rate_limit_storage.RATE_LIMIT_STORAGE_URI", "")
+        monkeypatch.setattr("src.rate_limit_storage.SERVER_MODE", "development")
+
+        assert default_storage_uri() == "memory://"
+
+    def test_production_uses_shared_file(self, monkeypatch):
+        monkeypatch.setattr("src.rate_limit_storage.RATE_LIMIT_STORAGE_URI", "")
+        monkeypatch.setattr("src.rate_limit_storage.SERVER_MODE", "production")
+
+        assert default_storage_uri().startswith("sqlite:///")
+
+    def test_configured_uri_wins(self, monkeypatch):
+        monkeypatch.setattr("src.rate_limit_storage.RATE_LIMIT_STORAGE_URI", "memory://")
+        monkeypatch.setattr("src.rate_limit_storage.SERVER_MODE", "production")
+
+        assert default_storage_uri() == "memory://"
@@ -0,0 +1,114 @@
+"""
+Unit tests for the in-memory settings cache.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from src.settings_cache import SettingsCache
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "settings.db"
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    connection.execute("INSERT INTO settings VALUES ('theme', '\"dark\"')")
+    connection.commit()
+    connection.close()
+    return path
+
+
+def write_setting(path, key, value):
+    """Write a setting from a separate connection, as another process would."""
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, json.dumps(value))
+    )
+    connection.commit()
+    connection.close()
+
+
+class TestSettingsCache:
+    """Tests for SettingsCache."""
+
+    def test_reads_are_served_from_memory(self, db_path):
+        cache = SettingsCache(db_path, "settings", decode=json.loads, poll_interval=60)
+
+        assert cache.get("theme") == "dark"
+        assert cache.get("missing", default=3) == 3
+        assert cache.get_stats()["reloads"] == 1
+
+    def test_invalidate_reloads_on_next_read(self, db_path):
+        cache = SettingsCache(db_path, "settings", decode=json.loads, poll_interval=60)
+        cache.load()
+
+        write_setting(db_path, "theme", "light")
+        assert cache.get("theme") == "dark"  # Within the poll interval
+
+        cache.invalidate()
+        assert cache.get("theme") == "light"
+
+    def test_other_connection_writes_are_detected(self, db_path):
+        cache = SettingsCache(db_path, "settings", decode=json.loads, poll_interval=0)
+        cache.load()
+
+        write_setting(db_path, "volume", 7)
+
+        assert cache.get("volume") == 7
+
+    def test_unchanged_database_is_not_reloaded(self, db_path):
+        cache = SettingsCache(db_path, "settings", decode=json.loads, poll_interval=0)
+        cache.load()
+
+        for _ in range(5):
+            cache.get("theme")
+
+        assert cache.get_stats()["reloads"] == 1
+
+    def test_listeners_receive_changed_keys(self, db_path):
+        cache = SettingsCache(db_path, "settings", decode=json.loads, poll_interval=0)
+        cache.load()
+        changes = []
+        cache.add_listener(changes.append)
+
+        write_setting(db_path, "theme", "light")
+        write_setting(db_path, "volume", 7)
+        cache.get("theme")
+
+        assert changes == [{"theme", "volume"}]
+
+    def test_returned_values_are_copies(self, db_path):
+        write_setting(db_path, "rooms", ["kitchen"])
+        cache = SettingsCache(db_path, "settings", decode=json.loads, poll_interval=60)
+
+        cache.get("rooms").append("office")
+
+        assert cache.get("rooms") == ["kitchen"]
+
+    def test_follows_database_path(self, db_path, tmp_path):
+        other = tmp_path / "other.db"
+        connection = sqlite3.connect(other)
+        connection.execute("CREATE TABLE settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        connection.close()
+        current = {"path": db_path}
+        cache = SettingsCache(lambda: current["path"], "settings", decode=json.loads)
+
+        assert cache.get("theme") == "dark"
+        current["path"] = other
+        assert cache.get("theme") is None
+
+
+class TestDatabaseSettings:
+    """Tests for the settings cache behind database.get_setting."""
+
+    def test_set_setting_is_visible_immediately(self, test_db):
+        from src.database import get_setting, set_setting
+
+        set_setting("theme", "dark")
+        assert get_setting("theme") == "dark"
+
+        set_setting("theme", "light")
+        assert get_setting("theme") == "light"
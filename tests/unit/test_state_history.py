@@ -0,0 +1,244 @@
+"""
+Unit tests for buffered device state history and its retention tiers.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.state_history import StateHistory, get_state_history
+
+
+NOW = datetime(2026, 3, 10, 12, 0, 0)
+
+
+@pytest.fixture
+def history(test_db):
+    history = StateHistory(database_path=test_db, batch_size=100, flush_interval=60)
+    yield history
+    history.stop()
+
+
+def locked_database():
+    raise sqlite3.OperationalError("database is locked")
+
+
+def raw_count(history):
+    connection = history._connect()
+    try:
+        return connection.execute("SELECT COUNT(*) FROM device_state_history").fetchone()[0]
+    finally:
+        connection.close()
+
+
+class TestIngestion:
+    """Tests for buffering, batching and deduplication."""
+
+    def test_record_buffers_until_flush(self, history):
+        history.record("light.kitchen", "on")
+        history.record("light.hall", "off")
+
+        assert raw_count(history) == 0
+        assert history.get_stats()["buffered"] == 2
+
+        assert history.flush() == 2
+        assert raw_count(history) == 2
+        assert history.get_stats()["batches"] == 1
+
+    def test_full_buffer_triggers_write(self, test_db):
+        history = StateHistory(database_path=test_db, batch_size=3, flush_interval=60)
+        try:
+            for state in ("1", "2", "3"):
+                history.record("sensor.power", state)
+            assert raw_count(history) == 3
+        finally:
+            history.stop()
+
+    def test_unchanged_consecutive_states_are_dropped(self, history):
+        for state in ("on", "on", "off", "off", "on"):
+            history.record("light.kitchen", state, {"brightness": 100})
+        history.flush()
+
+        assert raw_count(history) == 3
+        assert history.get_stats()["deduplicated"] == 2
+
+    def test_attribute_change_is_kept(self, history):
+        history.record("light.kitchen", "on", {"brightness": 100})
+        history.record("light.kitchen", "on", {"brightness": 200})
+        history.flush()
+
+        assert raw_count(history) == 2
+
+    def test_failed_write_keeps_batch_for_retry(self, history, monkeypatch):
+        history.record("light.kitchen", "on")
+        history.record("light.hall", "off")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(history, "_connect", locked_database)
+            history.record("light.porch", "on")
+            with pytest.raises(sqlite3.OperationalError):
+                history.flush()
+
+        assert history.get_stats()["buffered"] == 3
+        assert history.flush() == 3
+        assert raw_count(history) == 3
+
+    def test_retried_batches_are_bounded(self, test_db, monkeypatch):
+        history = StateHistory(database_path=test_db, batch_size=2, flush_interval=60)
+        monkeypatch.setattr("src.state_history.MAX_BUFFERED_BATCHES", 2)
+        monkeypatch.setattr(history, "_connect", locked_database)
+        try:
+            for number in range(6):
+                with pytest.raises(sqlite3.OperationalError):
+                    history.record("sensor.power", str(number), flush=True)
+
+            assert history.get_stats()["buffered"] == 4
+            assert [snapshot[1] for snapshot in history._buffer] == ["2", "3", "4", "5"]
+        finally:
+            history.stop()
+
+    def test_dedupe_uses_stored_history_across_instances(self, history, test_db):
+        history.record("light.kitchen", "on", flush=True)
+
+        fresh = StateHistory(database_path=test_db, batch_size=100, flush_interval=60)
+        try:
+            fresh.record("light.kitchen", "on", flush=True)
+            assert raw_count(fresh) == 1
+        finally:
+            fresh.stop()
+
+
+class TestRetention:
+    """Tests for compaction into minute and hour rollups."""
+
+    def test_old_raw_rows_become_minute_rollups(self, history):
+        base = NOW - timedelta(days=2)
+        for offset, value in ((0, "10"), (20, "30"), (70, "5")):
+            history.record("sensor.power", value, recorded_at=base + timedelta(seconds=offset))
+        history.record("sensor.power", "7", recorded_at=NOW - timedelta(hours=1))
+        history.flush()
+
+        counts = history.compact(now=NOW)
+
+        assert counts["raw_rolled_up"] == 3
+        assert raw_count(history) == 1
+
+        points = history.query_range("sensor.power", NOW - timedelta(days=3), NOW)
+        assert [point["resolution"] for point in points] == ["minute", "minute", "raw"]
+        first = points[0]
+        assert first["samples"] == 2
+        assert first["state"] == "30"
+        assert (first["min"], first["max"], first["avg"]) == (10.0, 30.0, 20.0)
+
+    def test_old_minute_rollups_become_hour_rollups(self, history):
+        base = NOW - timedelta(days=10)
+        for minute, value in ((0, "10"), (5, "20"), (50, "60")):
+            history.record("sensor.power", value, recorded_at=base + timedelta(minutes=minute))
+        history.flush()
+
+        history.compact(now=NOW)
+        points = history.query_range("sensor.power", base - timedelta(hours=1), NOW)
+
+        assert len(points) == 1
+        assert points[0]["resolution"] == "hour"
+        assert points[0]["samples"] == 3
+        assert points[0]["state"] == "60"
+        assert points[0]["avg"] == 30.0
+
+    def test_hour_rollup_keeps_latest_minute_state(self, history):
+        hour = NOW - timedelta(days=10)
+        connection = history._connect()
+        with connection:
+            # An earlier minute holds the hour's min and max value
+            for minute, state, low, high in (
+                (0, "A", 5.0, 5.0), (10, "B", 1.0, 90.0), (20, "C", 3.0, 3.0)
+            ):
+                bucket = (hour + timedelta(minutes=minute)).strftime("%Y-%m-%d %H:%M:%S")
+                connection.execute(
+                    """
+                    INSERT INTO device_state_rollups (
+                        entity_id, resolution, bucket_start, last_state, last_recorded_at,
+                        samples, value_count, value_sum, value_min, value_max
+                    ) VALUES ('select.mode', 'minute', ?, ?, ?, 1, 1, ?, ?, ?)
+                    """,
+                    (bucket, state, bucket, low, low, high),
+                )
+        connection.close()
+
+        history.compact(now=NOW)
+        points = history.query_range("select.mode", hour - timedelta(hours=1), NOW)
+
+        assert len(points) == 1
+        assert points[0]["resolution"] == "hour"
+        assert points[0]["samples"] == 3
+        assert points[0]["state"] == "C"
+        assert (points[0]["min"], points[0]["max"]) == (1.0, 90.0)
+
+    def test_repeated_compaction_merges_buckets(self, history):
+        base = NOW - timedelta(days=2)
+        history.record("sensor.power", "10", recorded_at=base, flush=True)
+        history.compact(now=NOW)
+        history.record("sensor.power", "20", recorded_at=base + timedelta(seconds=30), flush=True)
+        history.compact(now=NOW)
+
+        points = history.query_range("sensor.power", base, NOW)
+
+        assert len(points) == 1
+        assert points[0]["samples"] == 2
+        assert points[0]["state"] == "20"
+        assert (points[0]["min"], points[0]["max"]) == (10.0, 20.0)
+
+    def test_non_numeric_states_have_no_aggregates(self, history):
+        history.record("light.kitchen", "on", recorded_at=NOW - timedelta(days=2), flush=True)
+        history.compact(now=NOW)
+
+        point = history.query_range("light.kitchen", NOW - timedelta(days=3), NOW)[0]
+
+        assert point["state"] == "on"
+        assert point["avg"] is None
+
+    def test_expired_hour_rollups_are_deleted(self, history):
+        history.record("light.kitchen", "on", recorded_at=NOW - timedelta(days=400), flush=True)
+
+        counts = history.compact(now=NOW)
+
+        assert counts["hours_expired"] == 1
+        assert history.query_range("light.kitchen", NOW - timedelta(days=500), NOW) == []
+
+
+class TestRangeQuery:
+    """Tests for range queries over raw history."""
+
+    def test_range_bounds(self, history):
+        for hour in range(5):
+            history.record("sensor.power", str(hour), recorded_at=NOW - timedelta(hours=hour))
+        history.flush()
+
+        points = history.query_range("sensor.power", NOW - timedelta(hours=2), NOW)
+
+        assert [point["state"] for point in points] == ["2", "1", "0"]
+
+    def test_query_includes_buffered_snapshots(self, history):
+        history.record("light.kitchen", "on", {"brightness": 10}, recorded_at=NOW)
+
+        points = history.query_range("light.kitchen", NOW - timedelta(minutes=1), NOW)
+
+        assert points == [{
+            "recorded_at": "2026-03-10 12:00:00",
+            "state": "on",
+            "attributes": {"brightness": 10},
+            "resolution": "raw",
+        }]
+
+
+class TestGetStateHistory:
+    """Tests for the per-database singleton."""
+
+    def test_follows_database_path(self, test_db, monkeypatch, tmp_path):
+        first = get_state_history()
+        assert first is get_state_history()
+        assert first.database_path == test_db
+
+        monkeypatch.setattr("src.database.DATABASE_PATH", tmp_path / "other.db")
+        assert get_state_history() is not first
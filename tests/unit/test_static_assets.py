@@ -0,0 +1,117 @@
+"""
+Unit tests for content-hashed static assets (build + serving).
+"""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from flask import Flask, render_template_string
+
+from src.static_assets import IMMUTABLE_MAX_AGE, init_static_assets
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+import build_assets  # noqa: E402
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    """Static directory with a built copy of the real assets."""
+    build_assets.build_assets(PROJECT_ROOT / "static", tmp_path / "build", verbose=False)
+    return tmp_path
+
+
+@pytest.fixture
+def manifest(static_dir):
+    return json.loads((static_dir / "build" / "build-manifest.json").read_text())
+
+
+@pytest.fixture
+def app(static_dir):
+    app = Flask(__name__, static_folder=str(static_dir))
+    init_static_assets(app)
+    return app
+
+
+class TestBuild:
+    """Tests for the hashed build outputs."""
+
+    def test_hashed_bundles_and_precompressed_variants(self, static_dir, manifest):
+        build_dir = static_dir / "build"
+        hashed = manifest["assets"]["app.min.js"]
+
+        assert hashed.startswith("app.") and hashed != "app.min.js"
+        assert "gzip" in manifest["precompressed"][hashed]
+        assert gzip.decompress((build_dir / f"{hashed}.gz").read_bytes()) == (
+            build_dir / hashed
+        ).read_bytes()
+        assert "sw.min.js" not in manifest["assets"]
+
+    def test_service_worker_precaches_manifest_urls(self, static_dir, manifest):
+        sw = (static_dir / "build" / "sw.min.js").read_text()
+
+        assert f"/static/build/{manifest['assets']['style.min.css']}" in sw
+        assert manifest["version"] in sw
+        assert "PRECACHE_MANIFEST = null" not in sw
+
+    def test_rebuild_prunes_stale_bundles(self, static_dir, manifest):
+        build_dir = static_dir / "build"
+        stale = build_dir / "app.0badc0de.min.js"
+        stale.write_text("old")
+        previous = build_dir / manifest["assets"]["app.min.js"]
+
+        build_assets.build_assets(PROJECT_ROOT / "static", build_dir, verbose=False)
+
+        assert previous.exists()
+        assert not stale.exists()
+
+
+class TestServing:
+    """Tests for asset_url() and /static/build."""
+
+    def test_asset_url_resolves_hashed_name(self, app, manifest):
+        with app.test_request_context():
+            url = render_template_string("{{ asset_url('app.min.js') }}")
+            missing = render_template_string("{{ asset_url('other.min.js') }}")
+
+        assert url == f"/static/build/{manifest['assets']['app.min.js']}"
+        assert missing == "/static/build/other.min.js"
+
+    def test_hashed_asset_is_immutable_and_precompressed(self, app, static_dir, manifest):
+        hashed = manifest["assets"]["style.min.css"]
+
+        response = app.test_client().get(
+            f"/static/build/{hashed}", headers={"Accept-Encoding": "gzip, br"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.mimetype == "text/css"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert "immutable" in response.headers["Cache-Control"]
+        assert f"max-age={IMMUTABLE_MAX_AGE}" in response.headers["Cache-Control"]
+        assert gzip.decompress(response.data) == (static_dir / "build" / hashed).read_bytes()
+        response.close()
+
+    def test_identity_when_gzip_not_accepted(self, app, manifest):
+        hashed = manifest["assets"]["app.min.js"]
+
+        response = app.test_client().get(
+            f"/static/build/{hashed}", headers={"Accept-Encoding": "identity"}
+        )
+
+        assert "Content-Encoding" not in response.headers
+        assert "javascript" in response.mimetype
+        response.close()
+
+    def test_unhashed_build_files_are_not_immutable(self, app):
+        response = app.test_client().get("/static/build/sw.min.js")
+
+        assert response.status_code == 200
+        assert "immutable" not in response.headers.get("Cache-Control", "")
+        response.close()
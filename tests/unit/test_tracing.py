@@ -0,0 +1,119 @@
+"""
+Unit tests for request-scoped tracing spans.
+"""
+
+import logging
+import time
+
+import pytest
+from flask import Flask
+from prometheus_client import REGISTRY
+
+from src.async_loop import EventLoopThread
+from src.tracing import current_span, finish_trace, span, start_trace, traced
+
+
+def component_count(endpoint, component):
+    value = REGISTRY.get_sample_value(
+        "smarthome_request_component_seconds_count",
+        {"endpoint": endpoint, "component": component},
+    )
+    return value or 0
+
+
+class TestSpans:
+    """Tests for span nesting and time attribution."""
+
+    def test_span_outside_trace_is_a_no_op(self):
+        with span("database") as opened:
+            assert opened is None
+        assert current_span() is None
+
+    def test_exclusive_time_per_component(self):
+        token = start_trace("POST", "/trace/nested")
+        with span("tool", "control_lights"):
+            time.sleep(0.02)
+            with span("home_assistant", "POST /api/services/light/turn_on"):
+                time.sleep(0.03)
+        root = finish_trace(token, 200)
+
+        seconds = root.trace.component_seconds
+        assert seconds["home_assistant"] >= 0.03
+        assert 0.02 <= seconds["tool"] < 0.03 + 0.02
+        assert sum(seconds.values()) == pytest.approx(root.duration, abs=0.002)
+        assert current_span() is None
+
+    def test_components_are_exported_per_endpoint(self):
+        before = component_count("/trace/export", "database")
+
+        token = start_trace("GET", "/trace/export")
+        with span("database", "get_all_devices"):
+            pass
+        finish_trace(token)
+
+        assert component_count("/trace/export", "database") == before + 1
+        assert component_count("/trace/export", "app") >= 1
+
+    def test_traced_decorator_supports_coroutines(self):
+        @traced("llm")
+        async def complete():
+            return "ok"
+
+        loop = EventLoopThread("test-tracing-loop")
+        token = start_trace("POST", "/trace/async")
+        try:
+            # The shared loop runs tasks in its own thread; the span must
+            # still attach to this request
+            assert loop.run_sync(complete()) == "ok"
+        finally:
+            root = finish_trace(token)
+            loop.stop()
+
+        assert [child.component for child in root.children] == ["llm"]
+
+
+class TestSlowRequestLog:
+    """Tests for the slow-request span tree log."""
+
+    def test_slow_request_logs_span_tree(self, monkeypatch, caplog):
+        monkeypatch.setattr("src.tracing.SLOW_REQUEST_LOG_MS", 1)
+        token = start_trace("POST", "/trace/slow")
+        with span("llm", "gpt-4o-mini"):
+            time.sleep(0.005)
+
+        with caplog.at_level(logging.WARNING, logger="src.tracing"):
+            finish_trace(token, 200)
+
+        assert "Slow request POST /trace/slow -> 200" in caplog.text
+        assert "llm gpt-4o-mini" in caplog.text
+
+    def test_disabled_by_default(self, monkeypatch, caplog):
+        monkeypatch.setattr("src.tracing.SLOW_REQUEST_LOG_MS", 0)
+        token = start_trace("GET", "/trace/fast")
+        with caplog.at_level(logging.WARNING, logger="src.tracing"):
+            finish_trace(token)
+
+        assert "Slow request" not in caplog.text
+
+
+class TestFlaskMiddleware:
+    """Tests for tracing started by the metrics middleware."""
+
+    def test_request_spans_are_recorded(self):
+        from src.metrics import metrics_middleware
+
+        app = Flask(__name__)
+        before_request, after_request = metrics_middleware()
+        app.before_request(before_request)
+        app.after_request(after_request)
+
+        @app.route("/trace/flask")
+        def view():
+            with span("home_assistant", "GET /api/states"):
+                return "ok"
+
+        before = component_count("/trace/flask", "home_assistant")
+        response = app.test_client().get("/trace/flask")
+
+        assert response.status_code == 200
+        assert component_count("/trace/flask", "home_assistant") == before + 1
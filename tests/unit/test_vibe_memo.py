@@ -0,0 +1,120 @@
+"""
+Tests for src/vibe_memo.py - Persistent vibe interpretation memo
+
+Covers key normalization, time-of-day bucketing, TTL expiry, LRU eviction,
+and persistence across instances.
+"""
+
+import time
+
+import pytest
+
+from src.vibe_memo import VibeMemo, normalize_description, time_of_day_bucket
+
+
+@pytest.fixture
+def memo(tmp_path):
+    """Create a memo backed by a temporary database."""
+    return VibeMemo(database_path=tmp_path / "vibe_memo.db", max_entries=3, ttl_seconds=60)
+
+
+class TestNormalization:
+    """Tests for memo key normalization."""
+
+    def test_normalize_strips_punctuation_and_filler(self):
+        """Equivalent phrasings share a normalized description."""
+        assert normalize_description("A cozy, rainy vibe, please!") == "cozy rainy"
+        assert normalize_description("  cozy   RAINY ") == "cozy rainy"
+
+    def test_normalize_keeps_all_filler_description(self):
+        """A description made only of filler words is kept as-is."""
+        assert normalize_description("the vibe") == "the vibe"
+
+    @pytest.mark.parametrize(
+        "first,second",
+        [
+            ("light blue", "blue"),
+            ("dim the light", "dim"),
+            ("light and airy", "and airy"),
+            ("warm lights", "warm"),
+            ("set the mood", "the mood"),
+        ],
+    )
+    def test_normalize_keeps_meaningful_words(self, first, second):
+        """Words like "light" change the vibe, so they stay in the key."""
+        assert normalize_description(first) != normalize_description(second)
+
+    @pytest.mark.parametrize(
+        "time_of_day,expected",
+        [
+            (None, ""),
+            ("early morning", "morning"),
+            ("late evening", "evening"),
+            ("bedtime", "night"),
+            ("14:30", "afternoon"),
+            ("9pm", "night"),
+            ("7 pm", "evening"),
+            ("12am", "night"),
+        ],
+    )
+    def test_time_of_day_bucket(self, time_of_day, expected):
+        """Free-text time context is reduced to a coarse bucket."""
+        assert time_of_day_bucket(time_of_day) == expected
+
+
+class TestVibeMemo:
+    """Tests for memo storage behavior."""
+
+    def test_miss_then_hit(self, memo):
+        """Stored interpretations are returned for equivalent requests."""
+        settings = {"type": "basic", "brightness": 35, "color_temp_kelvin": 2400, "source": "llm"}
+
+        assert memo.get("cozy rainy", "living room", "evening") is None
+        memo.set("cozy rainy", settings, "living room", "evening")
+
+        assert memo.get("Cozy, rainy vibe", "living_room", "8pm") == settings
+        stats = memo.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_room_and_time_bucket_are_part_of_key(self, memo):
+        """The same vibe in a different room or time bucket is a miss."""
+        memo.set("cozy rainy", {"brightness": 35}, "bedroom", "evening")
+
+        assert memo.get("cozy rainy", "kitchen", "evening") is None
+        assert memo.get("cozy rainy", "bedroom", "morning") is None
+
+    def test_ttl_expiry(self, tmp_path):
+        """Expired interpretations are removed and treated as misses."""
+        memo = VibeMemo(database_path=tmp_path / "memo.db", ttl_seconds=0)
+        memo.set("neon noir", {"brightness": 30})
+        time.sleep(0.01)
+
+        assert memo.get("neon noir") is None
+        assert memo.get_stats()["size"] == 0
+
+    def test_lru_eviction(self, memo):
+        """The least recently used entry is evicted past max_entries."""
+        memo.set("vibe one", {"brightness": 1})
+        memo.set("vibe two", {"brightness": 2})
+        memo.set("vibe three", {"brightness": 3})
+        memo.get("vibe one")  # Touch so "vibe two" becomes least recent
+
+        memo.set("vibe four", {"brightness": 4})
+
+        assert memo.get("vibe two") is None
+        assert memo.get("vibe one") == {"brightness": 1}
+        assert memo.get_stats()["evictions"] == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        """Interpretations survive a process restart."""
+        path = tmp_path / "memo.db"
+        VibeMemo(database_path=path).set("misty forest dawn", {"brightness": 45})
+
+        assert VibeMemo(database_path=path).get("misty forest dawn") == {"brightness": 45}
+
+    def test_clear(self, memo):
+        """clear() removes all entries."""
+        memo.set("vibe one", {"brightness": 1})
+        memo.clear()
+        assert memo.get_stats()["size"] == 0
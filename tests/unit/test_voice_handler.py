@@ -171,6 +171,210 @@ class TestVoiceHandler:
         assert "took too long" in error_lower or "timeout" in error_lower or "time" in error_lower
 
 
+    def test_async_agent_cancelled_on_timeout(self):
+        """
+        Test that an async agent callback is cancelled when the timeout expires.
+
+        Verifies:
+        - Timeout error is returned promptly
+        - The agent task is cancelled rather than left running
+        """
+        import asyncio
+        import threading
+        from src.voice_handler import VoiceHandler
+
+        cancelled = threading.Event()
+
+        async def slow_agent(text):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "Done"
+
+        handler = VoiceHandler(agent_callback=slow_agent, timeout_seconds=0.2)
+
+        result = handler.process_command("do something slow")
+
+        assert result["success"] is False
+        assert "took too long" in result["error"].lower()
+        assert cancelled.wait(2)
+
+    def test_async_agent_response_returned(self):
+        """Test that an async agent callback's response is formatted and returned."""
+        from src.voice_handler import VoiceHandler
+
+        async def agent(text):
+            return f"Handled {text}"
+
+        handler = VoiceHandler(agent_callback=agent)
+
+        result = handler.process_command("lights on")
+
+        assert result["success"] is True
+        assert "Handled lights on" in result["response"]
+
+class TestVoiceExecutorPool:
+    """Tests for the shared voice worker pool and deadline propagation."""
+
+    def test_threads_reused_across_commands(self):
+        """Sequential commands run on the same pooled worker thread."""
+        import threading
+        from src.voice_handler import VoiceExecutorPool, VoiceHandler
+
+        pool = VoiceExecutorPool(max_workers=1, max_queue=4)
+        thread_ids = []
+
+        def agent(text):
+            thread_ids.append(threading.get_ident())
+            return "ok"
+
+        handler = VoiceHandler(agent_callback=agent, executor_pool=pool)
+        for _ in range(3):
+            assert handler.process_command("lights on")["success"] is True
+
+        assert len(set(thread_ids)) == 1
+        assert pool.get_stats()["completed"] == 3
+        pool.shutdown()
+
+    def test_rejects_when_queue_full(self):
+        """Commands beyond the queue bound get a busy response."""
+        import threading
+        from src.voice_handler import VoiceExecutorPool, VoiceHandler
+
+        pool = VoiceExecutorPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+        pool.submit(release.wait, 2)
+        pool.submit(release.wait, 2)
+
+        handler = VoiceHandler(agent_callback=lambda text: "ok", executor_pool=pool)
+        try:
+            result = handler.process_command("lights on")
+        finally:
+            release.set()
+            pool.shutdown(wait=True)
+
+        assert result["success"] is False
+        assert "busy" in result["error"].lower()
+        assert pool.get_stats()["rejected"] == 1
+
+    def test_cancelled_queued_command_frees_slot(self):
+        """A queued command cancelled before starting releases its queue slot."""
+        import threading
+        from src.voice_handler import VoiceExecutorPool
+
+        pool = VoiceExecutorPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+        pool.submit(release.wait, 2)
+        queued = pool.submit(lambda: "never")
+
+        assert queued.cancel() is True
+        assert pool.get_stats()["queued"] == 0
+        release.set()
+        pool.shutdown(wait=True)
+
+    def test_deadline_passed_and_cancelled_on_timeout(self):
+        """Callbacks declaring a deadline see it cancelled when the handler gives up."""
+        import threading
+        from src.voice_handler import VoiceExecutorPool, VoiceHandler
+
+        pool = VoiceExecutorPool(max_workers=1, max_queue=1)
+        received = []
+        finished = threading.Event()
+
+        def agent(text, deadline=None):
+            received.append(deadline)
+            while not deadline.expired():
+                threading.Event().wait(0.01)
+            finished.set()
+            return "too late"
+
+        handler = VoiceHandler(agent_callback=agent, timeout_seconds=5, executor_pool=pool)
+        handler.timeout_seconds = 0.1
+
+        result = handler.process_command("do something slow")
+
+        assert result["success"] is False
+        assert received[0] is not None
+        assert finished.wait(1)
+        pool.shutdown()
+
+    def test_deadline_not_passed_to_plain_callbacks(self):
+        """Callbacks without a deadline parameter are called with the text only."""
+        from src.voice_handler import VoiceExecutorPool, VoiceHandler
+
+        pool = VoiceExecutorPool(max_workers=1, max_queue=1)
+        agent = MagicMock(return_value="ok")
+        handler = VoiceHandler(agent_callback=lambda text: agent(text), executor_pool=pool)
+
+        handler.process_command("lights on")
+
+        agent.assert_called_once_with("lights on")
+        pool.shutdown()
+
+
+class TestVoiceStatePrefetch:
+    """Tests for speculative room state prefetch on puck commands."""
+
+    def test_prefetches_room_entities_for_puck(self):
+        """A command from a registered puck prefetches its room's states."""
+        import threading
+        from src.voice_handler import VoiceHandler
+
+        location_manager = MagicMock()
+        location_manager.get_room_from_context.return_value = "bedroom"
+        location_manager.get_room_entities.return_value = ["light.bubble", "cover.bedroom_blinds"]
+
+        ha_client = MagicMock()
+        prefetched = threading.Event()
+        ha_client.prefetch_states.side_effect = lambda ids: prefetched.set()
+
+        handler = VoiceHandler(
+            agent_callback=lambda text: "ok",
+            location_manager=location_manager,
+            prefetch_enabled=True,
+        )
+
+        with patch("src.ha_client.get_ha_client", return_value=ha_client):
+            result = handler.process_command("turn on the lights", {"device_id": "puck_1"})
+            assert prefetched.wait(2)
+
+        assert result["success"] is True
+        ha_client.prefetch_states.assert_called_once_with(["light.bubble", "cover.bedroom_blinds"])
+
+    def test_no_prefetch_without_device_id(self):
+        """Commands without a puck device_id don't prefetch."""
+        from src.voice_handler import VoiceHandler
+
+        location_manager = MagicMock()
+        handler = VoiceHandler(
+            agent_callback=lambda text: "ok",
+            location_manager=location_manager,
+            prefetch_enabled=True,
+        )
+
+        handler.process_command("turn on the lights", {"language": "en"})
+
+        location_manager.get_room_from_context.assert_not_called()
+
+    def test_prefetch_errors_do_not_fail_command(self):
+        """Prefetch failures never affect the command result."""
+        from src.voice_handler import VoiceHandler
+
+        location_manager = MagicMock()
+        location_manager.get_room_from_context.side_effect = Exception("db locked")
+        handler = VoiceHandler(
+            agent_callback=lambda text: "ok",
+            location_manager=location_manager,
+            prefetch_enabled=True,
+        )
+
+        result = handler.process_command("turn on the lights", {"device_id": "puck_1"})
+
+        assert result["success"] is True
+
+
 class TestVoiceHandlerRequestParsing:
     """Tests for parsing HA webhook request format."""
 
@@ -0,0 +1,142 @@
+"""
+Unit tests for the web server launcher (development/production modes).
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from src import web_server
+from src.web_server import build_options, default_workers, prepare_metrics_dir
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+class TestBuildOptions:
+    """Tests for the gunicorn settings."""
+
+    def test_plain_http_listener(self):
+        options = build_options("0.0.0.0:5049", workers=3, threads=4, primary=False)
+
+        assert options["bind"] == ["0.0.0.0:5049"]
+        assert options["workers"] == 3
+        assert options["threads"] == 4
+        assert options["worker_class"] == "gthread"
+        assert options["preload_app"] is False
+        assert "certfile" not in options
+        assert "on_reload" not in options
+
+    def test_tls_listener_reuses_ssl_config(self):
+        options = build_options("0.0.0.0:5050", workers=2, threads=8, use_tls=True)
+
+        assert options["certfile"].endswith("server.crt")
+        assert options["keyfile"].endswith("server.key")
+        assert options["ssl_context"] is web_server._ssl_context
+        assert options["on_reload"] is web_server._forward_reload
+        assert options["on_exit"] is web_server._stop_http_listener
+
+    def test_default_workers_is_capped(self, monkeypatch):
+        monkeypatch.setattr(os, "cpu_count", lambda: 16)
+        assert default_workers() == web_server.MAX_AUTO_WORKERS
+
+        monkeypatch.setattr(os, "cpu_count", lambda: None)
+        assert default_workers() == 1
+
+
+class TestRunProductionServer:
+    """Tests for the listeners started in production mode."""
+
+    def test_http_listener_gets_its_own_worker_count(self, tmp_path, monkeypatch):
+        listeners = {}
+
+        def record_options(bind, workers, threads, **kwargs):
+            listeners[bind] = workers
+            return build_options(bind, workers, threads, **kwargs)
+
+        monkeypatch.setattr(web_server, "certificates_exist", lambda: True)
+        monkeypatch.setattr(web_server, "prepare_metrics_dir", lambda: tmp_path)
+        monkeypatch.setattr(web_server, "build_options", record_options)
+        monkeypatch.setattr(web_server, "_serve", lambda options: None)
+        monkeypatch.setattr(os, "fork", lambda: 4321)  # stay in the parent
+        monkeypatch.setattr(web_server, "_http_listener_pid", None)
+
+        web_server.run_production_server(host="0.0.0.0", port=5050, workers=4, http_workers=1)
+
+        assert listeners == {"0.0.0.0:5049": 1, "0.0.0.0:5050": 4}
+        assert web_server._http_listener_pid == 4321
+
+
+class TestMultiprocessMetrics:
+    """Tests for metrics aggregation across worker processes."""
+
+    def test_prepare_clears_stale_files(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+        metrics_dir = tmp_path / "prometheus"
+        metrics_dir.mkdir()
+        (metrics_dir / "counter_123.db").write_bytes(b"stale")
+
+        assert prepare_metrics_dir(metrics_dir) == metrics_dir
+        assert list(metrics_dir.iterdir()) == []
+        assert os.environ["PROMETHEUS_MULTIPROC_DIR"] == str(metrics_dir)
+
+    def test_metrics_response_sums_workers(self, tmp_path, monkeypatch):
+        from src.metrics import get_metrics_response
+
+        # Two "workers" each record a request in the shared directory
+        worker = (
+            "from src.metrics import track_request_duration; "
+            "track_request_duration('GET', '/api/status', 200, 0.1)"
+        )
+        environment = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        for _ in range(2):
+            subprocess.run(
+                [sys.executable, "-c", worker], cwd=PROJECT_ROOT, env=environment, check=True
+            )
+
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+        body, _ = get_metrics_response()
+
+        assert (
+            'smarthome_http_requests_total{endpoint="/api/status",method="GET",status="200"} 2.0'
+            in body.decode()
+        )
+
+
+class TestMain:
+    """Tests for mode selection."""
+
+    def test_production_mode_starts_gunicorn(self, monkeypatch):
+        calls = []
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "/tmp/metrics")
+        monkeypatch.setattr(web_server, "SERVER_MODE", "production")
+        monkeypatch.setattr(
+            web_server, "run_production_server", lambda **kwargs: calls.append(kwargs)
+        )
+
+        web_server.main()
+
+        assert calls == [{"use_https": True, "http_listener": True}]
+
+    def test_production_mode_restarts_with_metrics_dir(self, tmp_path, monkeypatch):
+        restarts = []
+        monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+        monkeypatch.setattr(web_server, "SERVER_MODE", "production")
+        monkeypatch.setattr(web_server, "DEFAULT_METRICS_DIR", tmp_path)
+        monkeypatch.setattr(os, "execv", lambda path, args: restarts.append(args))
+        monkeypatch.setattr(web_server, "run_production_server", lambda **kwargs: None)
+
+        web_server.main()
+
+        assert restarts[0][1:3] == ["-m", "src.web_server"]
+        assert os.environ["PROMETHEUS_MULTIPROC_DIR"] == str(tmp_path)
+
+    def test_development_mode_runs_flask_server(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(web_server, "SERVER_MODE", "development")
+        monkeypatch.setattr("src.server.run_server", lambda **kwargs: calls.append(kwargs))
+
+        web_server.main()
+
+        assert calls[0]["port"] == web_server.SERVER_PORT
@@ -3,10 +3,12 @@ Smart Home Assistant - Philips Hue Specialist Agent
 
 A specialist agent that translates abstract vibe descriptions and scene requests
 into specific Philips Hue settings. Uses Claude to interpret complex requests
-that don't map directly to presets.
+that don't map directly to presets. LLM interpretations are memoized in
+src/vibe_memo.py so repeated creative vibes don't cost another LLM call.
 """
 
 import json
+import re
 from typing import Any
 
 import openai
@@ -17,6 +19,7 @@ from src.config import (
     VIBE_PRESETS,
 )
 from src.utils import load_prompts, setup_logging, track_api_usage
+from src.vibe_memo import get_vibe_memo
 
 
 logger = setup_logging("hue_specialist")
@@ -58,6 +61,32 @@ HUE_SCENE_MAPPINGS = {
     "xmas": {"scene": "chinatown", "dynamic": True, "speed": 20, "brightness": 70},
 }
 
+
+def _compile_scene_keywords(mappings: dict[str, dict]) -> tuple[re.Pattern, dict[str, int]]:
+    """
+    Compile scene keywords into a single regex for one-pass matching.
+
+    The alternation is wrapped in a lookahead so every start position is
+    examined, and alternatives are listed in mapping order so the earliest
+    keyword wins - the same result as testing each keyword as a substring.
+    """
+    keywords = list(mappings)
+    pattern = re.compile("(?=(" + "|".join(re.escape(keyword) for keyword in keywords) + "))")
+    priority = {keyword: index for index, keyword in enumerate(keywords)}
+    return pattern, priority
+
+
+_SCENE_KEYWORD_PATTERN, _SCENE_KEYWORD_PRIORITY = _compile_scene_keywords(HUE_SCENE_MAPPINGS)
+
+
+def _match_scene_keyword(description_lower: str) -> str | None:
+    """Return the highest-priority scene keyword found in the description."""
+    matches = {match.group(1) for match in _SCENE_KEYWORD_PATTERN.finditer(description_lower)}
+    if not matches:
+        return None
+    return min(matches, key=_SCENE_KEYWORD_PRIORITY.__getitem__)
+
+
 # Scene descriptions for the LLM to understand available options
 AVAILABLE_SCENES = {
     "arctic_aurora": "Cool blues and greens with purple accents, mimics northern lights",
@@ -77,8 +106,9 @@ def interpret_vibe_request(
     """
     Interpret an abstract vibe description and return light settings.
 
-    First checks for direct mappings in presets and scene mappings.
-    Falls back to LLM interpretation for complex requests.
+    First checks for direct mappings in presets and scene mappings, then the
+    persistent memo of earlier LLM interpretations. Falls back to LLM
+    interpretation for new complex requests.
 
     Args:
         description: The vibe description (e.g., "cozy evening", "under the sea")
@@ -102,21 +132,36 @@ def interpret_vibe_request(
         }
 
     # Check for Hue scene mappings
-    for keyword, scene_config in HUE_SCENE_MAPPINGS.items():
-        if keyword in description_lower:
-            logger.info(f"Matched Hue scene: {keyword} -> {scene_config['scene']}")
-            return {
-                "type": "scene",
-                "scene_name": scene_config["scene"],
-                "dynamic": scene_config["dynamic"],
-                "speed": scene_config["speed"],
-                "brightness": scene_config["brightness"],
-                "source": "scene_mapping",
-            }
+    keyword = _match_scene_keyword(description_lower)
+    if keyword is not None:
+        scene_config = HUE_SCENE_MAPPINGS[keyword]
+        logger.info(f"Matched Hue scene: {keyword} -> {scene_config['scene']}")
+        return {
+            "type": "scene",
+            "scene_name": scene_config["scene"],
+            "dynamic": scene_config["dynamic"],
+            "speed": scene_config["speed"],
+            "brightness": scene_config["brightness"],
+            "source": "scene_mapping",
+        }
+
+    # Check for a memoized LLM interpretation of the same vibe
+    memo = get_vibe_memo()
+    memoized = memo.get(description, room, time_of_day)
+    if memoized is not None:
+        logger.info(f"Matched memoized vibe interpretation: {description}")
+        memoized["source"] = "memo"
+        return memoized
 
     # Fall back to LLM interpretation for complex requests
     logger.info(f"Using LLM to interpret: {description}")
-    return _llm_interpret_vibe(description, room, time_of_day)
+    result = _llm_interpret_vibe(description, room, time_of_day)
+
+    # Only memoize real LLM answers; fallbacks are cheap and may reflect an outage
+    if result.get("source") == "llm":
+        memo.set(description, result, room, time_of_day)
+
+    return result
 
 
 def _llm_interpret_vibe(
@@ -345,16 +345,11 @@ def list_plugs(filter_device_class: str = "all") -> dict[str, Any]:
     ha_client = get_ha_client()
 
     try:
-        all_states = ha_client.get_all_states()
+        store = ha_client.get_entity_store()
         plugs = []
 
-        for entity in all_states:
-            entity_id = entity.get("entity_id", "")
-            if not entity_id.startswith("switch."):
-                continue
-
-            attributes = entity.get("attributes", {})
-            device_class = attributes.get("device_class", "switch")
+        for entity in store.by_domain("switch"):
+            device_class = entity.device_class or "switch"
 
             # Filter by device class if specified
             if filter_device_class != "all":
@@ -362,17 +357,17 @@ def list_plugs(filter_device_class: str = "all") -> dict[str, Any]:
                     continue
 
             plug_info = {
-                "entity_id": entity_id,
-                "friendly_name": attributes.get("friendly_name", entity_id),
-                "state": entity.get("state", "unknown"),
+                "entity_id": entity.entity_id,
+                "friendly_name": entity.friendly_name or entity.entity_id,
+                "state": entity.state,
                 "device_class": device_class,
             }
 
             # Add power monitoring availability
-            plug_info["power_monitoring_available"] = "current_power_w" in attributes
+            plug_info["power_monitoring_available"] = entity.has_attribute("current_power_w")
 
             # Mark high-power devices
-            if _is_high_power_device(entity_id):
+            if _is_high_power_device(entity.entity_id):
                 plug_info["is_high_power_device"] = True
 
             plugs.append(plug_info)